@@ -2,39 +2,72 @@
 Zemax Automation Script
 Zemax 자동화 스크립트
 
-This script demonstrates basic Zemax OpticStudio automation using ZOS-API.
-ZOS-API를 사용한 기본적인 Zemax OpticStudio 자동화를 시연합니다.
+This script demonstrates Zemax OpticStudio automation through a pluggable
+backend: ZOS-API on Windows, or the local pure-Python ray tracer anywhere.
+교체 가능한 백엔드를 통한 Zemax OpticStudio 자동화를 시연합니다.
+Windows에서는 ZOS-API, 그 밖의 환경에서는 로컬 순수 파이썬 광선 추적기를
+사용합니다.
 
-Note: This is an example script. Actual implementation requires ZOS-API installation.
-참고: 이것은 예제 스크립트입니다. 실제 구현을 위해서는 ZOS-API 설치가 필요합니다.
+Note: The 'zosapi' backend requires OpticStudio and pythonnet; the default
+'local' backend runs without them.
+참고: 'zosapi' 백엔드는 OpticStudio와 pythonnet이 필요하며, 기본 'local'
+백엔드는 추가 설치 없이 동작합니다.
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
+import sys
+import time
 from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from scripts.analysis_results import MTFData, SpotData
+from scripts.ghost_analysis import analyze_ghosts
+from scripts.image_simulation import (Detector, ImageSimulator, PSFGrid, band_radiance,
+                                      radiance_to_temperature)
+from scripts.nonsequential import CollimatedSource, NonSequentialTracer, Scene
+from scripts.optics_backend import BackendError, OpticsBackend, create_backend
+from scripts.prescription import Prescription
+from scripts.raytrace import paraxial_data
+from scripts.thin_film import ThinFilmStack
 
 
 class ZemaxAutomation:
-    """Zemax 자동화 클래스 (예제)"""
+    """Zemax 자동화 클래스 (백엔드 프로토콜 기반)"""
     
-    def __init__(self):
-        """초기화"""
-        self.system = None
-        self.lens_data_editor = None
+    def __init__(self, backend: Optional[OpticsBackend] = None):
+        """
+        초기화
+        
+        Args:
+            backend: 광학 엔진 백엔드 (None이면 처음 사용할 때 로컬 백엔드 연결).
+                OpticStudio 세션을 재사용하려면 BackendPool.acquire()로 빌린
+                백엔드를 전달하세요.
+        """
+        self.backend = backend
+    
+    @property
+    def system(self):
+        """백엔드의 현재 시스템 (로컬: Prescription, ZOS-API: IOpticalSystem)"""
+        return self._backend().system
     
-    def connect_to_zemax(self):
+    def _backend(self) -> OpticsBackend:
+        if self.backend is None:
+            self.connect_to_zemax()
+        return self.backend
+    
+    def connect_to_zemax(self, backend: str = 'local', **kwargs):
         """
-        Zemax OpticStudio 연결
+        광학 엔진 연결
         
-        실제 구현 예제:
-        import clr
-        clr.AddReference("path/to/ZOSAPI.dll")
-        import ZOSAPI
-        self.zos = ZOSAPI.ZOSAPI()
+        Args:
+            backend: 'local' (순수 파이썬) 또는 'zosapi' (OpticStudio)
+            **kwargs: 백엔드 생성자 인자 (예: zemax_root)
         """
-        print("Connecting to Zemax OpticStudio...")
-        # 실제 연결 코드는 ZOS-API 설치 후 사용
-        pass
+        print(f"Connecting to optical engine ({backend})...")
+        self.backend = create_backend(backend, **kwargs)
     
     def create_new_lens(self, system_type="NSC"):
         """
@@ -44,30 +77,43 @@ class ZemaxAutomation:
             system_type: "NSC" or "SEQ"
         """
         print(f"Creating new {system_type} lens system...")
-        pass
+        self._backend().new_system(system_type)
+    
+    def open_file(self, filepath):
+        """
+        렌즈 파일 열기
+        
+        Args:
+            filepath: 파일 경로
+        """
+        self._backend().open_file(filepath)
     
     def add_surface(self, surface_type, radius, thickness, material):
         """
-        표면 추가
+        표면 추가 (상면 앞에 삽입)
         
         Args:
             surface_type: 표면 타입 (Standard, Even Asphere, etc.)
             radius: 곡률 반경 (mm)
             thickness: 두께 (mm)
             material: 재질
+            
+        Returns:
+            삽입된 표면 번호
         """
         print(f"Adding surface: R={radius}, T={thickness}, Material={material}")
-        pass
+        return self._backend().insert_surface(surface_type=surface_type, radius=radius,
+                                              thickness=thickness, glass=material)
     
     def set_wavelength(self, wavelength_um):
         """
         파장 설정
         
         Args:
-            wavelength_um: 파장 (μm)
+            wavelength_um: 파장 (μm) 또는 파장 리스트
         """
         print(f"Setting wavelength: {wavelength_um} μm")
-        pass
+        self._backend().set_system_data(wavelengths=np.atleast_1d(wavelength_um))
     
     def set_field(self, field_angles):
         """
@@ -77,65 +123,118 @@ class ZemaxAutomation:
             field_angles: 시야각 리스트 (degrees)
         """
         print(f"Setting field angles: {field_angles}")
-        pass
+        self._backend().set_system_data(fields=np.atleast_1d(field_angles))
+    
+    def set_aperture(self, epd_mm):
+        """
+        입사동 지름 설정
+        
+        Args:
+            epd_mm: 입사동 지름 (mm)
+        """
+        self._backend().set_system_data(aperture=epd_mm)
     
-    def optimize_system(self, merit_function):
+    def optimize_system(self, merit_function, **settings):
         """
         시스템 최적화
         
         Args:
-            merit_function: 메리트 함수 정의
+            merit_function: 메리트 함수 정의 ('RMS_SPOT_SIZE')
+            **settings: 백엔드 최적화 인자. mode='global'이면 다중 시작
+                전역 탐색 (로컬: n_starts, glass_choices, time_budget,
+                max_workers / OpticStudio: Hammer, time_budget).
+                mode='surrogate'(로컬만)는 대리 모델로 실제 평가 일부를
+                건너뜀 (max_true, n_explore, kappa, screen). EI 탐색은
+                n_explore > 0을 지정해야 실행됨
+            
+        Returns:
+            최적화 후 메리트 값
         """
         print("Running optimization...")
-        pass
+        return self._backend().optimize(merit_function, **settings)
+    
+    def sweep_design(self, space, method='cartesian', n=None, seed=None, **settings):
+        """
+        매개변수 설계 스윕 (현재 시스템 기준, 로컬 광선 추적 엔진)
+        
+        Args:
+            space: 매개변수 이름 -> 값 (예: {'radius:4': [-110, -100, -90]})
+            method: 'cartesian', 'lhs' 또는 'sobol'
+            n: 'lhs'/'sobol' 점 수
+            seed: 난수 시드
+            **settings: DesignSweep 인자 (metrics, density, mtf_frequency)
+            
+        Returns:
+            점 x 시야 x 파장 한 행의 결과 DataFrame
+        """
+        from scripts.design_sweep import run_sweep
+        
+        system = self.system
+        if not isinstance(system, Prescription):
+            raise BackendError("design sweeps run on the local engine; save the design "
+                               "as .zmx and open it with the 'local' backend")
+        return run_sweep(system, space, method, n, seed, **settings)
     
-    def get_spot_diagram_data(self):
+    def get_spot_diagram_data(self, density=6):
         """
         스팟 다이어그램 데이터 추출
         
+        Args:
+            density: 동공 샘플 링 수
+            
         Returns:
-            dict: {wavelength: {field: {x: [], y: []}}}
+            SpotData: 주광선 기준 x, y (μm)와 field/wavelength 번호 열.
+                data.sel(field=f)는 해당 시야의 뷰, data.groups()는
+                (시야 번호, 파장 번호, 그룹 뷰) 순회
         """
-        # 예제 데이터 생성
-        data = {
-            0.55: {  # wavelength in μm
-                0: {  # field number
-                    'x': np.random.normal(0, 5, 1000),
-                    'y': np.random.normal(0, 5, 1000)
-                }
-            }
-        }
-        return data
-    
-    def get_mtf_data(self):
+        backend = self._backend()
+        arrays = backend.fetch_arrays(backend.run_analysis('spot', density=density))
+        wavelengths, fields = self._system_axes(backend)
+        return SpotData.from_arrays(arrays, fields, wavelengths)
+    
+    def get_mtf_data(self, max_frequency=100.0, n_frequencies=50):
         """
         MTF 데이터 추출
         
+        Args:
+            max_frequency: 최대 공간 주파수 (lp/mm)
+            n_frequencies: 주파수 점 수
+            
         Returns:
-            dict: {field: {freq: [], mtf_tangential: [], mtf_sagittal: []}}
+            MTFData: freq와 (시야 수, 주파수 수) tangential/sagittal 배열
         """
-        # 예제 데이터 생성
-        freq = np.linspace(0, 100, 50)
-        mtf = np.exp(-freq / 50)
-        
-        data = {
-            0: {
-                'freq': freq,
-                'mtf_tangential': mtf,
-                'mtf_sagittal': mtf * 0.95
-            }
-        }
-        return data
+        backend = self._backend()
+        arrays = backend.fetch_arrays(backend.run_analysis(
+            'mtf', max_frequency=max_frequency, n_frequencies=n_frequencies))
+        _, fields = self._system_axes(backend)
+        return MTFData.from_arrays(arrays, fields)
+    
+    @staticmethod
+    def _system_axes(backend):
+        """(파장 리스트, 시야 리스트)"""
+        system = backend.system
+        if hasattr(system, 'wavelengths'):
+            return [float(w) for w in system.wavelengths], [float(f) for f in system.fields]
+        data = system.SystemData
+        return ([data.Wavelengths.GetWavelength(i + 1).Wavelength
+                 for i in range(data.Wavelengths.NumberOfWavelengths)],
+                [data.Fields.GetField(i + 1).Y for i in range(data.Fields.NumberOfFields)])
     
     def save_system(self, filepath):
         """
         시스템 저장
         
         Args:
-            filepath: 저장 경로
+            filepath: 저장 경로 (로컬 백엔드는 .zmx 또는 .json)
         """
         print(f"Saving system to: {filepath}")
-        pass
+        self._backend().save_file(filepath)
+    
+    def close(self):
+        """백엔드 연결 종료"""
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
 
 
 def example_create_simple_lens():
@@ -154,6 +253,7 @@ def example_create_simple_lens():
     
     # 시야각 설정
     zemax.set_field([0, 5, 10])
+    zemax.set_aperture(10.0)
     
     # 표면 추가
     surfaces = [
@@ -174,58 +274,133 @@ def example_create_simple_lens():
     zemax.save_system("simple_doublet.zmx")
     
     print("\nLens creation completed!")
+    return zemax
 
 
-def example_analyze_spot_diagram():
+def example_global_optimization(time_budget=30.0):
+    """
+    전역 최적화 예제 (다중 시작 + 뒤쪽 렌즈 유리 후보)
+
+    max_iterations는 LocalBackend.optimize 기본값 200 (시작점당)을 씁니다.
+    이 이중 렌즈는 반복 수 상한 없이 국소 Nelder-Mead를 돌려도 수렴하므로,
+    비교는 같은 메리트 평가 수(n_evaluations)의 국소 최적화와 해야 합니다.
+    """
+    
+    print("\n" + "=" * 60)
+    print("Example: Global Optimization")
+    print("=" * 60)
+    
+    zemax = ZemaxAutomation()
+    zemax.connect_to_zemax()
+    zemax.create_new_lens(system_type="SEQ")
+    zemax.set_wavelength(0.55)
+    zemax.set_field([0, 5, 10])
+    zemax.set_aperture(10.0)
+    for surf in [("Standard", 50, 5, "BK7"), ("Standard", -30, 2, ""),
+                 ("Standard", -30, 5, "SF5"), ("Standard", -100, 95, "")]:
+        zemax.add_surface(*surf)
+    
+    merit = zemax.optimize_system("RMS_SPOT_SIZE", mode='global', n_starts=16,
+                                  glass_choices={3: ['N-SF5', 'F2', 'N-SF11']},
+                                  time_budget=time_budget, seed=0)
+    info = zemax.backend.optimization_info
+    statuses = [start['status'] for start in info['starts']]
+    print(f"Best RMS spot: {merit * 1e3:.1f} μm after {info['n_evaluations']} evaluations "
+          f"in {info['elapsed']:.1f} s")
+    print("Starts: " + ", ".join(f"{status} {statuses.count(status)}"
+                                 for status in sorted(set(statuses))))
+    print(f"Rear glass: {zemax.system.glass[3]}")
+    zemax.close()
+
+
+def example_surrogate_optimization():
+    """대리 모델 최적화 예제 (같은 이중 렌즈, 같은 Nelder-Mead의 선별 유무 비교)"""
+    
+    print("\n" + "=" * 60)
+    print("Example: Surrogate-Assisted Optimization")
+    print("=" * 60)
+    
+    # 같은 Nelder-Mead (같은 시작 단체)에서 선별만 켜고 끔, EI 탐색은 선택 사항
+    runs = [("Nelder-Mead", dict(screen=False)),
+            ("screened", dict(screen=True)),
+            ("EI + screened", dict(screen=True, n_explore=150))]
+    for name, settings in runs:
+        zemax = ZemaxAutomation()
+        zemax.connect_to_zemax()
+        zemax.create_new_lens(system_type="SEQ")
+        zemax.set_wavelength(0.55)
+        zemax.set_field([0, 5, 10])
+        zemax.set_aperture(10.0)
+        for surf in [("Standard", 50, 5, "BK7"), ("Standard", -30, 2, ""),
+                     ("Standard", -30, 5, "SF5"), ("Standard", -100, 95, "")]:
+            zemax.add_surface(*surf)
+        
+        merit = zemax.optimize_system("RMS_SPOT_SIZE", mode='surrogate', max_iterations=1000,
+                                      max_true=1500, seed=0, **settings)
+        info = zemax.backend.optimization_info
+        print(f"{name:>13}: RMS spot {merit * 1e3:.1f} μm, {info['n_evaluations']} true "
+              f"evaluations ({info['skipped_trials']} trial points rejected by surrogate), "
+              f"{info['elapsed']:.1f} s")
+        zemax.close()
+    print("(screening pays off only when one true evaluation costs more than a GP "
+          "prediction; this ray-trace merit is cheap, so wall time goes up)")
+
+
+def example_analyze_spot_diagram(zemax=None):
     """스팟 다이어그램 분석 예제"""
+    import matplotlib.pyplot as plt
     
     print("\n" + "=" * 60)
     print("Example: Analyze Spot Diagram")
     print("=" * 60)
     
-    zemax = ZemaxAutomation()
+    zemax = zemax or example_create_simple_lens()
     data = zemax.get_spot_diagram_data()
     
-    # 플롯
-    for wavelength, field_data in data.items():
-        for field, spots in field_data.items():
-            plt.figure(figsize=(8, 8))
-            plt.scatter(spots['x'], spots['y'], s=0.5, alpha=0.5)
-            plt.xlabel('X (μm)')
-            plt.ylabel('Y (μm)')
-            plt.title(f'Spot Diagram - λ={wavelength}μm, Field={field}°')
-            plt.axis('equal')
-            plt.grid(True, alpha=0.3)
-            
-            # RMS 계산
-            rms = np.sqrt(np.mean(spots['x']**2 + spots['y']**2))
-            plt.text(0.05, 0.95, f'RMS: {rms:.2f} μm',
-                    transform=plt.gca().transAxes,
-                    verticalalignment='top',
-                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-            
-            plt.tight_layout()
-            plt.savefig(f'spot_diagram_w{wavelength}_f{field}.png', dpi=150)
-            print(f"Saved: spot_diagram_w{wavelength}_f{field}.png")
-            plt.close()
+    # 플롯 (그룹별 뷰, RMS는 한 번에 벡터 계산)
+    rms = data.rms_radius(reference='chief')
+    for f, w, spots in data.groups():
+        field, wavelength = data.fields[f], data.wavelengths[w]
+        plt.figure(figsize=(8, 8))
+        plt.scatter(spots.x, spots.y, s=0.5, alpha=0.5)
+        plt.xlabel('X (μm)')
+        plt.ylabel('Y (μm)')
+        plt.title(f'Spot Diagram - λ={wavelength}μm, Field={field}°')
+        plt.axis('equal')
+        plt.grid(True, alpha=0.3)
+        
+        plt.text(0.05, 0.95, f'RMS: {rms[f, w]:.2f} μm',
+                transform=plt.gca().transAxes,
+                verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+        
+        plt.tight_layout()
+        plt.savefig(f'spot_diagram_w{wavelength}_f{field}.png', dpi=150)
+        print(f"Saved: spot_diagram_w{wavelength}_f{field}.png")
+        plt.close()
 
 
-def example_analyze_mtf():
+def example_analyze_mtf(zemax=None):
     """MTF 분석 예제"""
+    import matplotlib.pyplot as plt
     
     print("\n" + "=" * 60)
     print("Example: Analyze MTF")
     print("=" * 60)
     
-    zemax = ZemaxAutomation()
+    zemax = zemax or example_create_simple_lens()
     data = zemax.get_mtf_data()
     
+    # 주요 주파수에서 MTF (전체 시야 한 번에 보간)
+    freq_50 = 50
+    mtf_50, _ = data.at(freq_50)
+    
     # 플롯
-    for field, mtf_data in data.items():
+    for f, field in enumerate(data.fields):
         plt.figure(figsize=(10, 6))
-        plt.plot(mtf_data['freq'], mtf_data['mtf_tangential'], 
+        plt.plot(data.freq, data.tangential[f], 
                 'b-', linewidth=2, label='Tangential')
-        plt.plot(mtf_data['freq'], mtf_data['mtf_sagittal'], 
+        plt.plot(data.freq, data.sagittal[f], 
                 'r--', linewidth=2, label='Sagittal')
         
         plt.xlabel('Spatial Frequency (lp/mm)')
@@ -235,11 +410,8 @@ def example_analyze_mtf():
         plt.legend()
         plt.ylim([0, 1])
         
-        # 주요 주파수에서 MTF 표시
-        freq_50 = 50
-        mtf_50 = np.interp(freq_50, mtf_data['freq'], mtf_data['mtf_tangential'])
         plt.axvline(x=freq_50, color='g', linestyle=':', alpha=0.5)
-        plt.text(freq_50 + 2, 0.5, f'MTF@50lp/mm: {mtf_50:.3f}',
+        plt.text(freq_50 + 2, 0.5, f'MTF@50lp/mm: {mtf_50[f]:.3f}',
                 rotation=90, verticalalignment='center')
         
         plt.tight_layout()
@@ -248,37 +420,171 @@ def example_analyze_mtf():
         plt.close()
 
 
-def batch_analysis(zemax_files):
+def example_design_sweep(zemax):
+    """설계 스윕 예제 (현재 설계 주변의 마지막 면 곡률 반경 x 상면 거리)"""
+    
+    print("\n" + "=" * 60)
+    print("Example: Design Sweep")
+    print("=" * 60)
+    
+    system = zemax.system
+    space = {
+        'radius:4': system.radius[4] * np.linspace(0.8, 1.2, 13),
+        'thickness:4': system.thickness[4] + np.linspace(-10, 10, 21),
+    }
+    results = zemax.sweep_design(space, metrics=('efl', 'f_number', 'rms_spot'))
+    stats = results.attrs['sweep_stats']
+    print(f"{results['point'].nunique()} designs, "
+          f"{stats['points_per_second']:.0f} designs/s, "
+          f"ray-trace reuse {stats['reuse']:.0%}")
+    
+    merit = results.groupby('point')['rms_spot'].mean()
+    best = results[results['point'] == merit.idxmin()].iloc[0]
+    print(f"Best: R4={best['radius:4']:.1f} mm, T4={best['thickness:4']:.1f} mm, "
+          f"mean RMS spot {merit.min():.1f} μm, EFL {best['efl']:.1f} mm")
+    return results
+
+
+def example_stray_light(zemax, n_rays=50000):
+    """미광/고스트 예제 (현재 설계를 비순차 장면으로 바꾸고 하우징 추가)"""
+    
+    print("\n" + "=" * 60)
+    print("Example: Non-Sequential Stray Light")
+    print("=" * 60)
+    
+    system = zemax.system
+    scene = Scene.from_prescription(system, detector_pixels=64)
+    length = system.vertex_z()[system.image_surface]
+    scene.add_tube(-10.0, length + 10.0, radius=1.5 * system.aperture, scatter=0.05)
+    # 조리개보다 넓은 평행광 (렌즈 밖 광선은 하우징에서 산란)
+    source = CollimatedSource(radius=0.75 * system.aperture, z=-5.0, field_deg=5.0)
+    result = NonSequentialTracer(scene, float(system.wavelengths[0])).run(
+        source, n_rays, seed=0)
+    
+    image = result.detectors['image'].total()
+    print(f"{n_rays} rays, {result.stats['segments']} segments in {result.elapsed:.1f} s")
+    for part in ('direct', 'ghost', 'scatter'):
+        print(f"  {part:>7}: {image[part]:.3e} W ({image[part] / image['flux']:.2%})")
+    print(f"  absorbed {result.stats['absorbed']:.3f} W, escaped {result.stats['escaped']:.3f} W")
+    return result
+
+
+def example_ghost_analysis(zemax, power=5.0):
+    """고스트 반사 예제 (모든 2면 반사 경로의 초점 위치와 최대 조도)"""
+    
+    print("\n" + "=" * 60)
+    print("Example: Ghost Reflection Analysis")
+    print("=" * 60)
+    
+    ghosts = analyze_ghosts(zemax.system, power=power, threshold=1e-4)
+    print(f"{ghosts.attrs['n_traced']} of {ghosts.attrs['n_paths']} two-surface paths "
+          f"above {ghosts.attrs['threshold']:g} energy")
+    for row in ghosts.head(3).itertuples():
+        where = (f"z={row.focus_z:.1f} mm in {row.focus_medium}"
+                 if np.isfinite(row.focus_z) else "no real focus")
+        print(f"  surfaces {row.i}-{row.j}: {row.energy:.2e} of {power:g} W, {where}, "
+              f"peak {row.peak_irradiance:.2e} W/cm^2")
+    return ghosts
+
+
+def example_lwir_coating():
+    """박막 코팅 예제 (게르마늄 창 LWIR AR 코팅, 1064 nm 레이저 미러)"""
+    
+    print("\n" + "=" * 60)
+    print("Example: Thin-Film Coatings")
+    print("=" * 60)
+    
+    wavelengths = np.linspace(8.0, 12.0, 81)
+    bare = ThinFilmStack([], substrate='GERMANIUM').curve(wavelengths, [0.0, 30.0])
+    ar = ThinFilmStack.quarter_wave_stack(['YF3', 'ZNS'], 10.0, substrate='GERMANIUM')
+    coated = ar.curve(wavelengths, [0.0, 30.0])
+    for k, angle in enumerate(coated.angles):
+        print(f"Ge surface 8-12 um, {angle:.0f} deg: T = {bare.grid('T')[:, k].mean():.3f} bare, "
+              f"{coated.grid('T')[:, k].mean():.3f} with YF3/ZnS AR")
+    
+    mirror = ThinFilmStack.quarter_wave_stack(['TIO2', 'SIO2'] * 12 + ['TIO2'], 1.064)
+    curve = mirror.curve([1.064], [0.0, 45.0])
+    print(f"TiO2/SiO2 25-layer mirror at 1064 nm: R = {curve.grid('R', 's')[0, 0]:.5f} (0 deg), "
+          f"Rs = {curve.grid('R', 's')[0, 1]:.5f}, Rp = {curve.grid('R', 'p')[0, 1]:.5f} (45 deg)")
+    return coated
+
+
+def example_thermal_image():
+    """열상 영상 시뮬레이션 예제 (f = 100 mm 게르마늄 단렌즈, 1280x1024 / 640x512)"""
+    
+    print("\n" + "=" * 60)
+    print("Example: Thermal Image Simulation")
+    print("=" * 60)
+    
+    lens = Prescription(wavelengths=[10.0], fields=[0.0, 6.0], aperture=34.0)
+    lens.add_surface(radius=110.0, thickness=6.0, glass='GERMANIUM')
+    lens.add_surface(radius=165.0, thickness=0.0)
+    lens.thickness[2] = paraxial_data(lens).bfl
+    
+    # 장면: 290 K 배경 + 차량(310 K) + 사람(305 K)
+    rows, cols = np.mgrid[0:1024, 0:1280]
+    scene = np.full((1024, 1280), 290.0)
+    scene[600:760, 300:700] = 310.0
+    scene[((rows - 500) / 90)**2 + ((cols - 950) / 25)**2 < 1] = 305.0
+    
+    for name, pixel_mm, oversample in (("1280x1024, 17 um", 0.017, 1),
+                                       ("640x512, 17 um (2x oversampled scene)", 0.0085, 2)):
+        grid = PSFGrid.from_prescription(lens, scene.shape, pixel_mm, grid=(5, 5), size=31)
+        simulator = ImageSimulator(grid, scene.shape)
+        detector = Detector.from_netd(0.05, oversample=oversample, fpn_std=0.02, seed=0)
+        radiance = band_radiance(scene)
+        simulator.blur(radiance)  # 첫 호출에서 FFT plan 준비
+        start = time.perf_counter()
+        frame = simulator.simulate(radiance, detector, np.random.default_rng(0))
+        elapsed = time.perf_counter() - start
+        apparent = radiance_to_temperature(frame)
+        print(f"{name}: frame {frame.shape[1]}x{frame.shape[0]} in {elapsed * 1e3:.0f} ms, "
+              f"vehicle edge 10-90% width "
+              f"{_edge_width(apparent[680 // oversample], 700 // oversample):.1f} px, "
+              f"background {apparent[:100 // oversample].mean():.2f} K")
+    return apparent
+
+
+def _edge_width(profile, edge):
+    """경계 위치 주변 10-90% 상승 폭 (화소)"""
+    window = profile[edge - 15:edge + 15][::-1]
+    low, high = window[:5].mean(), window[-5:].mean()
+    level = (window - low) / (high - low)
+    return float(np.argmax(level > 0.9) - np.argmax(level > 0.1))
+
+
+def batch_analysis(zemax_files, out_dir="batch_results", backend="local",
+                   max_workers=None, max_backends=None, density=6):
     """
-    배치 분석
+    배치 분석 (프로세스 풀, 파일별 결과 즉시 저장, 중단 후 이어서 실행)
     
     Args:
-        zemax_files: Zemax 파일 경로 리스트
+        zemax_files: 렌즈 파일 경로 리스트
+        out_dir: 결과 디렉토리 (manifest.jsonl + results/*.npz)
+        backend: 백엔드 이름 ('local', 'zosapi')
+        max_workers: 프로세스 수 (None이면 CPU 수)
+        max_backends: 동시 백엔드 세션 수 (OpticStudio 라이선스 수)
+        density: 스팟 다이어그램 동공 밀도
+    
+    Returns:
+        실행 요약 딕셔너리 (completed, skipped, failed, elapsed, files_per_second)
     """
+    from scripts.batch_analysis import BatchAnalyzer
+
     print("\n" + "=" * 60)
     print("Batch Analysis")
     print("=" * 60)
     
-    results = []
+    batch = BatchAnalyzer(out_dir, backend=backend, max_workers=max_workers,
+                          max_backends=max_backends, density=density)
+    summary = batch.run(zemax_files)
     
-    for zmx_file in zemax_files:
-        print(f"\nAnalyzing: {zmx_file}")
-        
-        # 파일 열기 (예제)
-        # zemax.open_file(zmx_file)
-        
-        # 분석 수행
-        spot_data = {}  # zemax.get_spot_diagram_data()
-        mtf_data = {}   # zemax.get_mtf_data()
-        
-        results.append({
-            'file': zmx_file,
-            'spot_data': spot_data,
-            'mtf_data': mtf_data
-        })
-    
-    print(f"\nBatch analysis completed for {len(zemax_files)} files")
-    return results
+    print(f"\nCompleted: {summary['completed']}, skipped (already done): "
+          f"{summary['skipped']}, failed: {len(summary['failed'])}")
+    for entry in summary['failed']:
+        print(f"  {entry['file']}: {entry['error']}")
+    print(f"Throughput: {summary['files_per_second']:.2f} files/s")
+    return summary
 
 
 if __name__ == "__main__":
@@ -286,18 +592,25 @@ if __name__ == "__main__":
     print("=" * 60)
     
     # 예제 실행
-    example_create_simple_lens()
-    example_analyze_spot_diagram()
-    example_analyze_mtf()
-    
-    # 배치 분석 예제
-    files = ["lens1.zmx", "lens2.zmx", "lens3.zmx"]
-    # results = batch_analysis(files)
+    zemax = example_create_simple_lens()
+    example_analyze_spot_diagram(zemax)
+    example_analyze_mtf(zemax)
+    example_design_sweep(zemax)
+    example_stray_light(zemax)
+    example_ghost_analysis(zemax)
+    example_lwir_coating()
+    example_thermal_image()
+    example_global_optimization()
+    example_surrogate_optimization()
+    
+    # 배치 분석 예제 (두 번째 실행부터는 완료된 파일을 건너뜀)
+    files = ["simple_doublet.zmx", "missing_lens.zmx"]
+    batch_analysis(files)
     
     print("\n" + "=" * 60)
     print("All examples completed!")
     print("=" * 60)
     
-    print("\nNote: This is a demonstration script.")
-    print("For actual Zemax automation, install ZOS-API and")
-    print("uncomment the actual implementation code.")
+    print("\nNote: This demonstration uses the local ray-tracing backend.")
+    print("For OpticStudio automation, install ZOS-API and pythonnet and")
+    print("call connect_to_zemax('zosapi').")
@@ -0,0 +1,81 @@
+"""
+Optical Design Research Scripts
+광학 설계 연구 스크립트 패키지
+
+This package exposes the analysis modules with lazy loading, so importing it
+does not pull in pandas, matplotlib or scipy.
+분석 모듈을 지연 로드하므로 패키지를 import해도 pandas, matplotlib, scipy를
+불러오지 않습니다.
+
+    from scripts import ZemaxDataProcessor          # data_processing 로드
+    from scripts.optical_calculations import ...    # 모듈 직접 import
+
+무거운 의존성은 해당 기능을 처음 사용할 때 함수 안에서 import합니다.
+새 모듈에서도 모듈 최상위에서는 numpy와 표준 라이브러리만 import하세요
+(tests/test_import_time.py에서 검사).
+"""
+
+import importlib
+
+
+# 공개 이름 -> 정의된 하위 모듈
+_EXPORTS = {
+    'ZemaxDataProcessor': 'data_processing',
+    'MTFAnalyzer': 'data_processing',
+    'AnsysDataProcessor': 'data_processing',
+    'MeasurementDataProcessor': 'data_processing',
+    'ReportGenerator': 'data_processing',
+    'SpotAccumulator': 'spot_statistics',
+    'grouped_spot_statistics': 'spot_statistics',
+    'energy_curves': 'encircled_energy',
+    'energy_radius': 'encircled_energy',
+    'iter_spot_chunks': 'spot_reader',
+    'NodalTemperatureField': 'ansys_reader',
+    'read_nodal_temperatures': 'ansys_reader',
+    'ParseCache': 'parse_cache',
+    'MeasurementStore': 'measurement_store',
+    'batch_uncertainty': 'measurement_uncertainty',
+    'bootstrap_uncertainty': 'measurement_uncertainty',
+    'ReportPipeline': 'report_pipeline',
+    'export_tables': 'table_export',
+    'Prescription': 'prescription',
+    'LocalBackend': 'optics_backend',
+    'BackendPool': 'optics_backend',
+    'create_backend': 'optics_backend',
+    'BatchAnalyzer': 'batch_analysis',
+    'SpotData': 'analysis_results',
+    'MTFData': 'analysis_results',
+    'read_zmx': 'zmx_reader',
+    'index_designs': 'zmx_reader',
+    'ZmxDesign': 'zmx_reader',
+    'DesignSweep': 'design_sweep',
+    'run_sweep': 'design_sweep',
+    'GlobalOptimizer': 'global_optimizer',
+    'surrogate_minimize': 'surrogate',
+    'NonSequentialTracer': 'nonsequential',
+    'analyze_ghosts': 'ghost_analysis',
+    'surface_sag': 'surfaces',
+    'ThinFilmStack': 'thin_film',
+    'ImageSimulator': 'image_simulation',
+    'PSFGrid': 'image_simulation',
+    'OpticalCalculator': 'optical_calculations',
+    'ThermalOpticsCalculator': 'optical_calculations',
+    'ThermalAnalyzer': 'thermal_analysis',
+    'PeltierModule': 'thermal_analysis',
+    'HeatSinkDesigner': 'thermal_analysis',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,380 @@
+"""
+Columnar Analysis Result Containers
+열 기반 분석 결과 컨테이너
+
+This module holds spot diagram and MTF results in contiguous arrays with
+field/wavelength index columns, so selections are array views and the data
+can be handed to pandas, HDF5 and the statistics functions without copying.
+스팟 다이어그램과 MTF 결과를 시야/파장 번호 열이 있는 연속 배열로 보관하여
+선택 결과가 배열 뷰가 되고, pandas, HDF5, 통계 함수에 복사 없이 전달됩니다.
+
+SpotData 광선은 (시야, 파장) 그룹 순서로 정렬되어 있으며 offsets 표가 각
+그룹의 시작 위치를 가리킵니다::
+
+    g = field * n_wavelengths + wavelength
+    x[offsets[g]:offsets[g + 1]]       # 그룹 g의 광선
+
+따라서 한 시야(전체 파장, 다색 스팟 다이어그램)나 한 (시야, 파장) 그룹은
+연속 구간이며 뷰로 선택됩니다. 시야가 여럿일 때 한 파장만 고르면 여러
+구간을 모아야 하므로 복사본이 됩니다.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SPOT_COLUMNS = ('x', 'y', 'field', 'wavelength')
+
+
+@contextmanager
+def _hdf5_group(target, mode: str):
+    """경로 또는 h5py 그룹을 그룹으로 사용"""
+    if isinstance(target, (str, Path)):
+        import h5py
+
+        with h5py.File(target, mode) as f:
+            yield f
+    else:
+        yield target
+
+
+class SpotData:
+    """
+    스팟 다이어그램 결과 (구조체 배열 + 그룹 오프셋 표)
+
+    Attributes:
+        x, y: 주광선 기준 상면 좌표 (μm)
+        field, wavelength: 광선별 시야/파장 번호 (int32)
+        fields: 시야 값 (deg)
+        wavelengths: 파장 값 (μm)
+        offsets: (n_fields * n_wavelengths + 1,) 그룹 시작 위치
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, field: np.ndarray,
+                 wavelength: np.ndarray, fields: Optional[Sequence[float]] = None,
+                 wavelengths: Optional[Sequence[float]] = None):
+        """
+        광선 열에서 생성 (그룹 순서가 아니면 한 번 안정 정렬)
+
+        Args:
+            x, y: 광선 좌표 (μm)
+            field, wavelength: 광선별 시야/파장 번호
+            fields: 시야 값 (None이면 번호)
+            wavelengths: 파장 값 (None이면 번호)
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        field = np.asarray(field, dtype=np.int32)
+        wavelength = np.asarray(wavelength, dtype=np.int32)
+        if not x.shape == y.shape == field.shape == wavelength.shape or x.ndim != 1:
+            raise ValueError("x, y, field and wavelength must be 1-D arrays of equal length")
+        if fields is None:
+            fields = np.arange(field.max() + 1 if field.size else 0)
+        if wavelengths is None:
+            wavelengths = np.arange(wavelength.max() + 1 if wavelength.size else 0)
+        self.fields = np.asarray(fields, dtype=np.float64)
+        self.wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        n_wl = len(self.wavelengths)
+
+        if field.size and (field.min() < 0 or field.max() >= self.n_fields
+                           or wavelength.min() < 0 or wavelength.max() >= n_wl):
+            raise ValueError("field/wavelength index out of range of fields/wavelengths")
+        key = field.astype(np.int64) * n_wl + wavelength
+        if np.any(key[1:] < key[:-1]):
+            order = np.argsort(key, kind='stable')
+            key, x, y, field, wavelength = key[order], x[order], y[order], \
+                field[order], wavelength[order]
+        self.x, self.y, self.field, self.wavelength = x, y, field, wavelength
+        self.offsets = np.searchsorted(key, np.arange(self.n_groups + 1))
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray],
+                    fields: Optional[Sequence[float]] = None,
+                    wavelengths: Optional[Sequence[float]] = None) -> 'SpotData':
+        """백엔드 fetch_arrays('spot') 결과에서 생성"""
+        return cls(*(arrays[key] for key in SPOT_COLUMNS), fields, wavelengths)
+
+    @classmethod
+    def _view(cls, parent: 'SpotData', start: int, stop: int) -> 'SpotData':
+        """parent[start:stop] 연속 구간 뷰 (정렬/검사 생략)"""
+        view = cls.__new__(cls)
+        sl = slice(start, stop)
+        view.x, view.y = parent.x[sl], parent.y[sl]
+        view.field, view.wavelength = parent.field[sl], parent.wavelength[sl]
+        view.fields, view.wavelengths = parent.fields, parent.wavelengths
+        view.offsets = np.clip(parent.offsets - start, 0, stop - start)
+        return view
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __repr__(self) -> str:
+        return (f"SpotData({len(self)} rays, fields={self.fields.tolist()}, "
+                f"wavelengths={self.wavelengths.tolist()})")
+
+    @property
+    def n_fields(self) -> int:
+        return len(self.fields)
+
+    @property
+    def n_wavelengths(self) -> int:
+        return len(self.wavelengths)
+
+    @property
+    def n_groups(self) -> int:
+        return self.n_fields * self.n_wavelengths
+
+    @property
+    def counts(self) -> np.ndarray:
+        """(n_fields, n_wavelengths) 그룹별 광선 수"""
+        return np.diff(self.offsets).reshape(self.n_fields, self.n_wavelengths)
+
+    def sel(self, field: Optional[int] = None, wavelength: Optional[int] = None) -> 'SpotData':
+        """
+        시야/파장 번호로 선택
+
+        Args:
+            field: 시야 번호 (None이면 전체)
+            wavelength: 파장 번호 (None이면 전체)
+
+        Returns:
+            SpotData (한 시야 또는 한 그룹이면 뷰, 여러 시야의 한 파장이면 복사본)
+        """
+        n_wl = self.n_wavelengths
+        if field is not None:
+            field = range(self.n_fields)[field]
+            if wavelength is None:
+                return self._view(self, self.offsets[field * n_wl],
+                                  self.offsets[(field + 1) * n_wl])
+            g = field * n_wl + range(n_wl)[wavelength]
+            return self._view(self, self.offsets[g], self.offsets[g + 1])
+        if wavelength is None:
+            return self
+        wavelength = range(n_wl)[wavelength]
+        if self.n_fields == 1:
+            return self.sel(0, wavelength)
+        keep = self.wavelength == wavelength
+        return SpotData(self.x[keep], self.y[keep], self.field[keep], self.wavelength[keep],
+                        self.fields, self.wavelengths)
+
+    def groups(self) -> Iterator[Tuple[int, int, 'SpotData']]:
+        """
+        비어 있지 않은 그룹 순회
+
+        Yields:
+            (시야 번호, 파장 번호, 그룹 뷰)
+        """
+        for g in np.flatnonzero(np.diff(self.offsets)):
+            f, w = divmod(int(g), self.n_wavelengths)
+            yield f, w, self._view(self, self.offsets[g], self.offsets[g + 1])
+
+    def rms_radius(self, reference: str = 'centroid') -> np.ndarray:
+        """
+        그룹별 RMS 반경 (μm)
+
+        Args:
+            reference: 'centroid' (그룹 중심) 또는 'chief' (주광선 = 원점)
+
+        Returns:
+            (n_fields, n_wavelengths) 배열 (빈 그룹은 nan)
+        """
+        n = np.diff(self.offsets)
+        starts = self.offsets[:-1][n > 0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cx = np.zeros(self.n_groups)
+            cy = np.zeros(self.n_groups)
+            if reference == 'centroid':
+                cx[n > 0] = np.add.reduceat(self.x, starts) / n[n > 0]
+                cy[n > 0] = np.add.reduceat(self.y, starts) / n[n > 0]
+            elif reference != 'chief':
+                raise ValueError(f"reference must be 'centroid' or 'chief', got {reference!r}")
+            g = np.repeat(np.arange(self.n_groups), n)
+            sq = np.zeros(self.n_groups)
+            sq[n > 0] = np.add.reduceat((self.x - cx[g])**2 + (self.y - cy[g])**2, starts)
+            rms = np.sqrt(sq / n)
+        return rms.reshape(self.n_fields, self.n_wavelengths)
+
+    def statistics(self, **kwargs):
+        """
+        spot_statistics.grouped_spot_statistics에 전달
+
+        Returns:
+            {(field, wavelength): SpotStats}
+        """
+        from .spot_statistics import grouped_spot_statistics
+
+        return grouped_spot_statistics(self.x, self.y, self.field, self.wavelength, **kwargs)
+
+    def energy_curves(self, **kwargs):
+        """
+        encircled_energy.energy_curves에 전달
+
+        Returns:
+            {(field, wavelength): EnergyCurve}
+        """
+        from .encircled_energy import energy_curves
+
+        return energy_curves(self.x, self.y, field=self.field, wavelength=self.wavelength,
+                             **kwargs)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """열 배열 딕셔너리 (npz 저장, 해시용)"""
+        return {'x': self.x, 'y': self.y, 'field': self.field, 'wavelength': self.wavelength,
+                'fields': self.fields, 'wavelengths': self.wavelengths}
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        pandas DataFrame (열 배열을 복사하지 않음)
+
+        Returns:
+            x, y, field, wavelength 열 DataFrame
+        """
+        import pandas as pd
+
+        return pd.DataFrame({key: getattr(self, key) for key in SPOT_COLUMNS}, copy=False)
+
+    def to_hdf5(self, target, name: str = 'spot'):
+        """
+        HDF5 그룹으로 저장
+
+        Args:
+            target: 파일 경로 또는 h5py 그룹
+            name: 하위 그룹 이름
+        """
+        with _hdf5_group(target, 'a') as parent:
+            group = parent.require_group(name)
+            for key, value in {**self.to_arrays(), 'offsets': self.offsets}.items():
+                if key in group:
+                    del group[key]
+                group.create_dataset(key, data=value)
+
+    @classmethod
+    def from_hdf5(cls, target, name: str = 'spot') -> 'SpotData':
+        """to_hdf5로 저장한 그룹에서 로드"""
+        with _hdf5_group(target, 'r') as parent:
+            group = parent[name]
+            data = cls.__new__(cls)
+            for key in SPOT_COLUMNS + ('fields', 'wavelengths', 'offsets'):
+                setattr(data, key, group[key][()])
+        return data
+
+
+class MTFData:
+    """
+    MTF 결과 (시야 x 주파수 2차원 배열)
+
+    Attributes:
+        freq: 공간 주파수 (lp/mm)
+        tangential, sagittal: (n_fields, n_freq) MTF
+        fields: 시야 값 (deg)
+    """
+
+    def __init__(self, freq: np.ndarray, tangential: np.ndarray, sagittal: np.ndarray,
+                 fields: Optional[Sequence[float]] = None):
+        """
+        Args:
+            freq: 공간 주파수 (lp/mm)
+            tangential, sagittal: (n_fields, n_freq) MTF
+            fields: 시야 값 (None이면 번호)
+        """
+        self.freq = np.asarray(freq, dtype=np.float64)
+        self.tangential = np.atleast_2d(np.asarray(tangential, dtype=np.float64))
+        self.sagittal = np.atleast_2d(np.asarray(sagittal, dtype=np.float64))
+        if not self.tangential.shape == self.sagittal.shape or \
+                self.tangential.shape[1] != len(self.freq):
+            raise ValueError("tangential/sagittal must have shape (n_fields, len(freq))")
+        if fields is None:
+            fields = np.arange(len(self.tangential))
+        self.fields = np.asarray(fields, dtype=np.float64)
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray],
+                    fields: Optional[Sequence[float]] = None) -> 'MTFData':
+        """백엔드 fetch_arrays('mtf') 결과에서 생성"""
+        return cls(arrays['freq'], arrays['tangential'], arrays['sagittal'], fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __repr__(self) -> str:
+        return (f"MTFData(fields={self.fields.tolist()}, {len(self.freq)} frequencies "
+                f"up to {self.freq[-1] if len(self.freq) else 0:g} lp/mm)")
+
+    def sel(self, field: int) -> 'MTFData':
+        """한 시야 선택 (행 뷰)"""
+        f = range(len(self.fields))[field]
+        return MTFData(self.freq, self.tangential[f:f + 1], self.sagittal[f:f + 1],
+                       self.fields[f:f + 1])
+
+    def groups(self) -> Iterator[Tuple[int, 'MTFData']]:
+        """(시야 번호, 한 시야 뷰) 순회"""
+        for f in range(len(self.fields)):
+            yield f, self.sel(f)
+
+    def at(self, frequency: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        주어진 주파수의 시야별 MTF (선형 보간)
+
+        Args:
+            frequency: 공간 주파수 (lp/mm)
+
+        Returns:
+            (tangential, sagittal) 각 (n_fields,) 배열 (주파수가 하나면 그 값)
+        """
+        if len(self.freq) == 1:
+            return self.tangential[:, 0].copy(), self.sagittal[:, 0].copy()
+        i = int(np.clip(np.searchsorted(self.freq, frequency) - 1, 0, len(self.freq) - 2))
+        t = np.clip((frequency - self.freq[i]) / (self.freq[i + 1] - self.freq[i]), 0.0, 1.0)
+        return tuple((1 - t) * m[:, i] + t * m[:, i + 1]
+                     for m in (self.tangential, self.sagittal))
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """배열 딕셔너리 (npz 저장, 해시용)"""
+        return {'freq': self.freq, 'tangential': self.tangential,
+                'sagittal': self.sagittal, 'fields': self.fields}
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        긴 형식 pandas DataFrame (MTF 열은 2차원 배열의 평탄 뷰)
+
+        Returns:
+            field, freq, tangential, sagittal 열 DataFrame
+        """
+        import pandas as pd
+
+        n_fields, n_freq = self.tangential.shape
+        return pd.DataFrame({'field': np.repeat(self.fields, n_freq),
+                             'freq': np.tile(self.freq, n_fields),
+                             'tangential': self.tangential.reshape(-1),
+                             'sagittal': self.sagittal.reshape(-1)}, copy=False)
+
+    def to_hdf5(self, target, name: str = 'mtf'):
+        """
+        HDF5 그룹으로 저장
+
+        Args:
+            target: 파일 경로 또는 h5py 그룹
+            name: 하위 그룹 이름
+        """
+        with _hdf5_group(target, 'a') as parent:
+            group = parent.require_group(name)
+            for key, value in self.to_arrays().items():
+                if key in group:
+                    del group[key]
+                group.create_dataset(key, data=value)
+
+    @classmethod
+    def from_hdf5(cls, target, name: str = 'mtf') -> 'MTFData':
+        """to_hdf5로 저장한 그룹에서 로드"""
+        with _hdf5_group(target, 'r') as parent:
+            group = parent[name]
+            return cls(group['freq'][()], group['tangential'][()], group['sagittal'][()],
+                       group['fields'][()])
@@ -0,0 +1,283 @@
+"""
+ANSYS Nodal Temperature Reader
+ANSYS 절점 온도 리더
+
+This module streams exported ANSYS nodal temperature tables into compact
+arrays and answers spatial queries through a KD-tree index.
+ANSYS에서 내보낸 절점 온도 표를 청크 단위로 읽어 압축된 배열에 저장하고,
+KD-트리 공간 색인으로 위치 기반 질의에 응답합니다.
+
+입력 형식 (PRNSOL/사용자 내보내기)::
+
+    NODE    X        Y        Z        TEMP
+    1       0.0      0.0      0.0      25.31
+    2       0.001    0.0      0.0      25.40
+    ...
+
+숫자로 시작하지 않는 첫 줄들은 헤더로 건너뛰며, 구분자는 쉼표 또는 공백입니다.
+TEMP 열이 여러 개면 각 열을 하나의 시간 단계로 취급합니다.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+ANSYS_READER_VERSION = 1
+
+# 숫자 행: 실수 토큰 + 공백/쉼표/줄 끝으로 시작하는 줄 ('-----' 구분선 제외)
+_NUMERIC_ROW = re.compile(r'^[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?(?:[\s,]|$)')
+
+
+class AnsysFileFormatError(ValueError):
+    """ANSYS 결과 파일 형식 오류"""
+    pass
+
+
+def _sniff(filepath: Union[str, Path], max_lines: int = 1000) -> Tuple[int, str, int]:
+    """헤더 줄 수, 구분자, 열 수 추정"""
+    with open(filepath, 'r', errors='replace') as f:
+        for i, line in enumerate(f):
+            stripped = line.strip()
+            if _NUMERIC_ROW.match(stripped):
+                sep = ',' if ',' in stripped else r'\s+'
+                ncols = len(stripped.split(',') if sep == ',' else stripped.split())
+                return i, sep, ncols
+            if i >= max_lines:
+                break
+    raise AnsysFileFormatError(f"{filepath}: no numeric node rows found")
+
+
+def iter_nodal_chunks(filepath: Union[str, Path],
+                      chunk_rows: int = 1_000_000) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    절점 온도 파일을 청크 단위로 읽기
+
+    Args:
+        filepath: 결과 파일 경로
+        chunk_rows: 청크당 행 수
+
+    Yields:
+        (node_ids (n,), coords (n, 3), temperatures (n, T))
+    """
+    import pandas as pd
+
+    skip, sep, ncols = _sniff(filepath)
+    if ncols < 5:
+        raise AnsysFileFormatError(
+            f"{filepath}: expected columns NODE, X, Y, Z, TEMP..., got {ncols}")
+    dtype = {0: np.int64}
+    dtype.update({i: np.float64 for i in range(1, ncols)})
+    reader = pd.read_csv(filepath, sep=sep, skiprows=skip, header=None,
+                         names=range(ncols), dtype=dtype, chunksize=chunk_rows,
+                         engine='c', comment='!')
+    try:
+        for chunk in reader:
+            values = chunk.to_numpy(dtype=np.float64)
+            yield (chunk[0].to_numpy(np.int64), values[:, 1:4],
+                   values[:, 4:].astype(np.float32))
+    except (ValueError, pd.errors.ParserError) as e:
+        raise AnsysFileFormatError(f"{filepath}: {e}") from e
+
+
+class NodalTemperatureField:
+    """
+    절점 온도장 (좌표 + 시간 단계별 온도) 과 공간 색인
+
+    공간 색인(KD-트리)은 첫 질의 때 한 번만 만들어지며, 이후 경로/점/면
+    추출은 전체 절점 순회 없이 근접 절점 질의로 처리됩니다.
+    """
+
+    def __init__(self, node_ids: np.ndarray, coords: np.ndarray,
+                 temperatures: np.ndarray, times: Optional[np.ndarray] = None):
+        """
+        Args:
+            node_ids: 절점 번호 (N,)
+            coords: 절점 좌표 (N, 3)
+            temperatures: 온도 (T, N) 또는 (N,)
+            times: 시간 단계별 시각 (T,)
+        """
+        self.node_ids = np.ascontiguousarray(node_ids, dtype=np.int64)
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        temps = np.asarray(temperatures, dtype=np.float32)
+        self.temperatures = np.ascontiguousarray(temps[None] if temps.ndim == 1 else temps)
+        n_steps = self.temperatures.shape[0]
+        self.times = (np.arange(n_steps, dtype=np.float64) if times is None
+                      else np.asarray(times, dtype=np.float64))
+        if self.coords.shape != (len(self.node_ids), 3):
+            raise ValueError(f"coords must have shape (N, 3), got {self.coords.shape}")
+        if self.temperatures.shape[1] != len(self.node_ids):
+            raise ValueError("temperatures do not match node count")
+        self._tree = None
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def n_steps(self) -> int:
+        return self.temperatures.shape[0]
+
+    @property
+    def spatial_index(self):
+        """KD-트리 공간 색인 (지연 생성)"""
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(self.coords, balanced_tree=False, compact_nodes=True)
+        return self._tree
+
+    def sample(self, points: np.ndarray, step: Union[int, slice, None] = -1,
+               k: int = 8, method: str = 'idw', power: float = 2.0) -> np.ndarray:
+        """
+        임의 점에서의 온도 보간
+
+        Args:
+            points: 질의 점 (M, 3)
+            step: 시간 단계 인덱스 (None이면 모든 단계)
+            k: 보간에 사용할 근접 절점 수
+            method: 'idw' (역거리 가중) 또는 'nearest'
+            power: 역거리 가중 지수
+
+        Returns:
+            온도 (M,) 또는 (T, M)
+        """
+        points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+        temps = self.temperatures if step is None else self.temperatures[step]
+        if method == 'nearest' or k == 1:
+            _, idx = self.spatial_index.query(points, k=1, workers=-1)
+            return temps[..., idx]
+        if method != 'idw':
+            raise ValueError(f"method must be 'idw' or 'nearest', got {method!r}")
+
+        k = min(k, len(self))
+        dist, idx = self.spatial_index.query(points, k=k, workers=-1)
+        exact = dist[:, 0] == 0
+        w = 1.0 / np.where(exact[:, None], 1.0, np.maximum(dist, 1e-300))**power
+        w[exact] = 0.0
+        w[exact, 0] = 1.0
+        w /= w.sum(axis=1, keepdims=True)
+        return np.sum(temps[..., idx] * w, axis=-1)
+
+    def profile(self, waypoints: np.ndarray, n_points: int = 100,
+                step: Union[int, slice, None] = -1,
+                **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        꺾은선 경로를 따른 온도 프로파일
+
+        Args:
+            waypoints: 경로 꼭짓점 (P, 3), P >= 2
+            n_points: 경로 위 샘플 수
+            step: 시간 단계 인덱스 (None이면 모든 단계)
+            **kwargs: sample() 옵션
+
+        Returns:
+            (경로 거리 (n_points,), 온도 (n_points,) 또는 (T, n_points))
+        """
+        waypoints = np.asarray(waypoints, dtype=np.float64)
+        if waypoints.ndim != 2 or waypoints.shape[0] < 2 or waypoints.shape[1] != 3:
+            raise ValueError("waypoints must have shape (P >= 2, 3)")
+        seg = np.linalg.norm(np.diff(waypoints, axis=0), axis=1)
+        cum = np.concatenate(([0.0], np.cumsum(seg)))
+        distance = np.linspace(0, cum[-1], n_points)
+        points = np.column_stack([np.interp(distance, cum, waypoints[:, i])
+                                  for i in range(3)])
+        return distance, self.sample(points, step=step, **kwargs)
+
+    def stats(self, step: int = -1) -> Dict[str, float]:
+        """
+        시간 단계의 최고/최저/평균 온도
+
+        Args:
+            step: 시간 단계 인덱스
+
+        Returns:
+            {'max_temp', 'min_temp', 'avg_temp'}
+        """
+        t = self.temperatures[step]
+        return {'max_temp': float(t.max()), 'min_temp': float(t.min()),
+                'avg_temp': float(t.mean(dtype=np.float64))}
+
+    def to_dict(self) -> Dict:
+        """캐시/직렬화용 딕셔너리 (배열 + 요약 스칼라)"""
+        result = self.stats()
+        result.update({'nodes': self.node_ids, 'coordinates': self.coords,
+                       'temperatures': self.temperatures, 'times': self.times})
+        return result
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'NodalTemperatureField':
+        """to_dict() 결과에서 복원"""
+        return cls(data['nodes'], data['coordinates'], data['temperatures'],
+                   data.get('times'))
+
+
+def read_nodal_temperatures(filepath: Union[str, Path],
+                            chunk_rows: int = 1_000_000,
+                            times: Optional[Sequence[float]] = None) -> NodalTemperatureField:
+    """
+    절점 온도 파일 읽기
+
+    Args:
+        filepath: 결과 파일 경로 (NODE, X, Y, Z, TEMP[, TEMP2, ...])
+        chunk_rows: 청크당 행 수
+        times: TEMP 열별 시각 (None이면 0, 1, 2, ...)
+
+    Returns:
+        NodalTemperatureField
+    """
+    ids, coords, temps = [], [], []
+    for chunk_ids, chunk_coords, chunk_temps in iter_nodal_chunks(filepath, chunk_rows):
+        ids.append(chunk_ids)
+        coords.append(chunk_coords)
+        temps.append(chunk_temps)
+    if not ids:
+        raise AnsysFileFormatError(f"{filepath}: no node rows")
+    return NodalTemperatureField(np.concatenate(ids), np.concatenate(coords),
+                                 np.concatenate(temps).T, times)
+
+
+def read_nodal_temperature_series(filepaths: Sequence[Union[str, Path]],
+                                  times: Optional[Sequence[float]] = None,
+                                  chunk_rows: int = 1_000_000) -> NodalTemperatureField:
+    """
+    시간 단계별 파일들을 하나의 온도장으로 읽기
+
+    첫 파일의 절점 좌표를 기준으로 하며, 이후 파일은 절점 번호로 정렬하여
+    온도만 읽습니다. 파일마다 TEMP 열은 하나여야 합니다 (여러 시간 단계가
+    열로 들어 있는 파일은 read_nodal_temperatures로 읽음).
+
+    Args:
+        filepaths: 시간 단계 순서의 파일 경로 목록
+        times: 단계별 시각
+        chunk_rows: 청크당 행 수
+
+    Returns:
+        NodalTemperatureField (T = len(filepaths))
+
+    Raises:
+        AnsysFileFormatError: 절점 번호가 다르거나 TEMP 열이 여러 개인 파일
+    """
+    base = read_nodal_temperatures(filepaths[0], chunk_rows)
+    if base.n_steps != 1:
+        raise AnsysFileFormatError(
+            f"{filepaths[0]}: expected one TEMP column per file, got {base.n_steps}")
+    order = np.argsort(base.node_ids)
+    sorted_ids = base.node_ids[order]
+    temps = np.empty((len(filepaths), len(base)), dtype=np.float32)
+    temps[0] = base.temperatures[0]
+    for i, path in enumerate(filepaths[1:], start=1):
+        seen = 0
+        for chunk_ids, _, chunk_temps in iter_nodal_chunks(path, chunk_rows):
+            if chunk_temps.shape[1] != 1:
+                raise AnsysFileFormatError(
+                    f"{path}: expected one TEMP column per file, got {chunk_temps.shape[1]}")
+            pos = np.searchsorted(sorted_ids, chunk_ids)
+            pos = np.minimum(pos, len(sorted_ids) - 1)
+            if np.any(sorted_ids[pos] != chunk_ids):
+                raise AnsysFileFormatError(f"{path}: node ids differ from {filepaths[0]}")
+            temps[i, order[pos]] = chunk_temps[:, 0]
+            seen += len(chunk_ids)
+        if seen != len(base):
+            raise AnsysFileFormatError(f"{path}: expected {len(base)} nodes, got {seen}")
+    return NodalTemperatureField(base.node_ids, base.coords, temps, times)
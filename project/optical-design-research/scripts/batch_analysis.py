@@ -0,0 +1,320 @@
+"""
+Batch Design Analysis
+설계 배치 분석
+
+This module analyzes many lens files in a process pool, writes each file's
+result to disk as soon as it finishes and resumes interrupted runs.
+많은 렌즈 파일을 프로세스 풀에서 분석하고, 파일별 결과를 끝나는 즉시
+디스크에 기록하며, 중단된 실행을 이어서 수행합니다.
+
+출력 디렉토리 구조::
+
+    out_dir/
+        manifest.jsonl          파일별 결과 요약 (한 줄 = 한 파일, 추가 전용)
+        results/<이름>.npz      분석 배열 ('spot.x', 'mtf.tangential', ...)
+
+각 작업 프로세스는 백엔드 세션 하나를 만들어 여러 파일에 재사용합니다.
+다시 실행하면 매니페스트에 성공으로 기록되고 결과 파일이 남아 있으며
+원본 파일(크기, 수정 시각)과 분석 설정(density 등)이 바뀌지 않은 파일은
+건너뜁니다. 실패한 파일은
+오류 메시지와 함께 기록되고 다음 실행에서 다시 시도합니다.
+"""
+
+import hashlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from .optics_backend import BackendError, create_backend
+
+
+MANIFEST_NAME = 'manifest.jsonl'
+
+# 작업 프로세스의 백엔드 설정과 세션 (첫 작업에서 생성, BackendError 후 재생성)
+_backend_args = ('local', {})
+_session = None
+
+
+def file_signature(filepath: Union[str, Path]) -> List[int]:
+    """원본 파일 변경 감지용 [크기, 수정 시각(ns)]"""
+    st = os.stat(filepath)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def result_name(filepath: Union[str, Path]) -> str:
+    """결과 파일 이름 (같은 이름의 다른 경로 파일과 겹치지 않도록 경로 해시 포함)"""
+    path = Path(filepath).resolve()
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:10]
+    return f'{path.stem}-{digest}.npz'
+
+
+def _init_worker(backend: str, backend_kwargs: Dict):
+    global _backend_args
+    _backend_args = (backend, backend_kwargs)
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        _session = create_backend(_backend_args[0], **_backend_args[1])
+    return _session
+
+
+def _close_session():
+    global _session
+    if _session is not None:
+        try:
+            _session.close()
+        except Exception:
+            pass
+        _session = None
+
+
+def analyze_file(backend, filepath: Union[str, Path], density: int = 6,
+                 max_frequency: float = 100.0, n_frequencies: int = 50) -> Dict[str, np.ndarray]:
+    """
+    렌즈 파일 하나의 스팟/MTF/근축 분석
+
+    Args:
+        backend: OpticsBackend 세션
+        filepath: 렌즈 파일 경로
+        density: 스팟 다이어그램 동공 밀도
+        max_frequency: MTF 최대 주파수 (lp/mm)
+        n_frequencies: MTF 주파수 수
+
+    Returns:
+        {'<분석>.<배열 이름>': 배열}
+    """
+    backend.open_file(filepath)
+    settings = {
+        'paraxial': {},
+        'spot': {'density': density},
+        'mtf': {'max_frequency': max_frequency, 'n_frequencies': n_frequencies,
+                'density': density},
+    }
+    arrays = {}
+    for name, kwargs in settings.items():
+        for key, value in backend.fetch_arrays(backend.run_analysis(name, **kwargs)).items():
+            arrays[f'{name}.{key}'] = np.asarray(value)
+    return arrays
+
+
+def summarize(arrays: Dict[str, np.ndarray]) -> Dict:
+    """
+    분석 배열의 요약 값 (매니페스트 기록용)
+
+    Args:
+        arrays: analyze_file 결과
+
+    Returns:
+        {'efl', 'f_number', 'n_rays', 'rms_spot_um' (시야별)}
+    """
+    x, y, field = arrays['spot.x'], arrays['spot.y'], arrays['spot.field']
+    n_fields = int(field.max()) + 1 if len(field) else 0
+    count = np.bincount(field, minlength=n_fields)
+    mean_x = np.bincount(field, x, n_fields) / np.maximum(count, 1)
+    mean_y = np.bincount(field, y, n_fields) / np.maximum(count, 1)
+    sq = np.bincount(field, (x - mean_x[field])**2 + (y - mean_y[field])**2, n_fields)
+    return {
+        'efl': float(arrays['paraxial.efl']),
+        'f_number': float(arrays['paraxial.f_number']),
+        'n_rays': int(len(x)),
+        'rms_spot_um': np.sqrt(sq / np.maximum(count, 1)).round(4).tolist(),
+    }
+
+
+def _run_job(filepath: str, out_path: str, settings: Dict) -> Dict:
+    """작업 프로세스에서 파일 하나를 분석하고 결과를 기록 (예외는 결과로 반환)"""
+    start = time.perf_counter()
+    entry = {'file': filepath, 'result': Path(out_path).name, 'settings': settings}
+    try:
+        entry['signature'] = file_signature(filepath)
+        arrays = analyze_file(_get_session(), filepath, **settings)
+        tmp_path = out_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, out_path)
+        entry.update(status='ok', **summarize(arrays))
+    except Exception as e:
+        if isinstance(e, BackendError):
+            _close_session()
+        entry.update(status='failed', error=f'{type(e).__name__}: {e}',
+                     traceback=traceback.format_exc())
+    entry['elapsed'] = time.perf_counter() - start
+    return entry
+
+
+class BatchAnalyzer:
+    """
+    렌즈 파일 배치 분석기
+
+    Example:
+        >>> batch = BatchAnalyzer('batch_results', max_workers=4)
+        >>> summary = batch.run(Path('designs').glob('*.json'))
+        >>> arrays = batch.load_result('designs/doublet.json')
+    """
+
+    def __init__(self, out_dir: Union[str, Path], backend: str = 'local',
+                 max_workers: Optional[int] = None, max_backends: Optional[int] = None,
+                 density: int = 6, max_frequency: float = 100.0, n_frequencies: int = 50,
+                 progress: bool = True, **backend_kwargs):
+        """
+        Args:
+            out_dir: 출력 디렉토리
+            backend: 백엔드 이름 ('local', 'zosapi')
+            max_workers: 프로세스 수 (1이면 현재 프로세스, None이면 CPU 수)
+            max_backends: 동시에 열 수 있는 백엔드 세션 수 (라이선스 수 등)
+            density: 스팟 다이어그램 동공 밀도
+            max_frequency: MTF 최대 주파수 (lp/mm)
+            n_frequencies: MTF 주파수 수
+            progress: tqdm 진행 표시 여부
+            **backend_kwargs: 백엔드 생성자 인자
+        """
+        self.out_dir = Path(out_dir)
+        (self.out_dir / 'results').mkdir(parents=True, exist_ok=True)
+        self.backend = backend
+        self.backend_kwargs = backend_kwargs
+        self.max_workers = max_workers
+        self.max_backends = max_backends
+        self.settings = {'density': density, 'max_frequency': max_frequency,
+                         'n_frequencies': n_frequencies}
+        self.progress = progress
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.out_dir / MANIFEST_NAME
+
+    def manifest(self) -> Dict[str, Dict]:
+        """
+        매니페스트 읽기 (파일별 마지막 기록)
+
+        Returns:
+            {파일 경로: 기록}
+        """
+        entries = {}
+        try:
+            with open(self.manifest_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue    # 기록 중 중단된 마지막 줄
+                    entries[entry['file']] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def is_complete(self, filepath: Union[str, Path], entry: Optional[Dict]) -> bool:
+        """성공 기록과 결과 파일이 있고 원본과 분석 설정이 바뀌지 않았는지"""
+        if entry is None or entry.get('status') != 'ok':
+            return False
+        if entry.get('settings') != self.settings:
+            return False
+        if not (self.out_dir / 'results' / entry['result']).exists():
+            return False
+        try:
+            return entry.get('signature') == file_signature(filepath)
+        except OSError:
+            return False
+
+    def _terminate_manifest(self):
+        """이전 실행이 줄 중간에서 중단되었으면 줄바꿈 추가"""
+        try:
+            with open(self.manifest_path, 'rb+') as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+        except FileNotFoundError:
+            pass
+
+    def n_workers(self, n_jobs: int) -> int:
+        """작업 프로세스 수 (파일 수, CPU 수, 백엔드 수 중 최소)"""
+        n = self.max_workers or os.cpu_count() or 1
+        if self.max_backends is not None:
+            n = min(n, self.max_backends)
+        return max(1, min(n, n_jobs))
+
+    def run(self, files: Iterable[Union[str, Path]]) -> Dict:
+        """
+        배치 분석 실행
+
+        Args:
+            files: 렌즈 파일 경로들
+
+        Returns:
+            {'completed', 'skipped', 'failed' (실패 기록 리스트), 'elapsed',
+            'files_per_second'}
+        """
+        files = [str(Path(f).resolve()) for f in files]
+        done = self.manifest()
+        todo = [f for f in dict.fromkeys(files) if not self.is_complete(f, done.get(f))]
+        summary = {'completed': 0, 'skipped': len(set(files)) - len(todo), 'failed': []}
+
+        start = time.perf_counter()
+        if todo:
+            from tqdm import tqdm
+
+            bar = tqdm(total=len(todo), unit='file', disable=not self.progress)
+            n_rays = 0
+            self._terminate_manifest()
+            with open(self.manifest_path, 'a') as manifest:
+                for entry in self._execute(todo):
+                    manifest.write(json.dumps(entry) + '\n')
+                    manifest.flush()
+                    if entry['status'] == 'ok':
+                        summary['completed'] += 1
+                        n_rays += entry['n_rays']
+                    else:
+                        summary['failed'].append(entry)
+                    elapsed = time.perf_counter() - start
+                    bar.set_postfix(failed=len(summary['failed']),
+                                    rays_per_s=f'{n_rays / elapsed:.3g}', refresh=False)
+                    bar.update()
+            bar.close()
+        summary['elapsed'] = time.perf_counter() - start
+        summary['files_per_second'] = len(todo) / summary['elapsed'] if todo else 0.0
+        return summary
+
+    def _execute(self, todo: List[str]) -> Iterable[Dict]:
+        """파일별 결과를 끝나는 순서대로 생성"""
+        jobs = [(f, str(self.out_dir / 'results' / result_name(f)), self.settings)
+                for f in todo]
+        n_workers = self.n_workers(len(jobs))
+        if n_workers == 1:
+            _init_worker(self.backend, self.backend_kwargs)
+            try:
+                for job in jobs:
+                    yield _run_job(*job)
+            finally:
+                _close_session()
+            return
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(self.backend, self.backend_kwargs)) as pool:
+            futures = {pool.submit(_run_job, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # 작업 프로세스 자체가 죽은 경우 (BrokenProcessPool 등)
+                    yield {'file': futures[future], 'status': 'failed',
+                           'error': f'{type(e).__name__}: {e}'}
+
+    def load_result(self, filepath: Union[str, Path]) -> Dict[str, np.ndarray]:
+        """
+        파일 하나의 분석 배열 로드
+
+        Args:
+            filepath: 렌즈 파일 경로
+
+        Returns:
+            {'<분석>.<배열 이름>': 배열}
+        """
+        with np.load(self.out_dir / 'results' / result_name(filepath)) as data:
+            return {key: data[key] for key in data.files}
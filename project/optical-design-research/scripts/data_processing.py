@@ -4,38 +4,83 @@ Data Processing Module
 
 This module provides utilities for processing measurement and simulation data.
 측정 및 시뮬레이션 데이터 처리를 위한 유틸리티를 제공합니다.
+
+scripts 패키지의 다른 모듈을 상대 import하므로 예제는 프로젝트 루트에서
+모듈로 실행합니다: python -m scripts.data_processing
 """
 
+from __future__ import annotations
+
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
-from typing import Union, List, Dict, Tuple
+from typing import TYPE_CHECKING, Union, List, Dict, Tuple, Optional
 import json
 
+from .ansys_reader import ANSYS_READER_VERSION, NodalTemperatureField, read_nodal_temperatures
+from .measurement_uncertainty import t_quantile
+from .spot_reader import SPOT_READER_VERSION, SpotFileFormatError, iter_spot_chunks
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .measurement_store import MeasurementStore
+    from .parse_cache import ParseCache
+
+
+MEASUREMENT_CSV_VERSION = 1
+
+
+def _parse_spot_diagram(filepath, dtype, chunk_chars) -> pd.DataFrame:
+    import pandas as pd
+
+    chunks = list(iter_spot_chunks(filepath, chunk_chars=chunk_chars, dtype=dtype))
+    if not chunks:
+        return pd.DataFrame({'x': np.empty(0, dtype), 'y': np.empty(0, dtype),
+                             'wavelength': np.empty(0, np.int32),
+                             'field': np.empty(0, np.int32)})
+    return pd.DataFrame({
+        'x': np.concatenate([c.x for c in chunks]),
+        'y': np.concatenate([c.y for c in chunks]),
+        'wavelength': np.concatenate(
+            [np.full(len(c), c.wavelength, np.int32) for c in chunks]),
+        'field': np.concatenate(
+            [np.full(len(c), c.field, np.int32) for c in chunks]),
+    })
+
 
 class ZemaxDataProcessor:
     """Zemax 출력 데이터 처리 클래스"""
     
     @staticmethod
-    def read_spot_diagram(filepath: Union[str, Path]) -> pd.DataFrame:
+    def read_spot_diagram(filepath: Union[str, Path],
+                          dtype=np.float64,
+                          chunk_chars: int = 16 * 2**20,
+                          cache: Optional[ParseCache] = None) -> pd.DataFrame:
         """
         Zemax Spot Diagram 데이터 읽기
         
+        파일 헤더의 필드/파장 블록을 파싱하며, 전체 파일을 한 번에 올리지 않고
+        청크 단위로 읽습니다. 메모리에 담기 어려운 파일은
+        spot_reader.iter_spot_chunks 또는 convert_spot_file을 사용하세요.
+        
         Args:
             filepath: 파일 경로
+            dtype: 좌표 dtype (np.float32 또는 np.float64)
+            chunk_chars: 파싱 청크 크기 (문자)
+            cache: 파싱 결과 캐시 (None이면 캐시 사용 안 함)
             
         Returns:
             DataFrame with columns: [x, y, wavelength, field]
+            (wavelength, field는 Zemax 번호)
+            
+        Raises:
+            FileNotFoundError: 파일이 없을 때
+            SpotFileFormatError: 파일 형식이 올바르지 않을 때
         """
-        # Zemax 텍스트 출력 파일 파싱 예제
-        # 실제 구현은 파일 형식에 따라 조정 필요
-        try:
-            df = pd.read_csv(filepath, sep='\t', skiprows=10)
-            return df
-        except Exception as e:
-            print(f"Error reading file: {e}")
-            return pd.DataFrame()
+        if cache is None:
+            return _parse_spot_diagram(filepath, dtype, chunk_chars)
+        return cache.load(filepath, 'zemax.spot_diagram', SPOT_READER_VERSION,
+                          lambda: _parse_spot_diagram(filepath, dtype, chunk_chars),
+                          options={'dtype': np.dtype(dtype).str})
     
     @staticmethod
     def calculate_rms_spot_size(x: np.ndarray, y: np.ndarray) -> float:
@@ -108,48 +153,193 @@ class MTFAnalyzer:
         mtf_value = np.interp(frequency, freq_axis[:n//2], mtf[:n//2])
         
         return mtf_value
+    
+    @staticmethod
+    def _edge_fit(deriv: np.ndarray, window: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        행별 LSF 중심을 직선으로 피팅 (배치)
+        
+        Args:
+            deriv: 행 방향 미분 (B, H, W-1)
+            window: 중심 계산용 창 (B, H, W-1), None이면 창 없음
+            
+        Returns:
+            (절편, 기울기) 각각 (B,) - 엣지 x 위치 = 절편 + 기울기 * 행
+        """
+        weight = np.abs(deriv) if window is None else np.abs(deriv) * window
+        pos = np.arange(deriv.shape[2]) + 0.5
+        centroid = (weight @ pos) / np.maximum(weight.sum(axis=2), 1e-30)   # (B, H)
+        
+        rows = np.arange(deriv.shape[1], dtype=np.float64)
+        r_mean = rows.mean()
+        c_mean = centroid.mean(axis=1)
+        slope = ((rows - r_mean) @ (centroid - c_mean[:, None]).T) / np.sum((rows - r_mean)**2)
+        intercept = c_mean - slope * r_mean
+        return intercept, slope
+    
+    @staticmethod
+    def estimate_edge_angle(images: np.ndarray) -> np.ndarray:
+        """
+        슬랜티드 엣지 기울기 추정 (수직 엣지 기준)
+        
+        Args:
+            images: 엣지 ROI (H, W) 또는 (B, H, W)
+            
+        Returns:
+            엣지 각도 (도), 입력이 2D면 스칼라
+        """
+        stack = np.asarray(images, dtype=np.float64)
+        single = stack.ndim == 2
+        stack = np.atleast_3d(stack[None] if single else stack)
+        _, slope = MTFAnalyzer._edge_fit(np.diff(stack, axis=2))
+        angle = np.degrees(np.arctan(slope))
+        return float(angle[0]) if single else angle
+    
+    @staticmethod
+    def slanted_edge_mtf(images: np.ndarray, pixel_size: float,
+                         oversample: int = 4,
+                         orientation: str = 'auto') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ISO 12233 슬랜티드 엣지 MTF 곡선 (ROI 스택 배치 처리)
+        
+        엣지 각도를 추정하고, 엣지 법선 방향 거리로 화소를 1/oversample
+        화소 간격으로 비닝하여 ESF를 만든 뒤, 미분(LSF)에 해밍 창을 적용해
+        FFT합니다. 중앙 차분 미분의 주파수 응답은 보정합니다.
+        
+        Args:
+            images: 엣지 ROI (H, W) 또는 같은 크기 ROI 스택 (B, H, W)
+            pixel_size: 픽셀 크기 (mm)
+            oversample: ESF 초과 샘플링 배수 (ISO 12233: 4)
+            orientation: 'vertical', 'horizontal' 또는 'auto' (ROI별 판정,
+                방향이 섞인 스택은 정사각형 ROI만 가능)
+            
+        Returns:
+            (주파수 (lp/mm), MTF) - MTF는 (F,) 또는 (B, F), 1 cycle/pixel까지
+        
+        Raises:
+            ValueError: 'auto'에서 정사각형이 아닌 ROI의 엣지 방향이 섞여 있을 때
+        """
+        stack = np.asarray(images, dtype=np.float64)
+        single = stack.ndim == 2
+        if single:
+            stack = stack[None]
+        if orientation == 'auto':
+            gx = np.abs(np.diff(stack, axis=2)).mean(axis=(1, 2))
+            gy = np.abs(np.diff(stack, axis=1)).mean(axis=(1, 2))
+            horizontal = gx < gy
+            if horizontal.all():
+                orientation = 'horizontal'
+            elif horizontal.any():
+                if stack.shape[1] != stack.shape[2]:
+                    raise ValueError(
+                        f"ROIs {np.flatnonzero(horizontal).tolist()} have horizontal edges "
+                        f"and the rest vertical; mixed stacks need square ROIs")
+                # 가로 엣지 ROI만 전치
+                stack = np.where(horizontal[:, None, None], stack.transpose(0, 2, 1), stack)
+        if orientation == 'horizontal':
+            stack = stack.transpose(0, 2, 1)
+        elif orientation not in ('vertical', 'auto'):
+            raise ValueError(f"orientation must be 'vertical', 'horizontal' or 'auto', "
+                             f"got {orientation!r}")
+        
+        n_img, height, width = stack.shape
+        deriv = np.diff(stack, axis=2)
+        
+        # 1차 피팅 후, 피팅된 엣지 중심의 해밍 창으로 중심 재계산
+        intercept, slope = MTFAnalyzer._edge_fit(deriv)
+        pos = np.arange(width - 1) + 0.5
+        rows = np.arange(height)
+        edge = intercept[:, None] + slope[:, None] * rows                    # (B, H)
+        offset = pos[None, None, :] - edge[:, :, None]
+        win = np.where(np.abs(offset) <= (width - 1) / 2,
+                       0.54 + 0.46 * np.cos(2 * np.pi * offset / (width - 1)), 0.0)
+        intercept, slope = MTFAnalyzer._edge_fit(deriv, win)
+        
+        # 엣지 법선 방향 거리로 ESF 비닝
+        cos_theta = 1 / np.sqrt(1 + slope**2)
+        edge = intercept[:, None] + slope[:, None] * rows
+        dist = (np.arange(width)[None, None, :] - edge[:, :, None]) * cos_theta[:, None, None]
+        n_bins = width * oversample
+        idx = np.floor((dist + width / 2) * oversample).astype(np.intp)
+        valid = (idx >= 0) & (idx < n_bins)
+        flat = (np.arange(n_img)[:, None, None] * n_bins + idx)[valid]
+        counts = np.bincount(flat, minlength=n_img * n_bins).reshape(n_img, n_bins)
+        sums = np.bincount(flat, stack[valid], n_img * n_bins).reshape(n_img, n_bins)
+        
+        esf = np.empty((n_img, n_bins))
+        centers = np.arange(n_bins)
+        for b in range(n_img):
+            filled = counts[b] > 0
+            esf[b] = np.interp(centers, centers[filled], sums[b, filled] / counts[b, filled])
+        
+        # LSF + LSF 중심 기준 해밍 창
+        lsf = np.gradient(esf, axis=1)
+        weight = np.abs(lsf)
+        lsf_center = (weight @ centers) / weight.sum(axis=1)
+        shift = centers[None, :] - lsf_center[:, None]
+        lsf *= np.where(np.abs(shift) <= n_bins / 2,
+                        0.54 + 0.46 * np.cos(2 * np.pi * shift / n_bins), 0.0)
+        
+        spectrum = np.abs(np.fft.rfft(lsf, axis=1))
+        mtf = spectrum / spectrum[:, :1]
+        sample = pixel_size / oversample
+        freq = np.fft.rfftfreq(n_bins, sample)
+        
+        # 중앙 차분 미분 응답 보정, 1 cycle/pixel까지만 반환
+        mtf /= np.sinc(2 * freq * sample)
+        keep = freq <= 1 / pixel_size + 1e-12
+        freq, mtf = freq[keep], mtf[:, keep]
+        return freq, (mtf[0] if single else mtf)
 
 
 class AnsysDataProcessor:
     """ANSYS 출력 데이터 처리 클래스"""
     
     @staticmethod
-    def read_thermal_results(filepath: Union[str, Path]) -> Dict:
+    def read_thermal_results(filepath: Union[str, Path],
+                             cache: Optional[ParseCache] = None,
+                             chunk_rows: int = 1_000_000) -> Dict:
         """
-        ANSYS 열해석 결과 읽기
+        ANSYS 열해석 결과 읽기 (절점 온도 내보내기: NODE, X, Y, Z, TEMP...)
         
         Args:
             filepath: 결과 파일 경로
+            cache: 파싱 결과 캐시 (None이면 캐시 사용 안 함)
+            chunk_rows: 청크당 행 수
             
         Returns:
-            결과 딕셔너리
-        """
-        # 예제 구현 - 실제로는 ANSYS 출력 형식에 맞게 조정
-        results = {
-            'max_temp': 0,
-            'min_temp': 0,
-            'avg_temp': 0,
-            'nodes': [],
-            'temperatures': []
-        }
-        return results
+            결과 딕셔너리 (max_temp, min_temp, avg_temp는 마지막 시간 단계,
+            nodes, coordinates, temperatures (T, N), times)
+        """
+        def parse():
+            return read_nodal_temperatures(filepath, chunk_rows).to_dict()
+        if cache is None:
+            return parse()
+        return cache.load(filepath, 'ansys.thermal_results', ANSYS_READER_VERSION, parse)
     
     @staticmethod
-    def extract_temperature_profile(data: Dict, path: str) -> Tuple[np.ndarray, np.ndarray]:
+    def extract_temperature_profile(data: Union[Dict, NodalTemperatureField],
+                                    path: np.ndarray,
+                                    n_points: int = 100,
+                                    step: int = -1) -> Tuple[np.ndarray, np.ndarray]:
         """
         특정 경로를 따라 온도 프로파일 추출
         
+        여러 경로를 추출할 때는 NodalTemperatureField를 전달하면 공간 색인을
+        한 번만 만듭니다.
+        
         Args:
-            data: 결과 데이터
-            path: 경로 정의
+            data: read_thermal_results 결과 또는 NodalTemperatureField
+            path: 경로 꼭짓점 좌표 (P, 3)
+            n_points: 경로 위 샘플 수
+            step: 시간 단계 인덱스
             
         Returns:
             (위치, 온도) 배열
         """
-        # 예제 구현
-        position = np.linspace(0, 100, 100)
-        temperature = 25 + 10 * np.sin(position / 10)
-        return position, temperature
+        if not isinstance(data, NodalTemperatureField):
+            data = NodalTemperatureField.from_dict(data)
+        return data.profile(path, n_points=n_points, step=step)
 
 
 class MeasurementDataProcessor:
@@ -157,19 +347,55 @@ class MeasurementDataProcessor:
     
     @staticmethod
     def load_csv_data(filepath: Union[str, Path], 
-                     skiprows: int = 0) -> pd.DataFrame:
+                     skiprows: int = 0,
+                     cache: Optional[ParseCache] = None) -> pd.DataFrame:
         """
         CSV 측정 데이터 로드
         
         Args:
             filepath: CSV 파일 경로
             skiprows: 건너뛸 행 수
+            cache: 파싱 결과 캐시 (None이면 캐시 사용 안 함)
             
         Returns:
             DataFrame
         """
-        return pd.read_csv(filepath, skiprows=skiprows)
-    
+        import pandas as pd
+
+        if cache is None:
+            return pd.read_csv(filepath, skiprows=skiprows)
+        return cache.load(filepath, 'measurement.csv', MEASUREMENT_CSV_VERSION,
+                          lambda: pd.read_csv(filepath, skiprows=skiprows),
+                          options={'skiprows': skiprows})
+
+    @staticmethod
+    def append_csv_to_store(filepath: Union[str, Path], store: MeasurementStore,
+                            time_column: str, chunksize: int = 1_000_000,
+                            **read_csv_kwargs) -> int:
+        """
+        CSV 측정 로그를 청크 단위로 시계열 저장소에 추가
+
+        Args:
+            filepath: CSV 파일 경로
+            store: 측정 시계열 저장소
+            time_column: 시각 열 이름 (숫자 또는 날짜 문자열)
+            chunksize: 청크당 행 수
+            **read_csv_kwargs: pandas.read_csv 추가 인자
+
+        Returns:
+            추가된 행 수
+        """
+        import pandas as pd
+
+        n_rows = 0
+        for chunk in pd.read_csv(filepath, chunksize=chunksize, **read_csv_kwargs):
+            if not pd.api.types.is_numeric_dtype(chunk[time_column]):
+                chunk[time_column] = pd.to_datetime(chunk[time_column])
+            numeric = chunk.select_dtypes('number').columns.drop(time_column, errors='ignore')
+            store.append_frame(chunk[[time_column, *numeric]], time_column=time_column)
+            n_rows += len(chunk)
+        return n_rows
+
     @staticmethod
     def moving_average(data: np.ndarray, window_size: int) -> np.ndarray:
         """
@@ -202,6 +428,32 @@ class MeasurementDataProcessor:
         mask = np.abs(data - mean) < threshold * std
         return data[mask]
     
+    @staticmethod
+    def outlier_mask(data: Union[np.ndarray, pd.DataFrame], method: str = 'hampel',
+                     threshold: float = 3.0, half_window: int = 5) -> Union[np.ndarray, pd.DataFrame]:
+        """
+        강건 이상치 마스크 (열별, 길이 유지)
+        
+        remove_outliers와 달리 데이터를 줄이지 않고 True(이상치) 마스크를
+        반환하므로 타임스탬프/다른 채널과의 정렬이 유지됩니다.
+        
+        Args:
+            data: (n,) 또는 (n, channels) 배열, 또는 DataFrame
+            method: 'hampel' (이동 창 중앙값/MAD) 또는 'mad' (전역 중앙값/MAD)
+            threshold: MAD 기반 표준편차 배수
+            half_window: Hampel 창 반폭
+            
+        Returns:
+            data와 같은 모양의 불리언 마스크
+        """
+        from .robust_outliers import hampel_mask, mad_outlier_mask
+
+        if method == 'hampel':
+            return hampel_mask(data, half_window=half_window, n_sigmas=threshold)
+        if method == 'mad':
+            return mad_outlier_mask(data, threshold=threshold)
+        raise ValueError(f"method must be 'hampel' or 'mad', got {method!r}")
+    
     @staticmethod
     def calculate_uncertainty(data: np.ndarray, confidence: float = 0.95) -> Tuple[float, float]:
         """
@@ -214,14 +466,12 @@ class MeasurementDataProcessor:
         Returns:
             (평균, 불확도)
         """
-        from scipy import stats
-        
         mean = np.mean(data)
         std = np.std(data, ddof=1)
         n = len(data)
         
-        # t-분포 사용
-        t_value = stats.t.ppf((1 + confidence) / 2, n - 1)
+        # t-분포 사용 (분위수는 (n, confidence)별 캐시)
+        t_value = t_quantile(n, confidence)
         uncertainty = t_value * std / np.sqrt(n)
         
         return mean, uncertainty
@@ -230,74 +480,70 @@ class MeasurementDataProcessor:
 class ReportGenerator:
     """보고서 생성 클래스"""
     
+    # export_to_excel이 자동으로 스트리밍 모드를 쓰는 전체 행 수
+    STREAMING_ROW_THRESHOLD = 200_000
+    
     @staticmethod
-    def generate_summary_plot(data: Dict, save_path: Union[str, Path]):
+    def generate_summary_plot(data: Dict, save_path: Union[str, Path], dpi: int = 300):
         """
         요약 플롯 생성
         
+        pyplot 전역 상태 대신 Figure/Agg API로 그리며, 광선 수가 많은
+        스팟 다이어그램은 밀도 영상으로 그립니다. 여러 설계를 한꺼번에
+        그릴 때는 report_pipeline.ReportPipeline을 사용하세요.
+        
         Args:
             data: 플롯할 데이터 딕셔너리
             save_path: 저장 경로
+            dpi: 해상도
         """
-        fig, axes = plt.subplots(2, 2, figsize=(12, 10))
-        
-        # 예제 플롯들
-        # 1. 온도 분포
-        if 'temperature' in data:
-            axes[0, 0].plot(data['temperature'])
-            axes[0, 0].set_title('Temperature Distribution')
-            axes[0, 0].set_xlabel('Position')
-            axes[0, 0].set_ylabel('Temperature (°C)')
-            axes[0, 0].grid(True, alpha=0.3)
-        
-        # 2. 스팟 다이어그램
-        if 'spot_x' in data and 'spot_y' in data:
-            axes[0, 1].scatter(data['spot_x'], data['spot_y'], s=1)
-            axes[0, 1].set_title('Spot Diagram')
-            axes[0, 1].set_xlabel('X (μm)')
-            axes[0, 1].set_ylabel('Y (μm)')
-            axes[0, 1].set_aspect('equal')
-            axes[0, 1].grid(True, alpha=0.3)
-        
-        # 3. MTF 곡선
-        if 'mtf_freq' in data and 'mtf_value' in data:
-            axes[1, 0].plot(data['mtf_freq'], data['mtf_value'])
-            axes[1, 0].set_title('MTF Curve')
-            axes[1, 0].set_xlabel('Spatial Frequency (lp/mm)')
-            axes[1, 0].set_ylabel('MTF')
-            axes[1, 0].grid(True, alpha=0.3)
-            axes[1, 0].set_ylim([0, 1])
-        
-        # 4. 성능 요약
-        if 'performance' in data:
-            perf = data['performance']
-            axes[1, 1].axis('off')
-            
-            text = "Performance Summary\n" + "="*30 + "\n\n"
-            for key, value in perf.items():
-                text += f"{key}: {value}\n"
-            
-            axes[1, 1].text(0.1, 0.9, text, transform=axes[1, 1].transAxes,
-                           verticalalignment='top', fontfamily='monospace',
-                           fontsize=10)
-        
-        plt.tight_layout()
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        from .report_pipeline import render_summary_figure
+
+        render_summary_figure(data, save_path, dpi=dpi)
     
     @staticmethod
-    def export_to_excel(data: Dict, filepath: Union[str, Path]):
+    def export_to_excel(data: Dict, filepath: Union[str, Path],
+                        streaming: Optional[bool] = None):
         """
         데이터를 Excel 파일로 내보내기
         
         Args:
             data: 데이터 딕셔너리 (각 키는 시트가 됨)
             filepath: Excel 파일 경로
+            streaming: write-only 스트리밍 모드 사용 여부 (None이면 전체 행 수가
+                STREAMING_ROW_THRESHOLD를 넘을 때 자동 사용, 시트 행 제한을 넘는
+                표는 여러 시트로 분할)
         """
+        import pandas as pd
+        from .table_export import write_xlsx
+
+        if streaming is None:
+            n_rows = sum(len(df) for df in data.values() if isinstance(df, pd.DataFrame))
+            streaming = n_rows > ReportGenerator.STREAMING_ROW_THRESHOLD
+        if streaming:
+            write_xlsx({k: v for k, v in data.items() if isinstance(v, pd.DataFrame)},
+                       filepath)
+            return
         with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
             for sheet_name, df in data.items():
                 if isinstance(df, pd.DataFrame):
                     df.to_excel(writer, sheet_name=sheet_name, index=False)
+    
+    @staticmethod
+    def export_tables(data: Dict, filepath: Union[str, Path]) -> List[Path]:
+        """
+        확장자에 따라 대용량 표 내보내기 (.xlsx, .csv, .h5/.hdf5, .parquet)
+        
+        Args:
+            data: 데이터 딕셔너리 (각 키는 시트/표가 됨)
+            filepath: 출력 경로
+            
+        Returns:
+            작성된 파일 경로 목록
+        """
+        from .table_export import export_tables
+
+        return export_tables(data, filepath)
 
 
 if __name__ == "__main__":
@@ -323,6 +569,8 @@ if __name__ == "__main__":
     print(f"기하학적 스팟 반경: {geo_spot:.2f} μm")
     
     # 플롯
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(8, 8))
     plt.scatter(x, y, s=0.5, alpha=0.5)
     plt.xlabel('X (μm)')
@@ -0,0 +1,341 @@
+"""
+Parametric Design Sweep
+매개변수 설계 스윕
+
+This module evaluates metrics of a base prescription over parameter grids
+(Cartesian, Latin hypercube, Sobol) and reuses traced ray states between
+points that share the same leading surfaces.
+기준 렌즈 처방의 매개변수를 격자(데카르트 곱, 라틴 하이퍼큐브, Sobol)로
+바꿔가며 지표를 계산하고, 앞쪽 면이 같은 점끼리 추적된 광선 상태를
+재사용합니다.
+
+매개변수 이름은 '<키>:<면 번호>' (예: 'radius:2', 'thickness:4',
+'glass:1') 또는 'aperture'입니다.
+
+메모이제이션: i번 면의 곡률/코닉/반구경/유리를 바꾸면 i-1번 면까지의
+광선 상태는 그대로이고, i번 면 두께를 바꾸면 i번 면까지 그대로입니다.
+조리개 앞 면의 근축 값(입사동 위치)이나 입사동 지름, 물체 거리를 바꾸면
+광선 발사부터 다시 계산합니다. 스윕 점은 의존 깊이가 얕은 매개변수부터
+사전식으로 정렬해 연속한 점이 가장 긴 공통 접두부를 공유하도록 하고,
+파장마다 체크포인트 면의 광선 묶음(모든 시야를 이어 붙인 한 묶음)을
+보관합니다.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from itertools import product
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from . import raytrace
+from .prescription import Prescription
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SWEEP_METHODS = ('cartesian', 'lhs', 'sobol')
+
+SURFACE_KEYS = ('radius', 'curvature', 'thickness', 'conic', 'semi_diameter', 'glass')
+
+# 점 단위 근축 지표 (첫 번째 파장)
+PARAXIAL_METRICS = ('efl', 'bfl', 'f_number')
+
+# (시야, 파장) 단위 광선 지표
+RAY_METRICS = ('rms_spot', 'chief_y', 'transmission', 'mtf_tangential', 'mtf_sagittal')
+
+DEFAULT_METRICS = ('efl', 'f_number', 'rms_spot')
+
+
+@dataclass(frozen=True)
+class SweepParameter:
+    """
+    스윕 매개변수
+
+    Attributes:
+        name: 매개변수 이름 ('radius:2', 'aperture' 등)
+        key: Prescription 속성 ('radius', 'thickness', ..., 'aperture')
+        surface: 면 번호 (시스템 매개변수는 -1)
+    """
+    name: str
+    key: str
+    surface: int = -1
+
+    @classmethod
+    def parse(cls, name: str) -> 'SweepParameter':
+        """'<키>:<면 번호>' 또는 'aperture' 해석"""
+        if name == 'aperture':
+            return cls(name, 'aperture')
+        key, sep, surface = name.partition(':')
+        if not sep or key not in SURFACE_KEYS or not surface.isdigit():
+            raise ValueError(f"sweep parameter must be 'aperture' or '<key>:<surface>' with "
+                             f"key in {SURFACE_KEYS}, got {name!r}")
+        return cls(name, key, int(surface))
+
+    def depth(self, presc: Prescription) -> int:
+        """
+        이 매개변수를 바꿔도 광선 상태가 그대로인 마지막 면 번호
+
+        Args:
+            presc: 기준 렌즈 처방
+
+        Returns:
+            면 번호 (-1이면 광선 발사부터 다시 계산)
+        """
+        if self.key == 'aperture':
+            return -1
+        i = self.surface
+        if not 0 <= i < presc.image_surface + (self.key != 'thickness'):
+            raise ValueError(f"{self.name}: surface must be in 0..{presc.image_surface}")
+        if self.key == 'thickness':
+            # 물체 거리, 조리개 앞 간격은 입사동 위치를 바꿈
+            return -1 if i == 0 or i < presc.stop else i
+        if self.key in ('conic', 'semi_diameter'):
+            return i - 1
+        # 곡률, 유리: 조리개 앞이면 입사동 위치를 바꿈
+        return -1 if i < presc.stop else i - 1
+
+    def apply(self, presc: Prescription, value):
+        """렌즈 처방에 값 적용"""
+        if isinstance(value, np.generic):
+            value = value.item()
+        if self.key == 'aperture':
+            presc.aperture = float(value)
+        else:
+            presc.set_surface(self.surface, **{self.key: value})
+
+
+def _is_bounds(values: Sequence) -> bool:
+    return (len(values) == 2 and not isinstance(values, list)
+            and all(isinstance(v, (int, float, np.number)) for v in values))
+
+
+def sample_space(space: Mapping[str, Sequence], method: str = 'cartesian',
+                 n: Optional[int] = None, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    스윕 점 생성
+
+    Args:
+        space: 매개변수 이름 -> 값. 'cartesian'은 값 시퀀스,
+            'lhs'/'sobol'은 (하한, 상한) 튜플(연속) 또는 값 리스트(선택지)
+        method: 'cartesian', 'lhs' 또는 'sobol'
+        n: 'lhs'/'sobol' 점 수 ('sobol'은 2의 거듭제곱이면 균형 유지)
+        seed: 난수 시드
+
+    Returns:
+        매개변수 이름 -> (n_points,) 값 배열
+    """
+    names = list(space)
+    if method == 'cartesian':
+        grid = list(product(*(list(space[name]) for name in names)))
+        return {name: np.array([p[j] for p in grid]) for j, name in enumerate(names)}
+    if method not in SWEEP_METHODS:
+        raise ValueError(f"method must be one of {SWEEP_METHODS}, got {method!r}")
+    if n is None or n < 1:
+        raise ValueError(f"method {method!r} needs a positive point count n")
+
+    from scipy.stats import qmc
+
+    if method == 'lhs':
+        unit = qmc.LatinHypercube(d=len(names), seed=seed).random(n)
+    else:
+        m = max(0, math.ceil(math.log2(n)))
+        unit = qmc.Sobol(d=len(names), seed=seed).random_base2(m)[:n]
+
+    points = {}
+    for j, name in enumerate(names):
+        values = space[name]
+        if _is_bounds(values):
+            low, high = values
+            points[name] = low + unit[:, j] * (high - low)
+        else:
+            choices = np.asarray(list(values))
+            points[name] = choices[np.minimum((unit[:, j] * len(choices)).astype(int),
+                                              len(choices) - 1)]
+    return points
+
+
+class DesignSweep:
+    """
+    기준 렌즈 처방에 대한 매개변수 스윕 (광선 상태 접두부 재사용)
+
+    Attributes:
+        base: 기준 렌즈 처방 (변경하지 않음)
+        metrics: 계산할 지표 (PARAXIAL_METRICS, RAY_METRICS)
+        stats: 마지막 run()의 추적 통계
+            (surfaces_traced, surfaces_full, reuse, points_per_second)
+    """
+
+    def __init__(self, base: Prescription, metrics: Sequence[str] = DEFAULT_METRICS,
+                 density: int = 6, pattern: str = 'hexapolar', mtf_frequency: float = 50.0):
+        """
+        Args:
+            base: 기준 렌즈 처방
+            metrics: 지표 이름
+            density: 동공 샘플 밀도 (raytrace.pupil_grid 참고)
+            pattern: 동공 샘플 패턴
+            mtf_frequency: 'mtf_*' 지표의 공간 주파수 (lp/mm)
+        """
+        unknown = set(metrics) - set(PARAXIAL_METRICS) - set(RAY_METRICS)
+        if unknown:
+            raise ValueError(f"unknown metrics {sorted(unknown)}, expected any of "
+                             f"{PARAXIAL_METRICS + RAY_METRICS}")
+        self.base = base
+        self.metrics = tuple(metrics)
+        self.mtf_frequency = float(mtf_frequency)
+        px, py = raytrace.pupil_grid(density, pattern)
+        # 0번 광선은 주광선
+        self._px = np.concatenate(([0.0], px))
+        self._py = np.concatenate(([0.0], py))
+        self.stats: Dict[str, float] = {}
+
+    def _ray_metrics(self, bundle: raytrace.RayBundle, n_fields: int) -> Dict[str, np.ndarray]:
+        """시야별로 이어 붙인 상면 광선 묶음 -> (n_fields,) 지표 배열"""
+        n_rays = len(self._px)
+        out = {key: np.full(n_fields, np.nan) for key in RAY_METRICS}
+        position = bundle.position.reshape(n_fields, n_rays, 3)
+        valid = bundle.valid.reshape(n_fields, n_rays)
+        out['transmission'] = valid[:, 1:].mean(axis=1)
+        out['chief_y'] = np.where(valid[:, 0], position[:, 0, 1], np.nan)
+        mtf = 'mtf_tangential' in self.metrics or 'mtf_sagittal' in self.metrics
+        for f in range(n_fields):
+            xy = position[f, 1:][valid[f, 1:], :2]
+            if len(xy) < 2:
+                continue
+            rel = (xy - xy.mean(axis=0)) * 1e3
+            out['rms_spot'][f] = np.sqrt(np.mean(np.sum(rel**2, axis=1)))
+            if mtf:
+                t, s = raytrace.geometric_mtf(rel[:, 0], rel[:, 1], [self.mtf_frequency])
+                out['mtf_tangential'][f], out['mtf_sagittal'][f] = t[0], s[0]
+        return out
+
+    def run(self, points: Mapping[str, Sequence]) -> 'pd.DataFrame':
+        """
+        모든 스윕 점의 지표 계산
+
+        Args:
+            points: 매개변수 이름 -> 점별 값 (sample_space 결과 또는 DataFrame)
+
+        Returns:
+            정돈된(tidy) 결과 표 - 점 x 시야 x 파장 한 행, 열은
+            point, 매개변수, field, wavelength, 지표
+            (rms_spot은 무게중심 기준 μm, chief_y는 mm)
+        """
+        import pandas as pd
+
+        params = [SweepParameter.parse(name) for name in points]
+        columns = [np.asarray(points[p.name]) for p in params]
+        n_points = len(columns[0]) if columns else 0
+        if any(len(c) != n_points for c in columns):
+            raise ValueError("all sweep parameters need the same number of points")
+        base = self.base
+        depths = [p.depth(base) for p in params]
+
+        # 얕은 매개변수가 바깥 루프가 되도록 사전식 정렬
+        by_depth = sorted(range(len(params)), key=lambda j: depths[j])
+        codes = [np.unique(columns[j], return_inverse=True)[1] for j in by_depth]
+        order = np.lexsort(codes[::-1]) if codes else np.arange(n_points)
+        checkpoints = sorted({0} | {d for d in depths if d > 0})
+
+        fields, wavelengths = base.fields, base.wavelengths
+        shape = (n_points, len(fields), len(wavelengths))
+        ray = {key: np.full(shape, np.nan) for key in RAY_METRICS if key in self.metrics}
+        paraxial = {key: np.full(n_points, np.nan)
+                    for key in PARAXIAL_METRICS if key in self.metrics}
+
+        work = base.copy()
+        image = work.image_surface
+        # 파장 -> {체크포인트 면: 그 면을 지난 광선 묶음 (모든 시야를 이어 붙임)}
+        cache: Dict[int, Dict[int, raytrace.RayBundle]] = {}
+        indices_cache: Dict[tuple, np.ndarray] = {}
+        traced = 0
+        previous = None
+        start = time.perf_counter()
+
+        for idx in order:
+            values = [c[idx] for c in columns]
+            for p, v in zip(params, values):
+                p.apply(work, v)
+            if previous is None:
+                valid_through = -1
+            else:
+                changed = [d for d, v, pv in zip(depths, values, previous) if v != pv]
+                valid_through = min(changed, default=image)
+            previous = values
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                parax = [raytrace.paraxial_data(work, wl) for wl in wavelengths]
+            for key in paraxial:
+                paraxial[key][idx] = getattr(parax[0], key)
+            if not ray:
+                continue
+
+            for w, wavelength in enumerate(wavelengths):
+                glass_key = (w, *work.glass)
+                if glass_key not in indices_cache:
+                    indices_cache[glass_key] = raytrace.medium_indices(work, wavelength)
+                states = cache.setdefault(w, {})
+                for s in [s for s in states if s > valid_through]:
+                    del states[s]
+                if not states:
+                    launched = [raytrace.launch_rays(work, field, wavelength, self._px,
+                                                     self._py, parax[w]) for field in fields]
+                    states[0] = raytrace.RayBundle(
+                        np.concatenate([b.position for b in launched]),
+                        np.concatenate([b.direction for b in launched]),
+                        np.concatenate([b.valid for b in launched]), 0)
+                bundle = states[max(states)]
+                for s in checkpoints + [image]:
+                    if s <= bundle.surface:
+                        continue
+                    traced += (s - bundle.surface) * len(fields)
+                    bundle = raytrace.trace(work, bundle, wavelength, last=s,
+                                            indices=indices_cache[glass_key])
+                    if s != image:
+                        states[s] = bundle
+                for key, value in self._ray_metrics(bundle, len(fields)).items():
+                    if key in ray:
+                        ray[key][idx, :, w] = value
+
+        elapsed = time.perf_counter() - start
+        full = n_points * len(fields) * len(wavelengths) * image if ray else 0
+        self.stats = {'surfaces_traced': traced, 'surfaces_full': full,
+                      'reuse': 1.0 - traced / full if full else 0.0,
+                      'points_per_second': n_points / elapsed if elapsed > 0 else np.inf}
+
+        n_fw = len(fields) * len(wavelengths)
+        data = {'point': np.repeat(np.arange(n_points), n_fw)}
+        for p, c in zip(params, columns):
+            data[p.name] = np.repeat(c, n_fw)
+        data['field'] = np.tile(np.repeat(fields, len(wavelengths)), n_points)
+        data['wavelength'] = np.tile(wavelengths, n_points * len(fields))
+        for key in self.metrics:
+            data[key] = (np.repeat(paraxial[key], n_fw) if key in paraxial
+                         else ray[key].reshape(-1))
+        df = pd.DataFrame(data)
+        df.attrs['sweep_stats'] = dict(self.stats)
+        return df
+
+
+def run_sweep(base: Prescription, space: Mapping[str, Sequence], method: str = 'cartesian',
+              n: Optional[int] = None, seed: Optional[int] = None,
+              **kwargs) -> 'pd.DataFrame':
+    """
+    sample_space + DesignSweep.run
+
+    Args:
+        base: 기준 렌즈 처방
+        space: 매개변수 공간 (sample_space 참고)
+        method: 'cartesian', 'lhs' 또는 'sobol'
+        n: 'lhs'/'sobol' 점 수
+        seed: 난수 시드
+        **kwargs: DesignSweep 인자 (metrics, density, ...)
+
+    Returns:
+        정돈된 결과 표 (attrs['sweep_stats']에 추적 통계)
+    """
+    return DesignSweep(base, **kwargs).run(sample_space(space, method, n, seed))
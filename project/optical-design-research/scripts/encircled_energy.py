@@ -0,0 +1,240 @@
+"""
+Encircled / Ensquared Energy Module
+환형/정방형 에너지 모듈
+
+This module computes encircled and ensquared energy curves from ray data
+with O(n) radial histogramming.
+광선 데이터로부터 방사 히스토그램(O(n))을 이용해 환형/정방형 에너지 곡선을
+계산합니다.
+
+EE80/EE90 같은 에너지 반경은 먼저 거친 히스토그램에서 목표 비율이 걸친
+구간을 찾고, 그 구간에 속한 광선만 정렬하여 정확한 값을 구합니다. 따라서
+전체 정렬 없이도 정렬 방식과 같은 결과를 얻습니다.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+GroupKey = Tuple[int, int]  # (field, wavelength)
+
+# method='auto'일 때 정확 정렬을 사용하는 최대 광선 수
+EXACT_SORT_THRESHOLD = 100_000
+
+
+@dataclass
+class EnergyCurve:
+    """누적 에너지 곡선"""
+    radius: np.ndarray      # 반경 (환형) 또는 반폭 (정방형)
+    fraction: np.ndarray    # 누적 에너지 비율 (0~1)
+    total_energy: float
+    centroid: Tuple[float, float]
+
+    def radius_at(self, fraction: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+        """
+        곡선에서 주어진 에너지 비율의 반경 보간
+
+        Args:
+            fraction: 에너지 비율 (예: 0.8)
+
+        Returns:
+            반경 (곡선 해상도 이내)
+        """
+        r = np.concatenate(([0.0], self.radius))
+        frac = np.concatenate(([0.0], self.fraction))
+        # 동일 비율 구간(빈 구간)에서는 가장 작은 반경 선택
+        frac_u, first = np.unique(frac, return_index=True)
+        result = np.interp(fraction, frac_u, r[first])
+        return float(result) if np.ndim(result) == 0 else result
+
+
+def _group_index(n: int, field, wavelength):
+    if np.ndim(field) == 0 and np.ndim(wavelength) == 0:
+        return [(int(field), int(wavelength))], np.zeros(n, dtype=np.intp)
+    f = np.broadcast_to(np.asarray(field, dtype=np.int64), (n,))
+    w = np.broadcast_to(np.asarray(wavelength, dtype=np.int64), (n,))
+    pairs, inverse = np.unique(np.column_stack((f, w)), axis=0, return_inverse=True)
+    return [(int(a), int(b)) for a, b in pairs], inverse.ravel()
+
+
+def _distances(x, y, weights, inverse, n_groups, kind, center):
+    """그룹별 중심 기준 거리 (환형: 유클리드, 정방형: 체비쇼프)"""
+    w_sum = np.bincount(inverse, weights, n_groups)
+    if center == 'centroid':
+        cx = np.bincount(inverse, weights * x, n_groups) / w_sum
+        cy = np.bincount(inverse, weights * y, n_groups) / w_sum
+    elif center == 'origin':
+        cx = np.zeros(n_groups)
+        cy = np.zeros(n_groups)
+    else:
+        cx = np.full(n_groups, float(center[0]))
+        cy = np.full(n_groups, float(center[1]))
+    dx = x - cx[inverse]
+    dy = y - cy[inverse]
+    if kind == 'encircled':
+        d = np.hypot(dx, dy)
+    elif kind == 'ensquared':
+        d = np.maximum(np.abs(dx), np.abs(dy))
+    else:
+        raise ValueError(f"kind must be 'encircled' or 'ensquared', got {kind!r}")
+    return d, w_sum, cx, cy
+
+
+def _histogram(d, weights, inverse, n_groups, n_bins, r_max):
+    """그룹별 방사 히스토그램 (n_groups, n_bins)"""
+    scale = n_bins / np.where(r_max > 0, r_max, 1.0)
+    idx = np.minimum((d * scale[inverse]).astype(np.intp), n_bins - 1)
+    flat = inverse * n_bins + idx
+    hist = np.bincount(flat, weights, n_groups * n_bins).reshape(n_groups, n_bins)
+    return hist, idx
+
+
+def energy_curves(x: np.ndarray, y: np.ndarray,
+                  weights: Optional[np.ndarray] = None,
+                  field: Union[int, np.ndarray] = 0,
+                  wavelength: Union[int, np.ndarray] = 0,
+                  kind: str = 'encircled',
+                  n_bins: int = 1024,
+                  max_radius: Optional[float] = None,
+                  center='centroid',
+                  method: str = 'auto') -> Dict[GroupKey, EnergyCurve]:
+    """
+    그룹별 환형/정방형 에너지 곡선 계산
+
+    Args:
+        x: x 좌표 배열
+        y: y 좌표 배열
+        weights: 광선 가중치 (None이면 균일)
+        field: 필드 번호 (스칼라 또는 광선별 배열)
+        wavelength: 파장 번호 (스칼라 또는 광선별 배열)
+        kind: 'encircled' (원형) 또는 'ensquared' (정사각형 반폭)
+        n_bins: 히스토그램 구간 수
+        max_radius: 곡선 최대 반경 (None이면 그룹별 최대 거리)
+        center: 'centroid', 'origin' (원점) 또는 (cx, cy)
+        method: 'histogram', 'sort' (정확 정렬) 또는 'auto'
+
+    Returns:
+        {(field, wavelength): EnergyCurve}
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    weights = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    if method == 'auto':
+        method = 'sort' if n <= EXACT_SORT_THRESHOLD else 'histogram'
+
+    keys, inverse = _group_index(n, field, wavelength)
+    n_groups = len(keys)
+    d, w_sum, cx, cy = _distances(x, y, weights, inverse, n_groups, kind, center)
+
+    curves = {}
+    if method == 'sort':
+        order = np.lexsort((d, inverse))
+        bounds = np.searchsorted(inverse[order], np.arange(n_groups + 1))
+        for g, key in enumerate(keys):
+            sel = order[bounds[g]:bounds[g + 1]]
+            radius = d[sel]
+            cum = np.cumsum(weights[sel])
+            if max_radius is not None:
+                keep = radius <= max_radius
+                radius, cum = radius[keep], cum[keep]
+            curves[key] = EnergyCurve(radius, cum / w_sum[g], float(w_sum[g]),
+                                      (float(cx[g]), float(cy[g])))
+        return curves
+    if method != 'histogram':
+        raise ValueError(f"method must be 'histogram', 'sort' or 'auto', got {method!r}")
+
+    if max_radius is None:
+        r_max = np.zeros(n_groups)
+        np.maximum.at(r_max, inverse, d)
+    else:
+        r_max = np.full(n_groups, float(max_radius))
+        weights = np.where(d <= max_radius, weights, 0.0)
+    hist, _ = _histogram(d, weights, inverse, n_groups, n_bins, r_max)
+    cum = np.cumsum(hist, axis=1)
+    edges = np.arange(1, n_bins + 1) / n_bins
+    for g, key in enumerate(keys):
+        curves[key] = EnergyCurve(edges * r_max[g], cum[g] / w_sum[g], float(w_sum[g]),
+                                  (float(cx[g]), float(cy[g])))
+    return curves
+
+
+def energy_radius(x: np.ndarray, y: np.ndarray,
+                  fractions: Sequence[float] = (0.8, 0.9),
+                  weights: Optional[np.ndarray] = None,
+                  field: Union[int, np.ndarray] = 0,
+                  wavelength: Union[int, np.ndarray] = 0,
+                  kind: str = 'encircled',
+                  n_bins: int = 4096,
+                  center='centroid') -> Dict[GroupKey, np.ndarray]:
+    """
+    에너지 비율 반경 (EE80, EE90 등) - 전체 정렬 없이 정확한 값
+
+    히스토그램으로 목표 비율이 걸친 구간을 찾은 뒤, 해당 구간의 광선만
+    정렬합니다. 결과는 누적 가중치가 처음으로 목표 비율 이상이 되는 광선의
+    거리로, 전체 정렬 결과와 같습니다.
+
+    Args:
+        x: x 좌표 배열
+        y: y 좌표 배열
+        fractions: 에너지 비율 목록
+        weights: 광선 가중치 (None이면 균일)
+        field: 필드 번호 (스칼라 또는 광선별 배열)
+        wavelength: 파장 번호 (스칼라 또는 광선별 배열)
+        kind: 'encircled' 또는 'ensquared'
+        n_bins: 거친 히스토그램 구간 수
+        center: 'centroid', 'origin' 또는 (cx, cy)
+
+    Returns:
+        {(field, wavelength): fractions와 같은 길이의 반경 배열}
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = x.size
+    weights = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    fractions = np.atleast_1d(np.asarray(fractions, dtype=np.float64))
+    if np.any((fractions <= 0) | (fractions > 1)):
+        raise ValueError("fractions must be in (0, 1]")
+
+    keys, inverse = _group_index(n, field, wavelength)
+    n_groups = len(keys)
+    d, w_sum, _, _ = _distances(x, y, weights, inverse, n_groups, kind, center)
+
+    r_max = np.zeros(n_groups)
+    np.maximum.at(r_max, inverse, d)
+    hist, idx = _histogram(d, weights, inverse, n_groups, n_bins, r_max)
+    cum = np.cumsum(hist, axis=1)
+
+    # 그룹 g, 비율 k에 대한 목표 누적 가중치와 해당 구간
+    target = fractions[None, :] * w_sum[:, None]                       # (G, K)
+    target_bin = np.empty(target.shape, dtype=np.intp)
+    for g in range(n_groups):
+        target_bin[g] = np.searchsorted(cum[g], target[g] * (1 - 1e-12))
+    np.minimum(target_bin, n_bins - 1, out=target_bin)
+
+    # 목표 구간에 속한 광선만 선택 (O(n) 마스크)
+    wanted = np.zeros(n_groups * n_bins, dtype=bool)
+    wanted[(np.arange(n_groups)[:, None] * n_bins + target_bin).ravel()] = True
+    flat = inverse * n_bins + idx
+    sel = np.flatnonzero(wanted[flat])
+
+    # 선택된 광선을 (그룹, 구간, 거리) 순으로 정렬
+    order = sel[np.lexsort((d[sel], idx[sel], inverse[sel]))]
+    order_flat = flat[order]
+    order_cum = np.cumsum(weights[order])
+
+    result = {}
+    for g, key in enumerate(keys):
+        radii = np.empty(len(fractions))
+        for k in range(len(fractions)):
+            b = target_bin[g, k]
+            lo, hi = np.searchsorted(order_flat, [g * n_bins + b, g * n_bins + b + 1])
+            before = cum[g, b - 1] if b > 0 else 0.0
+            offset = order_cum[lo - 1] if lo > 0 else 0.0
+            in_bin = order_cum[lo:hi] - offset + before
+            j = np.searchsorted(in_bin, target[g, k] * (1 - 1e-12))
+            radii[k] = d[order[lo + min(j, hi - lo - 1)]] if hi > lo else 0.0
+        result[key] = radii
+    return result
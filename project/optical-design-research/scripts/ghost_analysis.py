@@ -0,0 +1,253 @@
+"""
+Ghost Reflection Analysis
+고스트 반사 해석
+
+This module enumerates every two-surface reflection path of a sequential
+prescription, prunes paths whose Fresnel energy is below a threshold and
+traces the surviving paths paraxially in one batched pass to locate ghost
+foci and estimate their peak irradiance for laser damage checks.
+순차 렌즈 처방의 모든 2면 반사 경로를 나열하고, 프레넬 에너지가 기준
+미만인 경로를 제외한 뒤 남은 경로를 한 번의 일괄 근축 추적으로 계산해
+고스트 초점 위치와 최대 조도(레이저 손상 검토용)를 구합니다.
+
+경로 (i, j), i < j::
+
+    1..j 전진  ->  j면 반사  ->  j-1..i 후진  ->  i면 반사  ->  i+1..상면 전진
+
+근축 y-nu 추적에서 후진 구간은 부호 있는 굴절률(-n)을 쓰므로 두께/굴절률
+비와 면의 굴절력이 전진과 같고, 반사만 nu' = nu + 2 n c y (j면, 앞 매질
+n) 와 nu' = nu - 2 n c y (i면, 뒤 매질 n)가 됩니다. 모든 경로를 (경로,)
+배열로 두고 면마다 해당하는 경로만 마스크로 갱신하므로, 면 20개 시스템의
+190개 경로도 면 순회 세 번으로 끝납니다.
+
+에너지 = R_i R_j Π T_k (R: 수직 입사 프레넬 또는 코팅 반사율, T = 1 - R,
+투과 횟수는 전진 1..j-1, 후진 i+1..j-1, 전진 i+1..마지막 면). 추적 전에
+계산하므로 threshold 미만 경로는 추적하지 않습니다.
+
+초점 조도는 레이저를 1/e^2 반경 = 주변 광선 높이인 가우시안 빔으로 보고
+허리 w0 = λ / (π n |u|), 최대 조도 2 P / (π w0^2)로 추정합니다.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import raytrace
+from .glass_catalog import MIRROR, canonical_name
+from .prescription import Prescription
+from .surfaces import paraxial_curvature
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def ghost_pairs(presc: Prescription) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    모든 2면 반사 경로
+
+    Returns:
+        (i, j) 배열 - 1 <= i < j <= 마지막 렌즈면
+    """
+    i, j = np.triu_indices(presc.image_surface - 1, k=1)
+    return i + 1, j + 1
+
+
+def surface_reflectance(presc: Prescription, wavelength_um: float) -> np.ndarray:
+    """
+    면별 수직 입사 프레넬 반사율
+
+    Returns:
+        (n_surfaces,) 배열 (물체면/상면은 0)
+    """
+    n = np.abs(raytrace.medium_indices(presc, wavelength_um))
+    R = np.zeros(presc.n_surfaces)
+    m = presc.image_surface
+    R[1:m] = ((n[1:m] - n[:m - 1]) / (n[1:m] + n[:m - 1]))**2
+    return R
+
+
+def path_energy(R: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    경로별 상면 도달 에너지 비율 (추적 없이)
+
+    Args:
+        R: (n_surfaces,) 면별 반사율
+        i, j: 경로 면 번호 배열
+
+    Returns:
+        (n_paths,) 에너지 비율
+    """
+    k = np.arange(len(R))[None, :]
+    i, j = np.asarray(i)[:, None], np.asarray(j)[:, None]
+    lens = (k >= 1) & (k < len(R) - 1)
+    passes = ((k < j).astype(int) + ((k > i) & (k < j)) + (k > i)) * lens
+    log_t = (passes * np.log(np.maximum(1 - R, 1e-300))[None, :]).sum(axis=1)
+    return R[i[:, 0]] * R[j[:, 0]] * np.exp(log_t)
+
+
+def unfolded_prescription(presc: Prescription, i: int, j: int) -> Prescription:
+    """
+    고스트 경로 (i, j)를 펼친 순차 처방 (j, i면은 MIRROR, 후진 두께는 음수)
+
+    raytrace.trace/paraxial_trace로 경로 하나를 실광선 또는 근축으로 검증할
+    때 씁니다.
+
+    Args:
+        presc: 렌즈 처방
+        i, j: 반사면 번호 (i < j)
+
+    Returns:
+        새 Prescription
+    """
+    m = presc.image_surface - 1
+    if not 1 <= i < j <= m:
+        raise ValueError(f"ghost path needs 1 <= i < j <= {m}, got ({i}, {j})")
+    out = Prescription(wavelengths=presc.wavelengths, fields=presc.fields,
+                       aperture=presc.aperture, object_distance=presc.thickness[0],
+                       name=f'{presc.name} ghost {i}-{j}'.strip())
+    # (원래 면 번호, 두께, 뒤 매질)
+    steps = [(k, presc.thickness[k], presc.glass[k]) for k in range(1, j)]
+    steps.append((j, -presc.thickness[j - 1], MIRROR))
+    steps += [(k, -presc.thickness[k - 1], presc.glass[k - 1]) for k in range(j - 1, i, -1)]
+    steps.append((i, presc.thickness[i], MIRROR))
+    steps += [(k, presc.thickness[k], presc.glass[k]) for k in range(i + 1, m + 1)]
+    for k, thickness, glass in steps:
+        index = out.add_surface(thickness=thickness, glass=glass, conic=presc.conic[k],
+                                semi_diameter=presc.semi_diameter[k],
+                                surface_type=presc.surface_type[k], params=presc.params[k])
+        out.curvature[index] = presc.curvature[k]
+    out.stop = presc.stop if presc.stop < j else 1
+    return out
+
+
+def analyze_ghosts(presc: Prescription, power: float = 1.0,
+                   wavelength_um: Optional[float] = None, threshold: float = 1e-7,
+                   reflectance: Optional[Union[float, Sequence[float]]] = None,
+                   beam_radius: Optional[float] = None) -> 'pd.DataFrame':
+    """
+    2면 반사 고스트 해석 (축상 빔, 일괄 근축 추적)
+
+    Args:
+        presc: 렌즈 처방 (반사면 없음)
+        power: 입사 레이저 출력 (W)
+        wavelength_um: 파장 (None이면 첫 번째 파장)
+        threshold: 추적할 최소 에너지 비율
+        reflectance: 면별 반사율 (코팅, 스칼라면 모든 렌즈면 같음,
+            None이면 수직 입사 프레넬)
+        beam_radius: 1/e^2 빔 반경 (mm, None이면 입사동 반경)
+
+    Returns:
+        고스트 경로별 DataFrame (peak_irradiance 내림차순):
+        i, j, energy, power (W), image_radius (상면 고스트 반경, mm),
+        image_irradiance (상면 평균 조도, W/cm^2), focus_z (j면 반사 뒤 실초점 중
+        허리가 가장 작은 초점, 1번 면 꼭짓점 기준, 없으면 NaN),
+        focus_region (초점이 있는 k~k+1면 사이 구간 k, 없으면 -1),
+        focus_medium, leg ('return' = j->i 후진, 'forward' = i->상면 전진,
+        상면 뒤 포함), waist (μm), peak_irradiance (W/cm^2).
+        attrs: n_paths, n_traced, threshold
+    """
+    import pandas as pd
+
+    if wavelength_um is None:
+        wavelength_um = float(presc.wavelengths[0])
+    m = presc.image_surface - 1
+    if m < 2:
+        raise ValueError("ghost analysis needs at least two lens surfaces")
+    if any(canonical_name(glass) == MIRROR for glass in presc.glass):
+        raise ValueError("ghost analysis supports refractive systems only (MIRROR found)")
+
+    if reflectance is None:
+        R = surface_reflectance(presc, wavelength_um)
+    else:
+        R = np.zeros(presc.n_surfaces)
+        R[1:m + 1] = np.broadcast_to(np.asarray(reflectance, dtype=np.float64), (m,))
+    i_all, j_all = ghost_pairs(presc)
+    energy_all = path_energy(R, i_all, j_all)
+    keep = energy_all >= threshold
+    i, j, energy = i_all[keep], j_all[keep], energy_all[keep]
+
+    n = raytrace.medium_indices(presc, wavelength_um)
+    c, t, z = paraxial_curvature(presc), presc.thickness, presc.vertex_z()
+    paraxial = raytrace.paraxial_data(presc, wavelength_um)
+    h = presc.aperture / 2 if beam_radius is None else float(beam_radius)
+    # 축상 물점에서 입사동 가장자리로 가는 주변 광선 (1번 면 도달 상태)
+    u0 = 0.0 if not np.isfinite(t[0]) else h / (paraxial.enp_z + t[0])
+    y = np.full(len(i), h - u0 * paraxial.enp_z)
+    nu = np.full(len(i), n[0] * u0)
+
+    focus_z = np.full(len(i), np.nan)
+    focus_region = np.full(len(i), -1)
+    focus_angle = np.zeros(len(i))
+    leg = np.full(len(i), '', dtype=object)
+
+    def refract(k, mask):
+        nu[mask] -= y[mask] * c[k] * (n[k] - n[k - 1])
+
+    def translate(k, mask, z_from, z_to, name):
+        """k 구간 통과, 축을 지나면 허리가 가장 작은 초점으로 기록"""
+        idx = np.flatnonzero(mask)
+        y_old = y[idx]
+        y_new = y_old + t[k] * nu[idx] / n[k]
+        angle = np.abs(nu[idx] / n[k])
+        hit = (y_old * y_new <= 0) & (y_old != y_new) & ~(focus_angle[idx] >= angle)
+        sel = idx[hit]
+        frac = y_old[hit] / (y_old[hit] - y_new[hit])
+        focus_z[sel] = z_from + frac * (z_to - z_from)
+        focus_region[sel] = k
+        focus_angle[sel] = angle[hit]
+        leg[sel] = name
+        y[idx] = y_new
+
+    # 1. 전진 1..j-1, j면 반사 (고스트 빔 생성 전이라 초점 기록 없음)
+    for k in range(1, m + 1):
+        go = k < j
+        refract(k, go)
+        y[go] += t[k] * nu[go] / n[k]
+        at = k == j
+        nu[at] += 2 * n[k - 1] * c[k] * y[at]
+    # 2. 후진 j-1..i: k 구간 (k+1면 -> k면), k > i면 굴절, k == i면 반사
+    for k in range(m - 1, 0, -1):
+        go = (k >= i) & (k < j)
+        translate(k, go, z[k + 1], z[k], 'return')
+        refract(k, go & (k > i))
+        at = go & (k == i)
+        nu[at] -= 2 * n[k] * c[k] * y[at]
+    # 3. 전진 i..상면: k 구간 (k면 -> k+1면), 다음 면이 렌즈면이면 굴절
+    for k in range(1, m + 1):
+        go = k >= i
+        translate(k, go, z[k], z[k + 1], 'forward')
+        if k < m:
+            refract(k + 1, go)
+
+    # 상면 뒤 초점 (마지막 구간 연장)
+    u_img = nu / n[m]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        beyond = (y * u_img < 0) & (np.abs(u_img) > focus_angle)
+        focus_z[beyond] = z[m + 1] - y[beyond] / u_img[beyond]
+    focus_region[beyond] = m
+    focus_angle[beyond] = np.abs(u_img[beyond])
+    leg[beyond] = 'forward'
+
+    wavelength_mm = wavelength_um * 1e-3
+    ghost_power = power * energy
+    region_index = np.abs(n[np.maximum(focus_region, 0)])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        waist = np.where(focus_region >= 0,
+                         wavelength_mm / (np.pi * region_index * focus_angle), np.nan)
+        # W/mm^2 -> W/cm^2
+        peak = 2 * ghost_power / (np.pi * waist**2) * 1e2
+        image_irradiance = ghost_power / (np.pi * y**2) * 1e2
+
+    df = pd.DataFrame({
+        'i': i, 'j': j, 'energy': energy, 'power': ghost_power,
+        'image_radius': np.abs(y), 'image_irradiance': image_irradiance,
+        'focus_z': focus_z, 'focus_region': focus_region,
+        'focus_medium': [presc.glass[k] or 'AIR' if k >= 0 else '' for k in focus_region],
+        'leg': leg, 'waist': waist * 1e3, 'peak_irradiance': peak,
+    })
+    df = df.sort_values('peak_irradiance', ascending=False, na_position='last',
+                        kind='stable').reset_index(drop=True)
+    df.attrs.update(n_paths=len(i_all), n_traced=len(i), threshold=threshold)
+    return df
@@ -0,0 +1,124 @@
+"""
+Optical Glass Catalog
+광학 유리 카탈로그
+
+This module provides refractive indices of common optical glasses and
+infrared materials from Sellmeier dispersion formulas.
+자주 쓰는 광학 유리와 적외선 재료의 굴절률을 Sellmeier 분산식으로 계산합니다.
+
+분산식::
+
+    n^2 = A + Σ B_i λ^2 / (λ^2 - C_i)      (λ: μm)
+
+A=1이면 Schott/Malitson 형식, Ge처럼 A≠1이면 Barnes-Piltch 형식입니다.
+재질 이름이 비어 있거나 'AIR'이면 1.0, 숫자 문자열('1.5168')이면 고정
+굴절률(분산 없음)로 취급합니다. 'MIRROR'는 반사면을 뜻하며 굴절률 대신
+직전 매질을 유지합니다 (raytrace 모듈에서 처리).
+"""
+
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+MIRROR = 'MIRROR'
+
+# 이름: (A, (B1, B2, B3), (C1, C2, C3), (λ_min, λ_max) μm)
+SELLMEIER_CATALOG: Dict[str, Tuple[float, Tuple[float, ...], Tuple[float, ...],
+                                   Tuple[float, float]]] = {
+    'N-BK7': (1.0, (1.03961212, 0.231792344, 1.01046945),
+              (0.00600069867, 0.0200179144, 103.560653), (0.3, 2.5)),
+    'N-SF5': (1.0, (1.52481889, 0.187085527, 1.42729015),
+              (0.011254756, 0.0588995392, 129.141675), (0.37, 2.5)),
+    'F2': (1.0, (1.34533359, 0.209073176, 0.937357162),
+           (0.00997743871, 0.0470450767, 111.886764), (0.32, 2.5)),
+    'N-SF11': (1.0, (1.73759695, 0.313747346, 1.89878101),
+               (0.013188707, 0.0623068142, 155.23629), (0.37, 2.5)),
+    'F_SILICA': (1.0, (0.6961663, 0.4079426, 0.8974794),
+                 (0.0684043**2, 0.1162414**2, 9.896161**2), (0.21, 3.7)),
+    'CAF2': (1.0, (0.5675888, 0.4710914, 3.8484723),
+             (0.050263605**2, 0.1003909**2, 34.649040**2), (0.23, 9.7)),
+    'GERMANIUM': (9.28156, (6.72880, 0.21307),
+                  (0.44105, 3870.1), (2.0, 12.0)),
+    'ZNSE': (1.0, (4.45813734, 0.467216334, 2.89566290),
+             (0.200859853**2, 0.391371166**2, 47.1362108**2), (0.54, 18.2)),
+}
+
+# 구 카탈로그/약칭
+ALIASES = {
+    'BK7': 'N-BK7',
+    'SF5': 'N-SF5',
+    'SF11': 'N-SF11',
+    'FUSED_SILICA': 'F_SILICA',
+    'SILICA': 'F_SILICA',
+    'GE': 'GERMANIUM',
+}
+
+
+class UnknownGlassError(ValueError):
+    """카탈로그에 없는 재질"""
+
+
+def canonical_name(glass: str) -> str:
+    """
+    재질 이름 정규화 (대문자, 약칭 변환)
+
+    Args:
+        glass: 재질 이름
+
+    Returns:
+        카탈로그 이름 ('' = 공기)
+    """
+    name = (glass or '').strip().upper()
+    if name == 'AIR':
+        return ''
+    return ALIASES.get(name, name)
+
+
+@lru_cache(maxsize=4096)
+def refractive_index(glass: str, wavelength_um: float) -> float:
+    """
+    굴절률 계산 (재질, 파장별 캐시)
+
+    Args:
+        glass: 재질 이름 (''/'AIR' = 1.0, 숫자 문자열 = 고정 굴절률)
+        wavelength_um: 파장 (μm)
+
+    Returns:
+        굴절률
+
+    Raises:
+        UnknownGlassError: 카탈로그에 없는 재질일 때
+    """
+    name = canonical_name(glass)
+    if not name:
+        return 1.0
+    if name == MIRROR:
+        raise UnknownGlassError("MIRROR has no refractive index")
+    if name in SELLMEIER_CATALOG:
+        a, b, c, _ = SELLMEIER_CATALOG[name]
+        lam2 = wavelength_um ** 2
+        n2 = a + sum(bi * lam2 / (lam2 - ci) for bi, ci in zip(b, c))
+        return float(np.sqrt(n2))
+    try:
+        return float(name)
+    except ValueError:
+        raise UnknownGlassError(
+            f"unknown glass {glass!r}, expected one of {sorted(SELLMEIER_CATALOG)}") from None
+
+
+def abbe_number(glass: str) -> float:
+    """
+    아베수 V_d = (n_d - 1) / (n_F - n_C)
+
+    Args:
+        glass: 재질 이름
+
+    Returns:
+        아베수
+    """
+    n_d = refractive_index(glass, 0.5875618)
+    n_f = refractive_index(glass, 0.4861327)
+    n_c = refractive_index(glass, 0.6562725)
+    return (n_d - 1) / (n_f - n_c)
@@ -0,0 +1,298 @@
+"""
+Global Lens Optimization
+전역 렌즈 최적화
+
+This module runs multi-start local optimization of a prescription in a
+process pool, sampling curvatures and catalog glasses per start, sharing
+the best merit found so far between workers and honoring a wall-clock
+budget.
+렌즈 처방의 다중 시작 국소 최적화를 프로세스 풀에서 실행합니다. 시작점마다
+곡률과 카탈로그 유리를 샘플링하고, 지금까지의 최고 메리트를 작업 프로세스
+사이에서 공유하며, 실행 시간 예산을 지킵니다.
+
+메리트는 LocalBackend.optimize와 같은 전 시야/파장 평균 RMS 스팟 반경
+(raytrace.rms_spot_radius, mm)이고 국소 탐색은 Nelder-Mead입니다.
+공유 최고값은 두 가지에 쓰입니다:
+
+- 가지치기: prune_after 반복 뒤에도 시작점의 최고 메리트가 공유 최고값의
+  prune_factor배보다 나쁘면 그 시작점을 중단하고 다음 시작점으로 넘어갑니다.
+  기준 설계에서 시작하는 시작점 0은 가지치기하지 않습니다.
+- 보고: 개선될 때마다 공유 값을 갱신하므로 진행 중 최고값을 볼 수 있습니다.
+
+시간 예산이 지나면 실행 중인 국소 탐색은 다음 반복에서 멈추고 그때까지의
+최고점을 돌려주며, 시작하지 않은 시작점은 건너뜁니다.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import raytrace
+from .prescription import Prescription
+
+
+# scipy Nelder-Mead 종료 코드 -> 시작점 상태
+_NELDER_MEAD_STATUS = {0: 'converged', 1: 'maxfev', 2: 'maxiter'}
+
+# 작업 프로세스의 공유 최고 메리트 (multiprocessing.Value)와 마감 시각 (time.time)
+_shared_best = None
+_deadline = None
+
+
+def _init_worker(best, deadline: Optional[float]):
+    global _shared_best, _deadline
+    _shared_best = best
+    _deadline = deadline
+
+
+def _publish(value: float):
+    if _shared_best is None:
+        return
+    with _shared_best.get_lock():
+        if value < _shared_best.value:
+            _shared_best.value = value
+
+
+@dataclass
+class GlobalResult:
+    """
+    전역 최적화 결과
+
+    Attributes:
+        merit: 최고 메리트 (mm)
+        prescription: 최고 설계 (기준 처방의 복사본)
+        starts: 시작점별 요약 (start, merit, status, iterations,
+            n_evaluations, elapsed, glass)
+        elapsed: 전체 실행 시간 (s)
+    """
+    merit: float
+    prescription: Prescription
+    starts: List[Dict] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def n_evaluations(self) -> int:
+        """전체 메리트 계산 수"""
+        return sum(s['n_evaluations'] for s in self.starts)
+
+
+def local_search(presc: Prescription, surfaces: Sequence[int], x0: np.ndarray,
+                 focus: bool = True, glass: Optional[Mapping[int, str]] = None,
+                 density: int = 4, max_iterations: int = 400, prune_after: int = 60,
+                 prune_factor: float = 3.0, prune: bool = True) -> Dict:
+    """
+    시작점 하나의 Nelder-Mead 국소 탐색
+
+    Args:
+        presc: 기준 렌즈 처방 (변경하지 않음)
+        surfaces: 곡률 변수 면 번호
+        x0: 시작 변수 (곡률들, focus면 마지막에 상면 직전 두께)
+        focus: 상면 직전 두께 변수 여부
+        glass: 이 시작점의 면 번호 -> 유리
+        density: 메리트 계산 동공 링 수
+        max_iterations: 최대 반복 수
+        prune_after: 가지치기 판단을 시작하는 반복 수
+        prune_factor: 공유 최고값 대비 허용 배수
+        prune: False면 가지치기하지 않음 (시간 예산은 그대로 적용)
+
+    Returns:
+        {'merit', 'x', 'glass', 'status', 'iterations', 'n_evaluations', 'elapsed'}
+        status는 'converged' (수렴), 'maxiter' (반복 수 상한), 'maxfev'
+        (평가 수 상한), 'failed' (그 밖의 종료), 'pruned', 'deadline' 또는
+        'skipped'
+    """
+    from scipy.optimize import minimize
+
+    start = time.time()
+    state = {'merit': np.inf, 'x': np.asarray(x0, dtype=np.float64), 'status': None,
+             'iterations': 0, 'n_evaluations': 0}
+    glass = dict(glass or {})
+    if _deadline is not None and start >= _deadline:
+        state['status'] = 'skipped'
+        return dict(state, glass=glass, elapsed=0.0)
+
+    work = presc.copy()
+    for surface, name in glass.items():
+        work.glass[surface] = name
+    surfaces = list(surfaces)
+    focus_index = work.image_surface - 1
+
+    def merit(x):
+        work.curvature[surfaces] = x[:len(surfaces)]
+        if focus:
+            work.thickness[focus_index] = x[-1]
+        value = raytrace.rms_spot_radius(work, density)
+        state['n_evaluations'] += 1
+        if value < state['merit']:
+            state['merit'], state['x'] = value, x.copy()
+        return value
+
+    def callback(xk):
+        state['iterations'] += 1
+        _publish(state['merit'])
+        if _deadline is not None and time.time() >= _deadline:
+            state['status'] = 'deadline'
+            raise StopIteration
+        if (prune and state['iterations'] >= prune_after and _shared_best is not None
+                and state['merit'] > prune_factor * _shared_best.value):
+            state['status'] = 'pruned'
+            raise StopIteration
+
+    res = minimize(merit, state['x'], method='Nelder-Mead', callback=callback,
+                   options={'maxiter': max_iterations, 'xatol': 1e-9, 'fatol': 1e-12})
+    if state['status'] is None:
+        state['status'] = _NELDER_MEAD_STATUS.get(res.status, 'failed')
+    _publish(state['merit'])
+    return dict(state, glass=glass, elapsed=time.time() - start)
+
+
+class GlobalOptimizer:
+    """
+    다중 시작 전역 최적화 (프로세스 풀)
+
+    시작점 0은 기준 설계 그대로이고 가지치기하지 않으므로, 시간 예산 안에
+    끝나면 결과는 같은 max_iterations의 LocalBackend.optimize(mode='local')
+    결과보다 나빠지지 않습니다 (예산이 먼저 지나면 status가 'deadline'이고
+    보장하지 않음). 나머지 시작점은 곡률을 라틴 하이퍼큐브로, 유리를
+    glass_choices에서 균등하게 샘플링하고 상면 거리는 근축 후초점거리에서
+    시작합니다.
+    """
+
+    def __init__(self, presc: Prescription, variables: Optional[Sequence[int]] = None,
+                 focus: bool = True, glass_choices: Optional[Mapping[int, Sequence[str]]] = None,
+                 n_starts: int = 16, curvature_bounds: Optional[Tuple[float, float]] = None,
+                 time_budget: Optional[float] = None, max_workers: Optional[int] = None,
+                 density: int = 4, max_iterations: int = 400, prune_after: int = 60,
+                 prune_factor: float = 3.0, seed: Optional[int] = None):
+        """
+        Args:
+            presc: 기준 렌즈 처방 (변경하지 않음)
+            variables: 곡률 변수 면 번호 (None이면 물체/상면 제외 전체)
+            focus: 상면 직전 두께도 변수로 사용
+            glass_choices: 면 번호 -> 유리 후보 (카탈로그 이름)
+            n_starts: 시작점 수
+            curvature_bounds: 곡률 샘플링 범위 (1/mm, None이면 기준 곡률
+                절댓값 최대의 ±1.5배)
+            time_budget: 실행 시간 예산 (s, None이면 무제한)
+            max_workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스)
+            density: 메리트 계산 동공 링 수
+            max_iterations: 시작점당 최대 반복 수
+            prune_after: 가지치기 판단을 시작하는 반복 수
+            prune_factor: 공유 최고값 대비 허용 배수
+            seed: 시작점 샘플링 난수 시드
+        """
+        if n_starts < 1:
+            raise ValueError(f"n_starts must be >= 1, got {n_starts}")
+        self.presc = presc
+        self.variables = (list(range(1, presc.image_surface)) if variables is None
+                          else list(variables))
+        self.focus = focus
+        self.glass_choices = {int(k): list(v) for k, v in (glass_choices or {}).items()}
+        for surface, choices in self.glass_choices.items():
+            if not 1 <= surface < presc.image_surface or not choices:
+                raise ValueError(f"glass_choices: surface {surface} needs at least one glass "
+                                 f"and must be in 1..{presc.image_surface - 1}")
+        self.n_starts = n_starts
+        if curvature_bounds is None:
+            limit = 1.5 * max(np.abs(presc.curvature[self.variables]).max(), 1e-3)
+            curvature_bounds = (-limit, limit)
+        self.curvature_bounds = curvature_bounds
+        self.time_budget = time_budget
+        self.max_workers = max_workers
+        self.search_options = dict(density=density, max_iterations=max_iterations,
+                                   prune_after=prune_after, prune_factor=prune_factor)
+        self.seed = seed
+
+    def n_workers(self) -> int:
+        """사용할 프로세스 수"""
+        return max(1, min(self.max_workers or os.cpu_count() or 1, self.n_starts))
+
+    def starts(self) -> List[Tuple[np.ndarray, Dict[int, str]]]:
+        """
+        시작점 목록
+
+        Returns:
+            [(시작 변수, 면 번호 -> 유리)]
+        """
+        presc = self.presc
+        focus_index = presc.image_surface - 1
+        x_base = presc.curvature[self.variables].copy()
+        if self.focus:
+            x_base = np.append(x_base, presc.thickness[focus_index])
+        out = [(x_base, {s: presc.glass[s] for s in self.glass_choices})]
+        if self.n_starts == 1:
+            return out
+
+        from scipy.stats import qmc
+
+        rng = np.random.default_rng(self.seed)
+        low, high = self.curvature_bounds
+        unit = qmc.LatinHypercube(d=len(self.variables), seed=rng).random(self.n_starts - 1)
+        trial = presc.copy()
+        for row in unit:
+            curvatures = low + row * (high - low)
+            glass = {s: str(rng.choice(choices)) for s, choices in self.glass_choices.items()}
+            x0 = curvatures
+            if self.focus:
+                trial.curvature[self.variables] = curvatures
+                for s, name in glass.items():
+                    trial.glass[s] = name
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    bfl = raytrace.paraxial_data(trial).bfl
+                x0 = np.append(curvatures, bfl if np.isfinite(bfl) and bfl > 0
+                               else presc.thickness[focus_index])
+            out.append((x0, glass))
+        return out
+
+    def run(self) -> GlobalResult:
+        """
+        전역 최적화 실행
+
+        Returns:
+            GlobalResult
+        """
+        begin = time.time()
+        deadline = None if self.time_budget is None else begin + self.time_budget
+        best = multiprocessing.Value('d', np.inf)
+        tasks = [(self.presc, self.variables, x0, self.focus, glass)
+                 for x0, glass in self.starts()]
+        options = [dict(self.search_options, prune=k > 0) for k in range(len(tasks))]
+
+        results: List[Dict] = [None] * len(tasks)
+        n_workers = self.n_workers()
+        if n_workers == 1:
+            previous = (_shared_best, _deadline)
+            _init_worker(best, deadline)
+            try:
+                for k, task in enumerate(tasks):
+                    results[k] = local_search(*task, **options[k])
+            finally:
+                _init_worker(*previous)
+        else:
+            with ProcessPoolExecutor(n_workers, initializer=_init_worker,
+                                     initargs=(best, deadline)) as pool:
+                futures = {pool.submit(local_search, *task, **options[k]): k
+                           for k, task in enumerate(tasks)}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+        winner = min(range(len(results)), key=lambda k: results[k]['merit'])
+        presc = self.presc.copy()
+        x = results[winner]['x']
+        presc.curvature[self.variables] = x[:len(self.variables)]
+        if self.focus:
+            presc.thickness[presc.image_surface - 1] = x[-1]
+        for surface, name in results[winner]['glass'].items():
+            presc.glass[surface] = name
+
+        starts = [{'start': k, 'merit': r['merit'], 'status': r['status'],
+                   'iterations': r['iterations'], 'n_evaluations': r['n_evaluations'],
+                   'elapsed': r['elapsed'], 'glass': r['glass']}
+                  for k, r in enumerate(results)]
+        return GlobalResult(merit=float(results[winner]['merit']), prescription=presc,
+                            starts=starts, elapsed=time.time() - begin)
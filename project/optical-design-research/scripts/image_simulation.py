@@ -0,0 +1,486 @@
+"""
+Image Simulation Module
+영상 시뮬레이션 모듈
+
+This module previews what a lens images: it blurs a scene (radiance or
+temperature map) with field-dependent PSFs using tiled overlap-add FFT
+convolution with PSF interpolation between field points, then applies
+detector pixel sampling, fixed-pattern and temporal noise and ADC
+quantization.
+장면(복사휘도 또는 온도 분포)을 시야별 PSF로 흐리게 하고(시야점 사이 PSF
+보간, 타일 overlap-add FFT 합성곱), 검출기 픽셀 샘플링, 고정 패턴/시간
+잡음, ADC 양자화를 적용해 렌즈가 실제로 만드는 영상을 미리 봅니다.
+
+공간 가변 흐림 (노드 간격 T, 노드 k의 PSF h_k, 텐트 창 w_k)::
+
+    out = Σ_k h_k * (w_k · scene),   w_k(x, y) = (1 - |x - x_k|/T)(1 - |y - y_k|/T)
+
+텐트 창의 합은 1이므로 PSF가 모두 같으면 전체 합성곱과 같고, 노드 사이
+화소는 주변 네 노드 PSF를 이중 선형 보간한 PSF로 흐려집니다. 노드 k의
+2T x 2T 타일을 FFT 크기 P >= 2T + PSF 크기 - 1로 0을 채워 합성곱한 뒤 출력
+버퍼에 겹쳐 더합니다(overlap-add).
+
+ImageSimulator는 생성 시 노드 PSF 스펙트럼, 창, FFT 크기와 타일/출력 버퍼를
+한 번 준비(plan)하고 프레임마다 재사용합니다. FFT는 scipy.fft (float32)로
+노드 한 줄씩 일괄 계산합니다. 장면 화소는 상면 위 등간격 격자이며
+(검출기 화소의 1/oversample), PSF도 같은 간격으로 샘플링합니다.
+"""
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import raytrace
+from .prescription import Prescription
+
+
+# 복사 상수 (SI)
+_H = 6.62607015e-34
+_C = 2.99792458e8
+_KB = 1.380649e-23
+
+# 밴드 복사휘도 표 온도 범위 (K)
+RADIANCE_TABLE_RANGE = (150.0, 1500.0)
+
+
+@lru_cache(maxsize=16)
+def _radiance_table(band_um: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray]:
+    """(온도, 밴드 복사휘도) 표"""
+    temperature = np.arange(RADIANCE_TABLE_RANGE[0], RADIANCE_TABLE_RANGE[1] + 0.25, 0.25)
+    wl = np.linspace(band_um[0], band_um[1], 401) * 1e-6
+    x = _H * _C / (wl[None, :] * _KB * temperature[:, None])
+    spectral = 2 * _H * _C**2 / wl**5 / np.expm1(x)
+    # 사다리꼴 적분 (W/(m^2 sr))
+    radiance = ((spectral[:, 1:] + spectral[:, :-1]) * 0.5 * np.diff(wl)).sum(axis=1)
+    return temperature, radiance
+
+
+def band_radiance(temperature_K, band_um: Tuple[float, float] = (8.0, 14.0)) -> np.ndarray:
+    """
+    흑체 밴드 복사휘도 (플랑크 적분 표 보간)
+
+    Args:
+        temperature_K: 온도 (K, 배열)
+        band_um: 파장 대역 (μm)
+
+    Returns:
+        복사휘도 (W/(m^2 sr)), 표 범위 밖 온도는 가장자리 값
+    """
+    temperature, radiance = _radiance_table(tuple(map(float, band_um)))
+    return np.interp(temperature_K, temperature, radiance)
+
+
+def radiance_to_temperature(radiance, band_um: Tuple[float, float] = (8.0, 14.0)) -> np.ndarray:
+    """
+    밴드 복사휘도 -> 흑체 겉보기 온도 (band_radiance의 역)
+
+    Args:
+        radiance: 복사휘도 (W/(m^2 sr), 배열)
+        band_um: 파장 대역 (μm)
+
+    Returns:
+        온도 (K)
+    """
+    temperature, table = _radiance_table(tuple(map(float, band_um)))
+    return np.interp(radiance, table, temperature)
+
+
+# ---------------------------------------------------------------------------
+# 시야별 PSF
+# ---------------------------------------------------------------------------
+
+class PSFGrid:
+    """
+    시야 격자점별 PSF
+
+    Attributes:
+        psfs: (gy, gx, k, k) 합이 1인 PSF (k 홀수, 중심 화소 (k-1)/2)
+        u: (gx,) 정규화 가로 위치 (-1 = 왼쪽 끝 열, +1 = 오른쪽 끝 열)
+        v: (gy,) 정규화 세로 위치 (-1 = 첫 행, +1 = 마지막 행)
+    """
+
+    def __init__(self, psfs: np.ndarray, u: Optional[Sequence[float]] = None,
+                 v: Optional[Sequence[float]] = None):
+        """
+        Args:
+            psfs: (gy, gx, k, k) PSF 배열 (합으로 정규화)
+            u, v: 격자 위치 (None이면 -1..1 등간격, 한 점이면 중심 0)
+        """
+        psfs = np.asarray(psfs, dtype=np.float64)
+        if psfs.ndim == 2:
+            psfs = psfs[None, None]
+        if psfs.ndim != 4 or psfs.shape[2] != psfs.shape[3] or psfs.shape[2] % 2 == 0:
+            raise ValueError(f"psfs must be (gy, gx, k, k) with odd k, got {psfs.shape}")
+        total = psfs.sum(axis=(2, 3), keepdims=True)
+        if np.any(total <= 0):
+            raise ValueError("every PSF needs a positive sum")
+        self.psfs = psfs / total
+        gy, gx = psfs.shape[:2]
+        self.u = _grid_positions(gx) if u is None else np.asarray(u, dtype=np.float64)
+        self.v = _grid_positions(gy) if v is None else np.asarray(v, dtype=np.float64)
+        if len(self.u) != gx or len(self.v) != gy:
+            raise ValueError("u and v must match the PSF grid shape")
+
+    @property
+    def size(self) -> int:
+        """PSF 크기 k"""
+        return self.psfs.shape[-1]
+
+    def weights(self, u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """
+        이중 선형 보간 (인덱스, 가중치) - 격자 밖은 가장자리 값
+
+        Returns:
+            (iy, ix, wy, wx): 각 위치의 아래쪽 격자 인덱스와 위쪽 격자 가중치
+        """
+        def axis(grid, x):
+            if len(grid) == 1:
+                return np.zeros(np.shape(x), dtype=np.intp), np.zeros(np.shape(x))
+            x = np.clip(x, grid[0], grid[-1])
+            i = np.clip(np.searchsorted(grid, x, side='right') - 1, 0, len(grid) - 2)
+            return i, (x - grid[i]) / (grid[i + 1] - grid[i])
+
+        iy, wy = axis(self.v, np.asarray(v, dtype=np.float64))
+        ix, wx = axis(self.u, np.asarray(u, dtype=np.float64))
+        return iy, ix, wy, wx
+
+    def _blend(self, values: np.ndarray, u, v) -> np.ndarray:
+        """격자 값(gy, gx, ...)의 이중 선형 보간"""
+        iy, ix, wy, wx = self.weights(u, v)
+        iy1 = np.minimum(iy + 1, len(self.v) - 1)
+        ix1 = np.minimum(ix + 1, len(self.u) - 1)
+        extra = (slice(None),) + (None,) * (values.ndim - 2)
+        wy, wx = np.asarray(wy)[extra], np.asarray(wx)[extra]
+        return ((1 - wy) * ((1 - wx) * values[iy, ix] + wx * values[iy, ix1]) +
+                wy * ((1 - wx) * values[iy1, ix] + wx * values[iy1, ix1]))
+
+    def at(self, u: float, v: float) -> np.ndarray:
+        """
+        (u, v) 위치의 보간 PSF
+
+        Returns:
+            (k, k) 배열
+        """
+        return self._blend(self.psfs, np.array([u]), np.array([v]))[0]
+
+    @classmethod
+    def from_prescription(cls, presc: Prescription, frame_shape: Tuple[int, int],
+                          pixel_mm: float, grid: Tuple[int, int] = (5, 5),
+                          size: int = 31, wavelength_um: Optional[float] = None,
+                          density: int = 16, diffraction: bool = True) -> 'PSFGrid':
+        """
+        순차 렌즈 처방의 기하(+ 회절) PSF 격자
+
+        격자점의 상 높이에서 근축 EFL로 시야각을 구해 y 방향 스팟
+        다이어그램을 추적하고(주광선 기준), 격자점의 방사 방향으로 회전해
+        화소 격자에 이중 선형으로 분배합니다. diffraction이면 원형 개구
+        회절 MTF를 곱합니다. 왜곡(주광선 위치 이동)은 무시합니다.
+
+        Args:
+            presc: 회전 대칭 렌즈 처방
+            frame_shape: 장면 (행, 열) 수
+            pixel_mm: 장면 화소 간격 (mm)
+            grid: PSF 격자 (gy, gx)
+            size: PSF 크기 (홀수 화소)
+            wavelength_um: 파장 (None이면 첫 번째 파장)
+            density: 동공 링 수
+            diffraction: 회절 MTF 적용
+
+        Returns:
+            PSFGrid
+        """
+        if size % 2 == 0:
+            raise ValueError(f"PSF size must be odd, got {size}")
+        if wavelength_um is None:
+            wavelength_um = float(presc.wavelengths[0])
+        paraxial = raytrace.paraxial_data(presc, wavelength_um)
+        gy, gx = grid
+        u, v = _grid_positions(gx), _grid_positions(gy)
+        half_w = (frame_shape[1] - 1) / 2 * pixel_mm
+        half_h = (frame_shape[0] - 1) / 2 * pixel_mm
+        c = (size - 1) // 2
+
+        pad = 2 * size
+        freq = np.hypot(*np.meshgrid(np.fft.fftfreq(pad, pixel_mm),
+                                     np.fft.rfftfreq(pad, pixel_mm), indexing='ij'))
+        mtf = raytrace.diffraction_mtf(freq, paraxial.f_number, wavelength_um)
+
+        psfs = np.zeros((gy, gx, size, size))
+        for j, vj in enumerate(v):
+            for i, ui in enumerate(u):
+                # 상면 위치 (열 방향, 행 방향) mm
+                col, row = ui * half_w, vj * half_h
+                height = np.hypot(col, row)
+                field = np.degrees(np.arctan(height / abs(paraxial.efl)))
+                spot = raytrace.spot_diagram(presc, field, wavelength_um, density,
+                                             paraxial=paraxial)
+                # 스팟 y는 주광선 쪽이 바깥 방향
+                outward = -1.0 if spot['chief_y'] < 0 else 1.0
+                radial = spot['y'] * outward * 1e-3
+                tangential = spot['x'] * 1e-3
+                e_col, e_row = (col / height, row / height) if height > 0 else (0.0, 1.0)
+                dc = (radial * e_col - tangential * e_row) / pixel_mm + c
+                dr = (radial * e_row + tangential * e_col) / pixel_mm + c
+                psfs[j, i] = _deposit(dr, dc, size)
+                if diffraction:
+                    # 실수 MTF는 0 위상이므로 PSF 중심이 그대로 유지됨
+                    full = np.fft.irfft2(np.fft.rfft2(psfs[j, i], s=(pad, pad)) * mtf,
+                                         s=(pad, pad))
+                    psfs[j, i] = np.maximum(full[:size, :size], 0.0)
+        return cls(psfs, u, v)
+
+
+def _grid_positions(n: int) -> np.ndarray:
+    """정규화 격자 위치 (-1..1 등간격, 한 점이면 중심)"""
+    return np.linspace(-1, 1, n) if n > 1 else np.zeros(1)
+
+
+def _deposit(rows: np.ndarray, cols: np.ndarray, size: int) -> np.ndarray:
+    """광선을 화소 격자에 이중 선형 분배 (창 밖 광선은 버림)"""
+    image = np.zeros((size + 1, size + 1))
+    r0, c0 = np.floor(rows).astype(int), np.floor(cols).astype(int)
+    fr, fc = rows - r0, cols - c0
+    keep = (r0 >= 0) & (r0 < size) & (c0 >= 0) & (c0 < size)
+    r0, c0, fr, fc = r0[keep], c0[keep], fr[keep], fc[keep]
+    for dr, dc, weight in ((0, 0, (1 - fr) * (1 - fc)), (0, 1, (1 - fr) * fc),
+                           (1, 0, fr * (1 - fc)), (1, 1, fr * fc)):
+        np.add.at(image, (r0 + dr, c0 + dc), weight)
+    image = image[:size, :size]
+    if image.sum() <= 0:
+        image[size // 2, size // 2] = 1.0
+    return image
+
+
+# ---------------------------------------------------------------------------
+# 검출기
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Detector:
+    """
+    검출기 샘플링과 잡음 모델
+
+    Attributes:
+        oversample: 검출기 화소당 장면 화소 수 (한 방향, 화소 개구 평균)
+        noise_std: 시간 잡음 표준편차 (신호 단위)
+        fpn_std: 고정 패턴(화소별 오프셋) 표준편차 (신호 단위)
+        bits: ADC 비트 수 (0이면 양자화 없음)
+        full_scale: ADC (최저, 최고) 신호 (bits > 0일 때 필요)
+        seed: 고정 패턴 난수 시드
+    """
+    oversample: int = 1
+    noise_std: float = 0.0
+    fpn_std: float = 0.0
+    bits: int = 0
+    full_scale: Optional[Tuple[float, float]] = None
+    seed: Optional[int] = None
+    _fpn: Dict[Tuple[int, int], np.ndarray] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        if self.oversample < 1:
+            raise ValueError(f"oversample must be >= 1, got {self.oversample}")
+        if self.bits and self.full_scale is None:
+            raise ValueError("full_scale is required when bits > 0")
+
+    @classmethod
+    def from_netd(cls, netd_K: float, temperature_K: float = 300.0,
+                  band_um: Tuple[float, float] = (8.0, 14.0), **kwargs) -> 'Detector':
+        """
+        NETD로 시간 잡음을 정한 열상 검출기 (신호 단위 = 밴드 복사휘도)
+
+        Args:
+            netd_K: 잡음 등가 온도차 (K)
+            temperature_K: NETD 기준 장면 온도 (K)
+            band_um: 파장 대역 (μm)
+            **kwargs: 나머지 Detector 속성
+
+        Returns:
+            Detector (noise_std = NETD · dL/dT)
+        """
+        dl_dt = (band_radiance(temperature_K + 0.5, band_um) -
+                 band_radiance(temperature_K - 0.5, band_um))
+        return cls(noise_std=float(netd_K * dl_dt), **kwargs)
+
+    def fixed_pattern(self, shape: Tuple[int, int]) -> np.ndarray:
+        """검출기 크기별 고정 패턴 (처음 한 번 생성 후 재사용)"""
+        if shape not in self._fpn:
+            rng = np.random.default_rng(self.seed)
+            self._fpn[shape] = rng.normal(0.0, self.fpn_std, shape).astype(np.float32)
+        return self._fpn[shape]
+
+    def sample(self, image: np.ndarray,
+               rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        장면 해상도 영상 -> 검출기 출력
+
+        Args:
+            image: (H, W) 흐린 영상 (H, W는 oversample의 배수)
+            rng: 시간 잡음 난수 생성기 (None이면 새로 생성)
+
+        Returns:
+            (H/s, W/s) 신호 (bits > 0이면 uint16 디지털 값)
+        """
+        s = self.oversample
+        h, w = image.shape
+        if h % s or w % s:
+            raise ValueError(f"frame {image.shape} is not a multiple of oversample {s}")
+        out = image.reshape(h // s, s, w // s, s).mean(axis=(1, 3)) if s > 1 else image.copy()
+        if self.fpn_std > 0:
+            out += self.fixed_pattern(out.shape)
+        if self.noise_std > 0:
+            rng = np.random.default_rng() if rng is None else rng
+            out += self.noise_std * rng.standard_normal(out.shape, dtype=np.float32)
+        if self.bits:
+            low, high = self.full_scale
+            levels = 2**self.bits - 1
+            counts = np.rint((out - low) / (high - low) * levels)
+            return np.clip(counts, 0, levels).astype(np.uint16)
+        return out
+
+    def to_signal(self, counts: np.ndarray) -> np.ndarray:
+        """ADC 디지털 값 -> 신호 단위"""
+        if not self.bits:
+            return np.asarray(counts, dtype=np.float64)
+        low, high = self.full_scale
+        return low + np.asarray(counts, dtype=np.float64) / (2**self.bits - 1) * (high - low)
+
+
+# ---------------------------------------------------------------------------
+# 공간 가변 흐림
+# ---------------------------------------------------------------------------
+
+BOUNDARIES = ('zero', 'edge', 'reflect')
+
+
+class ImageSimulator:
+    """
+    시야별 PSF 영상 시뮬레이터 (plan/버퍼 재사용)
+
+    Example:
+        >>> grid = PSFGrid.from_prescription(presc, (512, 640), 0.017)
+        >>> sim = ImageSimulator(grid, (512, 640))
+        >>> frame = sim.simulate(band_radiance(temperature_map), Detector.from_netd(0.05))
+    """
+
+    def __init__(self, psf_grid: PSFGrid, frame_shape: Tuple[int, int], tile: int = 64,
+                 boundary: str = 'edge', normalize: bool = True,
+                 workers: Optional[int] = None):
+        """
+        Args:
+            psf_grid: 시야별 PSF
+            frame_shape: 장면 (행, 열) 수
+            tile: PSF 노드 간격 T (화소), 타일 크기 2T
+            boundary: 장면 밖 값 ('zero', 'edge' = 가장자리 반복, 'reflect')
+            normalize: 균일 장면이 균일하게 유지되도록 화소별 이득 보정
+                (시야별 PSF 차이로 생기는 타일 경계 물결 제거, 총 광량은 근사 보존)
+            workers: scipy.fft 병렬 작업 수
+        """
+        import scipy.fft
+
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"boundary must be one of {BOUNDARIES}, got {boundary!r}")
+        if tile < 1:
+            raise ValueError(f"tile must be positive, got {tile}")
+        self._fft = scipy.fft
+        self.psf_grid = psf_grid
+        self.frame_shape = tuple(int(n) for n in frame_shape)
+        self.tile = T = int(tile)
+        self.boundary = boundary
+        self.workers = workers
+        k = psf_grid.size
+        self.center = c = (k - 1) // 2
+        # 가장자리 처리: PSF 반폭만큼 넓힌 장면을 계산 후 잘라냄
+        self.margin = c
+        H, W = (n + 2 * self.margin for n in self.frame_shape)
+        self.n_nodes = (-(-(H - 1) // T) + 1, -(-(W - 1) // T) + 1)
+        ny, nx = self.n_nodes
+        self.fft_size = P = scipy.fft.next_fast_len(2 * T + k - 1, real=True)
+
+        ramp = 1.0 - np.abs(np.arange(2 * T) - T) / T
+        self._window = np.outer(ramp, ramp).astype(np.float32)
+
+        # 노드 위치 -> 원래 프레임 정규화 좌표 -> PSF 스펙트럼 보간
+        rows = np.arange(ny) * T - self.margin
+        cols = np.arange(nx) * T - self.margin
+        v = _normalized(rows, self.frame_shape[0])
+        u = _normalized(cols, self.frame_shape[1])
+        grid_spectra = scipy.fft.rfft2(psf_grid.psfs.astype(np.float32), s=(P, P),
+                                       axes=(-2, -1), workers=workers)
+        uu, vv = np.meshgrid(u, v)
+        self._spectra = psf_grid._blend(grid_spectra, uu.ravel(), vv.ravel()).reshape(
+            ny, nx, P, P // 2 + 1).astype(np.complex64)
+
+        self._padded = np.zeros(((ny + 1) * T, (nx + 1) * T), dtype=np.float32)
+        self._tiles = np.zeros((nx, P, P), dtype=np.float32)
+        self._out = np.zeros(((ny - 1) * T + P, (nx - 1) * T + P), dtype=np.float32)
+
+        # 평탄 장면 이득: PSF가 노드마다 다르면 창 경계에서 Σ h_k * w_k != 1
+        self._gain = None
+        if normalize:
+            self._gain = 1.0 / self._overlap_add(np.ones((H, W), dtype=np.float32))
+
+    def _overlap_add(self, scene: np.ndarray) -> np.ndarray:
+        """가장자리 확장된 장면의 overlap-add 흐림 (출력 버퍼의 프레임 영역 뷰)"""
+        T, m, c, P = self.tile, self.margin, self.center, self.fft_size
+        ny, nx = self.n_nodes
+        fft, workers = self._fft, self.workers
+        H, W = scene.shape
+        padded, tiles, out = self._padded, self._tiles, self._out
+        padded[T:T + H, T:T + W] = scene
+        out.fill(0.0)
+        for j in range(ny):
+            band = padded[j * T:j * T + 2 * T]
+            for i in range(nx):
+                np.multiply(band[:, i * T:i * T + 2 * T], self._window,
+                            out=tiles[i, :2 * T, :2 * T])
+            spectrum = fft.rfft2(tiles, axes=(-2, -1), workers=workers)
+            spectrum *= self._spectra[j]
+            blurred = fft.irfft2(spectrum, s=(P, P), axes=(-2, -1),
+                                 overwrite_x=True, workers=workers)
+            for i in range(nx):
+                out[j * T:j * T + P, i * T:i * T + P] += blurred[i]
+        return out[T + c + m:T + c + m + self.frame_shape[0],
+                   T + c + m:T + c + m + self.frame_shape[1]]
+
+    def blur(self, scene: np.ndarray) -> np.ndarray:
+        """
+        시야별 PSF 흐림 (overlap-add)
+
+        Args:
+            scene: frame_shape 장면 (복사휘도 등 선형 신호)
+
+        Returns:
+            frame_shape float32 배열
+        """
+        scene = np.asarray(scene)
+        if scene.shape != self.frame_shape:
+            raise ValueError(f"scene shape {scene.shape} != frame {self.frame_shape}")
+        mode = 'constant' if self.boundary == 'zero' else self.boundary
+        blurred = self._overlap_add(np.pad(scene, self.margin, mode=mode))
+        if self._gain is None:
+            return blurred.copy()
+        return blurred * self._gain
+
+    def simulate(self, scene: np.ndarray, detector: Optional[Detector] = None,
+                 rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        흐림 + 검출기 샘플링/잡음
+
+        Args:
+            scene: frame_shape 장면 (선형 신호, 열상은 band_radiance 결과)
+            detector: 검출기 모델 (None이면 흐림만)
+            rng: 시간 잡음 난수 생성기
+
+        Returns:
+            검출기 출력
+        """
+        blurred = self.blur(scene)
+        return blurred if detector is None else detector.sample(blurred, rng)
+
+
+def _normalized(position: np.ndarray, n: int) -> np.ndarray:
+    """화소 위치 -> 정규화 좌표 (-1 = 0, +1 = n-1)"""
+    half = (n - 1) / 2
+    return (position - half) / half if half > 0 else np.zeros(len(position))
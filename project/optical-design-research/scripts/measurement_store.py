@@ -0,0 +1,252 @@
+"""
+Measurement Time-Series Store
+측정 시계열 저장소
+
+This module stores continuous test-stand measurements in an append-only,
+chunked and compressed HDF5 file.
+열/레이저 시험대의 연속 측정 데이터를 추가 전용, 청크 분할, 압축된 HDF5
+파일에 저장합니다.
+
+파일 구조::
+
+    /channels/<채널>/time          float64, 증가 순서 (초 또는 epoch 초)
+    /channels/<채널>/value         float32
+    /channels/<채널>/time_index    각 청크 첫 샘플의 시각 (시간 범위 질의용)
+    /channels/<채널>/pyramid/level_<k>/{time, min, max, mean}
+                                   factor**k 샘플 단위 요약 (확대/축소 플롯용)
+
+추가(append)는 데이터셋 크기만 늘려 새 행을 쓰므로 기존 데이터를 다시 쓰지
+않으며, 시간 범위 질의는 time_index로 해당 청크만 읽습니다.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+PYRAMID_FIELDS = ('time', 'min', 'max', 'mean')
+
+
+class MeasurementStore:
+    """
+    HDF5 기반 측정 시계열 저장소
+
+    Example:
+        with MeasurementStore('burn_in.h5') as store:
+            store.append('tc1', t, temperature)
+            t, v = store.query('tc1', t_start, t_end)
+            summary = store.query_downsampled('tc1', max_points=2000)
+    """
+
+    def __init__(self, filepath: Union[str, Path], mode: str = 'a',
+                 chunk_rows: int = 65536, compression: Optional[str] = 'gzip',
+                 pyramid_factor: int = 64, pyramid_levels: int = 4):
+        """
+        Args:
+            filepath: HDF5 파일 경로
+            mode: h5py 파일 모드 ('a', 'r', 'w')
+            chunk_rows: HDF5 청크 크기 (행) - 새 파일에만 적용
+            compression: 'gzip', 'lzf' 또는 None - 새 파일에만 적용
+            pyramid_factor: 피라미드 단계별 축소 배수 - 새 파일에만 적용
+            pyramid_levels: 피라미드 단계 수 - 새 파일에만 적용
+        """
+        import h5py
+
+        self._file = h5py.File(filepath, mode)
+        attrs = self._file.attrs
+        if 'chunk_rows' not in attrs and mode != 'r':
+            attrs['chunk_rows'] = chunk_rows
+            attrs['compression'] = compression or ''
+            attrs['pyramid_factor'] = pyramid_factor
+            attrs['pyramid_levels'] = pyramid_levels
+        self.chunk_rows = int(attrs.get('chunk_rows', chunk_rows))
+        self.compression = str(attrs.get('compression', compression or '')) or None
+        self.pyramid_factor = int(attrs.get('pyramid_factor', pyramid_factor))
+        self.pyramid_levels = int(attrs.get('pyramid_levels', pyramid_levels))
+
+    def __enter__(self) -> 'MeasurementStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """파일 닫기"""
+        self._file.close()
+
+    def channels(self) -> List[str]:
+        """채널 이름 목록"""
+        return list(self._file['channels']) if 'channels' in self._file else []
+
+    def n_samples(self, channel: str) -> int:
+        """채널의 샘플 수"""
+        return len(self._file[f'channels/{channel}/time'])
+
+    def _dataset(self, group, name: str, dtype, chunk_rows: int):
+        if name in group:
+            return group[name]
+        return group.create_dataset(name, shape=(0,), maxshape=(None,), dtype=dtype,
+                                    chunks=(chunk_rows,), compression=self.compression,
+                                    shuffle=self.compression is not None)
+
+    @staticmethod
+    def _append(ds, values: np.ndarray):
+        n = len(ds)
+        ds.resize((n + len(values),))
+        ds[n:] = values
+
+    def append(self, channel: str, times: np.ndarray, values: np.ndarray):
+        """
+        채널에 샘플 추가 (기존 데이터는 다시 쓰지 않음)
+
+        Args:
+            channel: 채널 이름
+            times: 시각 배열 (증가 순서, 기존 마지막 시각 이상)
+            values: 측정값 배열
+        """
+        times = np.asarray(times, dtype=np.float64).ravel()
+        values = np.asarray(values, dtype=np.float32).ravel()
+        if times.shape != values.shape:
+            raise ValueError(f"times and values lengths differ: {len(times)} vs {len(values)}")
+        if not len(times):
+            return
+        if np.any(np.diff(times) < 0):
+            raise ValueError("times must be non-decreasing")
+
+        group = self._file.require_group(f'channels/{channel}')
+        t_ds = self._dataset(group, 'time', np.float64, self.chunk_rows)
+        v_ds = self._dataset(group, 'value', np.float32, self.chunk_rows)
+        index = self._dataset(group, 'time_index', np.float64, 1024)
+        n = len(t_ds)
+        if n and times[0] < t_ds[n - 1]:
+            raise ValueError(f"times must start at or after the last stored time {t_ds[n - 1]}")
+
+        self._append(t_ds, times)
+        self._append(v_ds, values)
+
+        # 새로 시작된 청크의 첫 시각 기록
+        first_new_chunk = -(-n // self.chunk_rows)
+        starts = np.arange(first_new_chunk * self.chunk_rows, n + len(times), self.chunk_rows)
+        if len(starts):
+            self._append(index, times[starts - n])
+
+        self._update_pyramid(group)
+
+    def append_frame(self, frame, time_column: Optional[str] = None):
+        """
+        DataFrame의 각 열을 채널로 추가
+
+        Args:
+            frame: pandas.DataFrame (시각 열 또는 DatetimeIndex/숫자 인덱스)
+            time_column: 시각 열 이름 (None이면 인덱스 사용)
+        """
+        times = frame[time_column] if time_column is not None else frame.index
+        times = np.asarray(times)
+        if times.dtype.kind == 'M':
+            times = times.astype('datetime64[ns]').astype(np.int64) / 1e9
+        for col in frame.columns:
+            if col != time_column:
+                self.append(str(col), times, frame[col].to_numpy())
+
+    def _update_pyramid(self, group):
+        """완성된 블록만 요약하여 피라미드 단계에 추가"""
+        f = self.pyramid_factor
+        pyramid = group.require_group('pyramid')
+        source = None
+        for level in range(1, self.pyramid_levels + 1):
+            lg = pyramid.require_group(f'level_{level}')
+            ds = {name: self._dataset(lg, name, np.float64 if name == 'time' else np.float32,
+                                      4096) for name in PYRAMID_FIELDS}
+            done = len(ds['time'])
+            if level == 1:
+                n_src = len(group['time'])
+            else:
+                n_src = len(source['time'])
+            n_blocks = n_src // f - done
+            if n_blocks <= 0:
+                break
+            sl = slice(done * f, (done + n_blocks) * f)
+            if level == 1:
+                t = group['time'][sl].reshape(n_blocks, f)
+                v = group['value'][sl].reshape(n_blocks, f).astype(np.float64)
+                block = {'time': t[:, 0], 'min': v.min(axis=1), 'max': v.max(axis=1),
+                         'mean': v.mean(axis=1)}
+            else:
+                prev = {name: source[name][sl].reshape(n_blocks, f) for name in PYRAMID_FIELDS}
+                block = {'time': prev['time'][:, 0], 'min': prev['min'].min(axis=1),
+                         'max': prev['max'].max(axis=1),
+                         'mean': prev['mean'].astype(np.float64).mean(axis=1)}
+            for name in PYRAMID_FIELDS:
+                self._append(ds[name], block[name])
+            source = ds
+
+    def _row_range(self, channel: str, t_start: Optional[float],
+                   t_end: Optional[float]) -> Tuple[int, int]:
+        """time_index로 후보 청크를 찾고 그 청크의 시각만 읽어 행 범위 결정"""
+        group = self._file[f'channels/{channel}']
+        t_ds = group['time']
+        n = len(t_ds)
+        index = group['time_index'][()]
+        lo, hi = 0, n
+        if t_start is not None:
+            c = max(np.searchsorted(index, t_start, side='left') - 1, 0)
+            base = c * self.chunk_rows
+            window = t_ds[base:min(base + 2 * self.chunk_rows, n)]
+            lo = base + int(np.searchsorted(window, t_start, side='left'))
+        if t_end is not None:
+            c = max(np.searchsorted(index, t_end, side='right') - 1, 0)
+            base = c * self.chunk_rows
+            window = t_ds[base:min(base + self.chunk_rows, n)]
+            hi = base + int(np.searchsorted(window, t_end, side='right'))
+        return lo, max(lo, hi)
+
+    def query(self, channel: str, t_start: Optional[float] = None,
+              t_end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        시간 범위 질의 (해당 청크만 읽음)
+
+        Args:
+            channel: 채널 이름
+            t_start: 시작 시각 (포함, None이면 처음부터)
+            t_end: 끝 시각 (포함, None이면 끝까지)
+
+        Returns:
+            (시각, 값) 배열
+        """
+        lo, hi = self._row_range(channel, t_start, t_end)
+        group = self._file[f'channels/{channel}']
+        return group['time'][lo:hi], group['value'][lo:hi]
+
+    def query_downsampled(self, channel: str, t_start: Optional[float] = None,
+                          t_end: Optional[float] = None,
+                          max_points: int = 2000) -> Dict[str, np.ndarray]:
+        """
+        플롯용 요약 질의 - 구간 내 점 수가 max_points 이하인 가장 세밀한 단계 사용
+
+        Args:
+            channel: 채널 이름
+            t_start: 시작 시각
+            t_end: 끝 시각
+            max_points: 최대 반환 점 수
+
+        Returns:
+            {'time', 'min', 'max', 'mean', 'level'} (level 0은 원시 데이터)
+        """
+        lo, hi = self._row_range(channel, t_start, t_end)
+        if hi - lo <= max_points:
+            t, v = self.query(channel, t_start, t_end)
+            return {'time': t, 'min': v, 'max': v, 'mean': v, 'level': 0}
+
+        pyramid = self._file[f'channels/{channel}/pyramid']
+        f = self.pyramid_factor
+        level = 1
+        while (level < self.pyramid_levels and (hi - lo) // f**level > max_points
+               and len(pyramid[f'level_{level + 1}/time']) > 0):
+            level += 1
+        lg = pyramid[f'level_{level}']
+        a = lo // f**level
+        b = -(-hi // f**level)
+        result = {name: lg[name][a:b] for name in PYRAMID_FIELDS}
+        result['level'] = level
+        return result
@@ -0,0 +1,127 @@
+"""
+Measurement Uncertainty Module
+측정 불확도 모듈
+
+This module computes confidence intervals for many measurement channels at
+once, with t-based and bootstrap methods.
+여러 측정 채널(열)의 신뢰구간을 t-분포 방법과 부트스트랩 방법으로 한 번에
+계산합니다.
+
+부트스트랩은 재표본 묶음(task) 단위로 난수 시드를 SeedSequence.spawn으로
+나누므로, 워커 수와 관계없이 같은 seed면 같은 결과를 얻습니다.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# 부트스트랩 task 하나가 처리하는 재표본 수 (결과 재현성의 단위)
+BOOTSTRAP_TASK_SIZE = 250
+
+
+@lru_cache(maxsize=4096)
+def t_quantile(n: int, confidence: float = 0.95) -> float:
+    """
+    양측 t-분포 분위수 (표본 수, 신뢰수준별 캐시)
+
+    Args:
+        n: 표본 수 (자유도 n-1)
+        confidence: 신뢰 수준
+
+    Returns:
+        t 값
+    """
+    from scipy import stats
+
+    return float(stats.t.ppf((1 + confidence) / 2, n - 1))
+
+
+def batch_uncertainty(data: np.ndarray, confidence: float = 0.95,
+                      axis: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    열별 평균과 t-분포 기반 불확도 (한 번의 벡터화 호출)
+
+    NaN은 결측으로 보고 제외하므로 채널마다 표본 수가 달라도 됩니다.
+
+    Args:
+        data: (n,) 또는 (n, channels) 측정 데이터
+        confidence: 신뢰 수준
+        axis: 표본 축
+
+    Returns:
+        (평균, 불확도) - 채널별 배열 (1D 입력이면 스칼라)
+    """
+    data = np.asarray(data, dtype=np.float64)
+    valid = ~np.isnan(data)
+    n = valid.sum(axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nansum(data, axis=axis) / n
+        dev = np.where(valid, data - np.expand_dims(mean, axis), 0.0)
+        std = np.sqrt(np.sum(dev * dev, axis=axis) / (n - 1))
+
+    n_flat = np.atleast_1d(n)
+    t_values = np.full(n_flat.shape, np.nan)
+    for size in np.unique(n_flat):
+        if size >= 2:
+            t_values[n_flat == size] = t_quantile(int(size), confidence)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        uncertainty = t_values.reshape(np.shape(n)) * std / np.sqrt(n)
+    if np.ndim(mean) == 0:
+        return float(mean), float(uncertainty)
+    return mean, uncertainty
+
+
+def _bootstrap_task(data: np.ndarray, n_resamples: int,
+                    seed: np.random.SeedSequence) -> np.ndarray:
+    """재표본 평균 (n_resamples, channels)"""
+    rng = np.random.default_rng(seed)
+    n = data.shape[0]
+    means = np.empty((n_resamples, data.shape[1]))
+    for i in range(n_resamples):
+        means[i] = np.nanmean(data[rng.integers(0, n, n)], axis=0)
+    return means
+
+
+def bootstrap_uncertainty(data: np.ndarray, confidence: float = 0.95,
+                          n_resamples: int = 2000,
+                          seed: Optional[int] = None,
+                          n_workers: Optional[int] = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    부트스트랩 백분위 신뢰구간 (열별)
+
+    Args:
+        data: (n,) 또는 (n, channels) 측정 데이터
+        confidence: 신뢰 수준
+        n_resamples: 재표본 수
+        seed: 난수 시드 (같은 시드면 워커 수와 무관하게 같은 결과)
+        n_workers: 프로세스 수 (1이면 현재 프로세스, None이면 CPU 수)
+
+    Returns:
+        (평균, 하한, 상한) - 채널별 배열 (1D 입력이면 스칼라)
+    """
+    data = np.asarray(data, dtype=np.float64)
+    single = data.ndim == 1
+    if single:
+        data = data[:, None]
+
+    sizes = [BOOTSTRAP_TASK_SIZE] * (n_resamples // BOOTSTRAP_TASK_SIZE)
+    if n_resamples % BOOTSTRAP_TASK_SIZE:
+        sizes.append(n_resamples % BOOTSTRAP_TASK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if n_workers == 1 or len(sizes) == 1:
+        parts = [_bootstrap_task(data, size, s) for size, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(_bootstrap_task, [data] * len(sizes), sizes, seeds))
+    means = np.concatenate(parts)
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.quantile(means, [alpha, 1 - alpha], axis=0)
+    mean = np.nanmean(data, axis=0)
+    if single:
+        return float(mean[0]), float(lower[0]), float(upper[0])
+    return mean, lower, upper
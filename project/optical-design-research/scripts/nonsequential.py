@@ -0,0 +1,956 @@
+"""
+Non-Sequential Monte Carlo Ray Tracing
+비순차 몬테카를로 광선 추적
+
+This module traces ray batches through a scene of optical and mechanical
+faces (lens surfaces, windows, baffles, housings, detectors) in any order,
+splitting rays at Fresnel and scattering interfaces and terminating weak
+rays by Russian roulette, for stray-light and ghost analysis.
+광학/기구 면(렌즈면, 창, 배플, 하우징, 검출기)으로 이루어진 장면에서 광선
+묶음을 순서 제약 없이 추적합니다. 프레넬/산란 경계에서 광선을 분할하고
+약한 광선은 러시안 룰렛으로 종료하여 미광과 고스트를 해석합니다.
+
+구성::
+
+    Face         국소 좌표(z축 대칭)의 면 하나 + 전역 위치/기울기 + 표면 처리
+    Scene        면 목록과 축 정렬 경계 상자(AABB) BVH
+    *Source      광원 (광선 위치/방향 생성)
+    DetectorMap  검출기 조도 누적기 (직접/고스트/산란, merge로 합산)
+    NonSequentialTracer  청크 단위 추적, 프로세스 풀 병렬화
+
+면의 법선은 국소 +z(원통은 바깥) 쪽이고, before/after는 법선 반대쪽/쪽
+매질입니다. 표면 처리(coating)별 분기 가중치 (s = scatter, ρ = reflectance):
+
+    'fresnel'   투과 (1-s)(1-R), 정반사 (1-s)R, 산란 s (R: 비편광 프레넬,
+                전반사면 R = 1)
+    'mirror'    정반사 ρ(1-s), 산란 ρs
+    'absorb'    정반사 ρ, 산란 s (나머지 흡수, 배플/하우징 흑색 처리)
+    'detector'  기록 후 흡수
+
+산란은 입사 쪽 반구로의 램버트 분포입니다. split=True이면 가중치가 있는
+분기마다 자식 광선을 만들고, False이면 분기 하나를 확률적으로 고릅니다.
+가중치가 min_weight 미만인 광선은 w / min_weight 확률로 살아남아 가중치
+min_weight가 되므로(러시안 룰렛) 에너지는 기댓값으로 보존됩니다.
+
+광선 묶음은 BVH 노드마다 경계 상자 슬랩 검사를 벡터화해 통과시키고,
+잎 노드에서 면별 교점을 한 번에 계산합니다.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .glass_catalog import MIRROR, canonical_name, refractive_index
+from .prescription import Prescription
+
+
+COATINGS = ('fresnel', 'mirror', 'absorb', 'detector')
+
+# 자기 교차를 피하는 최소 진행 거리 (mm)
+T_MIN = 1e-6
+
+# BVH 잎 노드의 최대 면 수
+LEAF_SIZE = 2
+
+
+def _rotation_x(tilt_deg: float) -> np.ndarray:
+    """x축 회전 행렬 (열 = 전역 좌표의 국소 축)"""
+    c, s = np.cos(np.radians(tilt_deg)), np.sin(np.radians(tilt_deg))
+    return np.array([[1.0, 0.0, 0.0], [0.0, c, -s], [0.0, s, c]])
+
+
+def _smallest_root(a, b, cc, accept) -> Tuple[np.ndarray, np.ndarray]:
+    """a t^2 + 2 b t + cc = 0의 양의 근 중 accept(t)를 만족하는 작은 근"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        disc = b * b - a * cc
+        ok = disc >= 0
+        q = -(b + np.copysign(np.sqrt(np.where(ok, disc, 0.0)), b))
+        linear = np.abs(a) < 1e-300
+        t1 = np.where(linear, -cc / (2 * b), q / a)
+        t2 = np.where(linear, np.inf, cc / q)
+        t_lo, t_hi = np.fmin(t1, t2), np.fmax(t1, t2)
+        ok_lo = ok & (t_lo > T_MIN) & accept(t_lo)
+        ok_hi = ok & (t_hi > T_MIN) & accept(t_hi)
+    t = np.where(ok_lo, t_lo, t_hi)
+    return t, ok_lo | ok_hi
+
+
+class Face:
+    """
+    비순차 장면의 면 (기본 클래스)
+
+    하위 클래스는 국소 좌표의 _intersect, _normal, _local_bounds를
+    구현합니다. 국소 좌표는 전역 origin에서 시작하고 x축으로 tilt만큼
+    기울어집니다.
+    """
+
+    def __init__(self, origin: Sequence[float] = (0.0, 0.0, 0.0), tilt: float = 0.0,
+                 before: str = '', after: str = '', coating: str = 'fresnel',
+                 reflectance: float = 0.0, scatter: float = 0.0, name: str = ''):
+        """
+        Args:
+            origin: 국소 원점 (전역 mm)
+            tilt: x축 기울기 (deg)
+            before: 법선 반대쪽 매질 (glass_catalog 이름, '' = 공기)
+            after: 법선 쪽 매질
+            coating: 표면 처리 (COATINGS)
+            reflectance: 'mirror'/'absorb' 정반사율
+            scatter: 램버트 산란 비율 (TIS)
+            name: 면 이름
+        """
+        if coating not in COATINGS:
+            raise ValueError(f"coating must be one of {COATINGS}, got {coating!r}")
+        if not (0.0 <= reflectance <= 1.0 and 0.0 <= scatter <= 1.0):
+            raise ValueError("reflectance and scatter must be in [0, 1]")
+        if coating == 'absorb' and reflectance + scatter > 1.0:
+            raise ValueError("absorb: reflectance + scatter must be <= 1")
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.rotation = _rotation_x(tilt)
+        self.before = before
+        self.after = after
+        self.coating = coating
+        self.reflectance = float(reflectance)
+        self.scatter = float(scatter)
+        self.name = name
+
+    def to_local(self, p: np.ndarray, d: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """전역 위치/방향 -> 국소 좌표"""
+        return (p - self.origin) @ self.rotation, d @ self.rotation
+
+    def intersect(self, p: np.ndarray, d: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        전역 광선과의 가장 가까운 교점
+
+        Args:
+            p, d: (n, 3) 전역 위치, 방향
+
+        Returns:
+            (t, 유효 마스크)
+        """
+        return self._intersect(*self.to_local(p, d))
+
+    def normal(self, p: np.ndarray) -> np.ndarray:
+        """면 위 전역 위치의 전역 단위 법선"""
+        local = (p - self.origin) @ self.rotation
+        return self._normal(local) @ self.rotation.T
+
+    def bounds(self) -> np.ndarray:
+        """전역 AABB (2, 3)"""
+        lo, hi = self._local_bounds()
+        corners = np.array([[x, y, z] for x in (lo[0], hi[0]) for y in (lo[1], hi[1])
+                            for z in (lo[2], hi[2])])
+        world = corners @ self.rotation.T + self.origin
+        return np.array([world.min(axis=0) - 1e-6, world.max(axis=0) + 1e-6])
+
+    def _intersect(self, p, d):
+        raise NotImplementedError
+
+    def _normal(self, p):
+        raise NotImplementedError
+
+    def _local_bounds(self):
+        raise NotImplementedError
+
+
+class DiskFace(Face):
+    """국소 z = 0 평면의 원판/고리 (창, 배플)"""
+
+    def __init__(self, radius: float, inner_radius: float = 0.0, **kwargs):
+        """
+        Args:
+            radius: 바깥 반지름 (mm)
+            inner_radius: 안쪽 반지름 (mm, 고리 배플)
+            **kwargs: Face 인자
+        """
+        super().__init__(**kwargs)
+        self.radius = float(radius)
+        self.inner_radius = float(inner_radius)
+
+    def _intersect(self, p, d):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = -p[:, 2] / d[:, 2]
+        r2 = (p[:, 0] + t * d[:, 0])**2 + (p[:, 1] + t * d[:, 1])**2
+        ok = (t > T_MIN) & (r2 <= self.radius**2) & (r2 >= self.inner_radius**2)
+        return np.where(ok, t, np.inf), ok
+
+    def _normal(self, p):
+        return np.broadcast_to([0.0, 0.0, 1.0], p.shape)
+
+    def _local_bounds(self):
+        r = self.radius
+        return (-r, -r, 0.0), (r, r, 0.0)
+
+
+class RectFace(Face):
+    """국소 z = 0 평면의 직사각형 (검출기)"""
+
+    def __init__(self, half_width: float, half_height: Optional[float] = None, **kwargs):
+        """
+        Args:
+            half_width: x 반폭 (mm)
+            half_height: y 반폭 (mm, None이면 half_width)
+            **kwargs: Face 인자
+        """
+        super().__init__(**kwargs)
+        self.half_width = float(half_width)
+        self.half_height = float(half_width if half_height is None else half_height)
+
+    def _intersect(self, p, d):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = -p[:, 2] / d[:, 2]
+        ok = ((t > T_MIN) & (np.abs(p[:, 0] + t * d[:, 0]) <= self.half_width)
+              & (np.abs(p[:, 1] + t * d[:, 1]) <= self.half_height))
+        return np.where(ok, t, np.inf), ok
+
+    def _normal(self, p):
+        return np.broadcast_to([0.0, 0.0, 1.0], p.shape)
+
+    def _local_bounds(self):
+        return (-self.half_width, -self.half_height, 0.0), (self.half_width, self.half_height, 0.0)
+
+
+class ConicFace(Face):
+    """꼭짓점이 국소 원점인 코닉 면 (렌즈면), 꼭짓점 쪽 가지만 사용"""
+
+    def __init__(self, curvature: float, semi_diameter: float, conic: float = 0.0,
+                 **kwargs):
+        """
+        Args:
+            curvature: 곡률 (1/mm)
+            semi_diameter: 반구경 (mm)
+            conic: 코닉 상수
+            **kwargs: Face 인자
+        """
+        super().__init__(**kwargs)
+        self.curvature = float(curvature)
+        self.semi_diameter = float(semi_diameter)
+        self.conic = float(conic)
+
+    def sag(self, r: np.ndarray) -> np.ndarray:
+        """반경 r에서의 새그 (mm)"""
+        c, k = self.curvature, self.conic
+        r2 = np.asarray(r, dtype=np.float64)**2
+        return c * r2 / (1 + np.sqrt(np.maximum(1 - (1 + k) * c * c * r2, 0.0)))
+
+    def _intersect(self, p, d):
+        c, kz = self.curvature, 1.0 + self.conic
+        a = c * (d[:, 0]**2 + d[:, 1]**2 + kz * d[:, 2]**2)
+        b = c * (p[:, 0] * d[:, 0] + p[:, 1] * d[:, 1] + kz * p[:, 2] * d[:, 2]) - d[:, 2]
+        cc = c * (p[:, 0]**2 + p[:, 1]**2 + kz * p[:, 2]**2) - 2 * p[:, 2]
+        sd2 = self.semi_diameter**2
+
+        def accept(t):
+            x, y, z = (p + t[:, None] * d).T
+            return (x * x + y * y <= sd2) & (c * kz * z < 1.0)
+
+        t, ok = _smallest_root(a, b, cc, accept)
+        return np.where(ok, t, np.inf), ok
+
+    def _normal(self, p):
+        c, k = self.curvature, self.conic
+        normal = np.stack([-c * p[:, 0], -c * p[:, 1], 1.0 - c * (1.0 + k) * p[:, 2]], axis=1)
+        return normal / np.linalg.norm(normal, axis=1, keepdims=True)
+
+    def _local_bounds(self):
+        sd = self.semi_diameter
+        z = float(self.sag(sd))
+        return (-sd, -sd, min(0.0, z)), (sd, sd, max(0.0, z))
+
+
+class CylinderFace(Face):
+    """국소 z축 원통 0 <= z <= length (렌즈 테두리, 하우징), 법선은 바깥쪽"""
+
+    def __init__(self, radius: float, length: float, **kwargs):
+        """
+        Args:
+            radius: 반지름 (mm)
+            length: 길이 (mm)
+            **kwargs: Face 인자 (before = 안쪽, after = 바깥쪽 매질)
+        """
+        super().__init__(**kwargs)
+        self.radius = float(radius)
+        self.length = float(length)
+
+    def _intersect(self, p, d):
+        a = d[:, 0]**2 + d[:, 1]**2
+        b = p[:, 0] * d[:, 0] + p[:, 1] * d[:, 1]
+        cc = p[:, 0]**2 + p[:, 1]**2 - self.radius**2
+
+        def accept(t):
+            z = p[:, 2] + t * d[:, 2]
+            return (z >= 0.0) & (z <= self.length)
+
+        t, ok = _smallest_root(a, b, cc, accept)
+        return np.where(ok, t, np.inf), ok
+
+    def _normal(self, p):
+        normal = np.stack([p[:, 0], p[:, 1], np.zeros(len(p))], axis=1)
+        return normal / np.linalg.norm(normal, axis=1, keepdims=True)
+
+    def _local_bounds(self):
+        r = self.radius
+        return (-r, -r, 0.0), (r, r, self.length)
+
+
+@dataclass
+class DetectorMap:
+    """
+    검출기 조도 누적기
+
+    flux는 검출기에 도달한 전체 광속, ghost는 정반사를 한 번 이상 거치고
+    산란은 없는 광선, scatter는 산란을 한 번 이상 거친 광선입니다.
+    직접광은 flux - ghost - scatter.
+
+    Attributes:
+        name: 검출기 이름
+        half_width, half_height: 검출기 반폭 (mm)
+        flux, ghost, scatter: (pixels, pixels) 픽셀별 광속 (행 = y, 열 = x)
+        hits: 도달 광선 수
+    """
+    name: str
+    half_width: float
+    half_height: float
+    flux: np.ndarray
+    ghost: np.ndarray
+    scatter: np.ndarray
+    hits: int = 0
+
+    @classmethod
+    def empty(cls, name: str, half_width: float, half_height: float,
+              pixels: int) -> 'DetectorMap':
+        """빈 누적기"""
+        shape = (pixels, pixels)
+        return cls(name, half_width, half_height, np.zeros(shape), np.zeros(shape),
+                   np.zeros(shape))
+
+    @property
+    def direct(self) -> np.ndarray:
+        """직접광 (반사/산란 없이 도달)"""
+        return self.flux - self.ghost - self.scatter
+
+    def total(self) -> Dict[str, float]:
+        """성분별 전체 광속"""
+        return {'flux': float(self.flux.sum()), 'direct': float(self.direct.sum()),
+                'ghost': float(self.ghost.sum()), 'scatter': float(self.scatter.sum())}
+
+    def record(self, x: np.ndarray, y: np.ndarray, weight: np.ndarray,
+               n_reflections: np.ndarray, n_scatters: np.ndarray):
+        """검출기 국소 좌표의 도달 광선 누적"""
+        pixels = self.flux.shape[0]
+        ix = np.clip(((x + self.half_width) / (2 * self.half_width) * pixels).astype(int),
+                     0, pixels - 1)
+        iy = np.clip(((y + self.half_height) / (2 * self.half_height) * pixels).astype(int),
+                     0, pixels - 1)
+        flat = iy * pixels + ix
+        size = pixels * pixels
+        scattered = n_scatters > 0
+        ghost = (n_reflections > 0) & ~scattered
+        self.flux += np.bincount(flat, weight, size).reshape(pixels, pixels)
+        self.ghost += np.bincount(flat[ghost], weight[ghost], size).reshape(pixels, pixels)
+        self.scatter += np.bincount(flat[scattered], weight[scattered],
+                                    size).reshape(pixels, pixels)
+        self.hits += len(weight)
+
+    def merge(self, other: 'DetectorMap') -> 'DetectorMap':
+        """같은 검출기의 다른 누적기를 더함 (self 반환)"""
+        if other.flux.shape != self.flux.shape or other.name != self.name:
+            raise ValueError(f"cannot merge detector {other.name!r} into {self.name!r}")
+        self.flux += other.flux
+        self.ghost += other.ghost
+        self.scatter += other.scatter
+        self.hits += other.hits
+        return self
+
+
+class Scene:
+    """
+    비순차 장면 (면 목록 + BVH)
+
+    BVH는 면 AABB 중심의 가장 긴 축 중앙값으로 나눈 이진 트리이고, 첫
+    교점 계산 때 만들어 면을 추가할 때까지 재사용합니다.
+    """
+
+    def __init__(self):
+        self.faces: List[Face] = []
+        self.detectors: Dict[str, Tuple[int, int]] = {}
+        self._bvh = None
+
+    def add(self, face: Face) -> int:
+        """
+        면 추가
+
+        Returns:
+            면 번호
+        """
+        self.faces.append(face)
+        self._bvh = None
+        return len(self.faces) - 1
+
+    def add_lens(self, z: float, thickness: float, radius1: float, radius2: float,
+                 semi_diameter: float, glass: str, edge_scatter: float = 0.5,
+                 conic1: float = 0.0, conic2: float = 0.0, name: str = 'lens'):
+        """
+        단렌즈 (앞/뒷면 + 간 유리 테두리)
+
+        Args:
+            z: 앞면 꼭짓점 위치 (mm)
+            thickness: 중심 두께 (mm)
+            radius1, radius2: 곡률 반경 (mm, inf = 평면)
+            semi_diameter: 반구경 (mm)
+            glass: 재질
+            edge_scatter: 테두리 산란 비율 (나머지는 프레넬)
+            conic1, conic2: 코닉 상수
+            name: 면 이름 접두사
+        """
+        front = ConicFace(1.0 / radius1 if np.isfinite(radius1) else 0.0, semi_diameter,
+                          conic1, origin=(0, 0, z), after=glass, name=f'{name}.front')
+        back = ConicFace(1.0 / radius2 if np.isfinite(radius2) else 0.0, semi_diameter,
+                         conic2, origin=(0, 0, z + thickness), before=glass,
+                         name=f'{name}.back')
+        z0, z1 = z + float(front.sag(semi_diameter)), z + thickness + float(back.sag(semi_diameter))
+        if z1 <= z0:
+            raise ValueError(f"{name}: surfaces intersect inside the semi-diameter")
+        self.add(front)
+        self.add(back)
+        self.add(CylinderFace(semi_diameter, z1 - z0, origin=(0, 0, z0), before=glass,
+                              scatter=edge_scatter, name=f'{name}.edge'))
+
+    def add_window(self, z: float, thickness: float, radius: float, glass: str,
+                   tilt: float = 0.0, name: str = 'window'):
+        """
+        평행 평판 창 (x축 기울기 가능, 테두리는 흡수)
+
+        Args:
+            z: 앞면 중심 위치 (mm)
+            thickness: 두께 (mm)
+            radius: 반지름 (mm)
+            glass: 재질
+            tilt: x축 기울기 (deg)
+            name: 면 이름 접두사
+        """
+        rotation = _rotation_x(tilt)
+        back_origin = np.array([0.0, 0.0, z]) + thickness * rotation[:, 2]
+        self.add(DiskFace(radius, origin=(0, 0, z), tilt=tilt, after=glass,
+                          name=f'{name}.front'))
+        self.add(DiskFace(radius, origin=back_origin, tilt=tilt, before=glass,
+                          name=f'{name}.back'))
+        self.add(CylinderFace(radius, thickness, origin=(0, 0, z), tilt=tilt, before=glass,
+                              coating='absorb', name=f'{name}.edge'))
+
+    def add_baffle(self, z: float, inner_radius: float, outer_radius: float,
+                   reflectance: float = 0.02, scatter: float = 0.03, name: str = 'baffle'):
+        """
+        고리 배플 (흑색 처리)
+
+        Args:
+            z: 위치 (mm)
+            inner_radius, outer_radius: 구멍/바깥 반지름 (mm)
+            reflectance: 정반사율
+            scatter: 램버트 산란 비율
+            name: 면 이름
+        """
+        self.add(DiskFace(outer_radius, inner_radius, origin=(0, 0, z), coating='absorb',
+                          reflectance=reflectance, scatter=scatter, name=name))
+
+    def add_tube(self, z: float, length: float, radius: float, reflectance: float = 0.02,
+                 scatter: float = 0.05, name: str = 'housing'):
+        """
+        원통 하우징 내벽 (흑색 처리)
+
+        Args:
+            z: 시작 위치 (mm)
+            length: 길이 (mm)
+            radius: 반지름 (mm)
+            reflectance: 정반사율
+            scatter: 램버트 산란 비율
+            name: 면 이름
+        """
+        self.add(CylinderFace(radius, length, origin=(0, 0, z), coating='absorb',
+                              reflectance=reflectance, scatter=scatter, name=name))
+
+    def add_detector(self, z: float, half_width: float, pixels: int = 64,
+                     half_height: Optional[float] = None, name: str = 'detector'):
+        """
+        정사각 픽셀 검출기 (양쪽에서 도달한 광선을 기록 후 흡수)
+
+        Args:
+            z: 위치 (mm)
+            half_width: x 반폭 (mm)
+            pixels: 한 변 픽셀 수
+            half_height: y 반폭 (mm, None이면 half_width)
+            name: 검출기 이름
+        """
+        if name in self.detectors:
+            raise ValueError(f"duplicate detector name {name!r}")
+        index = self.add(RectFace(half_width, half_height, origin=(0, 0, z),
+                                  coating='detector', name=name))
+        self.detectors[name] = (index, pixels)
+
+    @classmethod
+    def from_prescription(cls, presc: Prescription, detector_pixels: int = 64,
+                          margin: float = 1.05) -> 'Scene':
+        """
+        순차 처방의 면들로 장면 생성 (상면에 검출기)
+
+        반구경이 0인 면은 모든 시야의 순차 추적 광선 높이 최댓값에
+        margin을 곱해 정합니다. 물체면은 장면에 넣지 않습니다.
+
+        Args:
+            presc: 렌즈 처방 (STANDARD 면만)
+            detector_pixels: 검출기 픽셀 수
+            margin: 자동 반구경 여유 배수
+
+        Returns:
+            Scene (검출기 이름 'image')
+        """
+        from . import raytrace
+
+        for i in range(1, presc.image_surface):
+            if presc.surface_type[i] != 'STANDARD':
+                raise ValueError(f"surface {i}: non-sequential scene supports only "
+                                 f"STANDARD surfaces, got {presc.surface_type[i]!r}")
+        heights = np.zeros(presc.n_surfaces)
+        wavelength = float(presc.wavelengths[0])
+        paraxial = raytrace.paraxial_data(presc, wavelength)
+        px, py = raytrace.pupil_grid(6)
+        for field_deg in presc.fields:
+            bundle = raytrace.launch_rays(presc, field_deg, wavelength, px, py, paraxial)
+            for i in range(1, presc.n_surfaces):
+                bundle = raytrace.trace(presc, bundle, wavelength, last=i)
+                r = np.hypot(bundle.position[bundle.valid, 0], bundle.position[bundle.valid, 1])
+                if len(r):
+                    heights[i] = max(heights[i], r.max())
+
+        scene = cls()
+        z = presc.vertex_z()
+        medium = ''
+        for i in range(1, presc.image_surface):
+            sd = presc.semi_diameter[i] or margin * heights[i]
+            glass = presc.glass[i]
+            mirror = canonical_name(glass) == MIRROR
+            after = medium if mirror else glass
+            scene.add(ConicFace(presc.curvature[i], sd, presc.conic[i], origin=(0, 0, z[i]),
+                                before=medium, after=after,
+                                coating='mirror' if mirror else 'fresnel',
+                                reflectance=1.0 if mirror else 0.0, name=f'surface {i}'))
+            medium = after
+        # 검출기는 상 높이와 마지막 렌즈면 반구경 중 큰 쪽 (미광이 상 밖에도 닿음)
+        half = presc.semi_diameter[presc.image_surface] or max(
+            margin * heights[presc.image_surface], sd)
+        scene.add_detector(z[presc.image_surface], half, detector_pixels, name='image')
+        return scene
+
+    # -- BVH ---------------------------------------------------------------
+
+    def _build(self):
+        """BVH 노드 배열 (lo, hi, (left, right, start, count, 분할 축))과 잎 면 순서"""
+        boxes = np.array([face.bounds() for face in self.faces])
+        order = list(range(len(self.faces)))
+        nodes = []
+
+        def build(items):
+            lo = boxes[items, 0].min(axis=0)
+            hi = boxes[items, 1].max(axis=0)
+            k = len(nodes)
+            nodes.append([lo, hi, -1, -1, 0, 0, 0])
+            if len(items) <= LEAF_SIZE:
+                nodes[k][4:6] = [len(leaf_faces), len(items)]
+                leaf_faces.extend(items)
+                return k
+            centers = boxes[items].mean(axis=1)
+            axis = int(np.argmax(centers.max(axis=0) - centers.min(axis=0)))
+            nodes[k][6] = axis
+            items = [items[j] for j in np.argsort(centers[:, axis], kind='stable')]
+            half = len(items) // 2
+            nodes[k][2] = build(items[:half])
+            nodes[k][3] = build(items[half:])
+            return k
+
+        leaf_faces: List[int] = []
+        build(order)
+        self._bvh = (np.array([n[0] for n in nodes]), np.array([n[1] for n in nodes]),
+                     np.array([n[2:] for n in nodes], dtype=np.int64),
+                     np.array(leaf_faces, dtype=np.int64))
+
+    def intersect(self, p: np.ndarray, d: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        광선 묶음의 첫 교점 (BVH, 노드별 벡터화)
+
+        Args:
+            p, d: (n, 3) 전역 위치, 단위 방향
+
+        Returns:
+            (t, 면 번호) - 교점이 없으면 (inf, -1)
+        """
+        if self._bvh is None:
+            if not self.faces:
+                raise ValueError("scene has no faces")
+            self._build()
+        lo, hi, links, leaf_faces = self._bvh
+        n = len(p)
+        best_t = np.full(n, np.inf)
+        best_face = np.full(n, -1, dtype=np.int64)
+        with np.errstate(divide='ignore'):
+            inv = 1.0 / d
+
+        # 노드마다 통과한 광선의 열(위치, 역방향, 번호)만 압축해서 넘김
+        stack = [(0, (*p.T, *inv.T, np.arange(n)))]
+        while stack:
+            node, columns = stack.pop()
+            idx = columns[6]
+            t_near, t_far = -np.inf, np.inf
+            with np.errstate(invalid='ignore'):
+                for axis in range(3):
+                    t1 = (lo[node, axis] - columns[axis]) * columns[3 + axis]
+                    t2 = (hi[node, axis] - columns[axis]) * columns[3 + axis]
+                    t_near = np.maximum(t_near, np.fmin(t1, t2))
+                    t_far = np.minimum(t_far, np.fmax(t1, t2))
+            hit = (t_far >= np.maximum(t_near, 0.0)) & (t_near < best_t[idx])
+            if not hit.all():
+                columns = tuple(c[hit] for c in columns)
+                idx = columns[6]
+                if len(idx) == 0:
+                    continue
+            left, right, start, count, axis = links[node]
+            if left >= 0:
+                # 광선 대부분의 진행 방향 기준으로 가까운 자식을 먼저 방문
+                if np.count_nonzero(columns[3 + axis] >= 0) * 2 >= len(idx):
+                    left, right = right, left
+                stack.append((left, columns))
+                stack.append((right, columns))
+                continue
+            for f in leaf_faces[start:start + count]:
+                t, ok = self.faces[f].intersect(p[idx], d[idx])
+                better = ok & (t < best_t[idx])
+                best_t[idx[better]] = t[better]
+                best_face[idx[better]] = f
+        return best_t, best_face
+
+    def intersect_brute_force(self, p: np.ndarray,
+                              d: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """BVH 없이 모든 면을 검사한 첫 교점 (검증용)"""
+        best_t = np.full(len(p), np.inf)
+        best_face = np.full(len(p), -1, dtype=np.int64)
+        for f, face in enumerate(self.faces):
+            t, ok = face.intersect(p, d)
+            better = ok & (t < best_t)
+            best_t[better] = t[better]
+            best_face[better] = f
+        return best_t, best_face
+
+
+class CollimatedSource:
+    """원형 평행광 (y 방향 시야각)"""
+
+    def __init__(self, radius: float, z: float = 0.0, field_deg: float = 0.0,
+                 power: float = 1.0):
+        """
+        Args:
+            radius: 빔 반지름 (mm, 시작 평면 기준)
+            z: 시작 평면 위치 (mm)
+            field_deg: y 방향 입사각 (deg)
+            power: 전체 광속 (W)
+        """
+        self.radius = float(radius)
+        self.z = float(z)
+        self.field_deg = float(field_deg)
+        self.power = float(power)
+
+    def generate(self, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """(n, 3) 위치, 방향"""
+        r = self.radius * np.sqrt(rng.random(n))
+        phi = 2 * np.pi * rng.random(n)
+        position = np.stack([r * np.cos(phi), r * np.sin(phi), np.full(n, self.z)], axis=1)
+        theta = np.radians(self.field_deg)
+        direction = np.broadcast_to([0.0, np.sin(theta), np.cos(theta)], (n, 3)).copy()
+        return position, direction
+
+
+class PointSource:
+    """+z축 원뿔로 균일하게 방사하는 점광원"""
+
+    def __init__(self, position: Sequence[float], half_angle_deg: float, power: float = 1.0):
+        """
+        Args:
+            position: 위치 (mm)
+            half_angle_deg: 원뿔 반각 (deg)
+            power: 원뿔 안 전체 광속 (W)
+        """
+        self.position = np.asarray(position, dtype=np.float64)
+        self.half_angle_deg = float(half_angle_deg)
+        self.power = float(power)
+
+    def generate(self, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """(n, 3) 위치, 방향 (입체각 균일)"""
+        cos_max = np.cos(np.radians(self.half_angle_deg))
+        cos_t = 1.0 - rng.random(n) * (1.0 - cos_max)
+        sin_t = np.sqrt(1.0 - cos_t**2)
+        phi = 2 * np.pi * rng.random(n)
+        direction = np.stack([sin_t * np.cos(phi), sin_t * np.sin(phi), cos_t], axis=1)
+        return np.broadcast_to(self.position, (n, 3)).copy(), direction
+
+
+@dataclass
+class NSResult:
+    """
+    비순차 추적 결과
+
+    Attributes:
+        detectors: 검출기 이름 -> DetectorMap
+        stats: 광속 수지 (source, detected, absorbed, escaped, truncated) W와
+            광선 수 (rays, segments, roulette_killed)
+        elapsed: 실행 시간 (s)
+    """
+    detectors: Dict[str, DetectorMap]
+    stats: Dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def merge(self, other: 'NSResult') -> 'NSResult':
+        """다른 청크의 결과를 더함 (self 반환)"""
+        for name, detector in other.detectors.items():
+            self.detectors[name].merge(detector)
+        for key, value in other.stats.items():
+            self.stats[key] = self.stats.get(key, 0) + value
+        self.elapsed = max(self.elapsed, other.elapsed)
+        return self
+
+
+def _lambertian(normal: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """normal 쪽 반구의 코사인 가중 방향"""
+    n = len(normal)
+    u, phi = rng.random(n), 2 * np.pi * rng.random(n)
+    cos_t, sin_t = np.sqrt(1 - u), np.sqrt(u)
+    # normal에 수직인 기저
+    helper = np.where(np.abs(normal[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+    e1 = np.cross(normal, helper)
+    e1 /= np.linalg.norm(e1, axis=1, keepdims=True)
+    e2 = np.cross(normal, e1)
+    return (sin_t * np.cos(phi))[:, None] * e1 + (sin_t * np.sin(phi))[:, None] * e2 \
+        + cos_t[:, None] * normal
+
+
+class NonSequentialTracer:
+    """
+    비순차 몬테카를로 추적기
+
+    광선은 chunk_size개씩 독립된 난수 스트림(SeedSequence.spawn)으로
+    추적하므로 결과는 프로세스 수와 관계없이 같습니다. 청크 결과
+    (검출기 누적기와 광속 수지)는 청크 순서대로 합산합니다.
+    """
+
+    def __init__(self, scene: Scene, wavelength_um: float = 0.55, split: bool = True,
+                 min_weight: float = 1e-3, max_depth: int = 50):
+        """
+        Args:
+            scene: 장면
+            wavelength_um: 파장 (μm)
+            split: True면 분기마다 자식 광선, False면 분기 하나를 확률 선택
+            min_weight: 러시안 룰렛 기준 (광선 초기 가중치 1 대비)
+            max_depth: 광선당 최대 상호작용 수 (넘으면 truncated)
+        """
+        self.scene = scene
+        self.wavelength_um = float(wavelength_um)
+        self.split = split
+        self.min_weight = float(min_weight)
+        self.max_depth = int(max_depth)
+        self._face_arrays()
+
+    def _face_arrays(self):
+        """면 속성 배열 (상호작용을 면 종류와 관계없이 한 번에 처리)"""
+        faces = self.scene.faces
+        wavelength = self.wavelength_um
+        self._n_before = np.array([refractive_index(f.before, wavelength) for f in faces])
+        self._n_after = np.array([refractive_index(f.after, wavelength) for f in faces])
+        self._coating = np.array([COATINGS.index(f.coating) for f in faces])
+        self._reflectance = np.array([f.reflectance for f in faces])
+        self._scatter = np.array([f.scatter for f in faces])
+
+    def _interact(self, face_idx, pos, d):
+        """
+        교점에서 분기 가중치와 방향
+
+        Returns:
+            (법선, 투과 방향, 반사 방향, (투과, 정반사, 산란) 가중치 비율)
+        """
+        normal = np.empty_like(pos)
+        for f in np.unique(face_idx):
+            mask = face_idx == f
+            normal[mask] = self.scene.faces[f].normal(pos[mask])
+        cos_d = np.einsum('ij,ij->i', d, normal)
+        from_before = cos_d > 0
+        n1 = np.where(from_before, self._n_before[face_idx], self._n_after[face_idx])
+        n2 = np.where(from_before, self._n_after[face_idx], self._n_before[face_idx])
+        # 입사 쪽을 향하는 법선
+        facing = np.where(from_before, -1.0, 1.0)[:, None] * normal
+        cos_i = np.abs(cos_d)
+        reflected = d + 2 * cos_i[:, None] * facing
+
+        eta = n1 / n2
+        k = 1.0 - eta**2 * (1.0 - cos_i**2)
+        tir = k < 0
+        cos_t = np.sqrt(np.where(tir, 0.0, k))
+        transmitted = eta[:, None] * d + (eta * cos_i - cos_t)[:, None] * facing
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = ((n1 * cos_i - n2 * cos_t) / (n1 * cos_i + n2 * cos_t))**2
+            rp = ((n1 * cos_t - n2 * cos_i) / (n1 * cos_t + n2 * cos_i))**2
+        fresnel_r = np.where(tir, 1.0, np.nan_to_num(0.5 * (rs + rp), nan=1.0))
+
+        coating = self._coating[face_idx]
+        s = self._scatter[face_idx]
+        rho = self._reflectance[face_idx]
+        fractions = np.zeros((len(d), 3))
+        is_fresnel = coating == 0
+        fractions[is_fresnel, 0] = ((1 - s) * (1 - fresnel_r))[is_fresnel]
+        fractions[is_fresnel, 1] = ((1 - s) * fresnel_r)[is_fresnel]
+        fractions[is_fresnel, 2] = s[is_fresnel]
+        is_mirror = coating == 1
+        fractions[is_mirror, 1] = (rho * (1 - s))[is_mirror]
+        fractions[is_mirror, 2] = (rho * s)[is_mirror]
+        is_absorb = coating == 2
+        fractions[is_absorb, 1] = rho[is_absorb]
+        fractions[is_absorb, 2] = s[is_absorb]
+        return facing, transmitted, reflected, fractions
+
+    def trace_chunk(self, source, n_rays: int, seed) -> NSResult:
+        """
+        광선 n_rays개 추적 (현재 프로세스)
+
+        Args:
+            source: generate(n, rng)가 있는 광원
+            n_rays: 광선 수
+            seed: 난수 시드 (int 또는 SeedSequence)
+
+        Returns:
+            NSResult (이 청크의 누적기, 광선 가중치 = source.power / n_rays)
+        """
+        begin = time.time()
+        rng = np.random.default_rng(seed)
+        scene = self.scene
+        detectors = {name: DetectorMap.empty(name, scene.faces[f].half_width,
+                                             scene.faces[f].half_height, pixels)
+                     for name, (f, pixels) in scene.detectors.items()}
+        detector_of = {f: name for name, (f, _) in scene.detectors.items()}
+        stats = dict(source=float(source.power), detected=0.0,
+                     absorbed=0.0, escaped=0.0, truncated=0.0, rays=n_rays, segments=0,
+                     roulette_killed=0)
+        unit = source.power / n_rays if n_rays else 0.0
+
+        pos, d = source.generate(n_rays, rng)
+        weight = np.ones(n_rays)
+        n_refl = np.zeros(n_rays, dtype=np.int64)
+        n_scat = np.zeros(n_rays, dtype=np.int64)
+        depth = np.zeros(n_rays, dtype=np.int64)
+
+        while len(weight):
+            stats['segments'] += len(weight)
+            t, face_idx = scene.intersect(pos, d)
+            miss = face_idx < 0
+            stats['escaped'] += float(unit * weight[miss].sum())
+            keep = ~miss
+            pos, d, weight, n_refl, n_scat, depth, t, face_idx = (
+                a[keep] for a in (pos, d, weight, n_refl, n_scat, depth, t, face_idx))
+            pos = pos + t[:, None] * d
+
+            at_detector = self._coating[face_idx] == 3
+            for f in np.unique(face_idx[at_detector]):
+                mask = face_idx == f
+                face = scene.faces[f]
+                local, _ = face.to_local(pos[mask], d[mask])
+                detectors[detector_of[f]].record(local[:, 0], local[:, 1],
+                                                 unit * weight[mask], n_refl[mask],
+                                                 n_scat[mask])
+            stats['detected'] += float(unit * weight[at_detector].sum())
+
+            facing, transmitted, reflected, fractions = self._interact(face_idx, pos, d)
+            fractions[at_detector] = 0.0
+            if self.split:
+                branch_weight = weight[:, None] * fractions
+            else:
+                # 분기 하나를 확률 선택 (나머지 확률은 흡수), 가중치는 유지
+                upper = np.cumsum(fractions, axis=1)
+                u = rng.random(len(weight))[:, None]
+                branch_weight = weight[:, None] * ((u < upper) & (u >= upper - fractions))
+            stats['absorbed'] += float(
+                unit * (weight - branch_weight.sum(axis=1))[~at_detector].sum())
+
+            parts = []
+            for branch in range(3):
+                live = branch_weight[:, branch] > 0
+                if not live.any():
+                    continue
+                if branch == 0:
+                    new_d = transmitted[live]
+                elif branch == 1:
+                    new_d = reflected[live]
+                else:
+                    new_d = _lambertian(facing[live], rng)
+                parts.append((pos[live], new_d, branch_weight[live, branch],
+                              n_refl[live] + (branch == 1), n_scat[live] + (branch == 2),
+                              depth[live] + 1))
+            if not parts:
+                break
+            pos, d, weight, n_refl, n_scat, depth = (np.concatenate(a) for a in zip(*parts))
+
+            too_deep = depth > self.max_depth
+            stats['truncated'] += float(unit * weight[too_deep].sum())
+            weak = (weight < self.min_weight) & ~too_deep
+            survive = rng.random(len(weight)) < weight / self.min_weight
+            killed = weak & ~survive
+            stats['roulette_killed'] += int(killed.sum())
+            weight = np.where(weak & survive, self.min_weight, weight)
+            keep = ~(too_deep | killed)
+            pos, d, weight, n_refl, n_scat, depth = (
+                a[keep] for a in (pos, d, weight, n_refl, n_scat, depth))
+
+        return NSResult(detectors, stats, time.time() - begin)
+
+    def run(self, source, n_rays: int, chunk_size: int = 20000,
+            max_workers: Optional[int] = None, seed: Optional[int] = None) -> NSResult:
+        """
+        광선 n_rays개를 청크로 나눠 추적 (프로세스 풀)
+
+        Args:
+            source: 광원
+            n_rays: 전체 광선 수
+            chunk_size: 청크당 광선 수
+            max_workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스)
+            seed: 난수 시드
+
+        Returns:
+            NSResult (청크 결과 합)
+        """
+        if n_rays < 1 or chunk_size < 1:
+            raise ValueError("n_rays and chunk_size must be >= 1")
+        begin = time.time()
+        sizes = [min(chunk_size, n_rays - start) for start in range(0, n_rays, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        # 청크 광선 가중치를 전체 광선 수 기준으로 맞춤
+        scale = [size / n_rays for size in sizes]
+        n_workers = max(1, min(max_workers or os.cpu_count() or 1, len(sizes)))
+
+        if n_workers == 1:
+            results = [self.trace_chunk(source, size, s) for size, s in zip(sizes, seeds)]
+        else:
+            with ProcessPoolExecutor(n_workers) as pool:
+                results = list(pool.map(self.trace_chunk, [source] * len(sizes), sizes, seeds))
+
+        total = None
+        for result, factor in zip(results, scale):
+            _scale_result(result, factor)
+            total = result if total is None else total.merge(result)
+        total.elapsed = time.time() - begin
+        return total
+
+
+def _scale_result(result: NSResult, factor: float):
+    """청크 광속을 factor배 (광선 수 통계는 그대로)"""
+    for detector in result.detectors.values():
+        detector.flux *= factor
+        detector.ghost *= factor
+        detector.scatter *= factor
+    for key in ('source', 'detected', 'absorbed', 'escaped', 'truncated'):
+        result.stats[key] *= factor
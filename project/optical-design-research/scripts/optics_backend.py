@@ -0,0 +1,824 @@
+"""
+Optical Engine Backends
+광학 엔진 백엔드
+
+This module defines the backend protocol used by the Zemax automation layer,
+a pure-Python local backend, an OpticStudio ZOS-API backend and a bounded
+connection pool.
+Zemax 자동화 계층이 사용하는 백엔드 프로토콜과 순수 파이썬 로컬 백엔드,
+OpticStudio ZOS-API 백엔드, 크기 제한 연결 풀을 정의합니다.
+
+백엔드 프로토콜 (OpticsBackend)::
+
+    new_system / open_file / save_file          파일과 시스템
+    set_system_data / insert_surface / set_surface   시스템 데이터
+    run_analysis(name) -> handle                분석 실행
+    fetch_arrays(handle) -> {이름: 배열}         결과 배열 가져오기
+    optimize / ping / close
+
+분석 결과는 항상 평탄한 numpy 배열 딕셔너리입니다. 'spot'은 광선별
+x, y (μm, 주광선 기준)와 field, wavelength 번호 열 (시야 우선 그룹 순서,
+analysis_results.SpotData 배치와 같음), 'mtf'는 freq와
+(시야 수, 주파수 수) tangential/sagittal, 'paraxial'은 0차원 배열입니다.
+
+OpticStudio 세션은 라이선스 수가 제한되고 시작 비용이 크므로 BackendPool로
+재사용합니다.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Union, \
+    runtime_checkable
+
+import numpy as np
+
+from . import raytrace
+from .prescription import Prescription
+
+
+ANALYSES = ('spot', 'mtf', 'paraxial')
+
+OPTIMIZE_MODES = ('local', 'global', 'surrogate')
+
+
+class BackendError(RuntimeError):
+    """백엔드 세션 오류 (풀에서는 해당 세션을 폐기)"""
+
+
+class BackendUnavailableError(BackendError):
+    """백엔드를 사용할 수 없음 (라이브러리/라이선스 없음)"""
+
+
+@runtime_checkable
+class OpticsBackend(Protocol):
+    """광학 엔진 백엔드 프로토콜"""
+
+    name: str
+
+    def new_system(self, mode: str = 'SEQ') -> None: ...
+
+    def open_file(self, filepath: Union[str, Path]) -> None: ...
+
+    def save_file(self, filepath: Union[str, Path]) -> None: ...
+
+    def set_system_data(self, wavelengths: Optional[Sequence[float]] = None,
+                        fields: Optional[Sequence[float]] = None,
+                        aperture: Optional[float] = None,
+                        stop: Optional[int] = None) -> None: ...
+
+    def insert_surface(self, index: Optional[int] = None, **params) -> int: ...
+
+    def set_surface(self, index: int, **params) -> None: ...
+
+    def run_analysis(self, name: str, **settings) -> int: ...
+
+    def fetch_arrays(self, handle: int) -> Dict[str, np.ndarray]: ...
+
+    def optimize(self, merit_function: str = 'RMS_SPOT_SIZE', **settings) -> float: ...
+
+    def ping(self) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+class _ResultHandles:
+    """분석 결과 핸들 저장 (fetch_arrays 시 반환 후 삭제)"""
+
+    def __init__(self):
+        self._results: Dict[int, Dict[str, np.ndarray]] = {}
+        self._next_handle = 1
+
+    def _store(self, arrays: Dict[str, np.ndarray]) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        self._results[handle] = arrays
+        return handle
+
+    def fetch_arrays(self, handle: int) -> Dict[str, np.ndarray]:
+        """
+        분석 결과 배열 가져오기
+
+        Args:
+            handle: run_analysis 반환값
+
+        Returns:
+            {이름: 배열}
+        """
+        try:
+            return self._results.pop(handle)
+        except KeyError:
+            raise BackendError(f"unknown or already fetched analysis handle {handle}") from None
+
+
+class LocalBackend(_ResultHandles):
+    """
+    순수 파이썬 로컬 백엔드 (raytrace 모듈 기반 순차 광선 추적)
+
+    OpticStudio 없이 Linux에서 전체 파이프라인을 실행/테스트하기 위한 대체
+    엔진입니다. 표준(코닉) 면과 반사면을 지원합니다.
+    """
+
+    name = 'local'
+
+    def __init__(self, prescription: Optional[Prescription] = None):
+        """
+        Args:
+            prescription: 초기 렌즈 처방 (None이면 빈 처방)
+        """
+        super().__init__()
+        self.system = prescription if prescription is not None else Prescription()
+        self.optimization_info: Dict = {}
+        self._closed = False
+
+    def _check_open(self):
+        if self._closed:
+            raise BackendError("local backend is closed")
+
+    def new_system(self, mode: str = 'SEQ'):
+        """
+        새 시스템 생성
+
+        Args:
+            mode: 'SEQ' (로컬 백엔드는 순차 모드만 지원)
+        """
+        self._check_open()
+        if mode.upper() != 'SEQ':
+            raise BackendError(f"local backend supports sequential ('SEQ') systems only, "
+                               f"got {mode!r}")
+        self.system = Prescription()
+
+    def open_file(self, filepath: Union[str, Path]):
+        """
+        처방 파일 열기 (.json 또는 .zmx, .zmx는 사이드카 캐시 사용)
+
+        Args:
+            filepath: 파일 경로
+        """
+        self._check_open()
+        suffix = Path(filepath).suffix.lower()
+        if suffix == '.json':
+            self.system = Prescription.load_json(filepath)
+        elif suffix == '.zmx':
+            from .zmx_reader import read_zmx
+
+            design = read_zmx(filepath)
+            unsupported = design.unsupported()
+            if unsupported:
+                raise BackendError(f"local backend does not support "
+                                   f"{', '.join(unsupported)}: {filepath}")
+            self.system = design.prescription
+        else:
+            raise BackendError(f"local backend cannot open {suffix!r} files: {filepath}")
+
+    def save_file(self, filepath: Union[str, Path]):
+        """
+        처방 저장 (.json 또는 .zmx)
+
+        Args:
+            filepath: 파일 경로
+        """
+        self._check_open()
+        suffix = Path(filepath).suffix.lower()
+        if suffix == '.json':
+            self.system.save_json(filepath)
+        elif suffix == '.zmx':
+            from .zmx_reader import write_zmx
+
+            write_zmx(self.system, filepath)
+        else:
+            raise BackendError(f"local backend saves .json or .zmx prescriptions only: "
+                               f"{filepath}")
+
+    def set_system_data(self, wavelengths: Optional[Sequence[float]] = None,
+                        fields: Optional[Sequence[float]] = None,
+                        aperture: Optional[float] = None,
+                        stop: Optional[int] = None):
+        """
+        시스템 데이터 설정 (None인 항목은 유지)
+
+        Args:
+            wavelengths: 파장 (μm)
+            fields: y 시야각 (deg)
+            aperture: 입사동 지름 (mm)
+            stop: 조리개 면 번호
+        """
+        self._check_open()
+        if wavelengths is not None:
+            self.system.wavelengths = np.atleast_1d(np.asarray(wavelengths, dtype=np.float64))
+        if fields is not None:
+            self.system.fields = np.atleast_1d(np.asarray(fields, dtype=np.float64))
+        if aperture is not None:
+            self.system.aperture = float(aperture)
+        if stop is not None:
+            self.system.stop = int(stop)
+
+    def insert_surface(self, index: Optional[int] = None, **params) -> int:
+        """
+        표면 삽입 (Prescription.add_surface 인자)
+
+        Returns:
+            삽입된 표면 번호
+        """
+        self._check_open()
+        return self.system.add_surface(index=index, **params)
+
+    def set_surface(self, index: int, **params):
+        """표면 매개변수 변경 (Prescription.set_surface 인자)"""
+        self._check_open()
+        self.system.set_surface(index, **params)
+
+    def run_analysis(self, name: str, **settings) -> int:
+        """
+        분석 실행
+
+        Args:
+            name: 'spot', 'mtf' 또는 'paraxial'
+            **settings: 'spot' - density, pattern
+                'mtf' - max_frequency (lp/mm), n_frequencies, density,
+                diffraction (True면 회절 한계 MTF를 곱함)
+
+        Returns:
+            결과 핸들
+        """
+        self._check_open()
+        presc = self.system
+        if presc.n_surfaces < 3:
+            raise BackendError("system has no lens surfaces")
+        if name == 'paraxial':
+            data = raytrace.paraxial_data(presc)
+            return self._store({key: np.asarray(value) for key, value in vars(data).items()})
+        if name == 'spot':
+            return self._store(self._spot_arrays(settings.get('density', 6),
+                                                 settings.get('pattern', 'hexapolar')))
+        if name == 'mtf':
+            freq = np.linspace(0.0, settings.get('max_frequency', 100.0),
+                               settings.get('n_frequencies', 50))
+            spots = self._spot_arrays(settings.get('density', 12), 'hexapolar')
+            wavelength = float(presc.wavelengths[0])
+            tangential = np.empty((len(presc.fields), len(freq)))
+            sagittal = np.empty_like(tangential)
+            for f in range(len(presc.fields)):
+                keep = (spots['field'] == f) & (spots['wavelength'] == 0)
+                tangential[f], sagittal[f] = raytrace.geometric_mtf(
+                    spots['x'][keep], spots['y'][keep], freq)
+            if settings.get('diffraction', True):
+                limit = raytrace.diffraction_mtf(
+                    freq, raytrace.paraxial_data(presc, wavelength).f_number, wavelength)
+                tangential *= limit
+                sagittal *= limit
+            return self._store({'freq': freq, 'field': np.arange(len(presc.fields)),
+                                'tangential': tangential, 'sagittal': sagittal})
+        raise BackendError(f"unknown analysis {name!r}, expected one of {ANALYSES}")
+
+    def _spot_arrays(self, density: int, pattern: str) -> Dict[str, np.ndarray]:
+        presc = self.system
+        parts = {'x': [], 'y': [], 'field': [], 'wavelength': []}
+        paraxial = [raytrace.paraxial_data(presc, wavelength)
+                    for wavelength in presc.wavelengths]
+        for f, field in enumerate(presc.fields):
+            for w, wavelength in enumerate(presc.wavelengths):
+                spot = raytrace.spot_diagram(presc, field, wavelength, density, pattern,
+                                             paraxial[w])
+                parts['x'].append(spot['x'])
+                parts['y'].append(spot['y'])
+                parts['field'].append(np.full(len(spot['x']), f, np.int32))
+                parts['wavelength'].append(np.full(len(spot['x']), w, np.int32))
+        return {key: np.concatenate(value) for key, value in parts.items()}
+
+    def optimize(self, merit_function: str = 'RMS_SPOT_SIZE',
+                 variables: Optional[Sequence[int]] = None,
+                 focus: bool = True, density: int = 4, max_iterations: int = 200,
+                 mode: str = 'local', **global_settings) -> float:
+        """
+        최적화 (곡률과 상면 거리)
+
+        Args:
+            merit_function: 'RMS_SPOT_SIZE' (전 시야/파장 평균 RMS 스팟 반경)
+            variables: 곡률 변수 면 번호 (None이면 물체/상면 제외 전체)
+            focus: True면 상면 직전 두께도 변수로 사용
+            density: 메리트 계산 동공 링 수
+            max_iterations: 최대 반복 수 ('global'은 시작점당)
+            mode: 'local' (Nelder-Mead), 'global'
+                (global_optimizer.GlobalOptimizer 다중 시작) 또는 'surrogate'
+                (surrogate.surrogate_minimize, 실제 평가 수 제한)
+            **global_settings: 'global' 인자 (n_starts, glass_choices,
+                time_budget, max_workers, curvature_bounds, seed) 또는
+                'surrogate' 인자 (max_true, n_explore, kappa, screen, seed).
+                'surrogate'의 EI 탐색은 n_explore > 0일 때만 실행 (기본 0)
+
+        Returns:
+            최적화 후 메리트 값 (mm). 실행 요약은 self.optimization_info
+            (n_evaluations = 실제 메리트 평가 수, 'surrogate'는
+            skipped_trials = 대리 모델로 기각한 시험점 수)
+        """
+        from scipy.optimize import minimize
+
+        self._check_open()
+        if merit_function.upper() != 'RMS_SPOT_SIZE':
+            raise BackendError(f"local backend supports merit function 'RMS_SPOT_SIZE', "
+                               f"got {merit_function!r}")
+        if mode not in OPTIMIZE_MODES:
+            raise BackendError(f"unknown optimization mode {mode!r}, "
+                               f"expected one of {OPTIMIZE_MODES}")
+        presc = self.system
+        if mode == 'global':
+            from .global_optimizer import GlobalOptimizer
+
+            result = GlobalOptimizer(presc, variables, focus, density=density,
+                                     max_iterations=max_iterations, **global_settings).run()
+            self.system = result.prescription
+            self.optimization_info = {'mode': mode, 'merit': result.merit,
+                                      'n_evaluations': result.n_evaluations,
+                                      'elapsed': result.elapsed, 'starts': result.starts}
+            return result.merit
+        surfaces = list(range(1, presc.image_surface)) if variables is None else list(variables)
+        focus_index = presc.image_surface - 1
+        if mode == 'surrogate':
+            from .surrogate import surrogate_minimize
+
+            trial = presc.copy()
+
+            def true_merit(x):
+                trial.curvature[surfaces] = x[:len(surfaces)]
+                if focus:
+                    trial.thickness[focus_index] = x[-1]
+                return raytrace.rms_spot_radius(trial, density)
+
+            # 탐색 척도: 곡률은 변수 곡률 최댓값의 1/4, 상면 거리는 10%
+            x0 = presc.curvature[surfaces].copy()
+            scale = np.full(len(surfaces), 0.25 * max(np.abs(x0).max(), 1e-3))
+            if focus:
+                x0 = np.append(x0, presc.thickness[focus_index])
+                scale = np.append(scale, 0.1 * max(abs(x0[-1]), 1.0))
+            result = surrogate_minimize(true_merit, x0, scale, max_iterations=max_iterations,
+                                        **global_settings)
+            presc.curvature[surfaces] = result.x[:len(surfaces)]
+            if focus:
+                presc.thickness[focus_index] = result.x[-1]
+            self.optimization_info = dict(result.summary(), mode=mode)
+            return result.merit
+        if global_settings:
+            raise BackendError(f"settings {sorted(global_settings)} need mode='global' "
+                               f"or 'surrogate'")
+
+        n_evaluations = 0
+
+        def apply(x):
+            presc.curvature[surfaces] = x[:len(surfaces)]
+            if focus:
+                presc.thickness[focus_index] = x[-1]
+
+        def merit(x):
+            nonlocal n_evaluations
+            n_evaluations += 1
+            apply(x)
+            return raytrace.rms_spot_radius(presc, density)
+
+        begin = time.time()
+        x0 = presc.curvature[surfaces].copy()
+        if focus:
+            x0 = np.append(x0, presc.thickness[focus_index])
+        result = minimize(merit, x0, method='Nelder-Mead',
+                          options={'maxiter': max_iterations, 'xatol': 1e-9, 'fatol': 1e-12})
+        apply(result.x)
+        self.optimization_info = {'mode': mode, 'merit': float(result.fun),
+                                  'n_evaluations': n_evaluations,
+                                  'elapsed': time.time() - begin}
+        return float(result.fun)
+
+    def ping(self) -> bool:
+        """세션 상태 확인"""
+        return not self._closed
+
+    def close(self):
+        """세션 종료"""
+        self._closed = True
+
+
+class ZOSAPIBackend(_ResultHandles):
+    """
+    OpticStudio ZOS-API 백엔드 (Windows, pythonnet 필요)
+
+    독립 실행(standalone) 응용 프로그램 하나가 라이선스 하나를 사용합니다.
+    여러 작업에서 쓸 때는 BackendPool로 세션을 재사용하세요.
+    """
+
+    name = 'zosapi'
+
+    def __init__(self, zemax_root: Optional[str] = None):
+        """
+        Args:
+            zemax_root: OpticStudio 설치 경로 (None이면 레지스트리에서 검색)
+
+        Raises:
+            BackendUnavailableError: pythonnet/ZOS-API/라이선스가 없을 때
+        """
+        super().__init__()
+        try:
+            import clr
+        except ImportError as e:
+            raise BackendUnavailableError(
+                "ZOS-API backend requires pythonnet (import clr) on Windows") from e
+        import os
+
+        if zemax_root is None:
+            import winreg
+            key = winreg.OpenKey(winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER),
+                                 r"Software\Zemax", 0, winreg.KEY_READ)
+            zemax_root = winreg.QueryValueEx(key, 'ZemaxRoot')[0]
+            winreg.CloseKey(key)
+        clr.AddReference(os.path.join(zemax_root, 'ZOS-API', 'Libraries',
+                                      'ZOSAPI_NetHelper.dll'))
+        import ZOSAPI_NetHelper
+        if not ZOSAPI_NetHelper.ZOSAPI_Initializer.Initialize():
+            raise BackendUnavailableError("cannot initialize ZOS-API")
+        zemax_dir = ZOSAPI_NetHelper.ZOSAPI_Initializer.GetZemaxDirectory()
+        clr.AddReference(os.path.join(zemax_dir, 'ZOSAPI.dll'))
+        clr.AddReference(os.path.join(zemax_dir, 'ZOSAPI_Interfaces.dll'))
+        import ZOSAPI
+
+        self._zosapi = ZOSAPI
+        self._connection = ZOSAPI.ZOSAPI_Connection()
+        self._app = self._connection.CreateNewApplication()
+        if self._app is None:
+            raise BackendUnavailableError("cannot start OpticStudio application")
+        if not self._app.IsValidLicenseForAPI:
+            self._app.CloseApplication()
+            raise BackendUnavailableError("OpticStudio license is not valid for ZOS-API")
+        self.system = self._app.PrimarySystem
+
+    def new_system(self, mode: str = 'SEQ'):
+        """새 시스템 생성 ('SEQ' 또는 'NSC')"""
+        self.system.New(False)
+        if mode.upper() == 'NSC':
+            self.system.MakeNonSequential()
+
+    def open_file(self, filepath: Union[str, Path]):
+        """.zmx/.zos 파일 열기"""
+        if not self.system.LoadFile(str(Path(filepath).resolve()), False):
+            raise BackendError(f"OpticStudio failed to open {filepath}")
+
+    def save_file(self, filepath: Union[str, Path]):
+        """다른 이름으로 저장"""
+        self.system.SaveAs(str(Path(filepath).resolve()))
+
+    def set_system_data(self, wavelengths: Optional[Sequence[float]] = None,
+                        fields: Optional[Sequence[float]] = None,
+                        aperture: Optional[float] = None,
+                        stop: Optional[int] = None):
+        """파장/시야/입사동 지름/조리개 설정"""
+        data = self.system.SystemData
+        if wavelengths is not None:
+            waves = data.Wavelengths
+            while waves.NumberOfWavelengths > 1:
+                waves.RemoveWavelength(waves.NumberOfWavelengths)
+            wavelengths = np.atleast_1d(wavelengths)
+            waves.GetWavelength(1).Wavelength = float(wavelengths[0])
+            for w in wavelengths[1:]:
+                waves.AddWavelength(float(w), 1.0)
+        if fields is not None:
+            data_fields = data.Fields
+            while data_fields.NumberOfFields > 1:
+                data_fields.RemoveField(data_fields.NumberOfFields)
+            fields = np.atleast_1d(fields)
+            data_fields.GetField(1).Y = float(fields[0])
+            for f in fields[1:]:
+                data_fields.AddField(0.0, float(f), 1.0)
+        if aperture is not None:
+            data.Aperture.ApertureType = \
+                self._zosapi.SystemData.ZemaxApertureType.EntrancePupilDiameter
+            data.Aperture.ApertureValue = float(aperture)
+        if stop is not None:
+            self.system.LDE.GetSurfaceAt(int(stop)).IsStop = True
+
+    def insert_surface(self, index: Optional[int] = None, **params) -> int:
+        """표면 삽입 (기본: 상면 앞)"""
+        lde = self.system.LDE
+        if index is None:
+            index = lde.NumberOfSurfaces - 1
+        lde.InsertNewSurfaceAt(index)
+        self.set_surface(index, **params)
+        return index
+
+    def set_surface(self, index: int, **params):
+        """표면 매개변수 변경 (radius, thickness, glass, conic, semi_diameter)"""
+        surface = self.system.LDE.GetSurfaceAt(index)
+        for key, value in params.items():
+            if key == 'radius':
+                surface.Radius = float(value) if np.isfinite(value) and value != 0 else 1e18
+            elif key == 'curvature':
+                surface.Radius = 1.0 / value if value else 1e18
+            elif key == 'thickness':
+                surface.Thickness = float(value)
+            elif key == 'glass':
+                surface.Material = value
+            elif key == 'conic':
+                surface.Conic = float(value)
+            elif key == 'semi_diameter':
+                surface.SemiDiameter = float(value)
+            elif key == 'surface_type':
+                if value.upper() != 'STANDARD':
+                    raise BackendError(f"set surface type in OpticStudio directly: {value!r}")
+            else:
+                raise BackendError(f"unknown surface parameter {key!r}")
+
+    def run_analysis(self, name: str, **settings) -> int:
+        """
+        분석 실행 ('spot': 배치 광선 추적, 'mtf': FFT MTF, 'paraxial': EFFL 등)
+
+        Returns:
+            결과 핸들
+        """
+        if name == 'spot':
+            return self._store(self._batch_spot(settings.get('density', 6),
+                                                settings.get('pattern', 'hexapolar')))
+        if name == 'mtf':
+            analysis = self.system.Analyses.New_FftMtf()
+            try:
+                analysis.ApplyAndWaitForCompletion()
+                results = analysis.GetResults()
+                tangential, sagittal = [], []
+                freq = None
+                for s in range(results.NumberOfDataSeries):
+                    series = results.GetDataSeries(s)
+                    freq = np.array(list(series.XData.Data))
+                    y = np.array([[series.YData.Data[i, j] for j in range(series.NumberOfSeries)]
+                                  for i in range(len(freq))])
+                    tangential.append(y[:, 0])
+                    sagittal.append(y[:, 1])
+            finally:
+                analysis.Close()
+            return self._store({'freq': freq, 'field': np.arange(len(tangential)),
+                                'tangential': np.array(tangential),
+                                'sagittal': np.array(sagittal)})
+        if name == 'paraxial':
+            mfe = self.system.MFE
+            operand = self._zosapi.Editors.MFE.MeritOperandType
+            efl = mfe.GetOperandValue(operand.EFFL, 0, 1, 0, 0, 0, 0, 0, 0)
+            f_number = mfe.GetOperandValue(operand.ISFN, 0, 0, 0, 0, 0, 0, 0, 0)
+            epd = self.system.SystemData.Aperture.ApertureValue
+            return self._store({'efl': np.asarray(efl), 'enp_diameter': np.asarray(epd),
+                                'f_number': np.asarray(f_number)})
+        raise BackendError(f"unknown analysis {name!r}, expected one of {ANALYSES}")
+
+    def _batch_spot(self, density: int, pattern: str) -> Dict[str, np.ndarray]:
+        ZOSAPI = self._zosapi
+        data = self.system.SystemData
+        fields = [data.Fields.GetField(i + 1).Y for i in range(data.Fields.NumberOfFields)]
+        max_field = max(abs(f) for f in fields) or 1.0
+        px, py = raytrace.pupil_grid(density, pattern)
+        px, py = np.concatenate(([0.0], px)), np.concatenate(([0.0], py))
+        image = self.system.LDE.NumberOfSurfaces - 1
+        parts = {'x': [], 'y': [], 'field': [], 'wavelength': []}
+
+        tool = self.system.Tools.OpenBatchRayTrace()
+        try:
+            for f, field in enumerate(fields):
+                for w in range(data.Wavelengths.NumberOfWavelengths):
+                    norm = tool.CreateNormUnpol(len(px), ZOSAPI.Tools.RayTrace.RaysType.Real,
+                                                image)
+                    for x, y in zip(px, py):
+                        norm.AddRay(w + 1, 0.0, field / max_field, float(x), float(y),
+                                    getattr(ZOSAPI.Tools.RayTrace.OPDMode, 'None'))
+                    tool.RunAndWaitForCompletion()
+                    norm.StartReadingResults()
+                    xy, ok = [], []
+                    for _ in range(len(px)):
+                        result = norm.ReadNextResult()
+                        success, err, vignetted, x, y = (result[0], result[2], result[3],
+                                                         result[4], result[5])
+                        xy.append((x, y))
+                        ok.append(success and err == 0 and vignetted == 0)
+                    xy, ok = np.array(xy), np.array(ok)
+                    chief = xy[0]
+                    rel = (xy[1:][ok[1:]] - chief) * 1e3
+                    parts['x'].append(rel[:, 0])
+                    parts['y'].append(rel[:, 1])
+                    parts['field'].append(np.full(len(rel), f, np.int32))
+                    parts['wavelength'].append(np.full(len(rel), w, np.int32))
+        finally:
+            tool.Close()
+        return {key: np.concatenate(value) for key, value in parts.items()}
+
+    def optimize(self, merit_function: str = 'RMS_SPOT_SIZE', cycles: int = 0,
+                 mode: str = 'local', time_budget: float = 60.0, max_workers: int = 0,
+                 **settings) -> float:
+        """
+        OpticStudio 최적화
+
+        Args:
+            merit_function: 'RMS_SPOT_SIZE' (최적화 마법사로 RMS 스팟 메리트 구성)
+            cycles: 반복 수 (0이면 자동, 'local'만)
+            mode: 'local' (감쇠 최소자승) 또는 'global' (Hammer 최적화).
+                'surrogate'는 로컬 백엔드만 지원
+            time_budget: 'global' 실행 시간 (s)
+            max_workers: 'global' CPU 코어 수 (0이면 OpticStudio 기본값)
+
+        Returns:
+            최적화 후 메리트 값
+        """
+        ZOSAPI = self._zosapi
+        if mode not in OPTIMIZE_MODES:
+            raise BackendError(f"unknown optimization mode {mode!r}, "
+                               f"expected one of {OPTIMIZE_MODES}")
+        if mode == 'surrogate':
+            raise BackendError("mode='surrogate' is only supported by the local backend")
+        if merit_function.upper() == 'RMS_SPOT_SIZE':
+            wizard = self.system.MFE.SEQOptimizationWizard
+            wizard.Type = 0      # RMS
+            wizard.Data = 1      # Spot radius
+            wizard.Reference = 0  # Centroid
+            wizard.OK()
+        if mode == 'global':
+            # Hammer는 현재 시스템을 최고 설계로 갱신함 (Global Optimization은 파일로만 저장)
+            optimizer = self.system.Tools.OpenHammerOptimization()
+            try:
+                if max_workers:
+                    optimizer.NumberOfCores = max_workers
+                optimizer.RunAndWaitWithTimeout(float(time_budget))
+                optimizer.Cancel()
+                optimizer.WaitForCompletion()
+                return float(optimizer.CurrentMeritFunction)
+            finally:
+                optimizer.Close()
+        optimizer = self.system.Tools.OpenLocalOptimization()
+        try:
+            optimizer.Algorithm = ZOSAPI.Tools.Optimization.OptimizationAlgorithm.DampedLeastSquares
+            optimizer.Cycles = (ZOSAPI.Tools.Optimization.OptimizationCycles.Automatic
+                                if cycles == 0 else cycles)
+            optimizer.RunAndWaitForCompletion()
+            return float(optimizer.CurrentMeritFunction)
+        finally:
+            optimizer.Close()
+
+    def ping(self) -> bool:
+        """세션 상태 확인 (라이선스/응용 프로그램 응답)"""
+        try:
+            return bool(self._app is not None and self._app.IsValidLicenseForAPI)
+        except Exception:
+            return False
+
+    def close(self):
+        """OpticStudio 응용 프로그램 종료"""
+        if self._app is not None:
+            try:
+                self._app.CloseApplication()
+            finally:
+                self._app = None
+
+
+BACKENDS: Dict[str, Callable[..., OpticsBackend]] = {
+    'local': LocalBackend,
+    'zosapi': ZOSAPIBackend,
+}
+
+
+def create_backend(name: str = 'local', **kwargs) -> OpticsBackend:
+    """
+    이름으로 백엔드 생성
+
+    Args:
+        name: 'local' 또는 'zosapi'
+        **kwargs: 백엔드 생성자 인자
+
+    Returns:
+        백엔드 객체
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend {name!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
+
+
+class BackendPool:
+    """
+    크기 제한 백엔드 연결 풀 (스레드 안전)
+
+    유휴 세션을 재사용하고, 꺼낼 때 ping()으로 상태를 확인하여 응답하지 않는
+    세션은 닫고 새로 만듭니다. 사용 중 BackendError가 발생한 세션은 풀로
+    돌려보내지 않고 폐기합니다.
+
+    Example:
+        pool = BackendPool(lambda: create_backend('zosapi'), max_size=2)
+        with pool.acquire() as backend:
+            backend.open_file('lens1.zmx')
+    """
+
+    def __init__(self, factory: Callable[[], OpticsBackend], max_size: int = 1,
+                 health_check: bool = True):
+        """
+        Args:
+            factory: 백엔드 생성 함수
+            max_size: 최대 동시 세션 수 (라이선스 수)
+            health_check: 재사용 전에 ping() 확인 여부
+        """
+        if max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {max_size}")
+        self.factory = factory
+        self.max_size = max_size
+        self.health_check = health_check
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0}
+        self._idle: List[OpticsBackend] = []
+        self._n_open = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def n_open(self) -> int:
+        """열린 세션 수 (사용 중 + 유휴)"""
+        return self._n_open
+
+    @staticmethod
+    def _close_quietly(backend: OpticsBackend):
+        try:
+            backend.close()
+        except Exception:
+            pass
+
+    def _checkout(self, timeout: Optional[float]) -> OpticsBackend:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise BackendError("backend pool is closed")
+                while self._idle:
+                    backend = self._idle.pop()
+                    if not self.health_check or backend.ping():
+                        self.stats['reused'] += 1
+                        return backend
+                    self._close_quietly(backend)
+                    self._n_open -= 1
+                    self.stats['discarded'] += 1
+                if self._n_open < self.max_size:
+                    self._n_open += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"no backend available within {timeout} s "
+                                       f"(max_size={self.max_size})")
+                self._cond.wait(remaining)
+
+        # 세션 시작은 느리므로 잠금 밖에서 생성
+        try:
+            backend = self.factory()
+        except BaseException:
+            with self._cond:
+                self._n_open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.stats['created'] += 1
+        return backend
+
+    def _checkin(self, backend: OpticsBackend, discard: bool):
+        with self._cond:
+            if discard or self._closed:
+                self._close_quietly(backend)
+                self._n_open -= 1
+                if discard:
+                    self.stats['discarded'] += 1
+            else:
+                self._idle.append(backend)
+            self._cond.notify()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[OpticsBackend]:
+        """
+        세션 빌리기 (with 블록이 끝나면 반환)
+
+        Args:
+            timeout: 대기 시간 제한 (초, None이면 무제한)
+
+        Yields:
+            백엔드 객체
+
+        Raises:
+            TimeoutError: timeout 안에 세션을 얻지 못했을 때
+        """
+        backend = self._checkout(timeout)
+        try:
+            yield backend
+        except BackendError:
+            self._checkin(backend, discard=True)
+            raise
+        except BaseException:
+            self._checkin(backend, discard=False)
+            raise
+        else:
+            self._checkin(backend, discard=False)
+
+    def close(self):
+        """유휴 세션을 모두 닫고 풀 종료 (사용 중 세션은 반환 시 닫힘)"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._close_quietly(self._idle.pop())
+                self._n_open -= 1
+            self._cond.notify_all()
+
+    def __enter__(self) -> 'BackendPool':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
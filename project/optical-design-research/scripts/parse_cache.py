@@ -0,0 +1,279 @@
+"""
+Parse Result Cache Module
+파싱 결과 캐시 모듈
+
+This module caches parsed Zemax/ANSYS/measurement exports as memory-mapped
+NumPy columns on disk.
+파싱된 Zemax/ANSYS/측정 데이터를 디스크에 메모리 매핑 가능한 NumPy 열로
+캐시합니다.
+
+캐시 키는 (파일 크기+수정시각 또는 내용 해시, 파서 이름, 파서 버전, 옵션)
+으로 결정되며, 파서 버전을 올리면 기존 항목은 자동으로 무효화됩니다. 전체
+크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다(LRU).
+
+디렉토리 구조::
+
+    cache_dir/
+        <key>/
+            meta.json        # 종류, 열 순서, 스칼라 값, 문자열 열의 dtype
+            <i>.npy          # 열 배열 (np.load(mmap_mode='c')로 로드)
+            <i>.missing.npy  # object 열의 결측값 코드 (0 값, 1 None, 2 NaN)
+
+적중 결과는 copy-on-write 메모리 매핑이라 미스 결과처럼 수정할 수 있고,
+수정 내용은 캐시 파일에 쓰이지 않습니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+CACHE_FORMAT_VERSION = 2
+
+# object 열 결측값 코드
+_MISSING_NONE = 1
+_MISSING_NAN = 2
+
+
+def file_digest(filepath: Union[str, Path], block_size: int = 4 * 2**20) -> str:
+    """
+    파일 내용 해시 (BLAKE2b)
+
+    Args:
+        filepath: 파일 경로
+        block_size: 읽기 블록 크기 (bytes)
+
+    Returns:
+        16진수 해시 문자열
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _to_storable(values) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """object 열을 고정폭 유니코드 배열 + 결측값 코드로 변환 (pickle 없이 저장)"""
+    import pandas as pd
+
+    arr = np.asarray(values)
+    if arr.dtype != object:
+        return arr, None
+    is_none = np.frompyfunc(lambda v: v is None, 1, 1)(arr).astype(bool)
+    missing = np.where(is_none, _MISSING_NONE,
+                       np.where(pd.isna(arr), _MISSING_NAN, 0)).astype(np.int8)
+    filled = arr.copy()
+    filled[missing != 0] = ''
+    return filled.astype(str), missing
+
+
+def _from_storable(arr: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    """_to_storable의 역변환 (object 배열, 결측값 복원)"""
+    values = arr.astype(object)
+    values[missing == _MISSING_NONE] = None
+    values[missing == _MISSING_NAN] = np.nan
+    return values
+
+
+class ParseCache:
+    """
+    파싱 결과의 디스크 캐시 (LRU, 크기 제한)
+
+    Example:
+        cache = ParseCache('~/.cache/optics', max_bytes=20 * 2**30)
+        df = ZemaxDataProcessor.read_spot_diagram('spot.txt', cache=cache)
+    """
+
+    def __init__(self, cache_dir: Union[str, Path],
+                 max_bytes: int = 10 * 2**30,
+                 key_mode: str = 'stat'):
+        """
+        Args:
+            cache_dir: 캐시 디렉토리
+            max_bytes: 캐시 최대 크기 (bytes)
+            key_mode: 'stat' (경로+크기+수정시각, 빠름) 또는
+                'content' (내용 해시, 복사/이동된 파일도 적중)
+        """
+        if key_mode not in ('stat', 'content'):
+            raise ValueError(f"key_mode must be 'stat' or 'content', got {key_mode!r}")
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.key_mode = key_mode
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, filepath: Union[str, Path], parser: str, version: int,
+            options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        캐시 키 계산
+
+        Args:
+            filepath: 원본 파일 경로
+            parser: 파서 이름
+            version: 파서 버전
+            options: 결과에 영향을 주는 파서 옵션
+
+        Returns:
+            캐시 키 (16진수 문자열)
+        """
+        filepath = Path(filepath)
+        if self.key_mode == 'content':
+            source = {'digest': file_digest(filepath)}
+        else:
+            st = filepath.stat()
+            source = {'path': str(filepath.resolve()), 'size': st.st_size,
+                      'mtime_ns': st.st_mtime_ns}
+        payload = json.dumps({'format': CACHE_FORMAT_VERSION, 'source': source,
+                              'parser': parser, 'version': version,
+                              'options': options or {}},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:40]
+
+    def get(self, key: str) -> Optional[Union[pd.DataFrame, Dict[str, Any]]]:
+        """
+        캐시 항목 로드 (배열은 메모리 매핑)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            DataFrame 또는 딕셔너리, 없으면 None
+        """
+        entry = self.cache_dir / key
+        try:
+            with open(entry / 'meta.json') as f:
+                meta = json.load(f)
+            arrays = {}
+            for i, name in enumerate(meta['columns']):
+                arr = np.load(entry / f'{i}.npy', mmap_mode='c')
+                if name in meta['dtypes']:
+                    arr = _from_storable(arr, np.load(entry / f'{i}.missing.npy'))
+                arrays[name] = arr
+        except (OSError, ValueError, KeyError):
+            return None
+        os.utime(entry / 'meta.json')  # LRU 사용 시각 갱신
+
+        if meta['kind'] == 'dataframe':
+            import pandas as pd
+
+            df = pd.DataFrame(arrays, copy=False)
+            return df.astype({name: dtype for name, dtype in meta['dtypes'].items()
+                              if dtype != str(df[name].dtype)})
+        result = dict(meta['scalars'])
+        result.update(arrays)
+        return result
+
+    def put(self, key: str, value: Union[pd.DataFrame, Dict[str, Any]]):
+        """
+        캐시 항목 저장 (임시 디렉토리에 쓴 후 원자적으로 이동)
+
+        Args:
+            key: 캐시 키
+            value: DataFrame 또는 {이름: 배열/스칼라} 딕셔너리
+        """
+        import pandas as pd
+
+        if isinstance(value, pd.DataFrame):
+            kind = 'dataframe'
+            columns = {str(c): value[c].to_numpy() for c in value.columns}
+            dtypes = {str(c): str(value[c].dtype) for c in value.columns}
+            scalars = {}
+        else:
+            kind = 'dict'
+            columns, scalars = {}, {}
+            for name, v in value.items():
+                if np.ndim(v) == 0 and not isinstance(v, (list, tuple)):
+                    scalars[name] = v.item() if isinstance(v, np.generic) else v
+                else:
+                    columns[name] = v
+            dtypes = {name: 'object' for name in columns}
+
+        tmp = Path(tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir))
+        try:
+            text_dtypes = {}
+            for i, (name, values) in enumerate(columns.items()):
+                arr, missing = _to_storable(values)
+                np.save(tmp / f'{i}.npy', arr, allow_pickle=False)
+                if missing is not None:
+                    np.save(tmp / f'{i}.missing.npy', missing, allow_pickle=False)
+                    text_dtypes[name] = dtypes[name]
+            with open(tmp / 'meta.json', 'w') as f:
+                json.dump({'kind': kind, 'columns': list(columns), 'dtypes': text_dtypes,
+                           'scalars': scalars, 'created': time.time()}, f)
+            target = self.cache_dir / key
+            if target.exists():
+                shutil.rmtree(target, ignore_errors=True)
+            os.replace(tmp, target)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.evict()
+
+    def load(self, filepath: Union[str, Path], parser: str, version: int,
+             parse: Callable[[], Union[pd.DataFrame, Dict[str, Any]]],
+             options: Optional[Dict[str, Any]] = None):
+        """
+        캐시에 있으면 로드하고, 없으면 파싱 후 저장
+
+        Args:
+            filepath: 원본 파일 경로
+            parser: 파서 이름
+            version: 파서 버전 (형식 변경 시 증가)
+            parse: 캐시 미스 때 호출할 파싱 함수
+            options: 결과에 영향을 주는 파서 옵션
+
+        Returns:
+            파싱 결과 (캐시 적중 시 copy-on-write 메모리 매핑된 배열)
+        """
+        key = self.key(filepath, parser, version, options)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        value = parse()
+        self.put(key, value)
+        return value
+
+    def _entries(self):
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            meta = entry / 'meta.json'
+            if entry.name.startswith('.tmp-') or not meta.exists():
+                continue
+            size = sum(p.stat().st_size for p in entry.iterdir())
+            entries.append((meta.stat().st_mtime, size, entry))
+        return entries
+
+    def size(self) -> int:
+        """캐시 전체 크기 (bytes)"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """모든 캐시 항목 삭제"""
+        for _, _, entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
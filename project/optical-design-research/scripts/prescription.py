@@ -0,0 +1,233 @@
+"""
+Lens Prescription Module
+렌즈 처방 모듈
+
+This module holds a sequential lens prescription as per-surface arrays.
+순차 광학계 렌즈 처방을 표면별 배열로 보관합니다.
+
+표면 번호는 Zemax LDE와 같습니다. 0번은 물체면, 마지막은 상면이며,
+thickness[i]는 i번 면에서 다음 면까지의 거리, glass[i]는 i번 면 뒤의
+매질입니다. 곡률 반경 0 또는 inf는 평면(곡률 0)입니다.
+
+params[i, k-1]은 Zemax의 PARM k에 해당하는 표면 종류별 매개변수입니다
+(예: EVENASPH의 PARM 1..8 = r^2..r^16 비구면 계수). 표면 종류는 Zemax
+이름으로 저장하며 'Even Asphere' 같은 LDE 표시 이름도 받습니다
+(surfaces 모듈 참고).
+"""
+
+import copy
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+SURFACE_ARRAYS = ('curvature', 'thickness', 'conic', 'semi_diameter')
+
+# 표면당 매개변수 수 (Zemax PARM 1..N_PARAMS)
+N_PARAMS = 14
+
+# LDE 표시 이름 -> 표면 종류 이름
+SURFACE_TYPE_ALIASES = {
+    'EVEN ASPHERE': 'EVENASPH',
+    'ASPHERE': 'EVENASPH',
+    'TOROID': 'TOROIDAL',
+    'CYLINDER': 'TOROIDAL',
+}
+
+
+def radius_to_curvature(radius: float) -> float:
+    """곡률 반경 -> 곡률 (0 또는 inf는 평면)"""
+    if radius == 0 or not np.isfinite(radius):
+        return 0.0
+    return 1.0 / radius
+
+
+def canonical_surface_type(name: str) -> str:
+    """표면 종류 이름 정규화 ('Even Asphere' -> 'EVENASPH')"""
+    key = ' '.join(name.upper().split())
+    return SURFACE_TYPE_ALIASES.get(key, key)
+
+
+class Prescription:
+    """
+    순차 렌즈 처방 (배열 기반)
+
+    Attributes:
+        curvature: 표면 곡률 (1/mm)
+        thickness: 다음 면까지 거리 (mm, 물체 거리 inf 허용)
+        conic: 코닉 상수
+        semi_diameter: 반구경 (mm, 0이면 제한 없음)
+        glass: 면 뒤 매질 이름 ('' = 공기, 'MIRROR' = 반사면)
+        surface_type: 표면 종류 ('STANDARD' 등)
+        params: (n_surfaces, N_PARAMS) 표면 매개변수 (PARM 1..N)
+        wavelengths: 파장 (μm)
+        fields: y 방향 시야각 (deg)
+        aperture: 입사동 지름 EPD (mm)
+        stop: 조리개 면 번호
+    """
+
+    def __init__(self, wavelengths: Sequence[float] = (0.55,),
+                 fields: Sequence[float] = (0.0,), aperture: float = 10.0,
+                 object_distance: float = np.inf, name: str = ''):
+        """
+        물체면과 상면만 있는 빈 처방 생성
+
+        Args:
+            wavelengths: 파장 (μm)
+            fields: 시야각 (deg)
+            aperture: 입사동 지름 (mm)
+            object_distance: 물체 거리 (mm)
+            name: 설계 이름
+        """
+        self.name = name
+        self.curvature = np.zeros(2)
+        self.thickness = np.array([object_distance, 0.0])
+        self.conic = np.zeros(2)
+        self.semi_diameter = np.zeros(2)
+        self.params = np.zeros((2, N_PARAMS))
+        self.glass: List[str] = ['', '']
+        self.surface_type: List[str] = ['STANDARD', 'STANDARD']
+        self.wavelengths = np.asarray(wavelengths, dtype=np.float64)
+        self.fields = np.asarray(fields, dtype=np.float64)
+        self.aperture = float(aperture)
+        self.stop = 1
+
+    @property
+    def n_surfaces(self) -> int:
+        """물체면/상면 포함 표면 수"""
+        return len(self.curvature)
+
+    @property
+    def image_surface(self) -> int:
+        """상면 번호"""
+        return self.n_surfaces - 1
+
+    def add_surface(self, radius: float = np.inf, thickness: float = 0.0,
+                    glass: str = '', conic: float = 0.0, semi_diameter: float = 0.0,
+                    surface_type: str = 'STANDARD', params: Optional[Sequence[float]] = None,
+                    index: Optional[int] = None) -> int:
+        """
+        표면 삽입 (기본: 상면 바로 앞)
+
+        Args:
+            radius: 곡률 반경 (mm)
+            thickness: 다음 면까지 거리 (mm)
+            glass: 면 뒤 매질
+            conic: 코닉 상수
+            semi_diameter: 반구경 (mm)
+            surface_type: 표면 종류
+            params: 표면 매개변수 (PARM 1부터, 나머지는 0)
+            index: 삽입 위치 (None이면 상면 앞)
+
+        Returns:
+            삽입된 표면 번호
+        """
+        if index is None:
+            index = self.image_surface
+        if not 1 <= index <= self.image_surface:
+            raise ValueError(f"surface index must be in 1..{self.image_surface}, got {index}")
+        self.curvature = np.insert(self.curvature, index, radius_to_curvature(radius))
+        self.thickness = np.insert(self.thickness, index, thickness)
+        self.conic = np.insert(self.conic, index, conic)
+        self.semi_diameter = np.insert(self.semi_diameter, index, semi_diameter)
+        row = np.zeros(N_PARAMS)
+        if params is not None:
+            row[:len(params)] = params
+        self.params = np.insert(self.params, index, row, axis=0)
+        self.glass.insert(index, glass)
+        self.surface_type.insert(index, canonical_surface_type(surface_type))
+        # 빈 처방에 처음 추가한 면이 기본 조리개
+        if self.stop >= index and self.n_surfaces > 3:
+            self.stop += 1
+        return index
+
+    def set_surface(self, index: int, **params):
+        """
+        표면 매개변수 변경
+
+        Args:
+            index: 표면 번호
+            **params: radius, curvature, thickness, conic, semi_diameter,
+                glass, surface_type, params (PARM 1부터의 값 시퀀스)
+        """
+        for key, value in params.items():
+            if key == 'radius':
+                self.curvature[index] = radius_to_curvature(value)
+            elif key == 'params':
+                self.params[index] = 0.0
+                self.params[index, :len(value)] = value
+            elif key in SURFACE_ARRAYS:
+                getattr(self, key)[index] = value
+            elif key == 'surface_type':
+                self.surface_type[index] = canonical_surface_type(value)
+            elif key == 'glass':
+                self.glass[index] = value
+            else:
+                raise ValueError(f"unknown surface parameter {key!r}")
+
+    @property
+    def radius(self) -> np.ndarray:
+        """곡률 반경 (평면은 inf)"""
+        with np.errstate(divide='ignore'):
+            return np.where(self.curvature == 0, np.inf, 1.0 / self.curvature)
+
+    def vertex_z(self) -> np.ndarray:
+        """
+        각 면 꼭짓점의 z 위치 (1번 면 = 0, 물체면은 -물체 거리)
+
+        Returns:
+            (n_surfaces,) 배열
+        """
+        z = np.zeros(self.n_surfaces)
+        z[0] = -self.thickness[0]
+        z[2:] = np.cumsum(self.thickness[1:-1])
+        return z
+
+    def copy(self) -> 'Prescription':
+        """깊은 복사"""
+        return copy.deepcopy(self)
+
+    def to_dict(self) -> Dict:
+        """JSON 직렬화 가능한 딕셔너리"""
+        data = {key: getattr(self, key).tolist() for key in SURFACE_ARRAYS}
+        data['thickness'] = [t if np.isfinite(t) else 'inf' for t in data['thickness']]
+        data['params'] = {str(i): row.tolist() for i, row in enumerate(self.params)
+                          if np.any(row)}
+        data.update(name=self.name, glass=list(self.glass),
+                    surface_type=list(self.surface_type),
+                    wavelengths=self.wavelengths.tolist(), fields=self.fields.tolist(),
+                    aperture=self.aperture, stop=self.stop)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Prescription':
+        """to_dict 결과에서 복원"""
+        presc = cls(data['wavelengths'], data['fields'], data['aperture'],
+                    name=data.get('name', ''))
+        for key in SURFACE_ARRAYS:
+            setattr(presc, key, np.array([float(v) for v in data[key]]))
+        presc.params = np.zeros((presc.n_surfaces, N_PARAMS))
+        for i, row in data.get('params', {}).items():
+            presc.params[int(i), :len(row)] = row
+        presc.glass = list(data['glass'])
+        presc.surface_type = list(data['surface_type'])
+        presc.stop = int(data['stop'])
+        return presc
+
+    def save_json(self, filepath: Union[str, Path]):
+        """JSON 파일로 저장"""
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load_json(cls, filepath: Union[str, Path]) -> 'Prescription':
+        """JSON 파일에서 로드"""
+        with open(filepath) as f:
+            return cls.from_dict(json.load(f))
+
+    def __repr__(self) -> str:
+        return (f"Prescription({self.name!r}, surfaces={self.n_surfaces}, "
+                f"wavelengths={self.wavelengths.tolist()}, fields={self.fields.tolist()}, "
+                f"EPD={self.aperture})")
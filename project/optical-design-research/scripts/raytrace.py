@@ -0,0 +1,449 @@
+"""
+Sequential Ray Tracing Module
+순차 광선 추적 모듈
+
+This module traces ray bundles through a sequential prescription with numpy
+and derives paraxial data, spot diagrams and geometric MTF.
+순차 렌즈 처방을 통과하는 광선 묶음을 numpy로 추적하고, 근축 데이터,
+스팟 다이어그램, 기하 MTF를 계산합니다.
+
+좌표계: 1번 면 꼭짓점이 원점, 광축은 +z, 시야는 y 방향입니다.
+광선 묶음은 (n, 3) 위치/방향 배열과 유효 마스크로 표현되며, 교점이 없거나
+반구경 밖이거나 전반사된 광선은 유효 마스크가 False가 되어 이후 면에서
+계산에서만 제외됩니다 (배열 크기는 유지).
+
+표면 종류별 교점/법선 함수는 SURFACE_INTERSECTORS에 등록합니다 (새그와
+뉴턴 교점은 surfaces 모듈). 근축 추적은 비구면/토로이드의 2차 항을 포함한
+y 단면 곡률을 씁니다.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .glass_catalog import MIRROR, canonical_name, refractive_index
+from .prescription import Prescription
+from .surfaces import (conic_intersection, intersect_even_asphere, intersect_toroidal,
+                       paraxial_curvature, sag_normal)
+
+
+@dataclass
+class RayBundle:
+    """
+    광선 묶음
+
+    Attributes:
+        position: (n, 3) 전역 좌표 위치 (mm)
+        direction: (n, 3) 단위 방향 벡터
+        valid: (n,) 유효 광선 마스크
+        surface: 광선이 마지막으로 도달한 면 번호
+    """
+    position: np.ndarray
+    direction: np.ndarray
+    valid: np.ndarray
+    surface: int = 0
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def copy(self) -> 'RayBundle':
+        """배열 복사본"""
+        return RayBundle(self.position.copy(), self.direction.copy(),
+                         self.valid.copy(), self.surface)
+
+
+@dataclass
+class ParaxialData:
+    """
+    근축 1차 특성
+
+    Attributes:
+        efl: 유효 초점거리 (mm)
+        bfl: 후초점거리 - 마지막 렌즈면에서 근축 초점까지 (mm)
+        enp_z: 입사동 위치 (1번 면 기준, mm)
+        enp_diameter: 입사동 지름 (mm)
+        f_number: 근축 F수 (EFL / EPD)
+    """
+    efl: float
+    bfl: float
+    enp_z: float
+    enp_diameter: float
+    f_number: float
+
+
+def medium_indices(presc: Prescription, wavelength_um: float) -> np.ndarray:
+    """
+    각 면 뒤 매질의 부호 있는 굴절률 (반사면마다 부호 반전)
+
+    Args:
+        presc: 렌즈 처방
+        wavelength_um: 파장 (μm)
+
+    Returns:
+        (n_surfaces,) 배열
+    """
+    n = np.empty(presc.n_surfaces)
+    current = 1.0
+    for i, glass in enumerate(presc.glass):
+        if canonical_name(glass) == MIRROR:
+            current = -current
+        else:
+            current = np.copysign(refractive_index(glass, float(wavelength_um)), current)
+        n[i] = current
+    return n
+
+
+# ---------------------------------------------------------------------------
+# 표면 교점/법선
+# ---------------------------------------------------------------------------
+
+def intersect_conic(p: np.ndarray, d: np.ndarray, presc: Prescription,
+                    i: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    코닉 면 교점 (닫힌 식, 꼭짓점에 가까운 근)
+
+    Args:
+        p: (n, 3) 면 국소 좌표 위치
+        d: (n, 3) 방향
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (t, 유효 마스크)
+    """
+    return conic_intersection(p, d, presc.curvature[i], presc.conic[i])
+
+
+def normal_conic(p: np.ndarray, presc: Prescription, i: int) -> np.ndarray:
+    """
+    코닉 면 단위 법선 (+z 방향 성분이 양수)
+
+    Args:
+        p: (n, 3) 면 위의 국소 좌표
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (n, 3) 단위 법선
+    """
+    c, k = presc.curvature[i], presc.conic[i]
+    normal = np.stack([-c * p[:, 0], -c * p[:, 1], 1.0 - c * (1.0 + k) * p[:, 2]], axis=1)
+    return normal / np.linalg.norm(normal, axis=1, keepdims=True)
+
+
+# 표면 종류: (교점 함수, 법선 함수)
+SURFACE_INTERSECTORS: Dict[str, Tuple[Callable, Callable]] = {
+    'STANDARD': (intersect_conic, normal_conic),
+    'EVENASPH': (intersect_even_asphere, sag_normal),
+    'TOROIDAL': (intersect_toroidal, sag_normal),
+}
+
+
+def _bend(d: np.ndarray, normal: np.ndarray, n1: float, n2: float,
+          mirror: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """벡터 스넬 굴절 또는 반사 (전반사 광선은 무효)"""
+    cos_i = np.einsum('ij,ij->i', d, normal)
+    if mirror:
+        return d - 2 * cos_i[:, None] * normal, np.ones(len(d), dtype=bool)
+    # 법선을 입사 방향 쪽으로 맞춤
+    sign = np.where(cos_i < 0, -1.0, 1.0)
+    cos_i = np.abs(cos_i)
+    normal = normal * sign[:, None]
+    eta = n1 / n2
+    k = 1.0 - eta**2 * (1.0 - cos_i**2)
+    ok = k >= 0
+    cos_t = np.sqrt(np.where(ok, k, 0.0))
+    out = eta * d + (cos_t - eta * cos_i)[:, None] * normal
+    return out, ok
+
+
+def trace(presc: Prescription, bundle: RayBundle, wavelength_um: float,
+          last: Optional[int] = None, indices: Optional[np.ndarray] = None) -> RayBundle:
+    """
+    광선 묶음을 bundle.surface 다음 면부터 last 면까지 추적
+
+    Args:
+        presc: 렌즈 처방
+        bundle: 시작 광선 묶음 (변경하지 않음)
+        wavelength_um: 파장 (μm)
+        last: 마지막 면 번호 (None이면 상면)
+        indices: medium_indices 결과 (반복 호출 시 재사용)
+
+    Returns:
+        last 면에서 굴절/반사된 뒤의 광선 묶음
+    """
+    if last is None:
+        last = presc.image_surface
+    if indices is None:
+        indices = medium_indices(presc, wavelength_um)
+    z = presc.vertex_z()
+    pos, dirs, valid = bundle.position.copy(), bundle.direction.copy(), bundle.valid.copy()
+
+    for i in range(bundle.surface + 1, last + 1):
+        surface_type = presc.surface_type[i]
+        if surface_type not in SURFACE_INTERSECTORS:
+            raise ValueError(f"surface {i}: unsupported surface type {surface_type!r}, "
+                             f"expected one of {sorted(SURFACE_INTERSECTORS)}")
+        intersect, normal_fn = SURFACE_INTERSECTORS[surface_type]
+        idx = np.flatnonzero(valid)
+        local = pos[idx] - (0.0, 0.0, z[i])
+        d = dirs[idx]
+        t, ok = intersect(local, d, presc, i)
+        local = local + t[:, None] * d
+        sd = presc.semi_diameter[i]
+        if sd > 0:
+            ok &= local[:, 0]**2 + local[:, 1]**2 <= sd * sd
+        new_d, ok_bend = _bend(d, normal_fn(local, presc, i), abs(indices[i - 1]),
+                               abs(indices[i]), indices[i] * indices[i - 1] < 0)
+        pos[idx] = local + (0.0, 0.0, z[i])
+        dirs[idx] = new_d
+        valid[idx] = ok & ok_bend
+    return RayBundle(pos, dirs, valid, last)
+
+
+# ---------------------------------------------------------------------------
+# 근축 추적
+# ---------------------------------------------------------------------------
+
+def paraxial_trace(presc: Prescription, wavelength_um: float, y: float, u: float,
+                   first: int = 1, last: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    근축 y-nu 추적
+
+    Args:
+        presc: 렌즈 처방
+        wavelength_um: 파장 (μm)
+        y: first 면에서의 광선 높이
+        u: first 면 입사 각도 (근축 기울기)
+        first: 시작 면 번호
+        last: 마지막 면 번호 (None이면 상면 직전 면)
+
+    Returns:
+        (각 면 높이, 각 면 통과 후 기울기) - first..last 순서
+    """
+    if last is None:
+        last = presc.image_surface - 1
+    n = medium_indices(presc, wavelength_um)
+    curvature = paraxial_curvature(presc)
+    heights, slopes = [], []
+    nu = n[first - 1] * u
+    for i in range(first, last + 1):
+        nu = nu - y * curvature[i] * (n[i] - n[i - 1])
+        heights.append(y)
+        slopes.append(nu / n[i])
+        y = y + presc.thickness[i] * nu / n[i]
+    return np.array(heights), np.array(slopes)
+
+
+def paraxial_data(presc: Prescription, wavelength_um: Optional[float] = None) -> ParaxialData:
+    """
+    근축 1차 특성 계산
+
+    Args:
+        presc: 렌즈 처방
+        wavelength_um: 파장 (None이면 첫 번째 파장)
+
+    Returns:
+        ParaxialData
+    """
+    if wavelength_um is None:
+        wavelength_um = float(presc.wavelengths[0])
+    n = medium_indices(presc, wavelength_um)
+    heights, slopes = paraxial_trace(presc, wavelength_um, 1.0, 0.0)
+    with np.errstate(divide='ignore'):
+        efl = -1.0 / (n[presc.image_surface - 1] * slopes[-1])
+        bfl = -heights[-1] / slopes[-1]
+
+    enp_z = 0.0
+    if presc.stop > 1:
+        # 조리개 면 높이 = a * y1 + b * u  ->  조리개 중심을 지나는 광선의 축 교차점
+        a = paraxial_trace(presc, wavelength_um, 1.0, 0.0, last=presc.stop)[0][-1]
+        b = paraxial_trace(presc, wavelength_um, 0.0, 1.0, last=presc.stop)[0][-1]
+        enp_z = b / a
+    return ParaxialData(efl=float(efl), bfl=float(bfl), enp_z=float(enp_z),
+                        enp_diameter=presc.aperture,
+                        f_number=float(abs(efl) / presc.aperture))
+
+
+# ---------------------------------------------------------------------------
+# 광선 발사와 분석
+# ---------------------------------------------------------------------------
+
+def pupil_grid(density: int = 6, pattern: str = 'hexapolar',
+               seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    정규화 동공 좌표 (단위 원 내부)
+
+    Args:
+        density: 'hexapolar' 링 수, 'square' 지름 방향 점 수,
+            'random' 점 수
+        pattern: 'hexapolar', 'square' 또는 'random'
+        seed: 'random' 난수 시드
+
+    Returns:
+        (px, py) 배열
+    """
+    if pattern == 'hexapolar':
+        rings = np.arange(1, density + 1)
+        counts = 6 * rings
+        ring_of = np.repeat(rings, counts)
+        j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        theta = 2 * np.pi * j / np.repeat(counts, counts)
+        r = ring_of / density
+        return (np.concatenate(([0.0], r * np.sin(theta))),
+                np.concatenate(([0.0], r * np.cos(theta))))
+    if pattern == 'square':
+        g = np.linspace(-1, 1, density)
+        px, py = np.meshgrid(g, g)
+        keep = px**2 + py**2 <= 1 + 1e-12
+        return px[keep], py[keep]
+    if pattern == 'random':
+        rng = np.random.default_rng(seed)
+        r = np.sqrt(rng.random(density))
+        theta = 2 * np.pi * rng.random(density)
+        return r * np.cos(theta), r * np.sin(theta)
+    raise ValueError(f"pattern must be 'hexapolar', 'square' or 'random', got {pattern!r}")
+
+
+def launch_rays(presc: Prescription, field_deg: float, wavelength_um: float,
+                px: np.ndarray, py: np.ndarray,
+                paraxial: Optional[ParaxialData] = None) -> RayBundle:
+    """
+    물체 공간 광선 묶음 생성 (근축 입사동 조준)
+
+    Args:
+        presc: 렌즈 처방
+        field_deg: y 방향 시야각 (deg)
+        wavelength_um: 파장 (μm)
+        px, py: 정규화 동공 좌표
+        paraxial: paraxial_data 결과 (None이면 계산)
+
+    Returns:
+        0번 면(물체면)에 있는 광선 묶음
+    """
+    if paraxial is None:
+        paraxial = paraxial_data(presc, wavelength_um)
+    px, py = np.broadcast_arrays(np.asarray(px, dtype=np.float64),
+                                 np.asarray(py, dtype=np.float64))
+    radius = paraxial.enp_diameter / 2
+    target = np.stack([px * radius, py * radius, np.full(px.shape, paraxial.enp_z)], axis=1)
+    theta = np.radians(field_deg)
+    object_distance = presc.thickness[0]
+
+    if np.isfinite(object_distance):
+        origin = np.array([0.0, -np.tan(theta) * (paraxial.enp_z + object_distance),
+                           -object_distance])
+        direction = target - origin
+        direction /= np.linalg.norm(direction, axis=1, keepdims=True)
+        position = np.broadcast_to(origin, target.shape).copy()
+    else:
+        direction = np.broadcast_to([0.0, np.sin(theta), np.cos(theta)], target.shape).copy()
+        z_start = min(paraxial.enp_z, 0.0)
+        position = target - direction * ((paraxial.enp_z - z_start) / direction[:, 2:3])
+    return RayBundle(position, direction, np.ones(len(target), dtype=bool), 0)
+
+
+def spot_diagram(presc: Prescription, field_deg: float, wavelength_um: float,
+                 density: int = 6, pattern: str = 'hexapolar',
+                 paraxial: Optional[ParaxialData] = None) -> Dict[str, np.ndarray]:
+    """
+    상면 스팟 다이어그램
+
+    Args:
+        presc: 렌즈 처방
+        field_deg: 시야각 (deg)
+        wavelength_um: 파장 (μm)
+        density: 동공 샘플 밀도 (pupil_grid 참고)
+        pattern: 동공 샘플 패턴
+        paraxial: paraxial_data 결과 (None이면 계산)
+
+    Returns:
+        {'x', 'y': 주광선 기준 상면 좌표 (μm, 유효 광선만),
+         'chief_x', 'chief_y': 주광선 상면 좌표 (mm),
+         'n_launched': 발사 광선 수}
+    """
+    if paraxial is None:
+        paraxial = paraxial_data(presc, wavelength_um)
+    px, py = pupil_grid(density, pattern)
+    px, py = np.concatenate(([0.0], px)), np.concatenate(([0.0], py))
+    indices = medium_indices(presc, wavelength_um)
+    bundle = trace(presc, launch_rays(presc, field_deg, wavelength_um, px, py, paraxial),
+                   wavelength_um, indices=indices)
+    chief = bundle.position[0, :2] if bundle.valid[0] else \
+        bundle.position[1:][bundle.valid[1:], :2].mean(axis=0)
+    valid = bundle.valid[1:]
+    xy = bundle.position[1:][valid, :2]
+    return {'x': (xy[:, 0] - chief[0]) * 1e3, 'y': (xy[:, 1] - chief[1]) * 1e3,
+            'chief_x': float(chief[0]), 'chief_y': float(chief[1]),
+            'n_launched': len(px) - 1}
+
+
+def diffraction_mtf(freq: np.ndarray, f_number: float, wavelength_um: float) -> np.ndarray:
+    """
+    무수차 원형 개구 MTF
+
+    Args:
+        freq: 공간 주파수 (lp/mm)
+        f_number: F수
+        wavelength_um: 파장 (μm)
+
+    Returns:
+        MTF 배열
+    """
+    cutoff = 1.0 / (wavelength_um * 1e-3 * f_number)
+    nu = np.clip(np.asarray(freq, dtype=np.float64) / cutoff, 0.0, 1.0)
+    phi = np.arccos(nu)
+    return 2 / np.pi * (phi - np.cos(phi) * np.sin(phi))
+
+
+def geometric_mtf(x_um: np.ndarray, y_um: np.ndarray,
+                  freq: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    스팟 광선 분포의 기하 MTF (|평균 exp(-2πiνx)|)
+
+    y 방향 시야에서 자오(tangential) 방향은 y, 구결(sagittal) 방향은 x입니다.
+
+    Args:
+        x_um, y_um: 상면 좌표 (μm)
+        freq: 공간 주파수 (lp/mm)
+
+    Returns:
+        (tangential, sagittal) MTF
+    """
+    freq = np.asarray(freq, dtype=np.float64)
+    phase = -2j * np.pi * freq[:, None] * 1e-3
+
+    def modulus(coord):
+        coord = np.asarray(coord, dtype=np.float64)
+        if not len(coord):
+            return np.zeros(len(freq))
+        return np.abs(np.exp(phase * (coord - coord.mean())[None, :]).mean(axis=1))
+
+    return modulus(y_um), modulus(x_um)
+
+
+def rms_spot_radius(presc: Prescription, density: int = 4) -> float:
+    """
+    전 시야/파장 평균 RMS 스팟 반경 (중심 기준, 최적화 메리트)
+
+    Args:
+        presc: 렌즈 처방
+        density: 동공 링 수
+
+    Returns:
+        RMS 반경 (mm), 유효 광선이 없는 조합이 있으면 inf
+    """
+    px, py = pupil_grid(density)
+    total = 0.0
+    for wavelength in presc.wavelengths:
+        paraxial = paraxial_data(presc, wavelength)
+        indices = medium_indices(presc, wavelength)
+        for field in presc.fields:
+            bundle = trace(presc, launch_rays(presc, field, wavelength, px, py, paraxial),
+                           wavelength, indices=indices)
+            xy = bundle.position[bundle.valid, :2]
+            if len(xy) < 2:
+                return np.inf
+            total += np.mean(np.sum((xy - xy.mean(axis=0))**2, axis=1))
+    return float(np.sqrt(total / (len(presc.wavelengths) * len(presc.fields))))
@@ -0,0 +1,240 @@
+"""
+Report Rendering Pipeline
+보고서 렌더링 파이프라인
+
+This module renders summary figures with the object-oriented Agg API in a
+process pool and skips figures whose input data has not changed.
+객체지향 Agg API로 요약 그림을 프로세스 풀에서 렌더링하며, 입력 데이터가
+바뀌지 않은 그림은 건너뜁니다.
+
+pyplot의 전역 상태를 사용하지 않으므로 여러 프로세스/스레드에서 안전하며,
+광선 수가 많은 스팟 다이어그램은 점 대신 2D 히스토그램 밀도 영상으로
+그립니다.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+import numpy as np
+
+
+# 이 광선 수를 넘으면 스팟 다이어그램을 밀도 영상으로 그림
+DENSITY_THRESHOLD = 50_000
+
+MANIFEST_NAME = '.report_manifest.json'
+
+
+def data_digest(data) -> str:
+    """
+    그림 입력 데이터의 내용 해시
+
+    Args:
+        data: 배열/스칼라/문자열/딕셔너리/리스트로 구성된 데이터
+
+    Returns:
+        16진수 해시 문자열
+    """
+    h = hashlib.sha256()
+
+    def update(value):
+        if isinstance(value, Mapping):
+            h.update(b'{')
+            for key in sorted(value, key=str):
+                h.update(str(key).encode() + b':')
+                update(value[key])
+            h.update(b'}')
+        elif isinstance(value, (list, tuple)):
+            h.update(b'[')
+            for v in value:
+                update(v)
+            h.update(b']')
+        elif hasattr(value, 'to_arrays'):
+            # analysis_results.SpotData / MTFData
+            update(value.to_arrays())
+        elif isinstance(value, np.ndarray) or hasattr(value, '__array__'):
+            arr = np.ascontiguousarray(np.asarray(value))
+            h.update(f'{arr.dtype.str}{arr.shape}'.encode())
+            h.update(arr.tobytes() if arr.dtype != object else repr(arr.tolist()).encode())
+        else:
+            h.update(repr(value).encode())
+        h.update(b';')
+
+    update(data)
+    return h.hexdigest()
+
+
+def _draw_spot(ax, x, y, density_threshold: int, bins: int):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if x.size > density_threshold:
+        from matplotlib.colors import LogNorm
+
+        hist, xe, ye = np.histogram2d(x, y, bins=bins)
+        hist = np.ma.masked_equal(hist.T, 0)
+        image = ax.imshow(hist, origin='lower', extent=(xe[0], xe[-1], ye[0], ye[-1]),
+                          norm=LogNorm(), cmap='viridis', interpolation='nearest')
+        ax.figure.colorbar(image, ax=ax, label='Rays / bin')
+        ax.set_title(f'Spot Diagram ({x.size:,} rays)')
+    else:
+        ax.scatter(x, y, s=1)
+        ax.set_title('Spot Diagram')
+    ax.set_xlabel('X (μm)')
+    ax.set_ylabel('Y (μm)')
+    ax.set_aspect('equal')
+    ax.grid(True, alpha=0.3)
+
+
+def render_summary_figure(data: Dict, save_path: Union[str, Path], dpi: int = 150,
+                          density_threshold: int = DENSITY_THRESHOLD,
+                          bins: int = 512) -> Path:
+    """
+    요약 그림 렌더링 (pyplot 없이 Figure + Agg 캔버스 사용)
+
+    Args:
+        data: 'temperature', 'spot_x'/'spot_y' 또는 'spot' (SpotData),
+            'mtf_freq'/'mtf_value' 또는 'mtf' (MTFData), 'performance' 키를
+            가진 딕셔너리
+        save_path: 저장 경로
+        dpi: 해상도
+        density_threshold: 밀도 영상으로 전환할 광선 수
+        bins: 밀도 영상 히스토그램 구간 수
+
+    Returns:
+        저장 경로
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(2, 2)
+
+    # 1. 온도 분포
+    if 'temperature' in data:
+        axes[0, 0].plot(data['temperature'])
+        axes[0, 0].set_title('Temperature Distribution')
+        axes[0, 0].set_xlabel('Position')
+        axes[0, 0].set_ylabel('Temperature (°C)')
+        axes[0, 0].grid(True, alpha=0.3)
+
+    # 2. 스팟 다이어그램
+    if 'spot' in data:
+        _draw_spot(axes[0, 1], data['spot'].x, data['spot'].y, density_threshold, bins)
+    elif 'spot_x' in data and 'spot_y' in data:
+        _draw_spot(axes[0, 1], data['spot_x'], data['spot_y'], density_threshold, bins)
+
+    # 3. MTF 곡선
+    if 'mtf' in data:
+        mtf = data['mtf']
+        # (시야 수, 주파수 수) 배열을 한 번에 그림 (열 = 시야)
+        axes[1, 0].plot(mtf.freq, mtf.tangential.T)
+        axes[1, 0].legend([f'{field:g}°' for field in mtf.fields], title='Field')
+    elif 'mtf_freq' in data and 'mtf_value' in data:
+        axes[1, 0].plot(data['mtf_freq'], data['mtf_value'])
+    if 'mtf' in data or ('mtf_freq' in data and 'mtf_value' in data):
+        axes[1, 0].set_title('MTF Curve')
+        axes[1, 0].set_xlabel('Spatial Frequency (lp/mm)')
+        axes[1, 0].set_ylabel('MTF')
+        axes[1, 0].grid(True, alpha=0.3)
+        axes[1, 0].set_ylim([0, 1])
+
+    # 4. 성능 요약
+    if 'performance' in data:
+        perf = data['performance']
+        axes[1, 1].axis('off')
+
+        text = "Performance Summary\n" + "=" * 30 + "\n\n"
+        for key, value in perf.items():
+            text += f"{key}: {value}\n"
+
+        axes[1, 1].text(0.1, 0.9, text, transform=axes[1, 1].transAxes,
+                        verticalalignment='top', fontfamily='monospace',
+                        fontsize=10)
+
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
+    return Path(save_path)
+
+
+def _render_job(data: Dict, save_path: str, dpi: int, density_threshold: int,
+                bins: int) -> str:
+    render_summary_figure(data, save_path, dpi, density_threshold, bins)
+    return save_path
+
+
+class ReportPipeline:
+    """
+    여러 설계의 요약 그림을 병렬로 렌더링하는 파이프라인
+
+    출력 디렉토리의 매니페스트에 그림별 입력 데이터 해시를 기록하여,
+    데이터와 렌더링 옵션이 같고 파일이 남아 있으면 다시 그리지 않습니다.
+    """
+
+    def __init__(self, out_dir: Union[str, Path], max_workers: Optional[int] = None,
+                 dpi: int = 150, density_threshold: int = DENSITY_THRESHOLD,
+                 bins: int = 512, image_format: str = 'png'):
+        """
+        Args:
+            out_dir: 출력 디렉토리
+            max_workers: 프로세스 수 (1이면 현재 프로세스, None이면 CPU 수)
+            dpi: 해상도
+            density_threshold: 밀도 영상으로 전환할 광선 수
+            bins: 밀도 영상 히스토그램 구간 수
+            image_format: 파일 확장자
+        """
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.dpi = dpi
+        self.density_threshold = density_threshold
+        self.bins = bins
+        self.image_format = image_format
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.out_dir / MANIFEST_NAME) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def render(self, jobs: Mapping[str, Dict], force: bool = False) -> Dict[str, str]:
+        """
+        그림 렌더링
+
+        Args:
+            jobs: {그림 이름: render_summary_figure 데이터}
+            force: True면 해시와 관계없이 모두 렌더링
+
+        Returns:
+            {그림 이름: 'rendered' 또는 'skipped'}
+        """
+        manifest = self._load_manifest()
+        options = (self.dpi, self.density_threshold, self.bins)
+        status, todo = {}, {}
+        for name, data in jobs.items():
+            filename = f'{name}.{self.image_format}'
+            digest = data_digest([data, options])
+            if (not force and manifest.get(filename) == digest
+                    and (self.out_dir / filename).exists()):
+                status[name] = 'skipped'
+            else:
+                todo[name] = (filename, digest)
+
+        args = [(jobs[name], str(self.out_dir / filename), self.dpi,
+                 self.density_threshold, self.bins) for name, (filename, _) in todo.items()]
+        if self.max_workers == 1 or len(args) <= 1:
+            for a in args:
+                _render_job(*a)
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                list(pool.map(_render_job, *zip(*args)))
+
+        for name, (filename, digest) in todo.items():
+            manifest[filename] = digest
+            status[name] = 'rendered'
+        with open(self.out_dir / MANIFEST_NAME, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        return status
@@ -0,0 +1,250 @@
+"""
+Robust Outlier Detection Module
+강건 이상치 검출 모듈
+
+This module flags outliers with median/MAD statistics and returns boolean
+masks that keep multi-channel data aligned.
+중앙값/MAD 통계로 이상치를 검출하고, 다채널 데이터의 정렬이 유지되도록
+불리언 마스크를 반환합니다.
+
+평균/표준편차 기반 방법은 이상치 자체가 표준편차를 키워 검출에 실패하지만,
+중앙값과 MAD(중앙값 절대 편차)는 이상치 비율이 50% 미만이면 영향을 받지
+않습니다. 마스크는 True가 이상치이며, 2D 배열은 열(채널)별로 판정합니다.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# 정규분포에서 MAD를 표준편차로 환산하는 계수
+MAD_SCALE = 1.4826
+
+# 이동 창 계산 시 한 번에 처리하는 행 수 (임시 메모리 제한)
+_ROW_BLOCK = 65536
+
+ArrayLike = Union[np.ndarray, 'pd.DataFrame']
+
+
+def _is_frame(data) -> bool:
+    """DataFrame 여부 (pandas가 이미 로드된 경우에만 가능하므로 import하지 않음)"""
+    pandas = sys.modules.get('pandas')
+    return pandas is not None and isinstance(data, pandas.DataFrame)
+
+
+def _as_2d(data: ArrayLike) -> Tuple[np.ndarray, bool]:
+    values = data.to_numpy(dtype=np.float64) if _is_frame(data) \
+        else np.asarray(data, dtype=np.float64)
+    squeeze = values.ndim == 1
+    return (values[:, None] if squeeze else values), squeeze
+
+
+def _wrap(mask: np.ndarray, data: ArrayLike, squeeze: bool, index=None) -> ArrayLike:
+    if _is_frame(data):
+        import pandas as pd
+
+        return pd.DataFrame(mask, index=data.index if index is None else index,
+                            columns=data.columns)
+    return mask[:, 0] if squeeze else mask
+
+
+def mad_outlier_mask(data: ArrayLike, threshold: float = 3.5) -> ArrayLike:
+    """
+    전역 중앙값/MAD 기반 이상치 마스크 (수정 Z-점수)
+
+    Args:
+        data: (n,) 또는 (n, channels) 배열, 또는 DataFrame
+        threshold: 수정 Z-점수 임계값 (Iglewicz-Hoaglin 권장값 3.5)
+
+    Returns:
+        data와 같은 모양의 불리언 마스크 (True = 이상치)
+    """
+    values, squeeze = _as_2d(data)
+    median = np.nanmedian(values, axis=0)
+    mad = MAD_SCALE * np.nanmedian(np.abs(values - median), axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = np.abs(values - median) / mad
+    mask = np.where(mad > 0, score > threshold, values != median)
+    return _wrap(mask & ~np.isnan(values), data, squeeze)
+
+
+def _hampel_rows(padded: np.ndarray, half_window: int, n_sigmas: float,
+                 rows: slice) -> np.ndarray:
+    """
+    패딩된 배열의 rows 구간(원본 행 기준)에 대한 Hampel 판정
+
+    padded는 앞뒤로 half_window 행이 추가된 배열이며, 패딩 값이 NaN인 경우
+    해당 창은 nanmedian으로 처리합니다.
+    """
+    w = 2 * half_window + 1
+    out = np.empty((rows.stop - rows.start, padded.shape[1]), dtype=bool)
+    for start in range(rows.start, rows.stop, _ROW_BLOCK):
+        stop = min(start + _ROW_BLOCK, rows.stop)
+        window = padded[start:stop + 2 * half_window]
+        views = np.lib.stride_tricks.sliding_window_view(window, w, axis=0)  # (m, C, w)
+        center = window[half_window:half_window + (stop - start)]
+        if np.isnan(views).any():
+            median = np.nanmedian(views, axis=-1)
+            mad = MAD_SCALE * np.nanmedian(np.abs(views - median[..., None]), axis=-1)
+        else:
+            median = np.median(views, axis=-1)
+            mad = MAD_SCALE * np.median(np.abs(views - median[..., None]), axis=-1)
+        dev = np.abs(center - median)
+        out[start - rows.start:stop - rows.start] = (dev > n_sigmas * mad) & (mad > 0)
+    return out
+
+
+def hampel_mask(data: ArrayLike, half_window: int = 5,
+                n_sigmas: float = 3.0) -> ArrayLike:
+    """
+    Hampel 필터 이상치 마스크 (중심 이동 창 중앙값/MAD)
+
+    Args:
+        data: (n,) 또는 (n, channels) 배열, 또는 DataFrame
+        half_window: 창 반폭 k (창 크기 2k+1)
+        n_sigmas: MAD 기반 표준편차 배수
+
+    Returns:
+        data와 같은 모양의 불리언 마스크 (True = 이상치)
+    """
+    values, squeeze = _as_2d(data)
+    pad = np.full((half_window, values.shape[1]), np.nan)
+    padded = np.concatenate((pad, values, pad))
+    mask = _hampel_rows(padded, half_window, n_sigmas, slice(0, len(values)))
+    return _wrap(mask, data, squeeze)
+
+
+class HampelStream:
+    """
+    청크 단위 Hampel 판정기 (메모리보다 큰 데이터용)
+
+    판정에 앞뒤 k행이 필요하므로 각 청크의 마지막 k행은 다음 청크가 들어올
+    때 판정됩니다. update()는 (시작 행 번호, 마스크)를 반환하며, 마지막에
+    flush()로 남은 행을 판정합니다. 결과는 hampel_mask()와 동일합니다.
+    """
+
+    def __init__(self, half_window: int = 5, n_sigmas: float = 3.0):
+        """
+        Args:
+            half_window: 창 반폭 k
+            n_sigmas: MAD 기반 표준편차 배수
+        """
+        self.half_window = half_window
+        self.n_sigmas = n_sigmas
+        self._context = None     # 이미 판정된 마지막 k행
+        self._pending = None     # 아직 판정되지 않은 행
+        self._next_row = 0
+
+    def update(self, chunk: ArrayLike) -> Tuple[int, np.ndarray]:
+        """
+        청크 추가
+
+        Args:
+            chunk: (n,) 또는 (n, channels) 배열, 또는 DataFrame
+
+        Returns:
+            (시작 행 번호, (m, channels) 마스크) - m은 0일 수 있음
+        """
+        values, _ = _as_2d(chunk)
+        k = self.half_window
+        if self._context is None:
+            self._context = np.full((k, values.shape[1]), np.nan)
+            self._pending = np.empty((0, values.shape[1]))
+        data = np.concatenate((self._context, self._pending, values))
+        n_ready = max(len(self._pending) + len(values) - k, 0)
+        mask = _hampel_rows(data, k, self.n_sigmas, slice(0, n_ready)) if n_ready \
+            else np.empty((0, values.shape[1]), dtype=bool)
+
+        start = self._next_row
+        self._next_row += n_ready
+        ready_end = len(self._context) + n_ready
+        self._context = data[ready_end - k:ready_end].copy() if k else data[:0]
+        self._pending = data[ready_end:].copy()
+        return start, mask
+
+    def flush(self) -> Tuple[int, np.ndarray]:
+        """
+        남은 행 판정 (스트림 끝)
+
+        Returns:
+            (시작 행 번호, 마스크)
+        """
+        if self._pending is None or not len(self._pending):
+            return self._next_row, np.empty((0, 0 if self._pending is None
+                                             else self._pending.shape[1]), dtype=bool)
+        k = self.half_window
+        pad = np.full((k, self._pending.shape[1]), np.nan)
+        data = np.concatenate((self._context, self._pending, pad))
+        mask = _hampel_rows(data, k, self.n_sigmas, slice(0, len(self._pending)))
+        start = self._next_row
+        self._next_row += len(self._pending)
+        self._pending = self._pending[:0]
+        return start, mask
+
+
+def iter_hampel_masks(chunks: Iterable[ArrayLike], half_window: int = 5,
+                      n_sigmas: float = 3.0) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    청크 이터러블에 대한 Hampel 마스크 스트림
+
+    Args:
+        chunks: 배열 또는 DataFrame 청크 이터러블 (열 수 동일)
+        half_window: 창 반폭 k
+        n_sigmas: MAD 기반 표준편차 배수
+
+    Yields:
+        (시작 행 번호, 마스크) - 빈 마스크는 건너뜀
+    """
+    stream = HampelStream(half_window, n_sigmas)
+    for chunk in chunks:
+        start, mask = stream.update(chunk)
+        if len(mask):
+            yield start, mask
+    start, mask = stream.flush()
+    if len(mask):
+        yield start, mask
+
+
+def iter_csv_outlier_masks(filepath: Union[str, Path],
+                           columns: Optional[Sequence[str]] = None,
+                           chunksize: int = 1_000_000,
+                           half_window: int = 5,
+                           n_sigmas: float = 3.0,
+                           **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    메모리보다 큰 CSV 로그의 열별 Hampel 마스크
+
+    Args:
+        filepath: CSV 파일 경로
+        columns: 검사할 열 이름 (None이면 숫자 열 전체)
+        chunksize: 청크당 행 수
+        half_window: 창 반폭 k
+        n_sigmas: MAD 기반 표준편차 배수
+        **read_csv_kwargs: pandas.read_csv 추가 인자
+
+    Yields:
+        마스크 DataFrame (인덱스 = 파일 내 행 번호, 열 = columns)
+    """
+    import pandas as pd
+
+    reader = pd.read_csv(filepath, usecols=columns, chunksize=chunksize,
+                         **read_csv_kwargs)
+    names = list(columns) if columns is not None else None
+
+    def numeric_chunks():
+        nonlocal names
+        for chunk in reader:
+            if names is None:
+                names = list(chunk.select_dtypes('number').columns)
+            yield chunk[names]
+
+    for start, mask in iter_hampel_masks(numeric_chunks(), half_window, n_sigmas):
+        yield pd.DataFrame(mask, index=pd.RangeIndex(start, start + len(mask)),
+                           columns=names)
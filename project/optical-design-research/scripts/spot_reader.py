@@ -0,0 +1,327 @@
+"""
+Spot Diagram Streaming Reader
+스팟 다이어그램 스트리밍 리더
+
+This module parses Zemax spot-diagram ray exports in bounded-memory chunks.
+대용량 Zemax 스팟 다이어그램 광선 출력을 일정한 메모리로 청크 단위 파싱합니다.
+
+Recognized layout (Zemax text export with ray listing)::
+
+    Spot Diagram
+    ...
+    Wavelength 1 : 0.5500 µm          <- 헤더의 파장 테이블
+    Field 1 : 0.0000 deg              <- 헤더의 필드 테이블
+    ...
+    Field : 1, Wavelength : 1         <- 블록 시작
+    Ray    X    Y                     <- 열 이름 (선택)
+    1    0.0123    -0.0045
+    ...
+
+숫자로 시작하지 않는 줄은 모두 헤더/주석으로 취급하며, 블록 사이의 숫자
+구간은 문자 단위 버퍼로 읽어 C 파서(np.fromstring)로 변환합니다.
+"""
+
+import json
+import re
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# 텍스트(헤더) 줄: 실수 토큰으로 시작하지 않는 비어 있지 않은 줄 ('-----' 구분선 포함)
+_NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+_TEXT_LINE = re.compile(r'^[ \t]*(?!' + _NUMBER + r'(?:[ \t,]|$))\S.*$', re.MULTILINE)
+# 구분선: 글자/숫자가 없는 줄
+_SEPARATOR = re.compile(r'^[\W_]*$')
+_BLOCK_HEADER = re.compile(
+    r'field\s*(?:#|no\.?)?\s*[:=]?\s*(\d+)\D+?wavelength\s*(?:#|no\.?)?\s*[:=]?\s*(\d+)',
+    re.IGNORECASE)
+_WAVELENGTH_ENTRY = re.compile(
+    r'^\s*wavelength\s+(\d+)\s*[:=]\s*([-+0-9.eE]+)', re.IGNORECASE)
+_FIELD_ENTRY = re.compile(
+    r'^\s*field\s+(\d+)\s*[:=]\s*([-+0-9.eE]+)', re.IGNORECASE)
+
+SPOT_READER_VERSION = 2
+
+
+class SpotFileFormatError(ValueError):
+    """스팟 다이어그램 파일 형식 오류"""
+
+    def __init__(self, message: str, filepath: Union[str, Path, None] = None,
+                 line: Optional[int] = None):
+        self.filepath = str(filepath) if filepath is not None else None
+        self.line = line
+        location = ''
+        if self.filepath is not None:
+            location = f"{self.filepath}"
+            if line is not None:
+                location += f":{line}"
+            location += ': '
+        super().__init__(location + message)
+
+
+@dataclass
+class SpotFileHeader:
+    """파일 헤더에서 파싱된 파장/필드 테이블"""
+    wavelengths: Dict[int, float] = field(default_factory=dict)  # 번호 -> μm
+    fields: Dict[int, float] = field(default_factory=dict)       # 번호 -> 값
+    columns: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SpotChunk:
+    """한 (필드, 파장) 블록에 속한 광선 좌표 청크"""
+    field: int
+    wavelength: int
+    x: np.ndarray
+    y: np.ndarray
+    block_index: int
+    start_row: int     # 블록 내 첫 광선의 순번
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+def _column_indices(columns: List[str], ncols: int) -> Tuple[int, int]:
+    """열 이름에서 x, y 열 위치 결정"""
+    names = [c.lower() for c in columns]
+    if len(names) == ncols:
+        xs = [i for i, c in enumerate(names) if c.startswith('x')]
+        ys = [i for i, c in enumerate(names) if c.startswith('y')]
+        if xs and ys:
+            return xs[0], ys[0]
+    # 열 이름이 없으면: (x, y) 또는 (ray, x, y, ...)
+    if ncols == 2:
+        return 0, 1
+    if ncols >= 3:
+        return 1, 2
+    raise ValueError(f"need at least 2 numeric columns, got {ncols}")
+
+
+def _text_lines(text: str) -> Iterator[Tuple[int, int, str]]:
+    for m in _TEXT_LINE.finditer(text):
+        yield m.start(), m.end(), m.group(0)
+
+
+def _parse_numbers(segment: str, dtype) -> np.ndarray:
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        return np.fromstring(segment, dtype=dtype, sep=' ')
+
+
+def iter_spot_chunks(filepath: Union[str, Path],
+                     chunk_chars: int = 16 * 2**20,
+                     dtype=np.float64,
+                     encoding: str = 'utf-8') -> Iterator[SpotChunk]:
+    """
+    스팟 다이어그램 파일을 청크 단위로 스트리밍 파싱
+
+    Args:
+        filepath: 파일 경로
+        chunk_chars: 한 번에 읽을 문자 수 (최대 메모리 사용량 결정)
+        dtype: 좌표 dtype (np.float32 또는 np.float64)
+        encoding: 파일 인코딩
+
+    Yields:
+        SpotChunk (같은 블록이 여러 청크로 나뉠 수 있음)
+
+    Raises:
+        FileNotFoundError: 파일이 없을 때
+        SpotFileFormatError: 숫자 행의 열 수가 맞지 않거나 블록 헤더가 없을 때
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}")
+
+    filepath = Path(filepath)
+    header = SpotFileHeader()
+    block = None           # (field, wavelength)
+    block_index = -1
+    block_rows = 0
+    ncols = None
+    xy = None
+    line_no = 1
+
+    with open(filepath, 'r', encoding=encoding, errors='replace') as f:
+        carry = ''
+        while True:
+            data = f.read(chunk_chars)
+            text = carry + data
+            if data:
+                cut = text.rfind('\n') + 1
+                if cut == 0:
+                    carry = text
+                    continue
+                text, carry = text[:cut], text[cut:]
+            else:
+                carry = ''
+            if not text:
+                break
+
+            pos = 0
+            pending = list(_text_lines(text)) + [(len(text), len(text), None)]
+            for start, end, line in pending:
+                segment = text[pos:start]
+                if segment.strip():
+                    lead = len(segment) - len(segment.lstrip())
+                    seg_line = line_no + text.count('\n', 0, pos + lead)
+                    segment = segment[lead:]
+                    if block is None:
+                        raise SpotFileFormatError(
+                            "ray data before any 'Field/Wavelength' block header",
+                            filepath, seg_line)
+                    values = _parse_numbers_checked(segment, dtype, filepath, seg_line)
+                    if ncols is None:
+                        first = segment.split('\n', 1)[0]
+                        ncols = len(first.split())
+                        try:
+                            xy = _column_indices(header.columns, ncols)
+                        except ValueError as e:
+                            raise SpotFileFormatError(str(e), filepath, seg_line)
+                    if values.size % ncols:
+                        raise SpotFileFormatError(
+                            f"ray rows must have {ncols} columns", filepath,
+                            seg_line + _first_bad_row(segment, ncols))
+                    rows = values.reshape(-1, ncols)
+                    yield SpotChunk(field=block[0], wavelength=block[1],
+                                    x=np.ascontiguousarray(rows[:, xy[0]]),
+                                    y=np.ascontiguousarray(rows[:, xy[1]]),
+                                    block_index=block_index, start_row=block_rows)
+                    block_rows += len(rows)
+                if line is None:
+                    break
+                m = _BLOCK_HEADER.search(line)
+                if m:
+                    block = (int(m.group(1)), int(m.group(2)))
+                    block_index += 1
+                    block_rows = 0
+                    ncols = None
+                    header.columns = []
+                else:
+                    m_w = _WAVELENGTH_ENTRY.match(line)
+                    m_f = _FIELD_ENTRY.match(line)
+                    if m_w and block is None:
+                        header.wavelengths[int(m_w.group(1))] = float(m_w.group(2))
+                    elif m_f and block is None:
+                        header.fields[int(m_f.group(1))] = float(m_f.group(2))
+                    elif not _SEPARATOR.match(line):
+                        header.columns = line.split()
+                pos = end
+            line_no += text.count('\n')
+
+    if block is None:
+        raise SpotFileFormatError("no 'Field/Wavelength' block header found", filepath)
+
+
+def _first_bad_row(segment: str, ncols: int) -> int:
+    """열 수가 맞지 않는 첫 행의 구간 내 줄 오프셋 (오류 보고용)"""
+    for i, row in enumerate(segment.split('\n')):
+        if row.strip() and len(row.split()) != ncols:
+            return i
+    return 0
+
+
+def _parse_numbers_checked(segment: str, dtype, filepath, line: int) -> np.ndarray:
+    try:
+        return _parse_numbers(segment, dtype)
+    except (ValueError, DeprecationWarning):
+        raise SpotFileFormatError("non-numeric value in ray data", filepath, line)
+
+
+def read_spot_header(filepath: Union[str, Path], max_chars: int = 2**16,
+                     encoding: str = 'utf-8') -> SpotFileHeader:
+    """
+    첫 블록 이전의 헤더(파장/필드 테이블)만 읽기
+
+    Args:
+        filepath: 파일 경로
+        max_chars: 읽을 최대 문자 수
+        encoding: 파일 인코딩
+
+    Returns:
+        SpotFileHeader
+    """
+    header = SpotFileHeader()
+    with open(filepath, 'r', encoding=encoding, errors='replace') as f:
+        for line in f.read(max_chars).splitlines():
+            if _BLOCK_HEADER.search(line):
+                break
+            m_w = _WAVELENGTH_ENTRY.match(line)
+            m_f = _FIELD_ENTRY.match(line)
+            if m_w:
+                header.wavelengths[int(m_w.group(1))] = float(m_w.group(2))
+            elif m_f:
+                header.fields[int(m_f.group(1))] = float(m_f.group(2))
+    return header
+
+
+def convert_spot_file(filepath: Union[str, Path], out_dir: Union[str, Path],
+                      dtype=np.float32, chunk_chars: int = 16 * 2**20) -> Path:
+    """
+    스팟 다이어그램 텍스트를 메모리 매핑 가능한 바이너리로 변환
+
+    x.bin / y.bin (원시 배열)과 블록 오프셋 테이블(index.json)을 기록합니다.
+
+    Args:
+        filepath: 원본 텍스트 파일 경로
+        out_dir: 출력 디렉토리
+        dtype: 저장 dtype
+        chunk_chars: 파싱 청크 크기 (문자)
+
+    Returns:
+        출력 디렉토리 경로
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    dtype = np.dtype(dtype)
+    blocks = []
+    total = 0
+    with open(out_dir / 'x.bin', 'wb') as fx, open(out_dir / 'y.bin', 'wb') as fy:
+        for chunk in iter_spot_chunks(filepath, chunk_chars=chunk_chars, dtype=dtype):
+            if not blocks or blocks[-1]['block_index'] != chunk.block_index:
+                blocks.append({'block_index': chunk.block_index,
+                               'field': chunk.field,
+                               'wavelength': chunk.wavelength,
+                               'offset': total, 'count': 0})
+            fx.write(chunk.x.tobytes())
+            fy.write(chunk.y.tobytes())
+            blocks[-1]['count'] += len(chunk)
+            total += len(chunk)
+
+    header = read_spot_header(filepath)
+    index = {
+        'version': SPOT_READER_VERSION,
+        'dtype': dtype.str,
+        'n_rays': total,
+        'wavelengths': {str(k): v for k, v in header.wavelengths.items()},
+        'fields': {str(k): v for k, v in header.fields.items()},
+        'blocks': blocks,
+    }
+    with open(out_dir / 'index.json', 'w') as f:
+        json.dump(index, f, indent=2)
+    return out_dir
+
+
+def open_spot_binary(out_dir: Union[str, Path]) -> Tuple[np.ndarray, np.ndarray, Dict]:
+    """
+    convert_spot_file 결과를 메모리 매핑으로 열기
+
+    Args:
+        out_dir: convert_spot_file 출력 디렉토리
+
+    Returns:
+        (x memmap, y memmap, index 딕셔너리)
+    """
+    out_dir = Path(out_dir)
+    with open(out_dir / 'index.json') as f:
+        index = json.load(f)
+    dtype = np.dtype(index['dtype'])
+    n = index['n_rays']
+    if n == 0:
+        return np.empty(0, dtype), np.empty(0, dtype), index
+    x = np.memmap(out_dir / 'x.bin', dtype=dtype, mode='r', shape=(n,))
+    y = np.memmap(out_dir / 'y.bin', dtype=dtype, mode='r', shape=(n,))
+    return x, y, index
@@ -0,0 +1,296 @@
+"""
+Grouped Spot Statistics Module
+그룹별 스팟 통계 모듈
+
+This module computes spot centroid, RMS and geometric radius for every
+(field, wavelength) group with mergeable streaming accumulators.
+모든 (필드, 파장) 그룹의 중심, RMS, 기하학적 반경을 병합 가능한 스트리밍
+누산기로 계산합니다.
+
+분산은 Welford/Chan 병렬 공식으로 누적하므로 청크나 워커 프로세스의 부분
+결과를 수치적으로 안정하게 합칠 수 있습니다. 최대 반경은 최종 중심을 알아야
+하므로 각 그룹의 볼록 껍질(convex hull) 꼭짓점만 보관합니다 - 임의의 점에서
+가장 먼 점은 항상 볼록 껍질의 꼭짓점입니다.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Tuple, Union
+
+import numpy as np
+
+from .spot_reader import iter_spot_chunks
+
+
+GroupKey = Tuple[int, int]  # (field, wavelength)
+
+# 볼록 껍질 계산이 실패(공선/중복 점)할 때 사용할 극점 탐색 방향 수
+_N_DIRECTIONS = 64
+
+
+@dataclass
+class SpotStats:
+    """한 그룹의 스팟 통계"""
+    n_rays: int
+    centroid_x: float
+    centroid_y: float
+    rms_x: float
+    rms_y: float
+    rms_radius: float
+    geometric_radius: float
+
+
+def _extreme_points(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """볼록 껍질 꼭짓점 (퇴화된 경우 여러 방향의 극점)"""
+    points = np.column_stack((x, y)).astype(np.float64, copy=False)
+    if len(points) <= 3:
+        return points.copy()
+    try:
+        from scipy.spatial import ConvexHull
+        return points[ConvexHull(points).vertices]
+    except Exception:
+        # 공선/단일점: 여러 방향으로의 투영 극값이 곧 껍질 꼭짓점
+        theta = np.linspace(0, np.pi, _N_DIRECTIONS, endpoint=False)
+        proj = points @ np.vstack((np.cos(theta), np.sin(theta)))
+        idx = np.unique(np.concatenate((proj.argmin(axis=0), proj.argmax(axis=0))))
+        return points[idx]
+
+
+class _GroupState:
+    """단일 그룹 누산 상태 (n, 평균, 편차 제곱합, 껍질 점)"""
+
+    __slots__ = ('n', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'hull')
+
+    def __init__(self, n, mean_x, mean_y, m2_x, m2_y, hull):
+        self.n = n
+        self.mean_x = mean_x
+        self.mean_y = mean_y
+        self.m2_x = m2_x
+        self.m2_y = m2_y
+        self.hull = hull
+
+    def merge(self, other: '_GroupState') -> '_GroupState':
+        """Chan et al. 병렬 분산 병합"""
+        n = self.n + other.n
+        if n == 0:
+            return self
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        w = self.n * other.n / n
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.m2_x += other.m2_x + dx * dx * w
+        self.m2_y += other.m2_y + dy * dy * w
+        self.n = n
+        hull = np.vstack((self.hull, other.hull))
+        self.hull = _extreme_points(hull[:, 0], hull[:, 1])
+        return self
+
+    def stats(self) -> SpotStats:
+        var_x = self.m2_x / self.n
+        var_y = self.m2_y / self.n
+        r = np.hypot(self.hull[:, 0] - self.mean_x, self.hull[:, 1] - self.mean_y)
+        return SpotStats(
+            n_rays=int(self.n),
+            centroid_x=float(self.mean_x),
+            centroid_y=float(self.mean_y),
+            rms_x=float(np.sqrt(var_x)),
+            rms_y=float(np.sqrt(var_y)),
+            rms_radius=float(np.sqrt(var_x + var_y)),
+            geometric_radius=float(r.max()),
+        )
+
+
+class SpotAccumulator:
+    """
+    (필드, 파장) 그룹별 스팟 통계 누산기
+
+    청크 단위로 update()를 호출하고, 다른 청크/프로세스의 누산기는
+    merge()로 합칩니다. 누산기는 pickle 가능하므로 워커 결과로 반환할 수
+    있습니다.
+    """
+
+    def __init__(self):
+        self._groups: Dict[GroupKey, _GroupState] = {}
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def update(self, x: np.ndarray, y: np.ndarray,
+               field: Union[int, np.ndarray] = 0,
+               wavelength: Union[int, np.ndarray] = 0) -> 'SpotAccumulator':
+        """
+        광선 청크 추가
+
+        Args:
+            x: x 좌표 배열
+            y: y 좌표 배열
+            field: 필드 번호 (스칼라 또는 광선별 배열)
+            wavelength: 파장 번호 (스칼라 또는 광선별 배열)
+
+        Returns:
+            self
+        """
+        x = np.asarray(x)
+        y = np.asarray(y)
+        if x.shape != y.shape:
+            raise ValueError(f"x and y shapes differ: {x.shape} vs {y.shape}")
+        if x.size == 0:
+            return self
+
+        if np.ndim(field) == 0 and np.ndim(wavelength) == 0:
+            keys = [(int(field), int(wavelength))]
+            inverse = None
+        else:
+            f = np.broadcast_to(np.asarray(field, dtype=np.int64), x.shape)
+            w = np.broadcast_to(np.asarray(wavelength, dtype=np.int64), x.shape)
+            pairs, inverse = np.unique(np.column_stack((f, w)), axis=0,
+                                       return_inverse=True)
+            inverse = inverse.ravel()
+            keys = [(int(a), int(b)) for a, b in pairs]
+
+        if inverse is None:
+            n = np.array([x.size], dtype=np.float64)
+            mean_x = np.array([x.mean(dtype=np.float64)])
+            mean_y = np.array([y.mean(dtype=np.float64)])
+            dx = x - mean_x[0]
+            dy = y - mean_y[0]
+            m2_x = np.array([np.dot(dx, dx)], dtype=np.float64)
+            m2_y = np.array([np.dot(dy, dy)], dtype=np.float64)
+        else:
+            n = np.bincount(inverse, minlength=len(keys)).astype(np.float64)
+            mean_x = np.bincount(inverse, x, len(keys)) / n
+            mean_y = np.bincount(inverse, y, len(keys)) / n
+            dx = x - mean_x[inverse]
+            dy = y - mean_y[inverse]
+            m2_x = np.bincount(inverse, dx * dx, len(keys))
+            m2_y = np.bincount(inverse, dy * dy, len(keys))
+
+        if inverse is None:
+            order = None
+        else:
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.concatenate(([0], np.cumsum(n.astype(np.int64))))
+
+        for i, key in enumerate(keys):
+            if order is None:
+                gx, gy = x, y
+            else:
+                sel = order[bounds[i]:bounds[i + 1]]
+                gx, gy = x[sel], y[sel]
+            state = _GroupState(n[i], mean_x[i], mean_y[i], m2_x[i], m2_y[i],
+                                _extreme_points(gx, gy))
+            if key in self._groups:
+                self._groups[key].merge(state)
+            else:
+                self._groups[key] = state
+        return self
+
+    def merge(self, other: 'SpotAccumulator') -> 'SpotAccumulator':
+        """
+        다른 누산기의 부분 결과 병합
+
+        Args:
+            other: 병합할 누산기
+
+        Returns:
+            self
+        """
+        for key, state in other._groups.items():
+            if key in self._groups:
+                self._groups[key].merge(state)
+            else:
+                self._groups[key] = _GroupState(state.n, state.mean_x, state.mean_y,
+                                                state.m2_x, state.m2_y,
+                                                state.hull.copy())
+        return self
+
+    def result(self) -> Dict[GroupKey, SpotStats]:
+        """
+        그룹별 통계 결과
+
+        Returns:
+            {(field, wavelength): SpotStats}
+        """
+        return {key: self._groups[key].stats() for key in sorted(self._groups)}
+
+    def to_records(self) -> np.ndarray:
+        """
+        결과를 구조화 배열로 변환 (pandas.DataFrame(records)로 바로 사용 가능)
+
+        Returns:
+            필드: field, wavelength, n_rays, centroid_x, centroid_y,
+            rms_x, rms_y, rms_radius, geometric_radius
+        """
+        dtype = [('field', 'i4'), ('wavelength', 'i4'), ('n_rays', 'i8'),
+                 ('centroid_x', 'f8'), ('centroid_y', 'f8'),
+                 ('rms_x', 'f8'), ('rms_y', 'f8'),
+                 ('rms_radius', 'f8'), ('geometric_radius', 'f8')]
+        rows = [(k[0], k[1], s.n_rays, s.centroid_x, s.centroid_y,
+                 s.rms_x, s.rms_y, s.rms_radius, s.geometric_radius)
+                for k, s in self.result().items()]
+        return np.array(rows, dtype=dtype)
+
+
+def grouped_spot_statistics(x: np.ndarray, y: np.ndarray,
+                            field: Union[int, np.ndarray] = 0,
+                            wavelength: Union[int, np.ndarray] = 0,
+                            chunk_size: int = 2**20) -> Dict[GroupKey, SpotStats]:
+    """
+    그룹별 스팟 통계 (고정 크기 청크로 순회하여 임시 메모리 제한)
+
+    Args:
+        x: x 좌표 배열
+        y: y 좌표 배열
+        field: 필드 번호 (스칼라 또는 광선별 배열)
+        wavelength: 파장 번호 (스칼라 또는 광선별 배열)
+        chunk_size: 청크당 광선 수
+
+    Returns:
+        {(field, wavelength): SpotStats}
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    field = field if np.ndim(field) == 0 else np.asarray(field)
+    wavelength = wavelength if np.ndim(wavelength) == 0 else np.asarray(wavelength)
+    acc = SpotAccumulator()
+    for start in range(0, x.size, chunk_size):
+        sl = slice(start, start + chunk_size)
+        acc.update(x[sl], y[sl],
+                   field if np.ndim(field) == 0 else field[sl],
+                   wavelength if np.ndim(wavelength) == 0 else wavelength[sl])
+    return acc.result()
+
+
+def accumulate_chunks(chunks: Iterable) -> SpotAccumulator:
+    """
+    spot_reader.SpotChunk 스트림 누산
+
+    Args:
+        chunks: SpotChunk 이터러블 (iter_spot_chunks 결과 등)
+
+    Returns:
+        SpotAccumulator
+    """
+    acc = SpotAccumulator()
+    for chunk in chunks:
+        acc.update(chunk.x, chunk.y, chunk.field, chunk.wavelength)
+    return acc
+
+
+def spot_statistics_from_file(filepath: Union[str, Path],
+                              chunk_chars: int = 16 * 2**20,
+                              dtype=np.float64) -> Dict[GroupKey, SpotStats]:
+    """
+    스팟 다이어그램 파일을 한 번 읽으며 모든 그룹 통계 계산
+
+    Args:
+        filepath: 스팟 다이어그램 파일 경로
+        chunk_chars: 파싱 청크 크기 (문자)
+        dtype: 좌표 dtype
+
+    Returns:
+        {(field, wavelength): SpotStats}
+    """
+    chunks = iter_spot_chunks(filepath, chunk_chars=chunk_chars, dtype=dtype)
+    return accumulate_chunks(chunks).result()
@@ -0,0 +1,243 @@
+"""
+Streaming Filters Module
+스트리밍 필터 모듈
+
+This module provides stateful filters for live measurement feeds that accept
+sample blocks incrementally.
+실시간 측정 데이터(열전대, 파워미터 등)를 블록 단위로 계속 입력받는 상태 유지
+필터를 제공합니다.
+
+모든 필터는 (n,) 단일 채널 블록 또는 (n, C) 다채널 블록을 받으며, 출력은
+입력과 같은 길이(Decimator 제외)입니다. 필터 상태는 블록 경계와 무관하므로
+블록을 어떻게 나누어 넣어도 전체 배열을 한 번에 처리한 결과와 같습니다.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class StreamingFilter:
+    """스트리밍 필터 기본 클래스"""
+
+    def __init__(self):
+        self._n_channels: Optional[int] = None
+        self._squeeze = False
+        self.n_samples = 0
+
+    def _as_2d(self, block: np.ndarray) -> np.ndarray:
+        block = np.asarray(block, dtype=np.float64)
+        squeeze = block.ndim == 1
+        block = block[:, None] if squeeze else block
+        if block.ndim != 2:
+            raise ValueError(f"block must be (n,) or (n, channels), got {block.shape}")
+        if self._n_channels is None:
+            self._n_channels = block.shape[1]
+            self._squeeze = squeeze
+            self._init_state(block.shape[1])
+        elif block.shape[1] != self._n_channels:
+            raise ValueError(f"expected {self._n_channels} channels, got {block.shape[1]}")
+        return block
+
+    def _output(self, out: np.ndarray) -> np.ndarray:
+        return out[:, 0] if self._squeeze else out
+
+    def _init_state(self, n_channels: int):
+        pass
+
+    def reset(self):
+        """필터 상태 초기화"""
+        self.__init__(**self._params())
+
+    def _params(self) -> dict:
+        return {}
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """
+        샘플 블록 처리
+
+        Args:
+            block: (n,) 또는 (n, channels) 샘플 블록
+
+        Returns:
+            필터링된 블록
+        """
+        block = self._as_2d(block)
+        out = self._process(block) if len(block) else np.empty((0, self._n_channels))
+        self.n_samples += len(block)
+        return self._output(out)
+
+    __call__ = process
+
+    def _process(self, block: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class MovingAverageFilter(StreamingFilter):
+    """
+    후행(trailing) 이동 평균 필터
+
+    최근 window 샘플을 링 버퍼에, 그 합을 누적값으로 보관합니다. 블록마다
+    (입력 - 윈도우에서 빠지는 샘플)의 누적합만 계산하므로 블록 처리 비용은
+    블록 길이에 비례하고 윈도우 크기와 무관합니다 (샘플당 O(1)). 누적값은
+    window 샘플마다 링 버퍼 합으로 다시 맞추므로 장시간 실행에서도 반올림
+    오차가 쌓이지 않습니다 (상각 O(1)). 처음 window-1 샘플은 지금까지의
+    샘플 평균을 출력합니다 (np.convolve(mode='valid')와 달리 길이 유지).
+    """
+
+    def __init__(self, window: int):
+        """
+        Args:
+            window: 윈도우 크기 (샘플)
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        super().__init__()
+        self.window = window
+
+    def _params(self):
+        return {'window': self.window}
+
+    def _init_state(self, n_channels):
+        self._ring = np.zeros((self.window, n_channels))  # 샘플 k는 k % window 칸
+        self._sum = np.zeros(n_channels)
+        self._since_sync = 0
+
+    def _process(self, block):
+        n, w, start = len(block), self.window, self.n_samples
+        # block[i]가 들어올 때 윈도우에서 빠지는 샘플 번호 (음수면 없음)
+        leaving = np.arange(start - w, start - w + n)
+        dropped = np.zeros_like(block)
+        old = (leaving >= 0) & (leaving < start)
+        dropped[old] = self._ring[leaving[old] % w]
+        new = leaving >= start
+        dropped[new] = block[leaving[new] - start]
+
+        cs = np.cumsum(block - dropped, axis=0)
+        count = np.minimum(np.arange(start + 1, start + n + 1), w)
+        out = (self._sum + cs) / count[:, None]
+
+        keep = min(n, w)
+        self._ring[np.arange(start + n - keep, start + n) % w] = block[n - keep:]
+        self._since_sync += n
+        if self._since_sync >= w:
+            self._sum = self._ring.sum(axis=0)
+            self._since_sync = 0
+        else:
+            self._sum = self._sum + cs[-1]
+        return out
+
+
+class ExponentialMovingAverage(StreamingFilter):
+    """
+    지수 이동 평균 (1차 IIR) 필터: y[n] = y[n-1] + α (x[n] - y[n-1])
+
+    첫 샘플로 초기화하므로 시작 과도 응답이 없습니다.
+    """
+
+    def __init__(self, alpha: Optional[float] = None,
+                 time_constant: Optional[float] = None,
+                 sample_interval: float = 1.0):
+        """
+        Args:
+            alpha: 평활 계수 (0 < α <= 1)
+            time_constant: 시정수 (alpha 대신 지정, sample_interval과 같은 단위)
+            sample_interval: 샘플 간격
+        """
+        if (alpha is None) == (time_constant is None):
+            raise ValueError("specify exactly one of alpha or time_constant")
+        if alpha is None:
+            alpha = 1 - np.exp(-sample_interval / time_constant)
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        super().__init__()
+        self.alpha = float(alpha)
+
+    def _params(self):
+        return {'alpha': self.alpha}
+
+    def _init_state(self, n_channels):
+        self._zi = None
+
+    def _process(self, block):
+        from scipy.signal import lfilter
+
+        a = self.alpha
+        if self._zi is None:
+            self._zi = (1 - a) * block[:1]
+        out, self._zi = lfilter([a], [1, a - 1], block, axis=0, zi=self._zi)
+        return out
+
+
+class RunningMedianFilter(StreamingFilter):
+    """
+    후행 이동 중앙값 필터
+
+    최근 window-1 샘플을 상태로 보관하고 블록 전체를 sliding window 뷰로
+    한 번에 계산합니다 (샘플당 O(window), 채널/샘플 방향 모두 벡터화).
+    처음 window-1 샘플은 지금까지의 샘플 중앙값을 출력합니다.
+    """
+
+    def __init__(self, window: int):
+        """
+        Args:
+            window: 윈도우 크기 (샘플)
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        super().__init__()
+        self.window = window
+
+    def _params(self):
+        return {'window': self.window}
+
+    def _init_state(self, n_channels):
+        self._tail = np.full((self.window - 1, n_channels), np.nan)
+
+    def _process(self, block):
+        ext = np.concatenate((self._tail, block))
+        views = np.lib.stride_tricks.sliding_window_view(ext, self.window, axis=0)
+        if self.n_samples >= self.window - 1:
+            out = np.median(views, axis=-1)
+        else:
+            out = np.nanmedian(views, axis=-1)  # 시작 구간만 NaN 패딩 처리
+        self._tail = ext[len(ext) - (self.window - 1):].copy()
+        return out
+
+
+class Decimator(StreamingFilter):
+    """
+    블록 평균(boxcar) 데시메이션
+
+    factor개 샘플마다 하나를 출력하며, 블록 경계에 남은 샘플은 다음 블록으로
+    넘깁니다. mode='mean'은 평균(간단한 저역통과), 'pick'은 마지막 샘플을
+    선택합니다.
+    """
+
+    def __init__(self, factor: int, mode: str = 'mean'):
+        """
+        Args:
+            factor: 데시메이션 배수
+            mode: 'mean' 또는 'pick'
+        """
+        if factor < 1:
+            raise ValueError("factor must be >= 1")
+        if mode not in ('mean', 'pick'):
+            raise ValueError(f"mode must be 'mean' or 'pick', got {mode!r}")
+        super().__init__()
+        self.factor = factor
+        self.mode = mode
+
+    def _params(self):
+        return {'factor': self.factor, 'mode': self.mode}
+
+    def _init_state(self, n_channels):
+        self._pending = np.empty((0, n_channels))
+
+    def _process(self, block):
+        ext = np.concatenate((self._pending, block))
+        n_out = len(ext) // self.factor
+        used = n_out * self.factor
+        self._pending = ext[used:].copy()
+        groups = ext[:used].reshape(n_out, self.factor, ext.shape[1])
+        return groups.mean(axis=1) if self.mode == 'mean' else groups[:, -1]
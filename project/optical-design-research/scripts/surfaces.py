@@ -0,0 +1,360 @@
+"""
+Surface Primitives
+표면 기본 요소
+
+This module evaluates sag and slope of sequential surface types (sphere and
+conic, even asphere, toroid/cylinder) on whole ray arrays and intersects
+rays with them using a batched Newton solver.
+순차 광학계 표면 종류(구면/코닉, 짝수 비구면, 토로이드/원통)의 새그와
+기울기를 광선 배열 단위로 계산하고, 일괄 뉴턴 해법으로 광선 교점을
+구합니다.
+
+표면 종류와 매개변수 (Zemax 표면 종류 이름, params[i, k-1] = PARM k)::
+
+    STANDARD   z = c r^2 / (1 + sqrt(1 - (1+k) c^2 r^2))
+    EVENASPH   STANDARD + Σ α_m r^(2m),  PARM 1..8 = α_1..α_8 (r^2..r^16)
+    TOROIDAL   yz 단면 z_y(y) = STANDARD(y) + Σ β_m y^(2m) 을 z = R인 y축
+               평행 축으로 회전,  PARM 1 = 회전 반경 R (0이면 무한 -> y 방향
+               원통), PARM 2..8 = β_1..β_7 (y^2..y^14)
+
+새그 함수는 (z, dz/dx, dz/dy)를 함께 돌려주므로 뉴턴 반복 한 번에 새그
+계산이 한 번이며, 다항식은 0이 아닌 마지막 계수까지만 호너 방식으로
+계산합니다. 뉴턴 해법은 반복마다 아직 수렴하지 않은 광선만 골라 계산하고,
+짝수 비구면은 기준 코닉의 닫힌 해에서 시작하므로 보통 새그 계산 2회로
+끝나 구면 추적과 처리량 차이가 작습니다.
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .prescription import Prescription
+
+
+# 표면 종류별 다항식 계수 수
+N_ASPHERE_TERMS = 8
+N_TOROIDAL_TERMS = 7
+
+# 뉴턴 교점 기본 허용 오차 (mm)와 최대 반복 수
+NEWTON_TOLERANCE = 1e-12
+NEWTON_MAX_ITERATIONS = 30
+
+
+def _trimmed(coeffs: np.ndarray) -> np.ndarray:
+    """0이 아닌 마지막 계수까지"""
+    nonzero = np.flatnonzero(coeffs)
+    return coeffs[:nonzero[-1] + 1] if len(nonzero) else coeffs[:0]
+
+
+def _even_polynomial(u: np.ndarray, coeffs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    P(u) = Σ a_m u^m (m = 1..)과 dP/du (호너 방식)
+
+    Args:
+        u: r^2 또는 y^2 배열
+        coeffs: a_1, a_2, ... (0이 아닌 마지막 계수까지)
+
+    Returns:
+        (P, dP/du)
+    """
+    if not len(coeffs):
+        zero = np.zeros_like(u)
+        return zero, zero
+    value = coeffs[-1] * u
+    slope = np.full_like(u, len(coeffs) * coeffs[-1])
+    for m in range(len(coeffs) - 1, 0, -1):
+        value += coeffs[m - 1]
+        value *= u
+        slope *= u
+        slope += m * coeffs[m - 1]
+    return value, slope
+
+
+def conic_sag(u: np.ndarray, c: float, k: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    코닉 새그와 dz/d(u) (u = r^2)
+
+    Args:
+        u: r^2 배열
+        c: 곡률 (1/mm)
+        k: 코닉 상수
+
+    Returns:
+        (z, dz/du), 정의역 밖(1 - (1+k) c^2 u < 0)은 NaN
+    """
+    with np.errstate(invalid='ignore'):
+        root = np.sqrt(1.0 - (1.0 + k) * c * c * u)
+    return c * u / (1.0 + root), 0.5 * c / root
+
+
+def sag_standard(x: np.ndarray, y: np.ndarray, presc: Prescription,
+                 i: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    구면/코닉 새그
+
+    Args:
+        x, y: 면 국소 좌표
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (z, dz/dx, dz/dy)
+    """
+    z, dz_du = conic_sag(x * x + y * y, presc.curvature[i], presc.conic[i])
+    return z, 2 * x * dz_du, 2 * y * dz_du
+
+
+def sag_even_asphere(x: np.ndarray, y: np.ndarray, presc: Prescription,
+                     i: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    짝수 비구면 새그 (기준 코닉 + Σ α_m r^2m)
+
+    Args:
+        x, y: 면 국소 좌표
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (z, dz/dx, dz/dy)
+    """
+    u = x * x + y * y
+    z, dz_du = conic_sag(u, presc.curvature[i], presc.conic[i])
+    poly, dpoly = _even_polynomial(u, _trimmed(presc.params[i, :N_ASPHERE_TERMS]))
+    dz_du = dz_du + dpoly
+    return z + poly, 2 * x * dz_du, 2 * y * dz_du
+
+
+def sag_toroidal(x: np.ndarray, y: np.ndarray, presc: Prescription,
+                 i: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    토로이드 새그 (yz 단면 곡선을 z = R 축으로 회전, R = 0이면 y 원통)
+
+    Args:
+        x, y: 면 국소 좌표
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (z, dz/dx, dz/dy), x 방향 정의역 밖은 NaN
+    """
+    v = y * y
+    zy, dzy_dv = conic_sag(v, presc.curvature[i], presc.conic[i])
+    poly, dpoly = _even_polynomial(
+        v, _trimmed(presc.params[i, 1:1 + N_TOROIDAL_TERMS]))
+    zy = zy + poly
+    dzy_dy = 2 * y * (dzy_dv + dpoly)
+    R = presc.params[i, 0]
+    if R == 0:
+        return zy, np.zeros_like(x), dzy_dy
+    arm = R - zy
+    with np.errstate(invalid='ignore'):
+        s = np.sqrt(arm * arm - x * x)
+    sign = np.sign(R)
+    return R - sign * s, sign * x / s, sign * arm * dzy_dy / s
+
+
+# 표면 종류: 새그 함수 (x, y, presc, i) -> (z, dz/dx, dz/dy)
+SAG_FUNCTIONS: Dict[str, Callable] = {
+    'STANDARD': sag_standard,
+    'EVENASPH': sag_even_asphere,
+    'TOROIDAL': sag_toroidal,
+}
+
+
+def surface_sag(presc: Prescription, i: int, x: np.ndarray,
+                y: np.ndarray) -> np.ndarray:
+    """
+    i번 면의 새그
+
+    Args:
+        presc: 렌즈 처방
+        i: 면 번호
+        x, y: 면 국소 좌표 (mm)
+
+    Returns:
+        z 배열 (mm)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64),
+                               np.asarray(y, dtype=np.float64))
+    return _sag_function(presc, i)(x, y, presc, i)[0]
+
+
+def _sag_function(presc: Prescription, i: int) -> Callable:
+    surface_type = presc.surface_type[i]
+    if surface_type not in SAG_FUNCTIONS:
+        raise ValueError(f"surface {i}: no sag function for {surface_type!r}, "
+                         f"expected one of {sorted(SAG_FUNCTIONS)}")
+    return SAG_FUNCTIONS[surface_type]
+
+
+def paraxial_curvature(presc: Prescription) -> np.ndarray:
+    """
+    근축(y 단면) 곡률 - 비구면/토로이드의 r^2, y^2 항 포함
+
+    Returns:
+        (n_surfaces,) 배열
+    """
+    c = presc.curvature.copy()
+    for i, surface_type in enumerate(presc.surface_type):
+        if surface_type == 'EVENASPH':
+            c[i] += 2 * presc.params[i, 0]
+        elif surface_type == 'TOROIDAL':
+            c[i] += 2 * presc.params[i, 1]
+    return c
+
+
+def conic_intersection(p: np.ndarray, d: np.ndarray, c: float,
+                       k: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    코닉 면 교점 (닫힌 식, 꼭짓점에 가까운 근)
+
+    면의 방정식 c(x^2 + y^2 + (1+k) z^2) - 2z = 0에 p + t d를 대입한
+    2차 방정식을 상쇄 오차 없는 형태로 풉니다.
+
+    Args:
+        p: (n, 3) 면 국소 좌표 위치
+        d: (n, 3) 방향
+        c: 곡률 (1/mm)
+        k: 코닉 상수
+
+    Returns:
+        (t, 유효 마스크)
+    """
+    kz = 1.0 + k
+    a = c * (d[:, 0]**2 + d[:, 1]**2 + kz * d[:, 2]**2)
+    b = c * (p[:, 0] * d[:, 0] + p[:, 1] * d[:, 1] + kz * p[:, 2] * d[:, 2]) - d[:, 2]
+    cc = c * (p[:, 0]**2 + p[:, 1]**2 + kz * p[:, 2]**2) - 2 * p[:, 2]
+    disc = b * b - a * cc
+    ok = disc >= 0
+    denom = b + np.copysign(np.sqrt(np.where(ok, disc, 0.0)), b)
+    ok &= denom != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where(ok, -cc / np.where(denom == 0, 1.0, denom), 0.0)
+    return t, ok
+
+
+def newton_intersection(p: np.ndarray, d: np.ndarray, presc: Prescription, i: int,
+                        t0: Optional[np.ndarray] = None,
+                        tolerance: float = NEWTON_TOLERANCE,
+                        max_iterations: int = NEWTON_MAX_ITERATIONS
+                        ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    일괄 뉴턴 교점 - g(t) = p_z + t d_z - sag(p + t d) = 0
+
+    반복마다 아직 수렴하지 않은 광선만 계산합니다. |Δt|가 tolerance
+    이하이거나, 2차 수렴으로 추정한 다음 보정량(|Δt|^3 / |이전 Δt|^2)이
+    tolerance 이하이면 수렴으로 보므로 확인용 반복이 필요 없습니다. 새그가
+    정의역 밖이거나 max_iterations 안에 수렴하지 않은 광선은 유효 마스크가
+    False입니다.
+
+    Args:
+        p: (n, 3) 면 국소 좌표 위치
+        d: (n, 3) 방향
+        presc: 렌즈 처방
+        i: 면 번호
+        t0: 시작값 (None이면 z = 0 평면 교점)
+        tolerance: |Δt| 수렴 기준 (mm)
+        max_iterations: 최대 반복 수
+
+    Returns:
+        (t, 유효 마스크)
+    """
+    sag = _sag_function(presc, i)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = -p[:, 2] / d[:, 2] if t0 is None else np.array(t0, dtype=np.float64)
+    ok = np.isfinite(t)
+    t[~ok] = 0.0
+    previous = np.full(len(t), np.nan)
+    # None = 아직 모든 광선이 미수렴 (인덱싱 없이 전체 배열로 계산)
+    active = None if ok.all() and len(ok) else np.flatnonzero(ok)
+    rays = None
+    for _ in range(max_iterations):
+        if active is None:
+            pxa, pya, pza, dxa, dya, dza = (*p.T, *d.T)
+            ta, prev = t, previous
+        elif len(active):
+            if rays is None:
+                # (6, n) 행 = px, py, pz, dx, dy, dz (미수렴 광선을 한 번에 모음)
+                rays = np.vstack([p.T, d.T])
+            pxa, pya, pza, dxa, dya, dza = np.take(rays, active, axis=1)
+            ta, prev = t[active], previous[active]
+        else:
+            break
+        z, zx, zy = sag(pxa + ta * dxa, pya + ta * dya, presc, i)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = (pza + ta * dza - z) / (dza - zx * dxa - zy * dya)
+        ta = ta - step
+        size = np.abs(step)
+        # 2차 수렴: 다음 보정량 ≈ |Δt|^3 / |이전 Δt|^2
+        keep = (size > tolerance) & ~(size * size * size <= tolerance * prev * prev)
+        bad = ~np.isfinite(step)
+        if bad.any():
+            ta[bad] = 0.0
+            keep &= ~bad
+        if active is None:
+            t, previous = ta, size
+            ok &= ~bad
+            active = None if keep.all() else np.flatnonzero(keep)
+        else:
+            t[active] = ta
+            previous[active] = size
+            ok[active[bad]] = False
+            active = active[keep]
+    else:
+        ok[np.arange(len(t)) if active is None else active] = False
+    return t, ok
+
+
+def intersect_even_asphere(p: np.ndarray, d: np.ndarray, presc: Prescription,
+                           i: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    짝수 비구면 교점 (기준 코닉 교점에서 뉴턴 시작)
+
+    Args:
+        p: (n, 3) 면 국소 좌표 위치
+        d: (n, 3) 방향
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (t, 유효 마스크)
+    """
+    t0, ok = conic_intersection(p, d, presc.curvature[i], presc.conic[i])
+    if not ok.all():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t0 = np.where(ok, t0, -p[:, 2] / d[:, 2])
+    return newton_intersection(p, d, presc, i, t0)
+
+
+def intersect_toroidal(p: np.ndarray, d: np.ndarray, presc: Prescription,
+                       i: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    토로이드/원통 교점 (z = 0 평면 교점에서 뉴턴 시작)
+
+    Args:
+        p: (n, 3) 면 국소 좌표 위치
+        d: (n, 3) 방향
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (t, 유효 마스크)
+    """
+    return newton_intersection(p, d, presc, i)
+
+
+def sag_normal(p: np.ndarray, presc: Prescription, i: int) -> np.ndarray:
+    """
+    새그 기울기로 구한 단위 법선 (+z 방향 성분이 양수)
+
+    Args:
+        p: (n, 3) 면 위의 국소 좌표
+        presc: 렌즈 처방
+        i: 면 번호
+
+    Returns:
+        (n, 3) 단위 법선
+    """
+    _, zx, zy = _sag_function(presc, i)(p[:, 0], p[:, 1], presc, i)
+    normal = np.stack([-zx, -zy, np.ones(len(p))], axis=1)
+    return normal / np.linalg.norm(normal, axis=1, keepdims=True)
@@ -0,0 +1,483 @@
+"""
+Surrogate-Assisted Optimization
+대리 모델 기반 최적화
+
+This module fits a Gaussian-process surrogate to evaluated merit values,
+proposes exploration points by expected improvement and skips true merit
+evaluations that the surrogate is confident would be rejected.
+평가된 메리트 값으로 가우시안 프로세스 대리 모델을 학습하고, 기대 개선량으로
+탐색점을 제안하며, 대리 모델이 기각될 것으로 확신하는 점의 실제 메리트
+평가를 건너뜁니다.
+
+흐름 (surrogate_minimize)::
+
+    1. (n_explore > 0) 탐색: 시작점과 주변 라틴 하이퍼큐브 점을 실제 평가한
+       뒤, 현재 최고점 중심 신뢰 영역의 후보 중 기대 개선량(EI)이 최대인
+       점을 실제 평가 (영역은 개선되면 넓히고 실패가 이어지면 좁힘)
+    2. 다듬기: 최고점에서 Nelder-Mead. 반사/확장/수축 시험점은 GP 신뢰
+       하한 exp(평균 - kappa * 표준편차)가 채택 기준 이상이면 실제 평가
+       없이 기각 (screen). 단체에는 실제 값만 들어감
+    3. 실제 평가한 점 중 최고점을 반환
+
+EI 탐색은 선택 사항입니다: n_explore 기본값은 0이라 지정하지 않으면 기대
+개선량 제안 없이 선별 Nelder-Mead만 실행합니다. max_true는 엄격한 상한으로,
+상한을 넘는 실제 평가 직전에 멈춥니다.
+
+입력은 (x - 중심) / 척도로 정규화하고, 메리트는 양수이므로 log를 모델링해
+신뢰 하한이 상대 오차 기준이 되도록 합니다. 대리 모델로 기각한 시험점 수는
+n_surrogate (optimization_info['skipped_trials'])로 보고합니다. 기각 뒤의
+단체 경로는 선별 없는 Nelder-Mead와 달라지므로 이 값은 절약한 실제 평가 수가
+아닙니다. 절약량은 screen=False 실행과 실제 평가 수, 메리트를 비교해서
+구합니다.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# GP 길이 척도 초기 후보 (정규화 입력 기준, 로그 주변 우도 최대인 값에서 시작)
+LENGTH_SCALES = (0.1, 0.2, 0.4, 0.8, 1.6, 3.2)
+
+# 차원별 길이 척도 범위
+LENGTH_SCALE_BOUNDS = (1e-2, 1e2)
+
+
+class _BudgetExhausted(Exception):
+    """실제 평가 상한 도달 (상한을 넘는 평가 직전에 발생)"""
+
+
+class GaussianProcess:
+    """
+    차원별 길이 척도(ARD) 제곱 지수 커널 가우시안 프로세스 회귀
+    (상수 평균, 결정적 함수)
+
+    신호 분산은 해석적으로 정하고, 길이 척도는 LENGTH_SCALES 중 로그 주변
+    우도가 최대인 등방 값에서 시작해 L-BFGS-B로 차원별로 최적화합니다.
+    fit(optimize=False)는 기존 길이 척도로 Cholesky 분해만 다시 합니다.
+    """
+
+    def __init__(self, length_scales: Sequence[float] = LENGTH_SCALES, nugget: float = 1e-8):
+        """
+        Args:
+            length_scales: 등방 길이 척도 초기 후보
+            nugget: 수치 안정용 대각 항 (상대값)
+        """
+        self.length_scales = tuple(length_scales)
+        self.nugget = nugget
+        self.length_scale: Optional[np.ndarray] = None
+
+    @staticmethod
+    def _sqdist(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        d2 = (a * a).sum(1)[:, None] + (b * b).sum(1)[None, :] - 2 * a @ b.T
+        return np.maximum(d2, 0.0)
+
+    def _factor(self, ell: np.ndarray, gradient: bool = False):
+        """(L, alpha, sigma2, 음의 로그 주변 우도, 기울기 또는 None) - 실패하면 None"""
+        from scipy.linalg import cho_solve
+
+        Xs = self.X / ell
+        K = np.exp(-0.5 * self._sqdist(Xs, Xs))
+        n = len(K)
+        K[np.diag_indices(n)] += self.nugget
+        try:
+            L = np.linalg.cholesky(K)
+        except np.linalg.LinAlgError:
+            return None
+        alpha = cho_solve((L, True), self._r)
+        quad = max(float(self._r @ alpha), 1e-300)
+        nll = 0.5 * n * np.log(quad / n) + np.log(np.diag(L)).sum()
+        if not gradient:
+            return L, alpha, quad / n, nll, None
+        # d(nll)/d(log ell_d), dK/d(log ell_d) = K * (x_i,d - x_j,d)^2 / ell_d^2
+        K_inv = cho_solve((L, True), np.eye(n))
+        W = K_inv - (n / quad) * np.outer(alpha, alpha)
+        grad = np.empty(len(ell))
+        for d in range(len(ell)):
+            diff = (self.X[:, d, None] - self.X[None, :, d]) ** 2 / ell[d] ** 2
+            grad[d] = 0.5 * np.sum(W * K * diff)
+        return L, alpha, quad / n, nll, grad
+
+    def fit(self, X: np.ndarray, y: np.ndarray, optimize: bool = True) -> 'GaussianProcess':
+        """
+        학습
+
+        Args:
+            X: (n, d) 입력
+            y: (n,) 출력
+            optimize: 길이 척도 최적화 여부 (False면 이전 값 재사용)
+
+        Returns:
+            self
+        """
+        from scipy.optimize import minimize
+
+        self.X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        y = np.asarray(y, dtype=np.float64)
+        self.mean = y.mean()
+        self._r = y - self.mean
+        dim = self.X.shape[1]
+
+        if optimize or self.length_scale is None or len(self.length_scale) != dim:
+            start = None
+            for ell in self.length_scales:
+                out = self._factor(np.full(dim, ell))
+                if out is not None and (start is None or out[3] < start[1]):
+                    start = (ell, out[3])
+            if start is None:
+                raise np.linalg.LinAlgError("kernel matrix is not positive definite "
+                                            "for any length scale")
+
+            def objective(log_ell):
+                out = self._factor(np.exp(log_ell), gradient=True)
+                if out is None:
+                    return 1e300, np.zeros(dim)
+                return out[3], out[4]
+
+            bounds = [tuple(np.log(LENGTH_SCALE_BOUNDS))] * dim
+            result = minimize(objective, np.full(dim, np.log(start[0])), jac=True,
+                              method='L-BFGS-B', bounds=bounds, options={'maxiter': 50})
+            self.length_scale = np.exp(result.x)
+
+        out = self._factor(self.length_scale)
+        if out is None:
+            raise np.linalg.LinAlgError("kernel matrix is not positive definite")
+        self._L, self._alpha, self.sigma2 = out[:3]
+        return self
+
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        예측
+
+        Args:
+            X: (m, d) 입력
+
+        Returns:
+            (평균, 표준편차) 각 (m,)
+        """
+        from scipy.linalg import solve_triangular
+
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        ks = np.exp(-0.5 * self._sqdist(X / self.length_scale, self.X / self.length_scale))
+        mean = self.mean + ks @ self._alpha
+        v = solve_triangular(self._L, ks.T, lower=True)
+        var = self.sigma2 * np.maximum(1.0 - (v * v).sum(0), 0.0)
+        return mean, np.sqrt(var)
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float) -> np.ndarray:
+    """
+    최소화 기대 개선량
+
+    Args:
+        mean, std: 예측 평균, 표준편차
+        best: 현재 최솟값
+
+    Returns:
+        EI 배열 (std = 0이면 0)
+    """
+    from scipy.special import ndtr
+
+    std = np.asarray(std, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(std > 0, (best - mean) / std, 0.0)
+    pdf = np.exp(-0.5 * z * z) / np.sqrt(2 * np.pi)
+    return np.where(std > 0, (best - mean) * ndtr(z) + std * pdf, 0.0)
+
+
+class SurrogateMerit:
+    """
+    실제 메리트 함수와 그 대리 모델
+
+    실제 평가한 점은 모두 학습 데이터가 되고, GP는 정규화 입력
+    (x - center) / scale에서 최근 max_points개 점의 log 메리트를
+    모델링합니다 (학습 비용 O(n^3)을 제한하고, 탐색이 머무는 지역에 맞춤).
+    screen()은 대리 모델이 기준값 이상임을 확신하는 점의 실제 평가를
+    건너뜁니다.
+
+    Attributes:
+        n_true: 실제 평가 수
+        n_surrogate: 대리 모델로 기각한 시험점 수
+        max_true: 실제 평가 상한 (None이면 제한 없음, 넘는 평가는 하지 않음)
+    """
+
+    def __init__(self, fn: Callable[[np.ndarray], float], center: np.ndarray,
+                 scale: np.ndarray, kappa: float = 3.0, min_points: int = 8,
+                 max_points: int = 100, max_true: Optional[int] = None):
+        """
+        Args:
+            fn: 실제 메리트 함수 (양수, 실패는 inf)
+            center, scale: 입력 정규화 (x - center) / scale
+            kappa: 건너뛰기 신뢰 하한 = exp(평균 - kappa * 표준편차)
+            min_points: 대리 모델 사용 전 최소 실제 평가 수
+            max_points: GP 학습에 쓰는 최근 실제 평가 수
+            max_true: 실제 평가 상한
+        """
+        self.fn = fn
+        self.center = np.asarray(center, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.kappa = kappa
+        self.min_points = min_points
+        self.max_points = max(max_points, min_points)
+        self.X: List[np.ndarray] = []
+        self.y: List[float] = []
+        self.n_true = 0
+        self.n_surrogate = 0
+        self.max_true = max_true
+        self._gp = GaussianProcess()
+        self._fitted = 0
+        self._optimized_at = 0
+
+    def _log_targets(self, y: Optional[Sequence[float]] = None) -> np.ndarray:
+        y = np.asarray(self.y if y is None else y)
+        finite = np.isfinite(y) & (y > 0)
+        log_y = np.log(np.where(finite, y, 1.0))
+        # 실패 점(inf)은 관측 최댓값보다 크게 두어 모델이 피하도록 함
+        ceiling = log_y[finite].max() + 1.0 if finite.any() else 0.0
+        return np.where(finite, log_y, ceiling)
+
+    def model(self) -> GaussianProcess:
+        """
+        최신 학습 데이터로 맞춘 GP (log 메리트, 정규화 입력)
+
+        길이 척도는 마지막 최적화 뒤 새 점이 학습 창의 20% 이상 쌓였을 때만
+        다시 최적화합니다.
+        """
+        n = len(self.y)
+        if self._fitted != n:
+            window = slice(max(0, n - self.max_points), n)
+            optimize = (self._optimized_at == 0
+                        or n - self._optimized_at >= max(1, 0.2 * min(n, self.max_points)))
+            self._gp.fit(np.array(self.X[window]), self._log_targets(self.y[window]),
+                         optimize=optimize)
+            if optimize:
+                self._optimized_at = n
+            self._fitted = n
+        return self._gp
+
+    def normalize(self, x: np.ndarray) -> np.ndarray:
+        """정규화 입력"""
+        return (np.asarray(x, dtype=np.float64) - self.center) / self.scale
+
+    @property
+    def exhausted(self) -> bool:
+        """실제 평가 상한 도달 여부"""
+        return self.max_true is not None and self.n_true >= self.max_true
+
+    def evaluate(self, x: np.ndarray) -> float:
+        """실제 평가 후 학습 데이터에 추가 (상한에 도달했으면 _BudgetExhausted)"""
+        if self.exhausted:
+            raise _BudgetExhausted
+        value = float(self.fn(np.asarray(x, dtype=np.float64)))
+        self.X.append(self.normalize(x))
+        self.y.append(value)
+        self.n_true += 1
+        return value
+
+    def screen(self, x: np.ndarray, threshold: float) -> Tuple[float, bool]:
+        """
+        기준값 이상임이 확실한 점은 실제 평가를 건너뜀
+
+        Args:
+            x: 변수
+            threshold: 이 값 이상이면 버려질 점의 기준 메리트
+
+        Returns:
+            (메리트, 실제 평가 여부) - 건너뛰면 대리 모델 평균
+        """
+        if len(self.y) >= self.min_points and np.isfinite(threshold) and threshold > 0:
+            mean, std = self.model().predict(self.normalize(x)[None, :])
+            if mean[0] - self.kappa * std[0] >= np.log(threshold):
+                self.n_surrogate += 1
+                return float(np.exp(mean[0])), False
+        return self.evaluate(x), True
+
+    def best(self) -> Tuple[np.ndarray, float]:
+        """실제 평가한 점 중 최고 (x, 메리트)"""
+        k = int(np.argmin(self.y))
+        return self.center + self.X[k] * self.scale, self.y[k]
+
+
+@dataclass
+class SurrogateResult:
+    """
+    대리 모델 최적화 결과
+
+    Attributes:
+        x: 최고 변수 (실제 평가한 점)
+        merit: 최고 메리트 (실제 값)
+        n_true: 실제 평가 수
+        n_surrogate: 대리 모델로 기각한 시험점 수 (절약한 실제 평가 수와 다름)
+        elapsed: 실행 시간 (s)
+        history: 실제 평가 순서의 메리트
+    """
+    x: np.ndarray
+    merit: float
+    n_true: int
+    n_surrogate: int
+    elapsed: float
+    history: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict:
+        """optimization_info 형식 요약"""
+        return {'merit': self.merit, 'n_evaluations': self.n_true,
+                'skipped_trials': self.n_surrogate, 'elapsed': self.elapsed}
+
+
+def _explore(merit: SurrogateMerit, n_true: int, n_candidates: int, rng) -> None:
+    """신뢰 영역 EI 탐색으로 실제 평가 수가 n_true가 될 때까지 점 추가"""
+    from scipy.stats import qmc
+
+    dim = len(merit.center)
+    sampler = qmc.LatinHypercube(d=dim, seed=rng)
+    # 신뢰 영역: 현재 최고점 중심, 반폭 length (정규화 좌표). 연속 개선이면
+    # 넓히고 연속 실패면 좁혀서 초기 상자 밖의 최소점까지 따라감
+    length, successes, failures = 1.0, 0, 0
+    while merit.n_true < n_true and length > 1e-3:
+        log_y = merit._log_targets()
+        center = merit.X[int(np.argmin(log_y))]
+        candidates = center + length * (2 * sampler.random(n_candidates) - 1)
+        mean, std = merit.model().predict(candidates)
+        ei = expected_improvement(mean, std, float(log_y.min()))
+        if ei.max() <= 0:
+            break
+        previous = merit.best()[1]
+        value = merit.evaluate(merit.center + candidates[int(np.argmax(ei))] * merit.scale)
+        if value < previous * (1 - 1e-3):
+            successes, failures = successes + 1, 0
+        else:
+            successes, failures = 0, failures + 1
+        if successes >= 2:
+            length, successes = min(2 * length, 16.0), 0
+        elif failures >= max(4, dim):
+            length, failures = length / 2, 0
+
+
+def screened_nelder_mead(merit: SurrogateMerit, u0: np.ndarray, step: float = 0.1,
+                         max_true: Optional[int] = 400, max_iterations: int = 1000,
+                         xatol: float = 1e-6, fatol: float = 1e-12,
+                         screen: bool = True) -> None:
+    """
+    대리 모델 선별 Nelder-Mead (정규화 좌표, 표준 계수 1, 2, 0.5, 0.5)
+
+    반사/확장/수축 시험점마다 대리 모델이 채택 기준 이상임을 확신하면
+    (screen) 실제 평가 없이 기각합니다. 단체에는 실제 값만 들어갑니다.
+    기각한 시험점이 실제로는 채택될 점이었으면 이후 경로가 선별 없는
+    Nelder-Mead와 달라집니다.
+    실제 평가 수가 max_true에 도달하면 다음 실제 평가 직전에 멈춥니다.
+
+    Args:
+        merit: 실제 메리트와 대리 모델 (결과는 merit.best())
+        u0: 시작점 (정규화 좌표)
+        step: 초기 단체 크기
+        max_true: 실제 평가 상한 (merit.max_true로 설정, None이면 유지)
+        max_iterations: 최대 반복 수
+        xatol, fatol: 수렴 기준 (단체 크기, 메리트 차)
+        screen: False면 선별 없이 모든 시험점을 실제 평가 (비교 기준 실행)
+    """
+    if max_true is not None:
+        merit.max_true = max_true
+    try:
+        _nelder_mead(merit, u0, step, max_iterations, xatol, fatol, screen)
+    except _BudgetExhausted:
+        pass
+
+
+def _nelder_mead(merit: SurrogateMerit, u0: np.ndarray, step: float, max_iterations: int,
+                 xatol: float, fatol: float, screen: bool) -> None:
+    dim = len(u0)
+    to_x = lambda u: merit.center + u * merit.scale
+
+    def trial(u, threshold):
+        return merit.screen(to_x(u), threshold if screen else np.inf)[0]
+
+    simplex = np.vstack([u0, u0 + step * np.eye(dim)])
+    values = np.array([merit.evaluate(to_x(u)) for u in simplex])
+
+    for _ in range(max_iterations):
+        order = np.argsort(values)
+        simplex, values = simplex[order], values[order]
+        if (np.max(np.abs(simplex[1:] - simplex[0])) <= xatol
+                and np.max(np.abs(values[1:] - values[0])) <= fatol):
+            break
+        if merit.exhausted:
+            break
+        centroid = simplex[:-1].mean(axis=0)
+        worst = simplex[-1]
+
+        xr = centroid + (centroid - worst)
+        # 반사점이 최악 이상이면 안쪽 수축으로 감 (실제 값이 필요 없음)
+        fr = trial(xr, values[-1])
+        if fr < values[0]:
+            xe = centroid + 2 * (centroid - worst)
+            fe = trial(xe, fr)
+            simplex[-1], values[-1] = (xe, fe) if fe < fr else (xr, fr)
+            continue
+        if fr < values[-2]:
+            simplex[-1], values[-1] = xr, fr
+            continue
+        if fr < values[-1]:
+            xc, limit = centroid + 0.5 * (xr - centroid), fr
+        else:
+            xc, limit = centroid + 0.5 * (worst - centroid), values[-1]
+        fc = trial(xc, limit)
+        if fc < limit:
+            simplex[-1], values[-1] = xc, fc
+            continue
+        # 축소: 최고점 쪽으로 (실제 평가)
+        simplex[1:] = simplex[0] + 0.5 * (simplex[1:] - simplex[0])
+        values[1:] = [merit.evaluate(to_x(u)) for u in simplex[1:]]
+
+
+def surrogate_minimize(fn: Callable[[np.ndarray], float], x0: np.ndarray, scale: np.ndarray,
+                       max_true: int = 400, n_explore: int = 0, kappa: float = 3.0,
+                       n_candidates: int = 2048, max_iterations: int = 1000,
+                       screen: bool = True, seed: Optional[int] = None) -> SurrogateResult:
+    """
+    대리 모델 기반 최소화
+
+    Args:
+        fn: 실제 메리트 함수 (양수, 실패는 inf)
+        x0: 시작 변수
+        scale: 변수별 척도 (정규화 단위, 초기 단체 = 0.1 * scale)
+        max_true: 실제 평가 상한 (넘는 평가는 하지 않음)
+        n_explore: 다듬기 전에 EI 신뢰 영역 탐색에 쓸 실제 평가 수
+            (0이면 x0에서 바로 다듬기)
+        kappa: 선별 신뢰 하한 계수 (클수록 보수적)
+        n_candidates: EI 탐색 반복당 후보 수
+        max_iterations: Nelder-Mead 최대 반복 수
+        screen: False면 대리 모델 선별 없이 Nelder-Mead 실행 (비교 기준)
+        seed: 난수 시드
+
+    Returns:
+        SurrogateResult
+    """
+    from scipy.stats import qmc
+
+    start = time.time()
+    x0 = np.asarray(x0, dtype=np.float64)
+    dim = len(x0)
+    rng = np.random.default_rng(seed)
+    merit = SurrogateMerit(fn, x0, scale, kappa=kappa, min_points=2 * dim + 2,
+                           max_true=max_true)
+
+    try:
+        if n_explore > 0:
+            merit.evaluate(x0)
+            initial = qmc.LatinHypercube(d=dim, seed=rng).random(2 * dim + 1)
+            for u in initial:
+                merit.evaluate(x0 + (2 * u - 1) * merit.scale)
+            _explore(merit, min(n_explore, max_true), n_candidates, rng)
+    except _BudgetExhausted:
+        pass
+
+    if not merit.exhausted:
+        u_best = merit.normalize(merit.best()[0]) if merit.y else np.zeros(dim)
+        screened_nelder_mead(merit, u_best, max_true=None, max_iterations=max_iterations,
+                             screen=screen)
+    x_best, best = merit.best()
+    return SurrogateResult(x=x_best, merit=best, n_true=merit.n_true,
+                           n_surrogate=merit.n_surrogate, elapsed=time.time() - start,
+                           history=list(merit.y))
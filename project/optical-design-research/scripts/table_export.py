@@ -0,0 +1,233 @@
+"""
+Large Table Export Module
+대용량 표 내보내기 모듈
+
+This module exports large DataFrames to Excel (write-only streaming), CSV,
+HDF5 or Parquet, chosen by file extension.
+대용량 DataFrame을 파일 확장자에 따라 Excel(쓰기 전용 스트리밍), CSV, HDF5,
+Parquet으로 내보냅니다.
+
+    .xlsx          openpyxl write-only 모드, 시트당 행 제한을 넘으면 다음 시트로 분할
+    .csv           청크 단위 추가 쓰기 (표가 여러 개면 <이름>_<표>.csv)
+    .h5 / .hdf5    표마다 그룹, 열마다 압축 청크 데이터셋
+    .parquet       pandas.to_parquet (pyarrow 필요, 표가 여러 개면 파일 분리)
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Excel 시트당 최대 행 수 (헤더 포함)
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_SHEET_NAME = 31
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def _sheet_names(name: str, n_parts: int) -> List[str]:
+    """분할 시트 이름 (31자 제한)"""
+    if n_parts == 1:
+        return [name[:EXCEL_MAX_SHEET_NAME]]
+    names = []
+    for i in range(n_parts):
+        suffix = f'_{i + 1}'
+        names.append(name[:EXCEL_MAX_SHEET_NAME - len(suffix)] + suffix)
+    return names
+
+
+def _excel_rows(df: pd.DataFrame, chunk_rows: int):
+    """NaN을 빈 셀로 바꾼 행 튜플 (청크 단위 변환)"""
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def write_xlsx(data: Dict[str, pd.DataFrame], filepath: Union[str, Path],
+               chunk_rows: int = DEFAULT_CHUNK_ROWS,
+               max_rows: int = EXCEL_MAX_ROWS) -> List[Path]:
+    """
+    Excel 스트리밍 쓰기 (openpyxl write-only)
+
+    Args:
+        data: {시트 이름: DataFrame}
+        filepath: .xlsx 경로
+        chunk_rows: 변환 청크 크기
+        max_rows: 시트당 최대 행 수 (헤더 포함)
+
+    Returns:
+        [filepath]
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    per_sheet = max_rows - 1
+    for name, df in data.items():
+        n_parts = max(1, -(-len(df) // per_sheet))
+        rows = _excel_rows(df, chunk_rows)
+        for sheet_name in _sheet_names(str(name), n_parts):
+            ws = wb.create_sheet(sheet_name)
+            ws.append([str(c) for c in df.columns])
+            for _, row in zip(range(per_sheet), rows):
+                ws.append(row)
+    wb.save(filepath)
+    return [Path(filepath)]
+
+
+def _per_table_paths(data: Dict[str, pd.DataFrame], filepath: Path) -> Dict[str, Path]:
+    if len(data) == 1:
+        return {next(iter(data)): filepath}
+    return {name: filepath.with_name(f'{filepath.stem}_{name}{filepath.suffix}')
+            for name in data}
+
+
+def write_csv(data: Dict[str, pd.DataFrame], filepath: Union[str, Path],
+              chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[Path]:
+    """
+    CSV 청크 쓰기
+
+    Args:
+        data: {표 이름: DataFrame}
+        filepath: .csv 경로 (표가 여러 개면 <stem>_<이름>.csv로 분리)
+        chunk_rows: 청크당 행 수
+
+    Returns:
+        작성된 파일 경로 목록
+    """
+    paths = _per_table_paths(data, Path(filepath))
+    for name, df in data.items():
+        with open(paths[name], 'w', newline='', encoding='utf-8') as f:
+            df.iloc[:0].to_csv(f, index=False)
+            for start in range(0, len(df), chunk_rows):
+                df.iloc[start:start + chunk_rows].to_csv(f, index=False, header=False)
+    return list(paths.values())
+
+
+def write_hdf5(data: Dict[str, pd.DataFrame], filepath: Union[str, Path],
+               chunk_rows: int = DEFAULT_CHUNK_ROWS,
+               compression: str = 'gzip') -> List[Path]:
+    """
+    HDF5 열 단위 쓰기 (표마다 그룹, 열마다 데이터셋)
+
+    Args:
+        data: {표 이름: DataFrame}
+        filepath: .h5 경로
+        chunk_rows: HDF5 청크 크기 (행)
+        compression: 'gzip', 'lzf' 또는 None
+
+    Returns:
+        [filepath]
+    """
+    import h5py
+    import pandas as pd
+
+    with h5py.File(filepath, 'w') as f:
+        for name, df in data.items():
+            group = f.create_group(str(name))
+            group.attrs['columns'] = [str(c) for c in df.columns]
+            group.attrs['n_rows'] = len(df)
+            chunks = (max(1, min(chunk_rows, len(df))),) if len(df) else None
+            for col in df.columns:
+                values = df[col].to_numpy()
+                if values.dtype.kind in 'OUS' or isinstance(df[col].dtype, pd.StringDtype):
+                    values = values.astype(object).astype(str).astype(object)
+                    dtype = h5py.string_dtype()
+                elif values.dtype.kind == 'M':
+                    values = values.astype('datetime64[ns]').view(np.int64)
+                    dtype = values.dtype
+                else:
+                    dtype = values.dtype
+                ds = group.create_dataset(str(col), data=values, dtype=dtype,
+                                          chunks=chunks,
+                                          compression=compression if chunks else None)
+                if df[col].dtype.kind == 'M':
+                    ds.attrs['datetime64'] = 'ns'
+    return [Path(filepath)]
+
+
+def read_hdf5(filepath: Union[str, Path]) -> Dict[str, pd.DataFrame]:
+    """
+    write_hdf5 결과 읽기
+
+    Args:
+        filepath: .h5 경로
+
+    Returns:
+        {표 이름: DataFrame}
+    """
+    import h5py
+    import pandas as pd
+
+    result = {}
+    with h5py.File(filepath, 'r') as f:
+        for name, group in f.items():
+            columns = {}
+            for col in group.attrs['columns']:
+                ds = group[col]
+                if h5py.check_string_dtype(ds.dtype) is not None:
+                    values = ds.asstr()[()]
+                elif 'datetime64' in ds.attrs:
+                    values = ds[()].view('datetime64[ns]')
+                else:
+                    values = ds[()]
+                columns[col] = values
+            result[name] = pd.DataFrame(columns)
+    return result
+
+
+def write_parquet(data: Dict[str, pd.DataFrame], filepath: Union[str, Path],
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[Path]:
+    """
+    Parquet 쓰기 (pyarrow 필요)
+
+    Args:
+        data: {표 이름: DataFrame}
+        filepath: .parquet 경로 (표가 여러 개면 파일 분리)
+        chunk_rows: row group 크기
+
+    Returns:
+        작성된 파일 경로 목록
+    """
+    paths = _per_table_paths(data, Path(filepath))
+    for name, df in data.items():
+        df.to_parquet(paths[name], index=False, row_group_size=chunk_rows)
+    return list(paths.values())
+
+
+WRITERS = {
+    '.xlsx': write_xlsx,
+    '.csv': write_csv,
+    '.h5': write_hdf5,
+    '.hdf5': write_hdf5,
+    '.parquet': write_parquet,
+}
+
+
+def export_tables(data: Dict[str, pd.DataFrame], filepath: Union[str, Path],
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS) -> List[Path]:
+    """
+    확장자에 따라 형식을 골라 표 내보내기
+
+    Args:
+        data: {표 이름: DataFrame} (DataFrame이 아닌 값은 무시)
+        filepath: 출력 경로 (.xlsx, .csv, .h5, .hdf5, .parquet)
+        chunk_rows: 청크 크기
+
+    Returns:
+        작성된 파일 경로 목록
+    """
+    import pandas as pd
+
+    suffix = Path(filepath).suffix.lower()
+    if suffix not in WRITERS:
+        raise ValueError(f"unsupported export format {suffix!r}, "
+                         f"expected one of {sorted(WRITERS)}")
+    tables = {name: df for name, df in data.items() if isinstance(df, pd.DataFrame)}
+    return WRITERS[suffix](tables, filepath, chunk_rows=chunk_rows)
@@ -7,7 +7,6 @@ This module provides thermal analysis calculations for optical modules.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
 from typing import Tuple, Dict, List
 from dataclasses import dataclass
 
@@ -329,6 +328,8 @@ if __name__ == "__main__":
                                 time, heat_input)
     
     # 플롯
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     plt.plot(time, temp, linewidth=2)
     plt.xlabel('Time (s)', fontsize=12)
@@ -0,0 +1,328 @@
+"""
+Thin-Film Coating Module
+박막 코팅 모듈
+
+This module computes reflectance, transmittance and absorptance of
+multilayer thin-film coatings with the characteristic matrix method, for s
+and p polarization and absorbing layers, batched over wavelength x angle
+grids, and caches the resulting coating curves for ray tracing and
+radiometry.
+특성 행렬법으로 다층 박막 코팅의 반사율/투과율/흡수율을 s, p 편광과 흡수
+층을 포함해 파장 x 입사각 격자 전체에 대해 한 번에 계산하고, 결과 코팅
+곡선을 광선 추적과 복사 계산에서 재사용할 수 있도록 캐시합니다.
+
+규약 (Macleod, 입력 굴절률 n + i k는 내부에서 N = n - i k로 바꿈)::
+
+    N = n - i k            (k > 0 흡수)
+    β = n0 sin θ0          (모든 층에서 보존)
+    η_s = N cos θ,  η_p = N / cos θ   (감쇠 가지 Im(N cos θ) <= 0)
+    δ = 2π N d cos θ / λ
+    M_j = [[cos δ, i sin δ / η], [i η sin δ, cos δ]]
+    [B, C] = M_1 ... M_m [1, η_sub]
+    R = |(η0 B - C) / (η0 B + C)|^2,  T = 4 η0 Re(η_sub) / |η0 B + C|^2,  A = 1 - R - T
+
+층은 입사 매질 쪽부터 (재질, 물리 두께 μm) 순서입니다. 2x2 행렬 곱은 (편광,
+파장, 각도) 배열의 원소별 식으로 써서 층마다 numpy 연산 몇 번으로 전체
+격자를 계산합니다.
+
+재질은 유리 카탈로그 이름(GERMANIUM, ZNSE 등), COATING_MATERIALS의 박막
+재질(분산 없는 공칭값), 숫자/복소수 굴절률, 또는 파장 배열 -> 복소 굴절률
+함수로 지정합니다.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .glass_catalog import refractive_index
+
+
+# 박막 재질 공칭 굴절률 (분산 없음, 정밀 계산은 함수나 복소수로 지정)
+COATING_MATERIALS = {
+    'MGF2': 1.38,
+    'SIO2': 1.45,
+    'AL2O3': 1.63,
+    'HFO2': 1.95,
+    'TA2O5': 2.10,
+    'TIO2': 2.30,
+    'ZNS': 2.20,
+    'YF3': 1.40,
+}
+
+Material = Union[str, float, complex, Callable[[np.ndarray], np.ndarray]]
+
+POLARIZATIONS = ('s', 'p', 'u')
+
+
+def material_index(material: Material, wavelength_um: np.ndarray) -> np.ndarray:
+    """
+    재질의 복소 굴절률
+
+    Args:
+        material: 재질 이름, 숫자/복소수, 또는 파장 -> 굴절률 함수
+        wavelength_um: (n,) 파장 (μm)
+
+    Returns:
+        (n,) complex 배열
+    """
+    wavelength_um = np.asarray(wavelength_um, dtype=np.float64)
+    if callable(material):
+        n = material(wavelength_um)
+    elif isinstance(material, str):
+        key = material.strip().upper()
+        if key in COATING_MATERIALS:
+            n = COATING_MATERIALS[key]
+        else:
+            n = [refractive_index(material, float(w)) for w in wavelength_um]
+    else:
+        n = material
+    return np.broadcast_to(np.asarray(n, dtype=np.complex128), wavelength_um.shape).copy()
+
+
+def quarter_wave(material: Material, wavelength_um: float) -> float:
+    """
+    설계 파장의 1/4 파장 물리 두께 (μm)
+
+    Args:
+        material: 재질
+        wavelength_um: 설계 파장 (μm)
+
+    Returns:
+        λ / (4 n)
+    """
+    n = material_index(material, np.array([wavelength_um]))[0].real
+    return wavelength_um / (4 * n)
+
+
+def _admittances(n: np.ndarray, beta: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (N cos θ, (2, ...) s/p 경사 어드미턴스)
+
+    Args:
+        n: (W, 1) 복소 굴절률 n + i k
+        beta: (W, A) n0 sin θ0
+    """
+    n = n.conj()
+    ncos = np.sqrt(n * n - beta * beta)
+    # 감쇠 가지: Im <= 0 (Im = 0이면 Re >= 0)
+    flip = (ncos.imag > 0) | ((ncos.imag == 0) & (ncos.real < 0))
+    ncos = np.where(flip, -ncos, ncos)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ncos, np.stack([ncos, n * n / ncos])
+
+
+@dataclass
+class CoatingCurve:
+    """
+    파장 x 입사각 격자의 코팅 곡선
+
+    Attributes:
+        wavelengths: (W,) 파장 (μm, 오름차순)
+        angles: (A,) 입사 매질 입사각 (deg, 오름차순)
+        R: (2, W, A) s/p 반사율
+        T: (2, W, A) s/p 투과율
+    """
+    wavelengths: np.ndarray
+    angles: np.ndarray
+    R: np.ndarray
+    T: np.ndarray
+
+    @property
+    def A(self) -> np.ndarray:
+        """(2, W, A) s/p 흡수율"""
+        return 1.0 - self.R - self.T
+
+    def _select(self, values: np.ndarray, polarization: str) -> np.ndarray:
+        if polarization not in POLARIZATIONS:
+            raise ValueError(f"polarization must be one of {POLARIZATIONS}, "
+                             f"got {polarization!r}")
+        if polarization == 'u':
+            return 0.5 * (values[0] + values[1])
+        return values[POLARIZATIONS.index(polarization)]
+
+    def grid(self, quantity: str = 'R', polarization: str = 'u') -> np.ndarray:
+        """
+        (W, A) 격자 값
+
+        Args:
+            quantity: 'R', 'T' 또는 'A'
+            polarization: 's', 'p' 또는 'u' (비편광 평균)
+        """
+        if quantity not in ('R', 'T', 'A'):
+            raise ValueError(f"quantity must be 'R', 'T' or 'A', got {quantity!r}")
+        return self._select(getattr(self, quantity), polarization)
+
+    def __call__(self, wavelength_um, angle_deg, quantity: str = 'R',
+                 polarization: str = 'u') -> np.ndarray:
+        """
+        광선별 값 (격자 이중 선형 보간, 범위 밖은 가장자리 값)
+
+        Args:
+            wavelength_um: 파장 (스칼라 또는 배열)
+            angle_deg: 입사각 (deg, 배열, 음수는 절댓값)
+            quantity: 'R', 'T' 또는 'A'
+            polarization: 's', 'p' 또는 'u'
+
+        Returns:
+            broadcast(wavelength_um, angle_deg) 모양 배열
+        """
+        values = self.grid(quantity, polarization)
+        w, a = np.broadcast_arrays(np.asarray(wavelength_um, dtype=np.float64),
+                                   np.abs(np.asarray(angle_deg, dtype=np.float64)))
+        iw, fw = _bracket(self.wavelengths, w)
+        ia, fa = _bracket(self.angles, a)
+        low = values[iw, ia] * (1 - fa) + values[iw, ia + 1] * fa
+        high = values[iw + 1, ia] * (1 - fa) + values[iw + 1, ia + 1] * fa
+        return low * (1 - fw) + high * fw
+
+    def save(self, filepath: Union[str, Path]):
+        """npz 파일로 저장"""
+        np.savez(filepath, wavelengths=self.wavelengths, angles=self.angles,
+                 R=self.R, T=self.T)
+
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> 'CoatingCurve':
+        """save 결과에서 복원"""
+        with np.load(filepath) as data:
+            return cls(data['wavelengths'], data['angles'], data['R'], data['T'])
+
+
+def _bracket(axis: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """보간 구간 인덱스와 비율 (축 길이 1이면 비율 0)"""
+    if len(axis) == 1:
+        return np.zeros(x.shape, dtype=np.intp), np.zeros(x.shape)
+    x = np.clip(x, axis[0], axis[-1])
+    i = np.clip(np.searchsorted(axis, x, side='right') - 1, 0, len(axis) - 2)
+    return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+class ThinFilmStack:
+    """
+    다층 박막 코팅
+
+    Example:
+        >>> ar = ThinFilmStack([('MGF2', quarter_wave('MGF2', 0.55))], substrate='N-BK7')
+        >>> curve = ar.curve(np.linspace(0.4, 0.7, 31), np.arange(0, 61, 5))
+        >>> curve(0.55, [0.0, 30.0])
+    """
+
+    def __init__(self, layers: Sequence[Tuple[Material, float]] = (),
+                 substrate: Material = 'N-BK7', incident: Material = '',
+                 cache_size: int = 32):
+        """
+        Args:
+            layers: 입사 쪽부터 (재질, 물리 두께 μm)
+            substrate: 기판 재질
+            incident: 입사 매질 (''= 공기, 흡수 없는 매질)
+            cache_size: curve() 캐시 항목 수
+        """
+        self.layers = tuple((material, float(thickness)) for material, thickness in layers)
+        if any(thickness < 0 for _, thickness in self.layers):
+            raise ValueError("layer thickness must be non-negative")
+        self.substrate = substrate
+        self.incident = incident
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[bytes, CoatingCurve]' = OrderedDict()
+
+    @classmethod
+    def quarter_wave_stack(cls, materials: Sequence[Material], wavelength_um: float,
+                           substrate: Material = 'N-BK7', incident: Material = '',
+                           multiples: Optional[Sequence[float]] = None) -> 'ThinFilmStack':
+        """
+        1/4 파장 (또는 그 배수) 층으로 된 코팅
+
+        Args:
+            materials: 입사 쪽부터 층 재질
+            wavelength_um: 설계 파장 (μm)
+            substrate: 기판 재질
+            incident: 입사 매질
+            multiples: 층별 1/4 파장 배수 (None이면 모두 1)
+
+        Returns:
+            ThinFilmStack
+        """
+        if multiples is None:
+            multiples = [1.0] * len(materials)
+        if len(multiples) != len(materials):
+            raise ValueError("multiples must match materials")
+        return cls([(m, q * quarter_wave(m, wavelength_um))
+                    for m, q in zip(materials, multiples)], substrate, incident)
+
+    def compute(self, wavelengths_um, angles_deg=0.0) -> CoatingCurve:
+        """
+        파장 x 입사각 격자의 R, T (s/p 동시)
+
+        Args:
+            wavelengths_um: (W,) 파장 (μm)
+            angles_deg: (A,) 입사 매질 입사각 (deg, 0 <= θ < 90)
+
+        Returns:
+            CoatingCurve
+        """
+        wl = np.atleast_1d(np.asarray(wavelengths_um, dtype=np.float64))
+        theta = np.atleast_1d(np.asarray(angles_deg, dtype=np.float64))
+        if np.any(wl <= 0):
+            raise ValueError("wavelengths must be positive")
+        if np.any((theta < 0) | (theta >= 90)):
+            raise ValueError("angles must be in [0, 90) degrees")
+        n0 = material_index(self.incident, wl)[:, None]
+        if np.any(n0.imag != 0):
+            raise ValueError("incident medium must be non-absorbing")
+        beta = n0.real * np.sin(np.radians(theta))[None, :]
+        _, eta0 = _admittances(n0, beta)
+        _, eta_sub = _admittances(material_index(self.substrate, wl)[:, None], beta)
+
+        shape = (2, len(wl), len(theta))
+        m11 = np.ones(shape, dtype=np.complex128)
+        m22 = m11.copy()
+        m12 = np.zeros(shape, dtype=np.complex128)
+        m21 = m12.copy()
+        for material, thickness in self.layers:
+            ncos, eta = _admittances(material_index(material, wl)[:, None], beta)
+            # cos δ, i sin δ를 exp(iδ) 하나로
+            e = np.exp(2j * np.pi * thickness / wl[:, None] * ncos)
+            e_inv = 1.0 / e
+            c, s = 0.5 * (e + e_inv), 0.5 * (e - e_inv)
+            # [m] <- [m] @ [[c, s / η], [η s, c]]
+            a12, a21 = s / eta, eta * s
+            m11, m12 = m11 * c + m12 * a21, m11 * a12 + m12 * c
+            m21, m22 = m21 * c + m22 * a21, m21 * a12 + m22 * c
+
+        B = m11 + m12 * eta_sub
+        C = m21 + m22 * eta_sub
+        denom = eta0 * B + C
+        R = np.abs((eta0 * B - C) / denom)**2
+        T = 4 * eta0.real * eta_sub.real / np.abs(denom)**2
+        return CoatingCurve(wl, theta, R, T)
+
+    def curve(self, wavelengths_um, angles_deg=None) -> CoatingCurve:
+        """
+        캐시된 코팅 곡선 (같은 격자면 다시 계산하지 않음)
+
+        Args:
+            wavelengths_um: (W,) 오름차순 파장 (μm)
+            angles_deg: (A,) 오름차순 입사각 (None이면 0..89도 1도 간격)
+
+        Returns:
+            CoatingCurve (캐시 항목이므로 배열을 수정하지 마세요)
+        """
+        if angles_deg is None:
+            angles_deg = np.arange(90.0)
+        wl = np.atleast_1d(np.asarray(wavelengths_um, dtype=np.float64))
+        theta = np.atleast_1d(np.asarray(angles_deg, dtype=np.float64))
+        key = wl.tobytes() + b'|' + theta.tobytes()
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        curve = self.compute(wl, theta)
+        self._cache[key] = curve
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return curve
+
+    def __repr__(self) -> str:
+        return (f"ThinFilmStack(layers={len(self.layers)}, substrate={self.substrate!r}, "
+                f"incident={self.incident!r})")
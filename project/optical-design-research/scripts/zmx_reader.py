@@ -0,0 +1,622 @@
+"""
+ZMX Lens File Reader
+ZMX 렌즈 파일 리더
+
+This module parses OpticStudio sequential .zmx text files into array-backed
+prescriptions without OpticStudio, and caches parsed designs in binary
+sidecar files for fast repeated loads.
+OpticStudio 없이 순차 광학계 .zmx 텍스트 파일을 배열 기반 처방으로 파싱하고,
+파싱 결과를 바이너리 사이드카 파일에 캐시하여 반복 로드를 빠르게 합니다.
+
+Recognized keywords::
+
+    NAME / UNIT / ENPD / FNUM / FTYP / XFLN / YFLN / WAVM / WAVL / PWAV / GCAT
+    SURF n                               <- 표면 블록 시작
+      TYPE / CURV / DISZ / GLAS / CONI / PARM k / DIAM / STOP
+    MNUM n_configs current               <- 다중 구성 (multi-configuration)
+    THIC 3 0 0                           <- 연산자 머리줄 (종류, 인자)
+    MOFF k c "문자열" 값 ...              <- 연산자 k의 구성 c 값
+
+파일은 UTF-16 (OpticStudio 기본) 또는 UTF-8/ASCII일 수 있으며 BOM으로
+구분합니다. 길이는 렌즈 단위(UNIT)에서 mm로 변환합니다. 그 밖의 키워드는
+무시합니다.
+
+사이드카 캐시는 `<파일>.cache`에 처방 배열과 메타데이터를 저장하며,
+원본 크기/수정 시각과 리더 버전이 같을 때만 사용합니다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .prescription import N_PARAMS, Prescription
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+ZMX_READER_VERSION = 1
+
+SIDECAR_SUFFIX = '.cache'
+
+# 렌즈 단위 -> mm
+UNIT_SCALE = {'MM': 1.0, 'CM': 10.0, 'IN': 25.4, 'METER': 1000.0, 'M': 1000.0}
+
+# FTYP 첫 값: 0 = 각도(deg), 1 = 물체 높이, 2 = 근축 상 높이, 3 = 실제 상 높이
+FIELD_TYPES = {0: 'angle', 1: 'object_height', 2: 'paraxial_image_height',
+               3: 'real_image_height'}
+
+_SURFACE_KEYS = frozenset(('TYPE', 'CURV', 'DISZ', 'GLAS', 'CONI', 'PARM', 'DIAM', 'STOP',
+                           'COMM', 'HIDE', 'MIRR', 'SLAB', 'FLAP', 'XDAT', 'MEMA', 'POPS',
+                           'CLAP', 'COAT', 'SQAP', 'OBSC'))
+_MOFF = re.compile(r'^MOFF\s+(\d+)\s+(\d+)\s+"([^"]*)"\s+(\S+)')
+
+
+class ZmxFormatError(ValueError):
+    """ZMX 파일 형식 오류"""
+
+    def __init__(self, message: str, filepath: Union[str, Path, None] = None,
+                 line: Optional[int] = None):
+        self.filepath = str(filepath) if filepath is not None else None
+        self.line = line
+        location = ''
+        if self.filepath is not None:
+            location = f"{self.filepath}"
+            if line is not None:
+                location += f":{line}"
+            location += ': '
+        super().__init__(location + message)
+
+
+@dataclass
+class MultiConfig:
+    """다중 구성 연산자 표"""
+    operands: List[str]         # 연산자 종류 ('THIC', 'GLSS', ...)
+    args: np.ndarray            # (n_operands, 3) 정수 인자 (표면 번호 등)
+    values: np.ndarray          # (n_operands, n_configs) 값 (렌즈 단위, 문자열 연산자는 nan)
+    strings: np.ndarray         # (n_operands, n_configs) 문자열 값 (GLSS 등)
+    current: int = 1
+
+    @property
+    def n_configs(self) -> int:
+        return self.values.shape[1]
+
+
+@dataclass
+class ZmxDesign:
+    """ZMX 파일에서 읽은 설계"""
+    prescription: Prescription              # 현재 구성(MNUM의 current) 처방, mm 단위
+    units: str = 'MM'
+    field_type: int = 0
+    x_fields: np.ndarray = field(default_factory=lambda: np.zeros(1))
+    aperture_type: str = 'ENPD'
+    primary_wavelength: int = 1
+    catalogs: List[str] = field(default_factory=list)
+    multi_config: Optional[MultiConfig] = None
+    base: Optional[Prescription] = None     # 다중 구성 적용 전 처방
+
+    @property
+    def n_configs(self) -> int:
+        return 1 if self.multi_config is None else self.multi_config.n_configs
+
+    def configuration(self, config: int) -> Prescription:
+        """
+        다중 구성 처방
+
+        Args:
+            config: 구성 번호 (1부터)
+
+        Returns:
+            연산자 값을 적용한 처방 (복사본)
+        """
+        if not 1 <= config <= self.n_configs:
+            raise ValueError(f"config must be in 1..{self.n_configs}, got {config}")
+        base = self.base if self.base is not None else self.prescription
+        presc = base.copy()
+        if self.multi_config is not None:
+            _apply_config(presc, self.multi_config, config - 1,
+                          UNIT_SCALE.get(self.units, 1.0))
+        return presc
+
+    def unsupported(self) -> List[str]:
+        """로컬 광선 추적 엔진이 표현할 수 없는 설정 목록 (비어 있으면 지원)"""
+        reasons = []
+        if self.field_type != 0:
+            reasons.append(f"field type {FIELD_TYPES.get(self.field_type, self.field_type)}")
+        if np.any(self.x_fields != 0):
+            reasons.append("x fields")
+        if self.aperture_type not in ('ENPD', 'FNUM'):
+            reasons.append(f"aperture type {self.aperture_type}")
+        if self.units not in UNIT_SCALE:
+            reasons.append(f"lens units {self.units}")
+        return reasons
+
+
+# ---------------------------------------------------------------------------
+# 파싱
+# ---------------------------------------------------------------------------
+
+def decode_zmx(raw: bytes) -> str:
+    """BOM으로 인코딩을 판별하여 텍스트로 변환 (UTF-16 또는 UTF-8/Latin-1)"""
+    if raw[:2] in (b'\xff\xfe', b'\xfe\xff'):
+        return raw.decode('utf-16')
+    if raw[:3] == b'\xef\xbb\xbf':
+        return raw[3:].decode('utf-8', errors='replace')
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return raw.decode('latin-1')
+
+
+def _float(token: str) -> float:
+    return np.inf if token.upper().startswith('INF') else float(token)
+
+
+def _scale_params(surface_type: str, params: np.ndarray, scale: float):
+    """
+    렌즈 단위 매개변수를 mm로 변환 (EVENASPH r^2k 계수: scale^(1-2k),
+    TOROIDAL 회전 반경: scale, y^2k 계수: scale^(1-2k))
+    """
+    if scale == 1.0:
+        return
+    if surface_type == 'EVENASPH':
+        k = np.arange(1, params.shape[-1] + 1)
+        params *= scale ** (1.0 - 2.0 * k)
+    elif surface_type == 'TOROIDAL':
+        k = np.arange(params.shape[-1])
+        params *= scale ** np.where(k == 0, 1.0, 1.0 - 2.0 * k)
+
+
+def _apply_config(presc: Prescription, mc: MultiConfig, c: int, scale: float):
+    """구성 c(0부터)의 연산자 값을 처방에 적용"""
+    for op, (a, b, _), value, text in zip(mc.operands, mc.args, mc.values[:, c],
+                                          mc.strings[:, c]):
+        if op == 'GLSS':
+            presc.glass[a] = text
+        elif np.isnan(value):
+            continue
+        elif op == 'THIC':
+            presc.thickness[a] = value * scale
+        elif op == 'CRVT':
+            presc.curvature[a] = value / scale
+        elif op == 'CONN':
+            presc.conic[a] = value
+        elif op == 'SDIA':
+            presc.semi_diameter[a] = value * scale
+        elif op == 'PRAM' and 1 <= b <= N_PARAMS:
+            row = np.zeros(N_PARAMS)
+            row[b - 1] = value
+            _scale_params(presc.surface_type[a], row, scale)
+            presc.params[a, b - 1] = row[b - 1]
+        elif op == 'WAVE':
+            presc.wavelengths[a - 1] = value
+        elif op == 'YFIE':
+            presc.fields[a - 1] = value
+        elif op == 'APER':
+            presc.aperture = value * scale
+
+
+def parse_zmx(text: str, filepath: Union[str, Path, None] = None) -> ZmxDesign:
+    """
+    ZMX 텍스트 파싱
+
+    Args:
+        text: 파일 내용
+        filepath: 오류 메시지용 파일 경로
+
+    Returns:
+        ZmxDesign
+
+    Raises:
+        ZmxFormatError: 형식 오류
+    """
+    surfaces: List[Dict] = []
+    surf = None
+    top: Dict[str, List[str]] = {}
+    waves: Dict[int, float] = {}
+    catalogs: List[str] = []
+    stop = None
+    n_configs, current = 0, 1
+    header = None
+    mc_headers: Dict[int, Tuple[str, List[int]]] = {}
+    mc_values: Dict[Tuple[int, int], Tuple[str, str]] = {}
+
+    lineno = 0
+    try:
+        for lineno, raw_line in enumerate(text.splitlines(), 1):
+            line = raw_line.strip()
+            if not line:
+                continue
+            key, _, rest = line.partition(' ')
+            tokens = rest.split()
+            if key == 'SURF':
+                surf = {'type': 'STANDARD', 'curv': 0.0, 'disz': 0.0, 'glass': '',
+                        'conic': 0.0, 'sd': 0.0, 'params': {}}
+                surfaces.append(surf)
+                continue
+            if surf is not None and key in _SURFACE_KEYS:
+                if key == 'TYPE':
+                    surf['type'] = tokens[0].upper()
+                elif key == 'CURV':
+                    surf['curv'] = float(tokens[0])
+                elif key == 'DISZ':
+                    surf['disz'] = _float(tokens[0])
+                elif key == 'GLAS':
+                    # 모델 유리(___BLANK)는 nd 값을 상수 굴절률로 사용
+                    surf['glass'] = tokens[3] if tokens[0] == '___BLANK' else tokens[0]
+                elif key == 'CONI':
+                    surf['conic'] = float(tokens[0])
+                elif key == 'PARM':
+                    surf['params'][int(tokens[0])] = float(tokens[1])
+                elif key == 'DIAM':
+                    # 두 번째 값 1 = 고정 반구경 (자동 계산 값은 제한으로 쓰지 않음)
+                    if len(tokens) > 1 and tokens[1] == '1':
+                        surf['sd'] = float(tokens[0])
+                elif key == 'STOP':
+                    stop = len(surfaces) - 1
+                continue
+
+            if key == 'MNUM':
+                n_configs = int(tokens[0])
+                current = int(tokens[1]) if len(tokens) > 1 else 1
+            elif key == 'MOFF' and n_configs:
+                match = _MOFF.match(line)
+                if match is None:
+                    raise ValueError(f"malformed MOFF line {line!r}")
+                k, c = int(match.group(1)), int(match.group(2))
+                if k == 0:
+                    continue
+                if k not in mc_headers:
+                    if header is None:
+                        raise ValueError("MOFF line without operand header")
+                    mc_headers[k] = header
+                mc_values[k, c] = (match.group(3), match.group(4))
+            elif n_configs and key.isalpha() and key.isupper() and len(key) == 4:
+                # 다중 구성 연산자 머리줄 (다음 MOFF 줄들의 종류/인자)
+                ints = [int(float(t)) for t in tokens[:3] if _is_number(t)]
+                header = (key, ints + [0] * (3 - len(ints)))
+            elif key == 'WAVM':
+                waves[int(tokens[0])] = float(tokens[1])
+            elif key == 'WAVL':
+                waves.update({i + 1: float(t) for i, t in enumerate(tokens)})
+            elif key == 'GCAT':
+                catalogs.extend(tokens)
+            else:
+                top[key] = tokens
+    except (ValueError, IndexError) as e:
+        raise ZmxFormatError(str(e), filepath, lineno) from e
+
+    if len(surfaces) < 2:
+        raise ZmxFormatError("no SURF blocks (at least object and image surfaces required)",
+                             filepath)
+    units = top.get('UNIT', ['MM'])[0].upper()
+    scale = UNIT_SCALE.get(units, 1.0)
+
+    # 시야/파장 수: FTYP type norm n_fields n_waves (오래된 형식은 값 목록에서 추정)
+    ftyp = [int(float(t)) for t in top.get('FTYP', ['0'])]
+    y_fields = [float(t) for t in top.get('YFLN', ['0'])]
+    x_fields = [float(t) for t in top.get('XFLN', ['0'])]
+    if len(ftyp) >= 3 and ftyp[2] > 0:
+        n_fields = ftyp[2]
+    else:
+        nonzero = [i for i, v in enumerate(y_fields + x_fields) if v != 0]
+        n_fields = max([1] + [i % max(len(y_fields), 1) + 1 for i in nonzero])
+    y_fields = (y_fields + [0.0] * n_fields)[:n_fields]
+    x_fields = (x_fields + [0.0] * n_fields)[:n_fields]
+    if len(ftyp) >= 4 and ftyp[3] > 0:
+        n_waves = ftyp[3]
+    else:
+        n_waves = max(waves) if waves else 1
+    wavelengths = [waves.get(i, 0.55) for i in range(1, n_waves + 1)]
+
+    if 'ENPD' in top:
+        aperture_type, aperture = 'ENPD', float(top['ENPD'][0]) * scale
+    elif 'FNUM' in top:
+        aperture_type, aperture = 'FNUM', np.nan
+    else:
+        aperture_type = next((k for k in ('OBNA', 'FLOA', 'OBSC') if k in top), 'ENPD')
+        aperture = np.nan
+
+    presc = Prescription(wavelengths, y_fields, aperture,
+                         name=' '.join(top.get('NAME', [])))
+    n = len(surfaces)
+    presc.curvature = np.array([s['curv'] for s in surfaces]) / scale
+    presc.thickness = np.array([s['disz'] for s in surfaces]) * scale
+    presc.thickness[-1] = 0.0
+    presc.conic = np.array([s['conic'] for s in surfaces])
+    presc.semi_diameter = np.array([s['sd'] for s in surfaces]) * scale
+    presc.glass = [s['glass'] for s in surfaces]
+    presc.surface_type = [s['type'] for s in surfaces]
+    presc.params = np.zeros((n, N_PARAMS))
+    for i, s in enumerate(surfaces):
+        for k, value in s['params'].items():
+            if 1 <= k <= N_PARAMS:
+                presc.params[i, k - 1] = value
+            elif value != 0:
+                raise ZmxFormatError(f"surface {i}: PARM {k} exceeds {N_PARAMS} parameters",
+                                     filepath)
+        _scale_params(s['type'], presc.params[i], scale)
+    presc.stop = stop if stop is not None and 0 < stop < n - 1 else 1
+
+    multi_config = None
+    if n_configs and mc_headers:
+        keys = sorted(mc_headers)
+        values = np.full((len(keys), n_configs), np.nan)
+        strings = np.full((len(keys), n_configs), '', dtype=object)
+        for row, k in enumerate(keys):
+            for c in range(1, n_configs + 1):
+                text_value, number = mc_values.get((k, c), ('', 'nan'))
+                strings[row, c - 1] = text_value
+                values[row, c - 1] = float(number) if _is_number(number) else np.nan
+        multi_config = MultiConfig([mc_headers[k][0] for k in keys],
+                                   np.array([mc_headers[k][1] for k in keys], dtype=np.int64),
+                                   values, strings.astype(str), current)
+
+    design = ZmxDesign(presc, units=units, field_type=ftyp[0] if ftyp else 0,
+                       x_fields=np.array(x_fields), aperture_type=aperture_type,
+                       primary_wavelength=int(top.get('PWAV', ['1'])[0]),
+                       catalogs=catalogs, multi_config=multi_config)
+    if multi_config is not None:
+        design.base = presc
+        design.prescription = design.configuration(min(max(current, 1), n_configs))
+    if aperture_type == 'FNUM':
+        _set_aperture_from_fnum(design, float(top['FNUM'][0]))
+    return design
+
+
+def _is_number(token: str) -> bool:
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _set_aperture_from_fnum(design: ZmxDesign, f_number: float):
+    """상측 F수 -> 입사동 지름 (주 파장 근축 EFL / F수)"""
+    from .raytrace import paraxial_data
+
+    targets = [design.prescription] + ([design.base] if design.base is not None else [])
+    for presc in targets:
+        wl = presc.wavelengths[min(design.primary_wavelength, len(presc.wavelengths)) - 1]
+        presc.aperture = 1.0
+        presc.aperture = abs(paraxial_data(presc, wl).efl) / f_number
+
+
+# ---------------------------------------------------------------------------
+# 사이드카 캐시
+# ---------------------------------------------------------------------------
+
+def sidecar_path(filepath: Union[str, Path], sidecar_dir: Union[str, Path, None] = None) -> Path:
+    """
+    사이드카 파일 경로
+
+    Args:
+        filepath: ZMX 파일 경로
+        sidecar_dir: 사이드카 디렉토리 (None이면 원본 옆, 아카이브가 읽기 전용일 때
+            지정하며 이름에 경로 해시를 포함)
+
+    Returns:
+        사이드카 경로
+    """
+    filepath = Path(filepath)
+    if sidecar_dir is None:
+        return filepath.with_name(filepath.name + SIDECAR_SUFFIX)
+    digest = hashlib.sha1(str(filepath.resolve()).encode()).hexdigest()[:10]
+    return Path(sidecar_dir) / f'{filepath.name}-{digest}{SIDECAR_SUFFIX}'
+
+
+# 사이드카 파일: MAGIC, uint32 메타데이터 길이, 메타데이터 JSON,
+# (n_surfaces, 4 + N_PARAMS) float64 표면 블록 (한 번 읽고 np.frombuffer)
+_SIDECAR_MAGIC = b'ZMXC'
+_SURFACE_BLOCK = ('curvature', 'thickness', 'conic', 'semi_diameter')
+
+
+def _nan_to_none(values: np.ndarray) -> list:
+    return [[None if np.isnan(v) else float(v) for v in row] for row in values]
+
+
+def _encode_sidecar(design: ZmxDesign, source: List[int]) -> bytes:
+    presc = design.base if design.base is not None else design.prescription
+    meta = {'version': ZMX_READER_VERSION, 'source': source, 'name': presc.name,
+            'units': design.units, 'field_type': design.field_type,
+            'aperture_type': design.aperture_type, 'aperture': presc.aperture,
+            'current_aperture': design.prescription.aperture,
+            'primary_wavelength': design.primary_wavelength, 'catalogs': design.catalogs,
+            'stop': presc.stop, 'glass': presc.glass, 'surface_type': presc.surface_type,
+            'wavelengths': presc.wavelengths.tolist(), 'fields': presc.fields.tolist(),
+            'x_fields': design.x_fields.tolist()}
+    mc = design.multi_config
+    if mc is not None:
+        meta['multi_config'] = {'operands': mc.operands, 'args': mc.args.tolist(),
+                                'values': _nan_to_none(mc.values),
+                                'strings': mc.strings.tolist(), 'current': mc.current}
+    block = np.column_stack([getattr(presc, key) for key in _SURFACE_BLOCK] + [presc.params])
+    meta_bytes = json.dumps(meta, allow_nan=True).encode()
+    return (_SIDECAR_MAGIC + len(meta_bytes).to_bytes(4, 'little') + meta_bytes
+            + np.ascontiguousarray(block, dtype='<f8').tobytes())
+
+
+def _decode_sidecar(raw: bytes, source: List[int]) -> Optional[ZmxDesign]:
+    """사이드카 내용 복원 (버전/원본이 다르거나 손상되었으면 None)"""
+    if raw[:4] != _SIDECAR_MAGIC:
+        return None
+    n_meta = int.from_bytes(raw[4:8], 'little')
+    meta = json.loads(raw[8:8 + n_meta])
+    if meta['version'] != ZMX_READER_VERSION or meta['source'] != source:
+        return None
+    n = len(meta['glass'])
+    block = np.frombuffer(raw, '<f8', offset=8 + n_meta).reshape(n, 4 + N_PARAMS)
+
+    presc = Prescription(meta['wavelengths'], meta['fields'], meta['aperture'],
+                         name=meta['name'])
+    for i, key in enumerate(_SURFACE_BLOCK):
+        setattr(presc, key, block[:, i].copy())
+    presc.params = block[:, 4:].copy()
+    presc.glass = meta['glass']
+    presc.surface_type = meta['surface_type']
+    presc.stop = meta['stop']
+    design = ZmxDesign(presc, units=meta['units'], field_type=meta['field_type'],
+                       x_fields=np.array(meta['x_fields']),
+                       aperture_type=meta['aperture_type'],
+                       primary_wavelength=meta['primary_wavelength'],
+                       catalogs=meta['catalogs'])
+    mc = meta.get('multi_config')
+    if mc is not None:
+        design.multi_config = MultiConfig(
+            mc['operands'], np.array(mc['args'], dtype=np.int64),
+            np.array(mc['values'], dtype=np.float64), np.array(mc['strings'], dtype=str),
+            mc['current'])
+        design.base = presc
+        design.prescription = design.configuration(mc['current'])
+        design.prescription.aperture = meta['current_aperture']
+    return design
+
+
+def read_zmx(filepath: Union[str, Path], sidecar: bool = True,
+             sidecar_dir: Union[str, Path, None] = None) -> ZmxDesign:
+    """
+    ZMX 파일 읽기 (사이드카 캐시 사용)
+
+    Args:
+        filepath: ZMX 파일 경로
+        sidecar: 사이드카 캐시 사용 여부 (쓰기 실패는 무시)
+        sidecar_dir: 사이드카 디렉토리 (None이면 원본 옆)
+
+    Returns:
+        ZmxDesign
+    """
+    filepath = Path(filepath)
+    st = filepath.stat()
+    source = [st.st_size, st.st_mtime_ns]
+    cache = sidecar_path(filepath, sidecar_dir) if sidecar else None
+    if cache is not None:
+        try:
+            with open(cache, 'rb') as f:
+                design = _decode_sidecar(f.read(), source)
+            if design is not None:
+                return design
+        except (OSError, ValueError, KeyError):
+            pass
+
+    with open(filepath, 'rb') as f:
+        design = parse_zmx(decode_zmx(f.read()), filepath)
+
+    if cache is not None:
+        tmp = cache.with_name(cache.name + '.tmp')
+        try:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(_encode_sidecar(design, source))
+            os.replace(tmp, cache)
+        except OSError:
+            pass
+    return design
+
+
+# ---------------------------------------------------------------------------
+# 쓰기와 색인
+# ---------------------------------------------------------------------------
+
+def write_zmx(design: Union[ZmxDesign, Prescription], filepath: Union[str, Path]):
+    """
+    처방을 ZMX 텍스트로 저장 (mm 단위, 입사동 지름, 각도 시야)
+
+    Args:
+        design: ZmxDesign 또는 Prescription
+        filepath: 저장 경로
+    """
+    if isinstance(design, Prescription):
+        design = ZmxDesign(design, x_fields=np.zeros(len(design.fields)))
+    presc = design.base if design.base is not None else design.prescription
+    n_fields, n_waves = len(presc.fields), len(presc.wavelengths)
+    lines = ['VERS 140617 0 0', 'MODE SEQ', f'NAME {presc.name}',
+             'UNIT MM X W X CM MR CPMM', f'ENPD {presc.aperture:.12g}',
+             f'FTYP {design.field_type} 0 {n_fields} {n_waves} 0 0 0',
+             'XFLN ' + ' '.join(f'{v:.12g}' for v in design.x_fields),
+             'YFLN ' + ' '.join(f'{v:.12g}' for v in presc.fields)]
+    lines += [f'WAVM {i + 1} {w:.12g} 1' for i, w in enumerate(presc.wavelengths)]
+    lines.append(f'PWAV {design.primary_wavelength}')
+    if design.catalogs:
+        lines.append('GCAT ' + ' '.join(design.catalogs))
+    for i in range(presc.n_surfaces):
+        lines += [f'SURF {i}', f'  TYPE {presc.surface_type[i]}',
+                  f'  CURV {presc.curvature[i]:.17g} 0 0 0 0 ""']
+        if i == presc.stop:
+            lines.append('  STOP')
+        for k in np.flatnonzero(presc.params[i]):
+            lines.append(f'  PARM {k + 1} {presc.params[i, k]:.17g}')
+        if presc.conic[i] != 0:
+            lines.append(f'  CONI {presc.conic[i]:.17g}')
+        if presc.glass[i]:
+            lines.append(f'  GLAS {presc.glass[i]} 0 0 0 0 0 0 0 0 0 0')
+        if presc.semi_diameter[i] > 0:
+            lines.append(f'  DIAM {presc.semi_diameter[i]:.17g} 1 0 0 1 ""')
+        thickness = presc.thickness[i]
+        lines.append(f'  DISZ {"INFINITY" if np.isinf(thickness) else f"{thickness:.17g}"}')
+    mc = design.multi_config
+    if mc is not None:
+        lines.append(f'MNUM {mc.n_configs} {mc.current}')
+        for k, op in enumerate(mc.operands):
+            lines.append(f'{op} ' + ' '.join(str(int(a)) for a in mc.args[k]))
+            for c in range(mc.n_configs):
+                value = mc.values[k, c]
+                lines.append(f'MOFF {k + 1} {c + 1} "{mc.strings[k, c]}" '
+                             f'{"nan" if np.isnan(value) else f"{value:.17g}"} 0 0 1 1 0 0.0 ""')
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def index_designs(files: Iterable[Union[str, Path]], sidecar: bool = True,
+                  sidecar_dir: Union[str, Path, None] = None) -> pd.DataFrame:
+    """
+    여러 ZMX 설계의 표면 색인 (표면당 한 행)
+
+    Args:
+        files: ZMX 파일 경로들
+        sidecar: 사이드카 캐시 사용 여부
+        sidecar_dir: 사이드카 디렉토리
+
+    Returns:
+        file, name, n_configs, surface, type, radius, thickness, glass, conic,
+        semi_diameter, is_stop 열 DataFrame. 읽지 못한 파일은
+        df.attrs['errors'] = {파일: 메시지}
+    """
+    import pandas as pd
+
+    columns: Dict[str, List[np.ndarray]] = {key: [] for key in (
+        'file', 'name', 'n_configs', 'surface', 'type', 'radius', 'thickness', 'glass',
+        'conic', 'semi_diameter', 'is_stop')}
+    errors = {}
+    for filepath in files:
+        try:
+            design = read_zmx(filepath, sidecar, sidecar_dir)
+        except (OSError, ValueError) as e:
+            errors[str(filepath)] = f'{type(e).__name__}: {e}'
+            continue
+        presc = design.prescription
+        n = presc.n_surfaces
+        surface = np.arange(n)
+        columns['file'].append(np.full(n, str(filepath), dtype=object))
+        columns['name'].append(np.full(n, presc.name, dtype=object))
+        columns['n_configs'].append(np.full(n, design.n_configs))
+        columns['surface'].append(surface)
+        columns['type'].append(np.array(presc.surface_type, dtype=object))
+        columns['radius'].append(presc.radius)
+        columns['thickness'].append(presc.thickness)
+        columns['glass'].append(np.array(presc.glass, dtype=object))
+        columns['conic'].append(presc.conic)
+        columns['semi_diameter'].append(presc.semi_diameter)
+        columns['is_stop'].append(surface == presc.stop)
+    df = pd.DataFrame({key: np.concatenate(value) if value else np.empty(0)
+                       for key, value in columns.items()})
+    df.attrs['errors'] = errors
+    return df
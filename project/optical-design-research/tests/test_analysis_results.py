@@ -0,0 +1,140 @@
+"""
+Unit Tests for Columnar Analysis Result Containers
+열 기반 분석 결과 컨테이너 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.analysis_results import MTFData, SpotData
+from scripts.spot_statistics import grouped_spot_statistics
+
+
+@pytest.fixture
+def spot():
+    """3 시야 x 2 파장, 파장 우선 순서로 섞인 광선"""
+    rng = np.random.default_rng(1)
+    n = 600
+    field = rng.integers(0, 3, n)
+    wavelength = rng.integers(0, 2, n)
+    x = rng.normal(field * 10.0, 1.0 + wavelength, n)
+    y = rng.normal(0.0, 1.0 + wavelength, n)
+    order = np.lexsort((field, wavelength))
+    return SpotData(x[order], y[order], field[order], wavelength[order],
+                    fields=[0.0, 5.0, 10.0], wavelengths=[0.486, 0.656])
+
+
+class TestSpotData:
+    """SpotData 테스트"""
+
+    def test_grouped_layout_and_offsets(self, spot):
+        """생성 시 (시야, 파장) 순서로 정렬, offsets가 그룹 경계"""
+        key = spot.field * 2 + spot.wavelength
+        assert np.all(np.diff(key) >= 0)
+        assert spot.offsets[0] == 0 and spot.offsets[-1] == len(spot)
+        assert spot.counts.sum() == len(spot)
+        g = 1 * 2 + 1
+        block = slice(spot.offsets[g], spot.offsets[g + 1])
+        assert np.all(spot.field[block] == 1) and np.all(spot.wavelength[block] == 1)
+
+    def test_already_grouped_input_is_not_copied(self):
+        """그룹 순서 입력은 복사하지 않음"""
+        x = np.arange(6.0)
+        spot = SpotData(x, x, np.array([0, 0, 0, 1, 1, 1]), np.zeros(6, int))
+        assert np.shares_memory(spot.x, x)
+
+    def test_selection_returns_views(self, spot):
+        """시야, (시야, 파장) 선택은 뷰"""
+        field = spot.sel(field=1)
+        assert np.shares_memory(field.x, spot.x)
+        assert np.all(field.field == 1) and len(field) == spot.counts[1].sum()
+        group = spot.sel(field=2, wavelength=0)
+        assert np.shares_memory(group.y, spot.y)
+        assert len(group) == spot.counts[2, 0]
+        # 뷰에서 다시 선택
+        assert len(field.sel(field=1, wavelength=1)) == spot.counts[1, 1]
+        assert len(field.sel(field=0)) == 0
+
+    def test_wavelength_selection_across_fields(self, spot):
+        """여러 시야의 한 파장 선택"""
+        sub = spot.sel(wavelength=1)
+        assert np.all(sub.wavelength == 1)
+        assert sub.counts[:, 1].tolist() == spot.counts[:, 1].tolist()
+
+    def test_groups_iteration(self, spot):
+        """그룹 순회"""
+        seen = [(f, w, len(view)) for f, w, view in spot.groups()]
+        assert seen == [(f, w, spot.counts[f, w]) for f in range(3) for w in range(2)]
+
+    def test_rms_matches_statistics(self, spot):
+        """벡터 RMS는 grouped_spot_statistics와 일치"""
+        stats = spot.statistics()
+        assert stats == grouped_spot_statistics(spot.x, spot.y, spot.field, spot.wavelength)
+        rms = spot.rms_radius()
+        for (f, w), s in stats.items():
+            assert rms[f, w] == pytest.approx(s.rms_radius)
+        chief = spot.rms_radius(reference='chief')
+        view = spot.sel(0, 1)
+        assert chief[0, 1] == pytest.approx(np.sqrt(np.mean(view.x**2 + view.y**2)))
+
+    def test_energy_curves_handoff(self, spot):
+        """환형 에너지 곡선 그룹 키"""
+        curves = spot.energy_curves(n_bins=64)
+        assert set(curves) == {(f, w) for f in range(3) for w in range(2)}
+
+    def test_pandas_handoff_without_copy(self, spot):
+        """DataFrame 열은 원본 배열 공유"""
+        df = spot.to_frame()
+        assert list(df.columns) == ['x', 'y', 'field', 'wavelength']
+        assert np.shares_memory(df['x'].to_numpy(), spot.x)
+
+    def test_hdf5_roundtrip(self, spot, tmp_path):
+        """HDF5 저장/로드"""
+        path = tmp_path / "results.h5"
+        spot.to_hdf5(path)
+        loaded = SpotData.from_hdf5(path)
+        np.testing.assert_array_equal(loaded.offsets, spot.offsets)
+        np.testing.assert_array_equal(loaded.sel(1, 1).x, spot.sel(1, 1).x)
+
+    def test_invalid_input(self):
+        """길이 불일치/범위 밖 번호"""
+        with pytest.raises(ValueError):
+            SpotData(np.zeros(3), np.zeros(2), np.zeros(3), np.zeros(3))
+        with pytest.raises(ValueError):
+            SpotData(np.zeros(2), np.zeros(2), [0, 2], [0, 0], fields=[0.0, 1.0])
+
+
+class TestMTFData:
+    """MTFData 테스트"""
+
+    def test_selection_interpolation_and_frame(self, tmp_path):
+        """시야 선택 뷰, 주파수 보간, DataFrame/HDF5 전달"""
+        freq = np.linspace(0, 100, 11)
+        tangential = np.vstack([1 - freq / 200, 1 - freq / 100])
+        mtf = MTFData(freq, tangential, tangential * 0.9, fields=[0.0, 7.0])
+
+        row = mtf.sel(1)
+        assert np.shares_memory(row.tangential, mtf.tangential)
+        t, s = mtf.at(45.0)
+        np.testing.assert_allclose(t, [1 - 45 / 200, 1 - 45 / 100])
+        np.testing.assert_allclose(s, 0.9 * t)
+
+        df = mtf.to_frame()
+        assert len(df) == 22
+        assert np.shares_memory(df['tangential'].to_numpy(), mtf.tangential)
+        assert df.loc[df['field'] == 7.0, 'tangential'].iloc[-1] == pytest.approx(0.0)
+
+        single = MTFData([30.0], tangential[:, 3:4], tangential[:, 3:4] * 0.9)
+        for frequency in (0.0, 30.0, 80.0):
+            t, s = single.at(frequency)
+            np.testing.assert_allclose(t, tangential[:, 3])
+            np.testing.assert_allclose(s, 0.9 * tangential[:, 3])
+
+        mtf.to_hdf5(tmp_path / "mtf.h5")
+        loaded = MTFData.from_hdf5(tmp_path / "mtf.h5")
+        np.testing.assert_array_equal(loaded.sagittal, mtf.sagittal)
+        np.testing.assert_array_equal(loaded.fields, mtf.fields)
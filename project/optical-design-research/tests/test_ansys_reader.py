@@ -0,0 +1,153 @@
+"""
+Unit Tests for ANSYS Nodal Temperature Reader
+ANSYS 절점 온도 리더 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.ansys_reader import (
+    AnsysFileFormatError,
+    NodalTemperatureField,
+    read_nodal_temperatures,
+    read_nodal_temperature_series
+)
+from scripts.data_processing import AnsysDataProcessor
+from scripts.parse_cache import ParseCache
+
+
+def linear_field(coords, t=0.0):
+    """선형 온도장 T = 20 + 100x + 50y + 10z + t"""
+    return 20 + 100 * coords[:, 0] + 50 * coords[:, 1] + 10 * coords[:, 2] + t
+
+
+@pytest.fixture
+def grid_nodes():
+    g = np.linspace(0, 0.01, 11)
+    x, y, z = np.meshgrid(g, g, g, indexing='ij')
+    coords = np.column_stack((x.ravel(), y.ravel(), z.ravel()))
+    ids = np.arange(1, len(coords) + 1)
+    return ids, coords
+
+
+def write_nodal_file(path, ids, coords, *temps, sep='\t'):
+    header = sep.join(['NODE', 'X', 'Y', 'Z'] + [f'TEMP{i}' for i in range(len(temps))])
+    rows = np.column_stack((ids, coords) + temps)
+    fmt = ['%d'] + ['%.9e'] * (rows.shape[1] - 1)
+    np.savetxt(path, rows, fmt=fmt, delimiter=sep,
+               header=f"ANSYS nodal temperatures\n{header}", comments='')
+
+
+class TestReadNodalTemperatures:
+    """절점 온도 파일 읽기 테스트"""
+
+    def test_chunked_read(self, tmp_path, grid_nodes):
+        ids, coords = grid_nodes
+        path = tmp_path / "temp.txt"
+        write_nodal_file(path, ids, coords, linear_field(coords))
+
+        field = read_nodal_temperatures(path, chunk_rows=100)
+
+        assert len(field) == len(ids)
+        assert field.temperatures.dtype == np.float32
+        np.testing.assert_allclose(field.temperatures[0], linear_field(coords), rtol=1e-6)
+
+    def test_multiple_steps_csv(self, tmp_path, grid_nodes):
+        ids, coords = grid_nodes
+        path = tmp_path / "temp.csv"
+        write_nodal_file(path, ids, coords, linear_field(coords),
+                         linear_field(coords, 5.0), sep=',')
+
+        field = read_nodal_temperatures(path, times=[0.0, 60.0])
+
+        assert field.n_steps == 2
+        np.testing.assert_allclose(field.temperatures[1] - field.temperatures[0], 5.0,
+                                   rtol=1e-5)
+
+    def test_series_reordered_nodes(self, tmp_path, grid_nodes):
+        ids, coords = grid_nodes
+        write_nodal_file(tmp_path / "t0.txt", ids, coords, linear_field(coords))
+        perm = np.random.default_rng(0).permutation(len(ids))
+        write_nodal_file(tmp_path / "t1.txt", ids[perm], coords[perm],
+                         linear_field(coords[perm], 3.0))
+
+        field = read_nodal_temperature_series([tmp_path / "t0.txt", tmp_path / "t1.txt"],
+                                              chunk_rows=200)
+
+        np.testing.assert_allclose(field.temperatures[1], linear_field(coords, 3.0),
+                                   rtol=1e-6)
+
+    def test_series_rejects_multiple_temp_columns(self, tmp_path, grid_nodes):
+        """TEMP 열이 여러 개인 파일은 시간 단계 목록에 쓰지 않음"""
+        ids, coords = grid_nodes
+        single, multi = tmp_path / "single.txt", tmp_path / "multi.txt"
+        write_nodal_file(single, ids, coords, linear_field(coords))
+        write_nodal_file(multi, ids, coords, linear_field(coords), linear_field(coords, 1.0))
+
+        with pytest.raises(AnsysFileFormatError, match="one TEMP column"):
+            read_nodal_temperature_series([multi, single])
+        with pytest.raises(AnsysFileFormatError, match="one TEMP column"):
+            read_nodal_temperature_series([single, multi])
+
+    def test_dashed_separator_before_data(self, tmp_path, grid_nodes):
+        """헤더 아래 '-----' 구분선은 숫자 행으로 취급하지 않음"""
+        ids, coords = grid_nodes
+        path = tmp_path / "dashed.txt"
+        write_nodal_file(path, ids, coords, linear_field(coords))
+        lines = path.read_text().split('\n')
+        path.write_text('\n'.join(lines[:2] + ['-' * 40] + lines[2:]))
+
+        field = read_nodal_temperatures(path)
+
+        assert len(field) == len(ids)
+        np.testing.assert_allclose(field.temperatures[0], linear_field(coords), rtol=1e-6)
+
+    def test_too_few_columns(self, tmp_path):
+        path = tmp_path / "bad.txt"
+        path.write_text("NODE TEMP\n1 25.0\n")
+
+        with pytest.raises(AnsysFileFormatError):
+            read_nodal_temperatures(path)
+
+
+class TestNodalTemperatureField:
+    """공간 질의 테스트"""
+
+    def test_sample_at_nodes_exact(self, grid_nodes):
+        ids, coords = grid_nodes
+        field = NodalTemperatureField(ids, coords, linear_field(coords))
+
+        t = field.sample(coords[:50])
+
+        np.testing.assert_allclose(t, linear_field(coords[:50]), rtol=1e-6)
+
+    def test_profile_along_path(self, grid_nodes):
+        ids, coords = grid_nodes
+        field = NodalTemperatureField(ids, coords, linear_field(coords))
+        path = np.array([[0.0, 0.005, 0.005], [0.01, 0.005, 0.005]])
+
+        distance, temp = field.profile(path, n_points=21, k=1)
+
+        assert distance[-1] == pytest.approx(0.01)
+        np.testing.assert_allclose(temp, 20 + 100 * distance + 0.25 + 0.05, atol=0.06)
+
+
+def test_processor_profile_with_cache(tmp_path, grid_nodes):
+    ids, coords = grid_nodes
+    path = tmp_path / "temp.txt"
+    write_nodal_file(path, ids, coords, linear_field(coords))
+    cache = ParseCache(tmp_path / "cache")
+
+    AnsysDataProcessor.read_thermal_results(path, cache=cache)
+    data = AnsysDataProcessor.read_thermal_results(path, cache=cache)
+    position, temperature = AnsysDataProcessor.extract_temperature_profile(
+        data, np.array([[0, 0, 0], [0.01, 0.01, 0.01]]), n_points=5)
+
+    assert cache.hits == 1
+    assert data['max_temp'] == pytest.approx(21.6, rel=1e-5)
+    assert temperature[0] == pytest.approx(20.0, rel=1e-5)
+    assert temperature[-1] == pytest.approx(21.6, rel=1e-5)
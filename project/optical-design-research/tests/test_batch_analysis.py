@@ -0,0 +1,116 @@
+"""
+Unit Tests for Batch Design Analysis
+설계 배치 분석 단위 테스트
+"""
+
+import json
+import os
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.batch_analysis import BatchAnalyzer
+from scripts.prescription import Prescription
+
+
+@pytest.fixture
+def designs(tmp_path):
+    """초점 거리가 다른 단렌즈 설계 파일 4개"""
+    paths = []
+    for i, radius in enumerate([40.0, 50.0, 60.0, 70.0]):
+        presc = Prescription(wavelengths=[0.55], fields=[0.0, 2.0], aperture=8.0)
+        presc.add_surface(radius=radius, thickness=4.0, glass='N-BK7')
+        presc.add_surface(radius=-radius, thickness=2 * radius * 0.9)
+        path = tmp_path / 'designs' / f'lens{i}.json'
+        path.parent.mkdir(exist_ok=True)
+        presc.save_json(path)
+        paths.append(path)
+    return paths
+
+
+def _options(tmp_path, **kwargs):
+    return dict(out_dir=tmp_path / 'out', density=3, n_frequencies=8, progress=False,
+                **kwargs)
+
+
+class TestBatchAnalyzer:
+    """배치 분석기 테스트"""
+
+    def test_runs_and_stores_results(self, tmp_path, designs):
+        """파일별 결과 배열과 매니페스트 기록"""
+        batch = BatchAnalyzer(**_options(tmp_path, max_workers=1))
+        summary = batch.run(designs)
+        assert summary['completed'] == 4 and summary['failed'] == []
+
+        arrays = batch.load_result(designs[1])
+        assert arrays['mtf.tangential'].shape == (2, 8)
+        assert len(arrays['spot.x']) == 2 * 37
+        manifest = batch.manifest()
+        assert manifest[str(designs[1].resolve())]['efl'] == pytest.approx(float(arrays['paraxial.efl']))
+        efls = [manifest[str(p.resolve())]['efl'] for p in designs]
+        assert efls == sorted(efls)
+
+    def test_failures_are_recorded_not_raised(self, tmp_path, designs):
+        """실패 파일은 기록만 하고 나머지는 계속 분석"""
+        bad = tmp_path / 'designs' / 'broken.json'
+        bad.write_text('{not json')
+        batch = BatchAnalyzer(**_options(tmp_path, max_workers=1))
+        summary = batch.run(designs + [bad, tmp_path / 'missing.json'])
+        assert summary['completed'] == 4
+        assert len(summary['failed']) == 2
+        assert 'JSONDecodeError' in summary['failed'][0]['error']
+
+    def test_resume_skips_completed_files(self, tmp_path, designs):
+        """재실행 시 완료 파일은 건너뛰고 바뀐/실패/중단 파일만 다시 분석"""
+        batch = BatchAnalyzer(**_options(tmp_path, max_workers=1))
+        batch.run(designs[:2])
+        # 기록 도중 중단된 마지막 줄
+        with open(batch.manifest_path, 'a') as f:
+            f.write('{"file": "trunc')
+
+        summary = batch.run(designs)
+        assert summary['skipped'] == 2 and summary['completed'] == 2
+
+        stat = os.stat(designs[0])
+        os.utime(designs[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        os.remove(tmp_path / 'out' / 'results' / batch.manifest()[str(designs[1].resolve())]['result'])
+        summary = batch.run(designs)
+        assert summary['skipped'] == 2 and summary['completed'] == 2
+
+    def test_changed_settings_rerun(self, tmp_path, designs):
+        """분석 설정이 바뀌면 완료 파일도 다시 분석"""
+        BatchAnalyzer(**_options(tmp_path, max_workers=1)).run(designs[:2])
+        same = BatchAnalyzer(**_options(tmp_path, max_workers=1)).run(designs[:2])
+        assert same['skipped'] == 2
+
+        options = _options(tmp_path, max_workers=1)
+        options['n_frequencies'] = 5
+        batch = BatchAnalyzer(**options)
+        summary = batch.run(designs[:2])
+        assert summary['skipped'] == 0 and summary['completed'] == 2
+        assert batch.load_result(designs[0])['mtf.tangential'].shape == (2, 5)
+        assert batch.manifest()[str(designs[0].resolve())]['settings']['n_frequencies'] == 5
+
+    def test_process_pool_matches_serial(self, tmp_path, designs):
+        """프로세스 풀 결과는 단일 프로세스 결과와 동일"""
+        serial = BatchAnalyzer(**_options(tmp_path / 'a', max_workers=1))
+        parallel = BatchAnalyzer(**_options(tmp_path / 'b', max_workers=2))
+        serial.run(designs)
+        summary = parallel.run(designs)
+        assert summary['completed'] == 4
+        for path in designs:
+            a, b = serial.load_result(path), parallel.load_result(path)
+            assert a.keys() == b.keys()
+            for key in a:
+                np.testing.assert_array_equal(a[key], b[key])
+
+    def test_worker_count_limits(self, tmp_path):
+        """작업 프로세스 수는 파일 수와 백엔드 수로 제한"""
+        batch = BatchAnalyzer(**_options(tmp_path, max_workers=8, max_backends=2))
+        assert batch.n_workers(100) == 2
+        assert batch.n_workers(1) == 1
+        assert BatchAnalyzer(**_options(tmp_path, max_workers=8)).n_workers(3) == 3
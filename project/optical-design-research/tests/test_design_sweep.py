@@ -0,0 +1,133 @@
+"""
+Unit Tests for Parametric Design Sweep
+매개변수 설계 스윕 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import raytrace
+from scripts.design_sweep import DesignSweep, SweepParameter, run_sweep, sample_space
+from scripts.prescription import Prescription
+
+
+@pytest.fixture
+def doublet():
+    """조리개가 2번 면인 3파장 3시야 이중 렌즈"""
+    presc = Prescription(wavelengths=[0.55, 0.486, 0.656], fields=[0.0, 3.0, 6.0],
+                         aperture=10.0)
+    presc.add_surface(radius=50.0, thickness=5.0, glass='N-BK7')
+    presc.add_surface(radius=-30.0, thickness=2.0)
+    presc.add_surface(radius=-30.0, thickness=5.0, glass='N-SF5')
+    presc.add_surface(radius=-100.0, thickness=90.0)
+    presc.stop = 2
+    return presc
+
+
+def _direct_rms(presc, field, wavelength, density=3):
+    """스윕 캐시 없이 처음부터 추적한 무게중심 기준 RMS (μm)"""
+    px, py = raytrace.pupil_grid(density)
+    bundle = raytrace.trace(presc, raytrace.launch_rays(presc, field, wavelength, px, py),
+                            wavelength)
+    xy = bundle.position[bundle.valid, :2]
+    return np.sqrt(np.mean(np.sum((xy - xy.mean(axis=0))**2, axis=1))) * 1e3
+
+
+class TestSampleSpace:
+    """스윕 점 생성 테스트"""
+
+    def test_cartesian_grid(self):
+        """데카르트 곱 (문자열 값 포함)"""
+        points = sample_space({'radius:1': [40, 50, 60], 'glass:1': ['N-BK7', 'N-SF5']})
+        assert len(points['radius:1']) == 6
+        assert list(zip(points['radius:1'], points['glass:1']))[:2] == [(40, 'N-BK7'),
+                                                                       (40, 'N-SF5')]
+
+    def test_latin_hypercube_and_sobol(self):
+        """LHS는 구간마다 한 점, Sobol 점 수, 선택지 샘플링"""
+        points = sample_space({'thickness:4': (80.0, 100.0), 'glass:3': ['N-SF5', 'F2']},
+                              method='lhs', n=10, seed=0)
+        bins = np.floor((points['thickness:4'] - 80.0) / 2.0).astype(int)
+        assert sorted(bins) == list(range(10))
+        assert set(points['glass:3']) == {'N-SF5', 'F2'}
+
+        sobol = sample_space({'radius:1': (40.0, 60.0)}, method='sobol', n=16, seed=0)
+        assert len(sobol['radius:1']) == 16
+        assert np.all((sobol['radius:1'] >= 40.0) & (sobol['radius:1'] <= 60.0))
+        with pytest.raises(ValueError):
+            sample_space({'radius:1': (40.0, 60.0)}, method='sobol')
+        with pytest.raises(ValueError):
+            sample_space({'radius:1': (40.0, 60.0)}, method='grid', n=4)
+
+
+class TestSweepParameter:
+    """매개변수 이름과 의존 깊이 테스트"""
+
+    def test_depths(self, doublet):
+        """조리개(2번 면) 앞은 광선 발사부터, 뒤는 접두부 재사용"""
+        depth = {name: SweepParameter.parse(name).depth(doublet) for name in
+                 ('aperture', 'radius:1', 'thickness:1', 'radius:2', 'conic:1',
+                  'thickness:2', 'glass:3', 'thickness:4')}
+        assert depth == {'aperture': -1, 'radius:1': -1, 'thickness:1': -1, 'radius:2': 1,
+                         'conic:1': 0, 'thickness:2': 2, 'glass:3': 2, 'thickness:4': 4}
+
+    def test_invalid_names(self, doublet):
+        """잘못된 이름/면 번호"""
+        for name in ('radius', 'power:1', 'radius:x'):
+            with pytest.raises(ValueError):
+                SweepParameter.parse(name)
+        with pytest.raises(ValueError):
+            SweepParameter.parse('thickness:5').depth(doublet)
+
+
+class TestDesignSweep:
+    """스윕 실행 테스트"""
+
+    def test_memoized_results_match_direct_trace(self, doublet):
+        """접두부를 재사용한 결과는 처음부터 추적한 결과와 같음"""
+        space = {'radius:3': [-32.0, -28.0], 'radius:4': [-110.0, -90.0],
+                 'thickness:4': [88.0, 92.0]}
+        df = run_sweep(doublet, space, metrics=('efl', 'rms_spot'), density=3)
+        assert len(df) == 8 * 3 * 3
+        for point in (0, 5, 7):
+            rows = df[df['point'] == point]
+            presc = doublet.copy()
+            for name in space:
+                SweepParameter.parse(name).apply(presc, rows[name].iloc[0])
+            assert rows['efl'].iloc[0] == pytest.approx(raytrace.paraxial_data(presc).efl)
+            for row in rows.itertuples():
+                assert row.rms_spot == pytest.approx(
+                    _direct_rms(presc, row.field, row.wavelength), rel=1e-12)
+
+    def test_trace_reuse(self, doublet):
+        """초점 거리 스윕은 마지막 간격만 다시 추적, 조리개 앞 변경은 재사용 없음"""
+        sweep = DesignSweep(doublet, metrics=('rms_spot',), density=2)
+        sweep.run({'thickness:4': np.linspace(85.0, 95.0, 20)})
+        # 첫 점만 1..5번 면 전체, 나머지는 상면 1면
+        assert sweep.stats['surfaces_traced'] == (5 + 19) * 3 * 3
+        assert sweep.stats['reuse'] == pytest.approx(1 - 24 / 100)
+
+        sweep.run({'radius:1': np.linspace(45.0, 55.0, 5)})
+        assert sweep.stats['reuse'] == 0.0
+
+    def test_tidy_table(self, doublet):
+        """점 x 시야 x 파장 한 행, 원래 점 순서 유지"""
+        points = {'glass:3': np.array(['N-SF5', 'F2', 'N-SF5']),
+                  'aperture': np.array([10.0, 8.0, 6.0])}
+        df = DesignSweep(doublet, metrics=('f_number', 'transmission', 'mtf_tangential'),
+                         density=2).run(points)
+        assert list(df.columns) == ['point', 'glass:3', 'aperture', 'field', 'wavelength',
+                                    'f_number', 'transmission', 'mtf_tangential']
+        assert df['point'].tolist() == sorted(df['point'])
+        assert df.groupby('point')['aperture'].first().tolist() == [10.0, 8.0, 6.0]
+        assert np.all(df['transmission'] == 1.0)
+        assert df.attrs['sweep_stats']['surfaces_full'] == 3 * 9 * 5
+
+    def test_unknown_metric(self, doublet):
+        """알 수 없는 지표"""
+        with pytest.raises(ValueError):
+            DesignSweep(doublet, metrics=('strehl',))
@@ -0,0 +1,93 @@
+"""
+Unit Tests for Encircled / Ensquared Energy
+환형/정방형 에너지 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.encircled_energy import energy_curves, energy_radius
+
+
+def reference_radius(d, w, fraction):
+    """전체 정렬 기준값"""
+    order = np.argsort(d)
+    cum = np.cumsum(w[order])
+    j = np.searchsorted(cum, fraction * cum[-1] * (1 - 1e-12))
+    return d[order][j]
+
+
+@pytest.fixture
+def gaussian_spot():
+    rng = np.random.default_rng(3)
+    return rng.normal(0, 10, 200000), rng.normal(0, 10, 200000)
+
+
+class TestEnergyRadius:
+    """에너지 반경 테스트"""
+
+    def test_matches_full_sort(self, gaussian_spot):
+        """히스토그램+구간 정렬 결과가 전체 정렬과 동일한지"""
+        x, y = gaussian_spot
+        w = np.random.default_rng(4).uniform(0.5, 1.5, len(x))
+
+        radii = energy_radius(x, y, (0.5, 0.8, 0.9), weights=w)[(0, 0)]
+
+        d = np.hypot(x - np.average(x, weights=w), y - np.average(y, weights=w))
+        for r, f in zip(radii, (0.5, 0.8, 0.9)):
+            assert r == pytest.approx(reference_radius(d, w, f), rel=1e-12)
+
+    def test_gaussian_ee80(self, gaussian_spot):
+        """2D 가우시안: EE80 = σ·sqrt(-2 ln 0.2)"""
+        x, y = gaussian_spot
+
+        ee80 = energy_radius(x, y, (0.8,))[(0, 0)][0]
+
+        assert ee80 == pytest.approx(10 * np.sqrt(-2 * np.log(0.2)), rel=0.01)
+
+    def test_multiple_fields(self):
+        rng = np.random.default_rng(5)
+        field = np.repeat([1, 2], 50000)
+        sigma = np.where(field == 1, 1.0, 3.0)
+        x = rng.normal(0, 1, field.size) * sigma
+        y = rng.normal(0, 1, field.size) * sigma
+
+        radii = energy_radius(x, y, (0.9,), field=field)
+
+        assert radii[(2, 0)][0] / radii[(1, 0)][0] == pytest.approx(3.0, rel=0.03)
+
+    def test_ensquared_uniform_square(self):
+        """균일 정사각형 분포: 반폭 a에서 에너지 비율 (a/L)²"""
+        rng = np.random.default_rng(6)
+        x = rng.uniform(-1, 1, 400000)
+        y = rng.uniform(-1, 1, 400000)
+
+        r = energy_radius(x, y, (0.25,), kind='ensquared', center=(0, 0))[(0, 0)][0]
+
+        assert r == pytest.approx(0.5, abs=0.005)
+
+
+class TestEnergyCurves:
+    """에너지 곡선 테스트"""
+
+    def test_histogram_and_sort_agree(self, gaussian_spot):
+        x, y = gaussian_spot
+
+        hist = energy_curves(x, y, method='histogram', n_bins=2048)[(0, 0)]
+        exact = energy_curves(x, y, method='sort')[(0, 0)]
+
+        assert hist.fraction[-1] == pytest.approx(1.0)
+        assert hist.radius_at(0.8) == pytest.approx(exact.radius_at(0.8), rel=0.01)
+
+    def test_weights_zero_excluded(self):
+        x = np.array([0.0, 1.0, 10.0])
+        y = np.zeros(3)
+        w = np.array([1.0, 1.0, 0.0])
+
+        curve = energy_curves(x, y, weights=w, center=(0, 0), method='sort')[(0, 0)]
+
+        assert curve.radius_at(1.0) == pytest.approx(1.0)
@@ -0,0 +1,128 @@
+"""
+Unit Tests for Ghost Reflection Analysis
+고스트 반사 해석 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import raytrace
+from scripts.ghost_analysis import (analyze_ghosts, ghost_pairs, path_energy,
+                                    surface_reflectance, unfolded_prescription)
+from scripts.glass_catalog import refractive_index
+from scripts.prescription import Prescription
+
+
+@pytest.fixture
+def doublet():
+    """1064 nm 이중 렌즈"""
+    presc = Prescription(wavelengths=[1.064], fields=[0.0], aperture=10.0)
+    presc.add_surface(radius=50.0, thickness=5.0, glass='N-BK7')
+    presc.add_surface(radius=-30.0, thickness=2.0)
+    presc.add_surface(radius=-30.0, thickness=5.0, glass='N-SF5')
+    presc.add_surface(radius=-100.0, thickness=95.0)
+    return presc
+
+
+def _unfolded_foci(presc, i, j, h=5.0):
+    """펼친 처방의 근축 추적으로 구한 (상면 높이, 허리가 가장 작은 실초점 z)"""
+    ghost = unfolded_prescription(presc, i, j)
+    heights, slopes = raytrace.paraxial_trace(ghost, 1.064, h, 0.0)
+    last = ghost.image_surface - 1
+    y_img = heights[-1] + ghost.thickness[last] * slopes[-1]
+    z = ghost.vertex_z()
+    # 두 번째 반사 뒤의 점들 (j 반사면 = j번째 펼친 면)
+    ys = np.append(heights, y_img)
+    best, focus = 0.0, np.nan
+    for k in range(j, last + 1):
+        y0, y1 = ys[k - 1], ys[k]
+        if y0 * y1 <= 0 and y0 != y1 and abs(slopes[k - 1]) > best:
+            best = abs(slopes[k - 1])
+            focus = z[k] + y0 / (y0 - y1) * (z[k + 1] - z[k])
+    if y_img * slopes[-1] < 0 and abs(slopes[-1]) > best:
+        focus = z[last + 1] - y_img / slopes[-1]
+    return abs(y_img), focus
+
+
+class TestGhostPaths:
+    """경로 나열과 에너지 테스트"""
+
+    def test_pairs_and_energy(self, doublet):
+        """경로 수 = C(m, 2), 에너지 = R_i R_j Π T"""
+        i, j = ghost_pairs(doublet)
+        assert len(i) == 6 and np.all(i < j)
+        R = surface_reflectance(doublet, 1.064)
+        n = refractive_index('N-BK7', 1.064)
+        assert R[1] == pytest.approx(((n - 1) / (n + 1))**2)
+        T = 1 - R
+        # (1, 3): 전진 1, 2 / 후진 2 / 전진 2, 3, 4
+        expected = R[1] * R[3] * T[1] * T[2] * T[2] * T[2] * T[3] * T[4]
+        energy = path_energy(R, np.array([1]), np.array([3]))
+        assert energy[0] == pytest.approx(expected, rel=1e-12)
+
+    def test_unfolded_prescription(self, doublet):
+        """펼친 처방은 j, i면이 반사면이고 상면 위치는 원래와 같음"""
+        ghost = unfolded_prescription(doublet, 2, 4)
+        assert ghost.glass[4] == 'MIRROR' and ghost.glass[6] == 'MIRROR'
+        assert ghost.n_surfaces == doublet.n_surfaces + 2 * (4 - 2)
+        assert ghost.vertex_z()[-1] == pytest.approx(doublet.vertex_z()[-1])
+        with pytest.raises(ValueError):
+            unfolded_prescription(doublet, 3, 3)
+
+
+class TestAnalyzeGhosts:
+    """일괄 근축 고스트 해석 테스트"""
+
+    def test_matches_unfolded_trace(self, doublet):
+        """일괄 결과 = 경로별 펼친 처방 근축 추적"""
+        df = analyze_ghosts(doublet, power=10.0)
+        assert len(df) == 6 and df.attrs['n_traced'] == 6
+        for row in df.itertuples():
+            radius, focus = _unfolded_foci(doublet, row.i, row.j)
+            assert row.image_radius == pytest.approx(radius, rel=1e-10)
+            if np.isnan(focus):
+                assert np.isnan(row.focus_z)
+            else:
+                assert row.focus_z == pytest.approx(focus, rel=1e-10)
+        assert df['peak_irradiance'].dropna().is_monotonic_decreasing
+        assert np.all(df['power'] == 10.0 * df['energy'])
+
+    def test_internal_focus_in_glass(self, doublet):
+        """(1, 3) 고스트는 첫 렌즈 유리 안에서 초점을 맺음"""
+        row = analyze_ghosts(doublet).set_index(['i', 'j']).loc[(1, 3)]
+        assert row['focus_medium'] == 'N-BK7' and row['focus_region'] == 1
+        assert 0.0 < row['focus_z'] < 5.0
+        # 가우시안 허리와 최대 조도
+        waist_mm = row['waist'] * 1e-3
+        assert row['peak_irradiance'] == pytest.approx(
+            2 * row['power'] / (np.pi * waist_mm**2) * 1e2)
+
+    def test_energy_pruning(self, doublet):
+        """코팅 반사율이 낮으면 기준 미만 경로는 추적하지 않음"""
+        R = [0.04, 0.04, 0.002, 0.002]
+        df = analyze_ghosts(doublet, reflectance=R, threshold=1e-4)
+        assert df.attrs['n_paths'] == 6 and df.attrs['n_traced'] == 1
+        assert (df['i'].iloc[0], df['j'].iloc[0]) == (1, 2)
+        assert len(analyze_ghosts(doublet, reflectance=0.0)) == 0
+
+    def test_batched_large_system(self):
+        """면 20개 시스템의 190개 경로를 한 번에 계산"""
+        presc = Prescription(wavelengths=[1.064], aperture=10.0)
+        for _ in range(10):
+            presc.add_surface(radius=80.0, thickness=4.0, glass='N-BK7')
+            presc.add_surface(radius=-200.0, thickness=3.0)
+        df = analyze_ghosts(presc, threshold=0.0)
+        assert len(df) == 190
+        for row in df.sample(5, random_state=0).itertuples():
+            radius, focus = _unfolded_foci(presc, row.i, row.j)
+            assert row.image_radius == pytest.approx(radius, rel=1e-9)
+
+    def test_rejects_mirror(self, doublet):
+        """반사면이 있는 처방"""
+        doublet.glass[2] = 'MIRROR'
+        with pytest.raises(ValueError):
+            analyze_ghosts(doublet)
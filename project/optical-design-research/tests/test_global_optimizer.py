@@ -0,0 +1,121 @@
+"""
+Unit Tests for Global Lens Optimization
+전역 렌즈 최적화 단위 테스트
+"""
+
+import time
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import raytrace
+from scripts.global_optimizer import GlobalOptimizer
+from scripts.optics_backend import BackendError, LocalBackend
+from scripts.prescription import Prescription
+
+
+def _doublet():
+    """예제의 초기 이중 렌즈 (반복 수 상한 안에서 국소 최적화가 느리게 수렴)"""
+    presc = Prescription(wavelengths=[0.55], fields=[0.0, 5.0, 10.0], aperture=10.0)
+    presc.add_surface(radius=50.0, thickness=5.0, glass='N-BK7')
+    presc.add_surface(radius=-30.0, thickness=2.0)
+    presc.add_surface(radius=-30.0, thickness=5.0, glass='N-SF5')
+    presc.add_surface(radius=-100.0, thickness=95.0)
+    return presc
+
+
+FAST = dict(density=2, max_iterations=150)
+
+
+class TestGlobalOptimizer:
+    """다중 시작 최적화 테스트"""
+
+    def test_start_points(self):
+        """시작점 0은 기준 설계, 나머지는 범위 안 곡률과 후보 유리"""
+        presc = _doublet()
+        opt = GlobalOptimizer(presc, glass_choices={3: ['N-SF5', 'F2']}, n_starts=6,
+                              curvature_bounds=(-0.05, 0.05), seed=1)
+        starts = opt.starts()
+        assert len(starts) == 6
+        np.testing.assert_array_equal(starts[0][0][:4], presc.curvature[1:5])
+        assert starts[0][0][-1] == 95.0 and starts[0][1] == {3: 'N-SF5'}
+        for x0, glass in starts[1:]:
+            assert np.all(np.abs(x0[:4]) <= 0.05) and x0[-1] > 0
+            assert glass[3] in ('N-SF5', 'F2')
+        with pytest.raises(ValueError):
+            GlobalOptimizer(presc, glass_choices={5: ['F2']})
+
+    def test_not_worse_than_local(self):
+        """같은 반복 수 상한에서 다중 시작 결과는 국소 최적 이하, 원본은 그대로"""
+        presc = _doublet()
+        local = LocalBackend(_doublet())
+        local_merit = local.optimize(density=2, max_iterations=150)
+
+        result = GlobalOptimizer(presc, n_starts=4, max_workers=1, seed=0, **FAST).run()
+        assert result.merit <= local_merit + 1e-12
+        assert result.merit == pytest.approx(raytrace.rms_spot_radius(result.prescription, 2))
+        assert presc.curvature[4] == pytest.approx(-1 / 100.0)
+        assert result.starts[0]['merit'] == pytest.approx(local_merit, rel=1e-6)
+        assert result.n_evaluations == sum(s['n_evaluations'] for s in result.starts)
+
+    def test_start_zero_never_pruned(self):
+        """모든 시작점을 가지치기하는 설정에서도 시작점 0은 끝까지 탐색"""
+        local = LocalBackend(_doublet())
+        local_merit = local.optimize(density=2, max_iterations=150)
+
+        result = GlobalOptimizer(_doublet(), n_starts=3, max_workers=1, seed=0,
+                                 prune_after=5, prune_factor=0.0, **FAST).run()
+        statuses = [s['status'] for s in result.starts]
+        assert statuses[1:] == ['pruned', 'pruned']
+        assert statuses[0] in ('converged', 'maxiter')
+        assert result.starts[0]['merit'] == pytest.approx(local_merit, rel=1e-6)
+        assert result.merit <= local_merit + 1e-12
+
+    def test_status_from_local_search(self):
+        """반복 수 상한에 걸린 탐색은 'maxiter'"""
+        result = GlobalOptimizer(_doublet(), n_starts=2, max_workers=1, seed=0,
+                                 density=2, max_iterations=5).run()
+        assert [s['status'] for s in result.starts] == ['maxiter', 'maxiter']
+
+    def test_time_budget(self):
+        """시간 예산이 지나면 실행 중인 탐색은 멈추고 나머지는 건너뜀"""
+        begin = time.time()
+        result = GlobalOptimizer(_doublet(), n_starts=50, time_budget=0.5, max_workers=1,
+                                 seed=0, density=4, max_iterations=2000).run()
+        assert time.time() - begin < 3.0
+        statuses = [s['status'] for s in result.starts]
+        assert 'skipped' in statuses
+        assert np.isfinite(result.merit)
+
+    def test_process_pool(self):
+        """프로세스 풀 실행과 시작점별 결과"""
+        result = GlobalOptimizer(_doublet(), glass_choices={3: ['N-SF5', 'N-SF11']},
+                                 n_starts=3, max_workers=2, seed=2, **FAST).run()
+        assert len(result.starts) == 3
+        assert result.merit == min(s['merit'] for s in result.starts)
+        assert result.prescription.glass[3] in ('N-SF5', 'N-SF11')
+
+
+class TestBackendGlobalMode:
+    """LocalBackend.optimize(mode='global') 테스트"""
+
+    def test_global_mode_updates_system(self):
+        """최고 설계로 시스템 교체, 실행 요약 기록"""
+        backend = LocalBackend(_doublet())
+        merit = backend.optimize(mode='global', n_starts=3, max_workers=1, seed=0, **FAST)
+        info = backend.optimization_info
+        assert info['mode'] == 'global' and info['merit'] == merit
+        assert len(info['starts']) == 3 and info['n_evaluations'] > 0
+        assert merit == pytest.approx(raytrace.rms_spot_radius(backend.system, 2))
+
+    def test_invalid_mode_and_settings(self):
+        """알 수 없는 모드, 국소 모드에 전역 인자"""
+        backend = LocalBackend(_doublet())
+        with pytest.raises(BackendError):
+            backend.optimize(mode='anneal')
+        with pytest.raises(BackendError):
+            backend.optimize(n_starts=4)
@@ -0,0 +1,152 @@
+"""
+Unit Tests for Image Simulation Module
+영상 시뮬레이션 모듈 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import raytrace
+from scripts.image_simulation import (Detector, ImageSimulator, PSFGrid, band_radiance,
+                                      radiance_to_temperature)
+from scripts.prescription import Prescription
+
+
+def _gaussian(size=15, sigma=2.0, shift=(0.0, 0.0)):
+    """중심에서 shift (행, 열)만큼 이동한 가우시안 PSF"""
+    r = np.arange(size) - (size - 1) / 2
+    return np.exp(-((r[:, None] - shift[0])**2 + (r[None, :] - shift[1])**2) / (2 * sigma**2))
+
+
+def _convolve(scene, psf):
+    """기준 전체 프레임 합성곱 ('same', 0 경계)"""
+    k = psf.shape[0]
+    shape = (scene.shape[0] + k - 1, scene.shape[1] + k - 1)
+    full = np.fft.irfft2(np.fft.rfft2(scene, shape) * np.fft.rfft2(psf / psf.sum(), shape),
+                         shape)
+    c = (k - 1) // 2
+    return full[c:c + scene.shape[0], c:c + scene.shape[1]]
+
+
+class TestBlur:
+    """공간 가변 흐림 테스트"""
+
+    @pytest.mark.parametrize('shape, tile', [((96, 128), 32), ((61, 83), 16)])
+    def test_uniform_psf_matches_full_convolution(self, shape, tile):
+        """모든 시야 PSF가 같으면 overlap-add = 전체 합성곱"""
+        psf = _gaussian(shift=(1.0, -2.0))
+        scene = np.random.default_rng(0).random(shape)
+        sim = ImageSimulator(PSFGrid(np.broadcast_to(psf, (3, 3) + psf.shape)), shape,
+                             tile=tile, boundary='zero')
+        out = sim.blur(scene)
+        assert out.dtype == np.float32 and out.shape == shape
+        np.testing.assert_allclose(out, _convolve(scene, psf), atol=1e-5)
+
+    def test_psf_interpolated_between_field_points(self):
+        """노드 사이 점광원 응답 = 주변 격자 PSF의 이중 선형 보간"""
+        left, right = _gaussian(sigma=1.0), _gaussian(sigma=3.0)
+        grid = PSFGrid(np.stack([left, right])[None])
+        np.testing.assert_allclose(grid.at(-0.5, 0.0),
+                                   0.75 * grid.psfs[0, 0] + 0.25 * grid.psfs[0, 1])
+        shape = (65, 129)
+        scene = np.zeros(shape)
+        scene[32, 32] = 1.0
+        out = ImageSimulator(grid, shape, tile=16).blur(scene)
+        np.testing.assert_allclose(out[25:40, 25:40], grid.at(-0.5, 0.0), atol=1e-6)
+
+    def test_flux_and_flat_field(self):
+        """보정 없으면 총 광량 보존, 보정하면 PSF가 달라도 균일 장면 유지"""
+        grid = PSFGrid(np.stack([[_gaussian(sigma=s) for s in (1.0, 2.0)],
+                                 [_gaussian(sigma=s) for s in (3.0, 1.5)]]))
+        shape = (70, 90)
+        scene = np.zeros(shape)
+        scene[10:60, 10:80] = np.random.default_rng(1).random((50, 70))
+        raw = ImageSimulator(grid, shape, tile=16, normalize=False)
+        assert raw.blur(scene).sum() == pytest.approx(scene.sum(), rel=1e-5)
+        flat = np.full(shape, 7.0)
+        assert np.ptp(raw.blur(flat)) > 1e-2
+        np.testing.assert_allclose(ImageSimulator(grid, shape, tile=16).blur(flat), 7.0,
+                                   rtol=1e-5)
+        zero = ImageSimulator(grid, shape, tile=16, boundary='zero').blur(flat)
+        assert zero[0, 0] < 0.6 * 7.0 and zero[35, 45] == pytest.approx(7.0, rel=1e-5)
+
+    def test_buffers_reused(self):
+        """반복 호출 결과가 같고 이전 결과와 버퍼를 공유하지 않음"""
+        grid = PSFGrid(np.stack([_gaussian(sigma=1.0), _gaussian(sigma=3.0)])[None])
+        shape = (70, 90)
+        sim = ImageSimulator(grid, shape, tile=16)
+        scene = np.random.default_rng(2).random(shape)
+        first = sim.blur(scene)
+        kept = first.copy()
+        sim.blur(np.zeros(shape))
+        np.testing.assert_array_equal(first, kept)
+        np.testing.assert_array_equal(sim.blur(scene), first)
+        with pytest.raises(ValueError):
+            sim.blur(np.zeros((10, 10)))
+        with pytest.raises(ValueError):
+            ImageSimulator(grid, shape, boundary='wrap')
+        with pytest.raises(ValueError):
+            PSFGrid(np.ones((4, 4)))
+
+    def test_psf_grid_from_prescription(self):
+        """축상 PSF는 대칭, 축외 PSF 중심은 방사 방향 대칭"""
+        presc = Prescription(wavelengths=[10.0], aperture=25.0)
+        presc.add_surface(radius=80.0, thickness=5.0, glass='GERMANIUM')
+        presc.add_surface(radius=120.0, thickness=0.0)
+        presc.thickness[2] = raytrace.paraxial_data(presc).bfl
+        grid = PSFGrid.from_prescription(presc, (256, 320), 0.017, grid=(3, 3), size=21)
+        np.testing.assert_allclose(grid.psfs.sum(axis=(2, 3)), 1.0)
+        r = np.arange(21) - 10
+        center = grid.psfs[1, 1]
+        np.testing.assert_allclose(center, center.T, atol=1e-3)
+        np.testing.assert_allclose(center, center[::-1, ::-1], atol=1e-3)
+        cx = [(grid.psfs[1, i] * r).sum() for i in (0, 2)]
+        cy = [(grid.psfs[j, 1] * r[:, None]).sum() for j in (0, 2)]
+        assert cx[0] == pytest.approx(-cx[1], abs=1e-6) and abs(cx[0]) > 0.1
+        assert cy[0] == pytest.approx(-cy[1], abs=1e-6)
+        geometric = PSFGrid.from_prescription(presc, (256, 320), 0.017, grid=(1, 1), size=21,
+                                              diffraction=False)
+        assert geometric.psfs.max() > center.max()
+
+
+class TestDetector:
+    """검출기 샘플링/잡음 테스트"""
+
+    def test_binning_and_quantization(self):
+        """oversample 화소 평균, ADC 왕복"""
+        image = np.arange(16.0).reshape(4, 4)
+        det = Detector(oversample=2, bits=8, full_scale=(0.0, 15.0))
+        counts = det.sample(image)
+        assert counts.dtype == np.uint16
+        np.testing.assert_allclose(det.to_signal(counts),
+                                   [[2.5, 4.5], [10.5, 12.5]], atol=15 / 255 / 2)
+        with pytest.raises(ValueError):
+            det.sample(np.zeros((5, 4)))
+        with pytest.raises(ValueError):
+            Detector(bits=8)
+
+    def test_noise_statistics(self):
+        """NETD 잡음 표준편차, 고정 패턴은 프레임 간 동일"""
+        det = Detector.from_netd(0.05, fpn_std=0.0, seed=3)
+        flat = np.full((256, 256), band_radiance(300.0))
+        rng = np.random.default_rng(0)
+        frames = np.stack([det.sample(flat, rng) for _ in range(4)])
+        temperature = radiance_to_temperature(frames)
+        assert temperature.std() == pytest.approx(0.05, rel=0.05)
+        fpn = Detector(fpn_std=0.1, seed=3)
+        a, b = fpn.sample(np.zeros((32, 32))), fpn.sample(np.zeros((32, 32)))
+        np.testing.assert_array_equal(a, b)
+        assert a.std() == pytest.approx(0.1, rel=0.2)
+
+    def test_band_radiance(self):
+        """단조 증가, 역변환 왕복, 스테판-볼츠만 상한"""
+        temperature = np.array([250.0, 300.0, 350.0])
+        radiance = band_radiance(temperature)
+        assert np.all(np.diff(radiance) > 0)
+        np.testing.assert_allclose(radiance_to_temperature(radiance), temperature, atol=1e-3)
+        assert radiance[1] < 5.670374419e-8 * 300.0**4 / np.pi
+        assert band_radiance(300.0) == pytest.approx(172.6 / np.pi, rel=0.01)
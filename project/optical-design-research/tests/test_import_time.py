@@ -0,0 +1,109 @@
+"""
+Import-Time Tests
+Import 시간 테스트
+
+핵심 계산 모듈을 import할 때 pandas, matplotlib, scipy를 불러오지 않는지
+새 인터프리터에서 검사합니다.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+HEAVY_MODULES = ('pandas', 'matplotlib', 'scipy')
+
+CORE_MODULES = (
+    'scripts',
+    'scripts.optical_calculations',
+    'scripts.thermal_analysis',
+    'scripts.data_processing',
+    'scripts.spot_reader',
+    'scripts.spot_statistics',
+    'scripts.encircled_energy',
+    'scripts.measurement_uncertainty',
+    'scripts.streaming_filters',
+    'scripts.parse_cache',
+    'scripts.ansys_reader',
+    'scripts.measurement_store',
+    'scripts.report_pipeline',
+    'scripts.glass_catalog',
+    'scripts.prescription',
+    'scripts.raytrace',
+    'scripts.optics_backend',
+    'scripts.batch_analysis',
+    'scripts.analysis_results',
+    'scripts.zmx_reader',
+    'scripts.design_sweep',
+    'scripts.global_optimizer',
+    'scripts.surrogate',
+    'scripts.nonsequential',
+    'scripts.ghost_analysis',
+    'scripts.surfaces',
+    'scripts.thin_film',
+    'scripts.image_simulation',
+    'scripts.robust_outliers',
+    'scripts.table_export',
+)
+
+
+def _run(code: str) -> dict:
+    """새 인터프리터에서 code 실행 후 마지막 줄의 JSON 반환"""
+    out = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _loaded_heavy(statements: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "t0 = time.perf_counter()\n"
+        f"{statements}\n"
+        "elapsed = time.perf_counter() - t0\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'heavy': heavy, 'seconds': elapsed}))\n"
+    )
+    return _run(code)
+
+
+@pytest.mark.parametrize('module', CORE_MODULES)
+def test_core_import_is_lightweight(module):
+    """핵심 모듈 import 시 무거운 의존성을 불러오지 않음"""
+    result = _loaded_heavy(f"import {module}")
+    assert result['heavy'] == [], f"{module} imports {result['heavy']}"
+
+
+def test_calculators_run_without_heavy_dependencies():
+    """numpy만 필요한 계산은 실행 후에도 무거운 의존성을 불러오지 않음"""
+    result = _loaded_heavy(
+        "import numpy as np\n"
+        "from scripts import OpticalCalculator, PeltierModule, ZemaxDataProcessor\n"
+        "from scripts.encircled_energy import energy_radius\n"
+        "x = np.random.default_rng(0).normal(size=1000)\n"
+        "ZemaxDataProcessor.calculate_rms_spot_size(x, x[::-1])\n"
+        "energy_radius(x, x[::-1])\n"
+        "OpticalCalculator.thin_lens_focal_length(50, -50, 1.5)\n"
+        "PeltierModule(qmax=25, delta_tmax=70, imax=4.0, vmax=15.4).cooling_power(30, 3.0)"
+    )
+    assert result['heavy'] == []
+
+
+def test_heavy_dependency_loads_on_first_use():
+    """무거운 의존성은 해당 기능을 처음 사용할 때 로드"""
+    result = _loaded_heavy(
+        "from scripts import MeasurementDataProcessor\n"
+        "MeasurementDataProcessor.calculate_uncertainty([1.0, 2.0, 3.0])"
+    )
+    assert result['heavy'] == ['scipy']
+
+
+def test_package_import_time():
+    """패키지 전체 import 시간 (무거운 의존성 없이 1초 이내)"""
+    result = _loaded_heavy("import " + ", ".join(CORE_MODULES))
+    assert result['heavy'] == []
+    assert result['seconds'] < 1.0
@@ -0,0 +1,126 @@
+"""
+Unit Tests for Measurement Time-Series Store
+측정 시계열 저장소 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.measurement_store import MeasurementStore
+from scripts.data_processing import MeasurementDataProcessor
+
+
+def _series(n, start=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = start + np.arange(n) * 0.5
+    return t, rng.normal(25.0, 1.0, n).astype(np.float32)
+
+
+class TestMeasurementStore:
+    """추가/질의 테스트"""
+
+    def test_append_in_batches_matches_single_write(self, tmp_path):
+        """여러 번 나누어 추가해도 한 번에 쓴 것과 동일"""
+        t, v = _series(10_000)
+        path = tmp_path / "store.h5"
+        with MeasurementStore(path, chunk_rows=1000, pyramid_factor=8,
+                              pyramid_levels=3) as store:
+            for a, b in [(0, 1), (1, 2500), (2500, 2501), (2501, 10_000)]:
+                store.append('tc1', t[a:b], v[a:b])
+
+        with MeasurementStore(path, mode='r') as store:
+            assert store.channels() == ['tc1']
+            assert store.n_samples('tc1') == 10_000
+            assert store.chunk_rows == 1000
+            t_all, v_all = store.query('tc1')
+        np.testing.assert_array_equal(t_all, t)
+        np.testing.assert_array_equal(v_all, v)
+
+    def test_time_range_query(self, tmp_path):
+        """시간 범위 질의 결과가 마스크 필터링과 동일 (경계 포함)"""
+        t, v = _series(5000)
+        with MeasurementStore(tmp_path / "store.h5", chunk_rows=256) as store:
+            store.append('laser', t, v)
+            for t0, t1 in [(0.0, 10.0), (100.25, 1800.0), (1234.5, 1234.5),
+                           (-5.0, 3.0), (2400.0, 9999.0), (3000.0, 2000.0)]:
+                qt, qv = store.query('laser', t0, t1)
+                keep = (t >= t0) & (t <= t1)
+                np.testing.assert_array_equal(qt, t[keep])
+                np.testing.assert_array_equal(qv, v[keep])
+
+    def test_rejects_out_of_order_times(self, tmp_path):
+        """시각이 역순이면 오류"""
+        with MeasurementStore(tmp_path / "store.h5") as store:
+            store.append('tc1', [0.0, 1.0], [1.0, 2.0])
+            with pytest.raises(ValueError):
+                store.append('tc1', [0.5], [3.0])
+            with pytest.raises(ValueError):
+                store.append('tc2', [2.0, 1.0], [1.0, 2.0])
+
+    def test_append_frame(self, tmp_path):
+        """DataFrame 열이 채널로 저장됨"""
+        index = pd.date_range('2026-01-01', periods=100, freq='s')
+        frame = pd.DataFrame({'tc1': np.arange(100.0), 'tc2': np.ones(100)}, index=index)
+        with MeasurementStore(tmp_path / "store.h5") as store:
+            store.append_frame(frame)
+            assert sorted(store.channels()) == ['tc1', 'tc2']
+            t, v = store.query('tc1')
+        assert t[1] - t[0] == pytest.approx(1.0)
+        np.testing.assert_array_equal(v, np.arange(100.0))
+
+    def test_append_csv_to_store(self, tmp_path):
+        """CSV 로그를 청크 단위로 저장소에 추가"""
+        csv_path = tmp_path / "log.csv"
+        pd.DataFrame({'time': pd.date_range('2026-01-01', periods=250, freq='s').astype(str),
+                      'tc1': np.arange(250.0), 'label': 'run'}).to_csv(csv_path, index=False)
+        with MeasurementStore(tmp_path / "store.h5") as store:
+            n = MeasurementDataProcessor.append_csv_to_store(csv_path, store, 'time',
+                                                             chunksize=100)
+            assert n == 250
+            assert store.channels() == ['tc1']
+            t, v = store.query('tc1')
+        np.testing.assert_allclose(np.diff(t), 1.0)
+        np.testing.assert_array_equal(v, np.arange(250.0))
+
+
+class TestPyramid:
+    """다운샘플 피라미드 테스트"""
+
+    def test_pyramid_levels_match_raw(self, tmp_path):
+        """피라미드 min/max/mean이 원시 데이터 블록 통계와 일치"""
+        t, v = _series(8 ** 3 * 5 + 17)
+        with MeasurementStore(tmp_path / "store.h5", chunk_rows=100,
+                              pyramid_factor=8, pyramid_levels=3) as store:
+            for start in range(0, len(t), 333):
+                store.append('tc1', t[start:start + 333], v[start:start + 333])
+
+            for level in (1, 2, 3):
+                size = 8 ** level
+                n_blocks = len(t) // size
+                blocks = v[:n_blocks * size].reshape(n_blocks, size).astype(np.float64)
+                lg = store._file[f'channels/tc1/pyramid/level_{level}']
+                np.testing.assert_allclose(lg['min'][()], blocks.min(axis=1))
+                np.testing.assert_allclose(lg['max'][()], blocks.max(axis=1))
+                np.testing.assert_allclose(lg['mean'][()], blocks.mean(axis=1), rtol=1e-6)
+                np.testing.assert_array_equal(lg['time'][()], t[:n_blocks * size:size])
+
+    def test_downsampled_query_limits_points(self, tmp_path):
+        """요약 질의는 점 수를 제한하고 구간 극값을 보존"""
+        t, v = _series(50_000)
+        v[31_337] = 1000.0
+        with MeasurementStore(tmp_path / "store.h5", chunk_rows=4096,
+                              pyramid_factor=16, pyramid_levels=4) as store:
+            store.append('tc1', t, v)
+            raw = store.query_downsampled('tc1', 0.0, 100.0, max_points=500)
+            summary = store.query_downsampled('tc1', max_points=500)
+
+        assert raw['level'] == 0
+        assert len(raw['time']) == 201
+        assert summary['level'] == 2
+        assert len(summary['time']) <= 500
+        assert summary['max'].max() == pytest.approx(1000.0)
@@ -0,0 +1,75 @@
+"""
+Unit Tests for Measurement Uncertainty
+측정 불확도 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.measurement_uncertainty import (
+    t_quantile,
+    batch_uncertainty,
+    bootstrap_uncertainty
+)
+from scripts.data_processing import MeasurementDataProcessor
+
+
+@pytest.fixture
+def lots():
+    rng = np.random.default_rng(21)
+    return rng.normal(100.0, 0.5, (20, 300))
+
+
+class TestBatchUncertainty:
+    """배치 t-분포 불확도 테스트"""
+
+    def test_matches_per_column(self, lots):
+        mean, unc = batch_uncertainty(lots)
+
+        assert mean.shape == unc.shape == (300,)
+        for j in (0, 150, 299):
+            m, u = MeasurementDataProcessor.calculate_uncertainty(lots[:, j])
+            assert mean[j] == pytest.approx(m)
+            assert unc[j] == pytest.approx(u)
+
+    def test_nan_columns_use_own_sample_count(self, lots):
+        data = lots[:, :2].copy()
+        data[10:, 1] = np.nan
+
+        mean, unc = batch_uncertainty(data)
+
+        m, u = MeasurementDataProcessor.calculate_uncertainty(lots[:10, 1])
+        assert mean[1] == pytest.approx(m)
+        assert unc[1] == pytest.approx(u)
+
+    def test_t_quantile_cached(self):
+        t_quantile.cache_clear()
+        t_quantile(20, 0.95)
+        t_quantile(20, 0.95)
+
+        assert t_quantile.cache_info().hits == 1
+        assert t_quantile(20, 0.95) == pytest.approx(2.093, abs=1e-3)
+
+
+class TestBootstrapUncertainty:
+    """부트스트랩 불확도 테스트"""
+
+    def test_reproducible_across_worker_counts(self, lots):
+        serial = bootstrap_uncertainty(lots[:, :5], n_resamples=600, seed=3, n_workers=1)
+        parallel = bootstrap_uncertainty(lots[:, :5], n_resamples=600, seed=3, n_workers=2)
+
+        for a, b in zip(serial, parallel):
+            np.testing.assert_array_equal(a, b)
+
+    def test_interval_close_to_t_interval(self):
+        data = np.random.default_rng(5).normal(10.0, 1.0, 400)
+
+        mean, lower, upper = bootstrap_uncertainty(data, n_resamples=2000, seed=1)
+        _, unc = batch_uncertainty(data)
+
+        assert lower < mean < upper
+        assert (upper - lower) / 2 == pytest.approx(unc, rel=0.15)
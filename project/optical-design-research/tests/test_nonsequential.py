@@ -0,0 +1,181 @@
+"""
+Unit Tests for Non-Sequential Monte Carlo Ray Tracing
+비순차 몬테카를로 광선 추적 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import raytrace
+from scripts.glass_catalog import refractive_index
+from scripts.nonsequential import (CollimatedSource, ConicFace, DetectorMap, DiskFace,
+                                   NonSequentialTracer, PointSource, Scene)
+from scripts.prescription import Prescription
+
+
+def _window_scene(tilt=0.0):
+    """BK7 창 하나와 검출기"""
+    scene = Scene()
+    scene.add_window(10.0, 3.0, 15.0, 'N-BK7', tilt=tilt)
+    scene.add_detector(30.0, 20.0, pixels=32)
+    return scene
+
+
+def _reflectance(glass='N-BK7'):
+    """수직 입사 프레넬 반사율"""
+    n = refractive_index(glass, 0.55)
+    return ((n - 1) / (n + 1))**2
+
+
+class TestScene:
+    """면 교점과 BVH 테스트"""
+
+    def test_bvh_matches_brute_force(self):
+        """배플/하우징/렌즈/기운 창이 섞인 장면에서 BVH = 전수 검사"""
+        rng = np.random.default_rng(0)
+        scene = Scene()
+        for k in range(40):
+            scene.add_baffle(k * 4.0, 3 + 5 * rng.random(), 20.0)
+        scene.add_tube(0.0, 160.0, 20.0)
+        scene.add_lens(41.0, 3.0, 50.0, -50.0, 10.0, 'N-BK7')
+        scene.add_window(81.0, 2.0, 10.0, 'N-BK7', tilt=10.0)
+        p = rng.uniform(-10, 10, (5000, 3))
+        p[:, 2] = rng.uniform(-5, 160, 5000)
+        d = rng.normal(size=(5000, 3))
+        d /= np.linalg.norm(d, axis=1, keepdims=True)
+        t, face = scene.intersect(p, d)
+        t_ref, face_ref = scene.intersect_brute_force(p, d)
+        np.testing.assert_array_equal(face, face_ref)
+        np.testing.assert_allclose(t[face >= 0], t_ref[face_ref >= 0])
+        assert np.any(face < 0) and np.any(face >= 0)
+
+    def test_conic_face_matches_sequential_trace(self):
+        """ConicFace 교점은 순차 추적의 코닉 교점과 같음"""
+        presc = Prescription()
+        presc.add_surface(radius=-40.0, thickness=10.0, conic=-0.5)
+        face = ConicFace(-1 / 40.0, 15.0, -0.5)
+        rng = np.random.default_rng(1)
+        p = np.column_stack([rng.uniform(-5, 5, (100, 2)), np.full(100, -20.0)])
+        d = np.column_stack([rng.normal(0, 0.1, (100, 2)), np.ones(100)])
+        d /= np.linalg.norm(d, axis=1, keepdims=True)
+        t, ok = face.intersect(p, d)
+        t_seq, ok_seq = raytrace.intersect_conic(p, d, presc, 1)
+        assert ok.all() and ok_seq.all()
+        np.testing.assert_allclose(t, t_seq, rtol=1e-12)
+
+    def test_invalid_faces(self):
+        """알 수 없는 표면 처리, 범위 밖 반사율, 중복 검출기"""
+        with pytest.raises(ValueError):
+            DiskFace(5.0, coating='paint')
+        with pytest.raises(ValueError):
+            DiskFace(5.0, coating='absorb', reflectance=0.6, scatter=0.6)
+        scene = _window_scene()
+        with pytest.raises(ValueError):
+            scene.add_detector(40.0, 5.0)
+
+
+class TestTracer:
+    """몬테카를로 추적 테스트"""
+
+    def test_window_fresnel_splitting(self):
+        """수직 입사 창: 직접광 (1-R)^2, 다중 반사 포함 (1-R)/(1+R)"""
+        R = _reflectance()
+        tracer = NonSequentialTracer(_window_scene(), min_weight=1e-6)
+        result = tracer.run(CollimatedSource(5.0), 2000, max_workers=1, seed=0)
+        total = result.detectors['detector'].total()
+        assert total['direct'] == pytest.approx((1 - R)**2, rel=1e-9)
+        assert total['flux'] == pytest.approx((1 - R) / (1 + R), rel=1e-6)
+        assert total['scatter'] == 0.0
+        stats = result.stats
+        assert stats['detected'] + stats['escaped'] + stats['absorbed'] + \
+            stats['truncated'] == pytest.approx(1.0, abs=1e-6)
+
+    def test_roulette_and_selection_unbiased(self):
+        """룰렛 기준이 커도, 분기 확률 선택이어도 광속 기댓값은 같음"""
+        R = _reflectance()
+        expected = (1 - R) / (1 + R)
+        for tracer in (NonSequentialTracer(_window_scene(), min_weight=0.5),
+                       NonSequentialTracer(_window_scene(), split=False)):
+            result = tracer.run(CollimatedSource(5.0), 40000, max_workers=1, seed=3)
+            assert result.detectors['detector'].total()['flux'] == \
+                pytest.approx(expected, abs=0.01)
+
+    def test_scatter_from_housing(self):
+        """하우징 산란은 scatter 성분으로만 검출기에 도달"""
+        scene = Scene()
+        scene.add_tube(0.0, 50.0, 10.0, reflectance=0.0, scatter=0.2)
+        scene.add_detector(50.0, 10.0, pixels=16)
+        source = PointSource((0.0, 0.0, 0.0), half_angle_deg=30.0)
+        result = NonSequentialTracer(scene).run(source, 20000, max_workers=1, seed=0)
+        total = result.detectors['detector'].total()
+        # 원뿔 안 직접광: tan(θ) = 10/50 이하 광선
+        cos_max = np.cos(np.radians(30.0))
+        direct = (1 - np.cos(np.arctan(0.2))) / (1 - cos_max)
+        assert total['direct'] == pytest.approx(direct, abs=0.01)
+        assert total['scatter'] > 0 and total['ghost'] == 0.0
+
+    def test_tilted_window_ghost_shift(self):
+        """기운 창의 내부 2회 반사 고스트는 2 t tan(θt) cos(θi)만큼 옆으로 이동"""
+        scene = Scene()
+        scene.add_window(10.0, 3.0, 15.0, 'N-BK7', tilt=10.0)
+        scene.add_detector(30.0, 4.0, pixels=80)
+        result = NonSequentialTracer(scene, min_weight=1e-6).run(
+            CollimatedSource(2.0), 3000, max_workers=1, seed=0)
+        detector = result.detectors['detector']
+        y = (np.arange(80) + 0.5) / 80 * 8.0 - 4.0
+        centroid = lambda image: (image.sum(axis=1) * y).sum() / image.sum()
+        theta_t = np.arcsin(np.sin(np.radians(10.0)) / refractive_index('N-BK7', 0.55))
+        shift = 2 * 3.0 * np.tan(theta_t) * np.cos(np.radians(10.0))
+        assert abs(centroid(detector.ghost) - centroid(detector.direct)) == \
+            pytest.approx(shift, abs=0.03)
+
+    def test_process_pool_matches_serial(self):
+        """청크 시드가 같으면 프로세스 수와 관계없이 같은 결과"""
+        tracer = NonSequentialTracer(_window_scene())
+        source = CollimatedSource(5.0, field_deg=3.0)
+        serial = tracer.run(source, 3000, chunk_size=1000, max_workers=1, seed=7)
+        pooled = tracer.run(source, 3000, chunk_size=1000, max_workers=2, seed=7)
+        np.testing.assert_allclose(pooled.detectors['detector'].flux,
+                                   serial.detectors['detector'].flux)
+        assert pooled.stats['segments'] == serial.stats['segments']
+
+    def test_detector_merge(self):
+        """누적기 합산과 이름 확인"""
+        a = DetectorMap.empty('image', 1.0, 1.0, 4)
+        b = DetectorMap.empty('image', 1.0, 1.0, 4)
+        a.record(np.array([0.1]), np.array([-0.9]), np.array([2.0]), np.array([0]),
+                 np.array([0]))
+        b.record(np.array([0.1, 0.9]), np.array([-0.9, 0.9]), np.array([1.0, 0.5]),
+                 np.array([1, 0]), np.array([0, 1]))
+        a.merge(b)
+        assert a.hits == 3 and a.flux[0, 2] == 3.0 and a.ghost[0, 2] == 1.0
+        assert a.scatter[3, 3] == 0.5
+        with pytest.raises(ValueError):
+            a.merge(DetectorMap.empty('other', 1.0, 1.0, 4))
+
+
+class TestFromPrescription:
+    """순차 처방 -> 비순차 장면 테스트"""
+
+    def test_singlet_focus(self):
+        """초점에 모인 직접광과 두 면 프레넬 투과"""
+        presc = Prescription(wavelengths=[0.55], fields=[0.0], aperture=10.0)
+        presc.add_surface(radius=50.0, thickness=4.0, glass='N-BK7')
+        presc.add_surface(radius=-50.0, thickness=0.0)
+        presc.thickness[2] = raytrace.paraxial_data(presc).bfl
+        scene = Scene.from_prescription(presc, detector_pixels=51)
+        assert [face.name for face in scene.faces] == ['surface 1', 'surface 2', 'image']
+        assert scene.faces[0].semi_diameter == pytest.approx(5.0 * 1.05)
+
+        result = NonSequentialTracer(scene).run(CollimatedSource(5.0, z=-5.0), 2000,
+                                                max_workers=1, seed=0)
+        detector = result.detectors['image']
+        R = _reflectance()
+        assert detector.total()['direct'] == pytest.approx((1 - R)**2, rel=0.01)
+        # 검출기 반폭 = 마지막 렌즈면 반구경, 직접광은 중앙 3x3 픽셀에 모임
+        assert detector.half_width == pytest.approx(scene.faces[1].semi_diameter)
+        assert detector.direct[24:27, 24:27].sum() > 0.99 * detector.direct.sum()
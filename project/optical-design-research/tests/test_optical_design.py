@@ -9,9 +9,9 @@ import sys
 from pathlib import Path
 
 # 스크립트 경로 추가
-sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from optical_calculations import (
+from scripts.optical_calculations import (
     OpticalCalculator,
     ThermalOpticsCalculator,
     calculate_f_theta_distortion,
@@ -0,0 +1,201 @@
+"""
+Unit Tests for Optical Engine Backends
+광학 엔진 백엔드 단위 테스트
+"""
+
+import threading
+import time
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / '05_simulation_tools' / 'zemax_automation'))
+
+from scripts.optics_backend import (
+    BackendError,
+    BackendPool,
+    BackendUnavailableError,
+    LocalBackend,
+    OpticsBackend,
+    create_backend,
+)
+from zemax_automation_example import ZemaxAutomation
+
+
+def _doublet(backend):
+    backend.set_system_data(wavelengths=[0.486, 0.588, 0.656], fields=[0.0, 5.0],
+                            aperture=10.0)
+    for radius, thickness, glass in [(61.0, 4.0, 'N-BK7'), (-44.0, 2.5, 'F2'),
+                                     (-130.0, 95.0, '')]:
+        backend.insert_surface(radius=radius, thickness=thickness, glass=glass)
+    return backend
+
+
+class TestLocalBackend:
+    """로컬 백엔드 테스트"""
+
+    def test_satisfies_protocol(self):
+        """백엔드 프로토콜 구현"""
+        assert isinstance(LocalBackend(), OpticsBackend)
+
+    def test_spot_arrays_are_columnar(self):
+        """스팟 결과는 field/wavelength 번호 열을 가진 평탄 배열"""
+        backend = _doublet(LocalBackend())
+        arrays = backend.fetch_arrays(backend.run_analysis('spot', density=4))
+        assert set(arrays) == {'x', 'y', 'field', 'wavelength'}
+        counts = np.bincount(arrays['field'] * 3 + arrays['wavelength'])
+        assert counts.tolist() == [61] * 6
+        with pytest.raises(BackendError):
+            backend.fetch_arrays(1)
+
+    def test_mtf_and_paraxial(self):
+        """MTF는 0 주파수에서 1, 근축 데이터는 스칼라 배열"""
+        backend = _doublet(LocalBackend())
+        mtf = backend.fetch_arrays(backend.run_analysis('mtf', n_frequencies=20))
+        assert mtf['tangential'].shape == (2, 20)
+        np.testing.assert_allclose(mtf['tangential'][:, 0], 1.0)
+        assert np.all(mtf['tangential'] <= 1.0 + 1e-9)
+        paraxial = backend.fetch_arrays(backend.run_analysis('paraxial'))
+        assert 90 < float(paraxial['efl']) < 110
+
+    def test_save_and_open_roundtrip(self, tmp_path):
+        """JSON 처방 저장/열기"""
+        backend = _doublet(LocalBackend())
+        backend.save_file(tmp_path / "doublet.json")
+        other = LocalBackend()
+        other.open_file(tmp_path / "doublet.json")
+        np.testing.assert_array_equal(other.system.curvature, backend.system.curvature)
+        assert other.system.glass == backend.system.glass
+        with pytest.raises(BackendError):
+            other.open_file(tmp_path / "doublet.seq")
+
+    def test_optimize_reduces_spot(self):
+        """RMS 스팟 최적화로 메리트 감소"""
+        from scripts.raytrace import rms_spot_radius
+        backend = _doublet(LocalBackend())
+        before = rms_spot_radius(backend.system)
+        after = backend.optimize('RMS_SPOT_SIZE', max_iterations=300)
+        assert after < before
+
+    def test_unknown_backend_and_missing_zosapi(self):
+        """알 수 없는 백엔드 이름, ZOS-API 미설치"""
+        with pytest.raises(ValueError):
+            create_backend('nope')
+        try:
+            import clr  # noqa: F401
+        except ImportError:
+            with pytest.raises(BackendUnavailableError):
+                create_backend('zosapi')
+
+
+class _FakeSession(LocalBackend):
+    """시작 비용/상태를 흉내 내는 세션"""
+    started = 0
+
+    def __init__(self):
+        super().__init__()
+        _doublet(self)
+        type(self).started += 1
+        self.healthy = True
+
+    def ping(self):
+        return self.healthy and super().ping()
+
+
+class TestBackendPool:
+    """연결 풀 테스트"""
+
+    def setup_method(self):
+        _FakeSession.started = 0
+
+    def test_reuses_sessions(self):
+        """반환된 세션 재사용"""
+        pool = BackendPool(_FakeSession, max_size=2)
+        for _ in range(5):
+            with pool.acquire() as backend:
+                backend.run_analysis('paraxial')
+        assert _FakeSession.started == 1
+        assert pool.stats == {'created': 1, 'reused': 4, 'discarded': 0}
+
+    def test_unhealthy_session_replaced(self):
+        """ping 실패 세션은 닫고 새로 생성"""
+        pool = BackendPool(_FakeSession, max_size=1)
+        with pool.acquire() as backend:
+            first = backend
+        first.healthy = False
+        with pool.acquire() as backend:
+            assert backend is not first
+        assert first.ping() is False
+        assert pool.stats['discarded'] == 1 and pool.n_open == 1
+
+    def test_backend_error_discards_session(self):
+        """사용 중 BackendError가 난 세션은 폐기, 일반 오류는 반환"""
+        pool = BackendPool(_FakeSession, max_size=1)
+        with pytest.raises(BackendError):
+            with pool.acquire() as backend:
+                backend.fetch_arrays(12345)
+        assert pool.n_open == 0
+        with pytest.raises(KeyError):
+            with pool.acquire():
+                raise KeyError('x')
+        assert pool.n_open == 1 and pool.stats['discarded'] == 1
+
+    def test_bounded_concurrency(self):
+        """동시 세션 수는 max_size 이하, 초과 요청은 대기/시간 초과"""
+        pool = BackendPool(_FakeSession, max_size=2)
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work():
+            with pool.acquire():
+                with lock:
+                    active[0] += 1
+                    peak[0] = max(peak[0], active[0])
+                time.sleep(0.02)
+                with lock:
+                    active[0] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak[0] == 2
+        assert _FakeSession.started == 2
+
+        with pool.acquire(), pool.acquire():
+            with pytest.raises(TimeoutError):
+                with pool.acquire(timeout=0.05):
+                    pass
+        pool.close()
+        assert pool.n_open == 0
+
+
+class TestZemaxAutomation:
+    """ZemaxAutomation 로컬 백엔드 파이프라인 테스트"""
+
+    def test_pipeline_runs_on_local_backend(self, tmp_path):
+        """렌즈 생성 - 분석 - 저장"""
+        zemax = ZemaxAutomation()
+        zemax.create_new_lens(system_type="SEQ")
+        zemax.set_wavelength(0.55)
+        zemax.set_field([0, 5])
+        for surface in [("Standard", 50, 5, "BK7"), ("Standard", -30, 2, ""),
+                        ("Standard", -30, 5, "SF5"), ("Standard", -100, 95, "")]:
+            zemax.add_surface(*surface)
+
+        spots = zemax.get_spot_diagram_data(density=3)
+        assert spots.wavelengths.tolist() == [0.55]
+        assert spots.fields.tolist() == [0.0, 5.0]
+        assert spots.counts.tolist() == [[37], [37]]
+        assert np.shares_memory(spots.sel(field=1).x, spots.x)
+
+        mtf = zemax.get_mtf_data(n_frequencies=10)
+        assert mtf.tangential.shape == (2, 10)
+
+        zemax.save_system(tmp_path / "doublet.json")
+        assert (tmp_path / "doublet.json").exists()
+        zemax.close()
@@ -0,0 +1,120 @@
+"""
+Unit Tests for Parse Result Cache
+파싱 결과 캐시 단위 테스트
+"""
+
+import os
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.parse_cache import ParseCache
+from scripts.data_processing import MeasurementDataProcessor
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "meas.csv"
+    df = pd.DataFrame({'time': np.arange(1000) * 0.1,
+                       'power': np.linspace(1, 2, 1000),
+                       'label': ['run'] * 1000})
+    df.to_csv(path, index=False)
+    return path
+
+
+class TestParseCache:
+    """파싱 캐시 테스트"""
+
+    def test_hit_after_miss(self, tmp_path, csv_file):
+        cache = ParseCache(tmp_path / "cache")
+
+        first = MeasurementDataProcessor.load_csv_data(csv_file, cache=cache)
+        second = MeasurementDataProcessor.load_csv_data(csv_file, cache=cache)
+
+        assert (cache.misses, cache.hits) == (1, 1)
+        pd.testing.assert_frame_equal(first, second, check_dtype=False)
+
+    def test_hit_matches_miss_with_missing_text(self, tmp_path):
+        """텍스트 열의 NaN이 적중 후에도 NaN, 적중/미스 결과 모두 수정 가능"""
+        path = tmp_path / "notes.csv"
+        pd.DataFrame({'time': [0.0, 0.1, 0.2], 'note': ['start', None, 'end']}).to_csv(
+            path, index=False)
+        cache = ParseCache(tmp_path / "cache")
+
+        miss = MeasurementDataProcessor.load_csv_data(path, cache=cache)
+        hit = MeasurementDataProcessor.load_csv_data(path, cache=cache)
+
+        assert (cache.misses, cache.hits) == (1, 1)
+        pd.testing.assert_frame_equal(miss, hit)
+        assert hit['note'].isna().tolist() == [False, True, False]
+        for df in (miss, hit):
+            df.loc[0, 'time'] = 5.0
+            df.loc[1, 'note'] = 'pause'
+        pd.testing.assert_frame_equal(miss, hit)
+        reloaded = MeasurementDataProcessor.load_csv_data(path, cache=cache)
+        assert reloaded.loc[0, 'time'] == 0.0 and pd.isna(reloaded.loc[1, 'note'])
+
+    def test_object_array_none_and_nan(self, tmp_path):
+        """dict 결과의 object 배열은 None과 NaN을 구분해 복원"""
+        cache = ParseCache(tmp_path / "cache")
+        cache.put("k", {'names': np.array(['a', None, np.nan], dtype=object)})
+
+        names = cache.get("k")['names']
+
+        assert names[0] == 'a' and names[1] is None and np.isnan(names[2])
+
+    def test_modified_file_invalidates(self, tmp_path, csv_file):
+        cache = ParseCache(tmp_path / "cache")
+        MeasurementDataProcessor.load_csv_data(csv_file, cache=cache)
+
+        pd.DataFrame({'time': [0.0], 'power': [5.0], 'label': ['x']}).to_csv(
+            csv_file, index=False)
+        os.utime(csv_file, ns=(0, 10**18))
+        df = MeasurementDataProcessor.load_csv_data(csv_file, cache=cache)
+
+        assert cache.misses == 2
+        assert len(df) == 1
+
+    def test_parser_version_invalidates(self, tmp_path, csv_file):
+        cache = ParseCache(tmp_path / "cache")
+
+        k1 = cache.key(csv_file, 'p', 1)
+        k2 = cache.key(csv_file, 'p', 2)
+
+        assert k1 != k2
+
+    def test_content_key_survives_copy(self, tmp_path, csv_file):
+        cache = ParseCache(tmp_path / "cache", key_mode='content')
+        copy = tmp_path / "copy.csv"
+        copy.write_bytes(csv_file.read_bytes())
+
+        assert cache.key(csv_file, 'p', 1) == cache.key(copy, 'p', 1)
+
+    def test_dict_results_memory_mapped(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache")
+        src = tmp_path / "result.txt"
+        src.write_text("x")
+        value = {'max_temp': 42.0, 'temperatures': np.arange(10.0)}
+
+        cache.load(src, 'ansys', 1, lambda: value)
+        loaded = cache.load(src, 'ansys', 1, lambda: pytest.fail("should hit"))
+
+        assert loaded['max_temp'] == 42.0
+        assert isinstance(loaded['temperatures'], np.memmap)
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ParseCache(tmp_path / "cache", max_bytes=10**9)
+        for i in range(3):
+            cache.put(f"k{i}", {'a': np.zeros(10000)})
+            os.utime(cache.cache_dir / f"k{i}" / 'meta.json', (i, i))
+        cache.get("k0")  # k0 사용 -> 가장 최근
+
+        cache.max_bytes = 2 * 80500
+        cache.evict()
+
+        remaining = sorted(p.name for p in cache.cache_dir.iterdir())
+        assert remaining == ["k0", "k2"]
@@ -0,0 +1,124 @@
+"""
+Unit Tests for Sequential Ray Tracing
+순차 광선 추적 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.glass_catalog import UnknownGlassError, abbe_number, refractive_index
+from scripts.prescription import Prescription
+from scripts.raytrace import (
+    RayBundle,
+    geometric_mtf,
+    launch_rays,
+    paraxial_data,
+    pupil_grid,
+    spot_diagram,
+    trace,
+)
+
+
+@pytest.fixture
+def singlet():
+    """BK7 평볼록 렌즈 (EFL 100 mm, 근축 초점에 상면)"""
+    presc = Prescription(wavelengths=[0.5875618], fields=[0.0, 3.0], aperture=10.0)
+    n = refractive_index('N-BK7', 0.5875618)
+    presc.add_surface(radius=(n - 1) * 100, thickness=4.0, glass='N-BK7')
+    presc.add_surface(radius=np.inf, thickness=0.0)
+    presc.thickness[2] = paraxial_data(presc).bfl
+    return presc
+
+
+class TestGlassCatalog:
+    """유리 카탈로그 테스트"""
+
+    def test_catalog_values(self):
+        """대표 재질 굴절률/아베수"""
+        assert refractive_index('N-BK7', 0.5875618) == pytest.approx(1.5168, abs=1e-4)
+        assert abbe_number('BK7') == pytest.approx(64.17, abs=0.05)
+        assert refractive_index('GERMANIUM', 10.0) == pytest.approx(4.004, abs=2e-3)
+        assert refractive_index('', 0.55) == 1.0
+        assert refractive_index('1.6', 0.55) == 1.6
+
+    def test_unknown_glass(self):
+        """카탈로그에 없는 재질은 오류"""
+        with pytest.raises(UnknownGlassError):
+            refractive_index('UNOBTAINIUM', 0.55)
+
+
+class TestRayTrace:
+    """광선 추적 테스트"""
+
+    def test_paraxial_focal_length(self, singlet):
+        """근축 EFL과 F수"""
+        data = paraxial_data(singlet)
+        assert data.efl == pytest.approx(100.0)
+        assert data.f_number == pytest.approx(10.0)
+
+    def test_small_aperture_converges_to_paraxial_focus(self, singlet):
+        """아주 작은 개구의 광선은 근축 초점에 모임"""
+        singlet.aperture = 1e-3
+        spot = spot_diagram(singlet, 0.0, 0.5875618, density=3)
+        assert np.max(np.hypot(spot['x'], spot['y'])) < 1e-6
+
+    def test_spherical_aberration_present(self, singlet):
+        """구면 렌즈는 전체 개구에서 구면수차로 스팟이 커짐"""
+        spot = spot_diagram(singlet, 0.0, 0.5875618, density=8)
+        assert np.sqrt(np.mean(spot['x']**2 + spot['y']**2)) > 1.0
+
+    def test_chief_ray_height(self, singlet):
+        """주광선 상 높이 ~ EFL * tan(시야각)"""
+        spot = spot_diagram(singlet, 3.0, 0.5875618)
+        assert spot['chief_y'] == pytest.approx(100.0 * np.tan(np.radians(3.0)), rel=1e-3)
+
+    def test_parabolic_mirror_is_perfect_on_axis(self):
+        """포물면 거울 축상 스팟은 점"""
+        presc = Prescription(aperture=40.0)
+        presc.add_surface(radius=-200.0, thickness=-100.0, glass='MIRROR', conic=-1.0)
+        assert paraxial_data(presc).efl == pytest.approx(100.0)
+        spot = spot_diagram(presc, 0.0, 0.55, density=10)
+        assert np.max(np.hypot(spot['x'], spot['y'])) < 1e-6
+
+    def test_semi_diameter_vignetting(self, singlet):
+        """반구경 밖 광선은 무효"""
+        singlet.semi_diameter[1] = 3.0
+        px, py = pupil_grid(6)
+        out = trace(singlet, launch_rays(singlet, 0.0, 0.5875618, px, py), 0.5875618)
+        assert np.array_equal(out.valid, np.hypot(px, py) * 5.0 <= 3.0)
+
+    def test_total_internal_reflection(self):
+        """임계각을 넘는 광선은 전반사로 무효"""
+        presc = Prescription()
+        presc.add_surface(radius=np.inf, thickness=1.0, glass='1.5')
+        presc.add_surface(radius=np.inf, thickness=1.0)
+        angle = np.radians([30.0, 50.0])    # 유리 내부 각도 (임계각 41.8도)
+        bundle = RayBundle(np.zeros((2, 3)) + [0, 0, 0.5],
+                           np.stack([np.zeros(2), np.sin(angle), np.cos(angle)], axis=1),
+                           np.ones(2, dtype=bool), surface=1)
+        out = trace(presc, bundle, 0.55)
+        assert out.valid.tolist() == [True, False]
+
+    def test_partial_trace_matches_full_trace(self, singlet):
+        """중간 면까지 추적 후 이어서 추적해도 결과 동일"""
+        px, py = pupil_grid(5)
+        start = launch_rays(singlet, 3.0, 0.5875618, px, py)
+        full = trace(singlet, start, 0.5875618)
+        middle = trace(singlet, start, 0.5875618, last=1)
+        resumed = trace(singlet, middle, 0.5875618)
+        np.testing.assert_allclose(resumed.position, full.position)
+
+    def test_geometric_mtf_of_point_is_one(self):
+        """점 스팟의 기하 MTF는 1, 넓은 스팟은 감소"""
+        freq = np.linspace(0, 100, 11)
+        tan, sag = geometric_mtf(np.zeros(10), np.zeros(10), freq)
+        np.testing.assert_allclose(tan, 1.0)
+        rng = np.random.default_rng(0)
+        tan, sag = geometric_mtf(rng.normal(0, 5, 5000), rng.normal(0, 5, 5000), freq)
+        # 가우시안 분포: exp(-2 (π σ ν)^2)
+        expected = np.exp(-2 * (np.pi * 5e-3 * freq)**2)
+        np.testing.assert_allclose(tan, expected, atol=0.03)
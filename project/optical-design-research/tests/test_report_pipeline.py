@@ -0,0 +1,96 @@
+"""
+Unit Tests for Report Rendering Pipeline
+보고서 렌더링 파이프라인 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.report_pipeline import ReportPipeline, data_digest, render_summary_figure
+from scripts.data_processing import ReportGenerator
+
+
+def design_data(seed, n_rays=1000):
+    rng = np.random.default_rng(seed)
+    return {
+        'temperature': 25 + rng.normal(0, 1, 50),
+        'spot_x': rng.normal(0, 5, n_rays),
+        'spot_y': rng.normal(0, 5, n_rays),
+        'mtf_freq': np.linspace(0, 100, 50),
+        'mtf_value': np.exp(-np.linspace(0, 100, 50) / 50),
+        'performance': {'RMS spot': '5.0 μm', 'EFL': '100 mm'},
+    }
+
+
+def test_data_digest_sensitive_to_values():
+    a = design_data(0)
+    b = design_data(0)
+
+    assert data_digest(a) == data_digest(b)
+    b['spot_x'][0] += 1e-9
+    assert data_digest(a) != data_digest(b)
+
+
+def test_density_rendering_for_large_spot(tmp_path):
+    path = render_summary_figure(design_data(1, n_rays=200_000), tmp_path / "big.png",
+                                 dpi=50, density_threshold=10_000)
+
+    assert path.stat().st_size > 0
+
+
+def test_result_containers_render_and_hash(tmp_path):
+    from scripts.analysis_results import MTFData, SpotData
+    rng = np.random.default_rng(3)
+    spot = SpotData(rng.normal(0, 5, 400), rng.normal(0, 5, 400),
+                    np.repeat([0, 1], 200), np.zeros(400, int), fields=[0.0, 5.0])
+    freq = np.linspace(0, 100, 20)
+    mtf = MTFData(freq, np.exp(-np.outer([1, 2], freq) / 100),
+                  np.exp(-np.outer([1, 3], freq) / 100), fields=[0.0, 5.0])
+    data = {'spot': spot, 'mtf': mtf}
+
+    path = render_summary_figure(data, tmp_path / "containers.png", dpi=40)
+
+    assert path.stat().st_size > 0
+    digest = data_digest(data)
+    spot.x[0] += 1e-9
+    assert data_digest(data) != digest
+
+
+def test_generate_summary_plot_without_pyplot_state(tmp_path):
+    import matplotlib.pyplot as plt
+    n_before = len(plt.get_fignums())
+
+    ReportGenerator.generate_summary_plot(design_data(2), tmp_path / "summary.png", dpi=50)
+
+    assert (tmp_path / "summary.png").exists()
+    assert len(plt.get_fignums()) == n_before
+
+
+class TestReportPipeline:
+    """파이프라인 테스트"""
+
+    def test_parallel_render_and_skip_unchanged(self, tmp_path):
+        jobs = {f'design_{i}': design_data(i) for i in range(3)}
+        pipeline = ReportPipeline(tmp_path, max_workers=2, dpi=40)
+
+        first = pipeline.render(jobs)
+        jobs['design_1'] = design_data(10)
+        second = pipeline.render(jobs)
+
+        assert set(first.values()) == {'rendered'}
+        assert second == {'design_0': 'skipped', 'design_1': 'rendered',
+                          'design_2': 'skipped'}
+        assert all((tmp_path / f'design_{i}.png').exists() for i in range(3))
+
+    def test_missing_file_rerendered(self, tmp_path):
+        jobs = {'lens': design_data(0)}
+        pipeline = ReportPipeline(tmp_path, max_workers=1, dpi=40)
+        pipeline.render(jobs)
+
+        (tmp_path / 'lens.png').unlink()
+
+        assert pipeline.render(jobs) == {'lens': 'rendered'}
@@ -0,0 +1,89 @@
+"""
+Unit Tests for Robust Outlier Detection
+강건 이상치 검출 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.robust_outliers import (
+    mad_outlier_mask,
+    hampel_mask,
+    iter_hampel_masks,
+    iter_csv_outlier_masks
+)
+from scripts.data_processing import MeasurementDataProcessor
+
+
+@pytest.fixture
+def drifting_log():
+    """드리프트 + 스파이크가 있는 3채널 로그"""
+    rng = np.random.default_rng(11)
+    n = 5000
+    t = np.arange(n)
+    data = np.column_stack([25 + 0.002 * t, 10 + np.sin(t / 200), np.zeros(n)])
+    data += rng.normal(0, 0.05, data.shape)
+    spikes = np.zeros(data.shape, dtype=bool)
+    idx = rng.choice(n, 60, replace=False)
+    spikes[idx, rng.integers(0, 3, 60)] = True
+    data[spikes] += 5.0
+    return data, spikes
+
+
+class TestHampelMask:
+    """Hampel 마스크 테스트"""
+
+    def test_finds_spikes_on_drift(self, drifting_log):
+        data, spikes = drifting_log
+
+        mask = hampel_mask(data, half_window=10, n_sigmas=5)
+
+        assert mask.shape == data.shape
+        assert np.all(mask[spikes])
+        assert mask[~spikes].mean() < 0.001
+
+    def test_std_method_masks_nothing_but_mad_does(self):
+        """큰 이상치가 표준편차를 부풀려도 MAD는 검출"""
+        x = np.concatenate((np.random.default_rng(0).normal(0, 1, 100), np.full(20, 50.0)))
+
+        assert len(MeasurementDataProcessor.remove_outliers(x)) == 120
+        assert mad_outlier_mask(x)[-20:].all()
+
+    def test_dataframe_keeps_index(self, drifting_log):
+        data, _ = drifting_log
+        df = pd.DataFrame(data, columns=['tc1', 'tc2', 'pm'],
+                          index=pd.RangeIndex(100, 100 + len(data)))
+
+        mask = MeasurementDataProcessor.outlier_mask(df)
+
+        assert list(mask.columns) == ['tc1', 'tc2', 'pm']
+        assert mask.index.equals(df.index)
+
+    def test_chunked_equals_whole(self, drifting_log):
+        data, _ = drifting_log
+        chunks = [data[i:i + 333] for i in range(0, len(data), 333)]
+
+        parts = list(iter_hampel_masks(chunks, half_window=7, n_sigmas=3))
+
+        assert parts[0][0] == 0
+        streamed = np.concatenate([m for _, m in parts])
+        np.testing.assert_array_equal(streamed, hampel_mask(data, 7, 3))
+
+
+def test_csv_masks_aligned(tmp_path, drifting_log):
+    data, _ = drifting_log
+    path = tmp_path / "log.csv"
+    df = pd.DataFrame(data, columns=['tc1', 'tc2', 'pm'])
+    df.insert(0, 'timestamp', pd.date_range('2026-01-01', periods=len(df), freq='s'))
+    df.to_csv(path, index=False)
+
+    masks = pd.concat(iter_csv_outlier_masks(path, chunksize=700, n_sigmas=4))
+
+    assert list(masks.columns) == ['tc1', 'tc2', 'pm']
+    assert masks.index.equals(pd.RangeIndex(len(df)))
+    np.testing.assert_array_equal(masks.to_numpy(), hampel_mask(data, 5, 4))
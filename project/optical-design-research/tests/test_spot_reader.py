@@ -0,0 +1,143 @@
+"""
+Unit Tests for Spot Diagram Reader
+스팟 다이어그램 리더 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.spot_reader import (
+    SpotFileFormatError,
+    iter_spot_chunks,
+    read_spot_header,
+    convert_spot_file,
+    open_spot_binary
+)
+from scripts.data_processing import ZemaxDataProcessor
+
+
+def write_spot_file(path, blocks):
+    """(field, wavelength, x, y) 블록으로 예제 파일 생성"""
+    lines = [
+        "Spot Diagram",
+        "File : doublet.zmx",
+        "Wavelength 1 : 0.4861 µm",
+        "Wavelength 2 : 0.5876 µm",
+        "Field 1 : 0.0000 deg",
+        "Field 2 : 10.0000 deg",
+        "",
+    ]
+    for field, wave, x, y in blocks:
+        lines.append(f"Field : {field}, Wavelength : {wave}")
+        lines.append("Ray\tX (um)\tY (um)")
+        for i, (xi, yi) in enumerate(zip(x, y)):
+            lines.append(f"{i + 1}\t{xi:.9e}\t{yi:.9e}")
+        lines.append("")
+    path.write_text("\n".join(lines), encoding='utf-8')
+
+
+@pytest.fixture
+def spot_blocks():
+    rng = np.random.default_rng(0)
+    return [(f, w, rng.normal(0, 5, 500), rng.normal(0, 5, 500))
+            for f in (1, 2) for w in (1, 2)]
+
+
+class TestIterSpotChunks:
+    """스트리밍 파서 테스트"""
+
+    def test_blocks_parsed_with_small_chunks(self, tmp_path, spot_blocks):
+        """작은 청크 크기에서도 블록별 좌표가 그대로 복원되는지"""
+        path = tmp_path / "spot.txt"
+        write_spot_file(path, spot_blocks)
+
+        chunks = list(iter_spot_chunks(path, chunk_chars=4096))
+
+        assert len(chunks) > len(spot_blocks)  # 블록이 여러 청크로 분할됨
+        for i, (field, wave, x, y) in enumerate(spot_blocks):
+            parts = [c for c in chunks if c.block_index == i]
+            assert all(c.field == field and c.wavelength == wave for c in parts)
+            np.testing.assert_allclose(np.concatenate([c.x for c in parts]), x, rtol=1e-8)
+            np.testing.assert_allclose(np.concatenate([c.y for c in parts]), y, rtol=1e-8)
+
+    def test_float32_dtype(self, tmp_path, spot_blocks):
+        path = tmp_path / "spot.txt"
+        write_spot_file(path, spot_blocks[:1])
+
+        chunk = next(iter_spot_chunks(path, dtype=np.float32))
+
+        assert chunk.x.dtype == np.float32
+
+    def test_header_tables(self, tmp_path, spot_blocks):
+        path = tmp_path / "spot.txt"
+        write_spot_file(path, spot_blocks)
+
+        header = read_spot_header(path)
+
+        assert header.wavelengths == {1: 0.4861, 2: 0.5876}
+        assert header.fields == {1: 0.0, 2: 10.0}
+
+    def test_dashed_separator_lines(self, tmp_path):
+        """'-----' 구분선은 텍스트 줄, 음수/소수점으로 시작하는 행은 광선 데이터"""
+        path = tmp_path / "dashed.txt"
+        path.write_text("Spot Diagram\n"
+                        "--------------------\n"
+                        "Field : 1, Wavelength : 1\n"
+                        "Ray X Y\n"
+                        "-----  -----  -----\n"
+                        "1 -0.5 .25\n"
+                        "-2 +1e-3 -.75\n")
+
+        chunks = list(iter_spot_chunks(path))
+
+        assert len(chunks) == 1
+        np.testing.assert_allclose(chunks[0].x, [-0.5, 1e-3])
+        np.testing.assert_allclose(chunks[0].y, [0.25, -0.75])
+
+    def test_bad_row_raises_with_line_number(self, tmp_path):
+        path = tmp_path / "bad.txt"
+        path.write_text("Field : 1, Wavelength : 1\n1 0.1 0.2\n2 0.3\n")
+
+        with pytest.raises(SpotFileFormatError) as excinfo:
+            list(iter_spot_chunks(path))
+
+        assert excinfo.value.line == 3
+
+    def test_missing_block_header_raises(self, tmp_path):
+        path = tmp_path / "noheader.txt"
+        path.write_text("Spot Diagram\n1 0.1 0.2\n")
+
+        with pytest.raises(SpotFileFormatError):
+            list(iter_spot_chunks(path))
+
+
+def test_convert_and_memmap_roundtrip(tmp_path, spot_blocks):
+    """바이너리 변환 후 메모리 매핑 결과 확인"""
+    path = tmp_path / "spot.txt"
+    write_spot_file(path, spot_blocks)
+
+    out = convert_spot_file(path, tmp_path / "spot_bin", dtype=np.float64,
+                            chunk_chars=4096)
+    x, y, index = open_spot_binary(out)
+
+    assert isinstance(x, np.memmap)
+    assert index['n_rays'] == 2000
+    assert len(index['blocks']) == 4
+    block = index['blocks'][3]
+    sl = slice(block['offset'], block['offset'] + block['count'])
+    np.testing.assert_allclose(x[sl], spot_blocks[3][2], rtol=1e-8)
+
+
+def test_read_spot_diagram_dataframe(tmp_path, spot_blocks):
+    path = tmp_path / "spot.txt"
+    write_spot_file(path, spot_blocks)
+
+    df = ZemaxDataProcessor.read_spot_diagram(path)
+
+    assert list(df.columns) == ['x', 'y', 'wavelength', 'field']
+    assert len(df) == 2000
+    assert set(zip(df['field'], df['wavelength'])) == {(1, 1), (1, 2), (2, 1), (2, 2)}
@@ -0,0 +1,93 @@
+"""
+Unit Tests for Grouped Spot Statistics
+그룹별 스팟 통계 단위 테스트
+"""
+
+import pickle
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.spot_statistics import SpotAccumulator, grouped_spot_statistics
+from scripts.data_processing import ZemaxDataProcessor
+
+
+@pytest.fixture
+def rays():
+    rng = np.random.default_rng(1)
+    n = 30000
+    field = rng.integers(1, 4, n)
+    wavelength = rng.integers(1, 3, n)
+    x = rng.normal(0, 5, n) + 100 * field   # 필드별 중심 이동
+    y = rng.normal(0, 3, n) - 20 * wavelength
+    return x, y, field, wavelength
+
+
+class TestSpotAccumulator:
+    """그룹별 스팟 통계 누산기 테스트"""
+
+    def test_matches_reference_per_group(self, rays):
+        """그룹별 결과가 기존 단일 그룹 계산과 일치하는지"""
+        x, y, field, wavelength = rays
+
+        result = grouped_spot_statistics(x, y, field, wavelength, chunk_size=4096)
+
+        assert len(result) == 6
+        for (f, w), stats in result.items():
+            sel = (field == f) & (wavelength == w)
+            gx, gy = x[sel], y[sel]
+            assert stats.n_rays == sel.sum()
+            assert abs(stats.centroid_x - gx.mean()) < 1e-9
+            assert abs(stats.rms_radius
+                       - ZemaxDataProcessor.calculate_rms_spot_size(gx, gy)) < 1e-9
+            assert abs(stats.geometric_radius
+                       - ZemaxDataProcessor.calculate_geometric_spot_size(gx, gy)) < 1e-9
+            assert abs(stats.rms_x - gx.std()) < 1e-9
+
+    def test_merge_equals_single_pass(self, rays):
+        """워커별 부분 결과 병합 (pickle 왕복 포함)"""
+        x, y, field, wavelength = rays
+        half = len(x) // 2
+
+        a = SpotAccumulator().update(x[:half], y[:half], field[:half], wavelength[:half])
+        b = SpotAccumulator().update(x[half:], y[half:], field[half:], wavelength[half:])
+        merged = a.merge(pickle.loads(pickle.dumps(b))).result()
+        single = SpotAccumulator().update(x, y, field, wavelength).result()
+
+        for key in single:
+            assert merged[key].rms_radius == pytest.approx(single[key].rms_radius, rel=1e-12)
+            assert merged[key].geometric_radius == pytest.approx(
+                single[key].geometric_radius, rel=1e-12)
+
+    def test_numerically_stable_with_large_offset(self):
+        """큰 좌표 오프셋에서도 분산이 정확한지 (단순 E[x²]-E[x]² 방식은 실패)"""
+        rng = np.random.default_rng(2)
+        x = 1e8 + rng.normal(0, 1e-3, 100000)
+        y = rng.normal(0, 1e-3, 100000)
+
+        acc = SpotAccumulator()
+        for start in range(0, len(x), 1000):
+            acc.update(x[start:start + 1000], y[start:start + 1000])
+        stats = acc.result()[(0, 0)]
+
+        assert stats.rms_x == pytest.approx(np.std(x - 1e8), rel=1e-6)
+
+    def test_collinear_points(self):
+        """공선 점에서도 기하학적 반경 계산"""
+        x = np.linspace(-1, 1, 101)
+        y = np.zeros_like(x)
+
+        stats = grouped_spot_statistics(x, y)[(0, 0)]
+
+        assert stats.geometric_radius == pytest.approx(1.0)
+
+    def test_records(self, rays):
+        x, y, field, wavelength = rays
+
+        records = SpotAccumulator().update(x, y, field, wavelength).to_records()
+
+        assert records.dtype.names[:3] == ('field', 'wavelength', 'n_rays')
+        assert records['n_rays'].sum() == len(x)
@@ -0,0 +1,152 @@
+"""
+Unit Tests for Streaming Filters
+스트리밍 필터 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.streaming_filters import (
+    MovingAverageFilter,
+    ExponentialMovingAverage,
+    RunningMedianFilter,
+    Decimator
+)
+
+
+@pytest.fixture
+def signal():
+    rng = np.random.default_rng(7)
+    return 25 + np.cumsum(rng.normal(0, 0.1, (1000, 4)), axis=0)
+
+
+def feed(filt, data, block_sizes=(1, 7, 50, 3, 200)):
+    """여러 크기의 블록으로 나누어 입력"""
+    out, i, k = [], 0, 0
+    while i < len(data):
+        n = block_sizes[k % len(block_sizes)]
+        out.append(filt.process(data[i:i + n]))
+        i += n
+        k += 1
+    return np.concatenate(out)
+
+
+class TestMovingAverageFilter:
+    """이동 평균 필터 테스트"""
+
+    def test_matches_convolve_after_warmup(self, signal):
+        window = 16
+
+        out = feed(MovingAverageFilter(window), signal[:, 0])
+
+        expected = np.convolve(signal[:, 0], np.ones(window) / window, mode='valid')
+        assert out.shape == signal[:, 0].shape
+        np.testing.assert_allclose(out[window - 1:], expected, rtol=1e-12)
+        assert out[0] == signal[0, 0]
+
+    def test_multichannel_blocks_equal_single_call(self, signal):
+        streamed = feed(MovingAverageFilter(10), signal)
+        whole = MovingAverageFilter(10).process(signal)
+
+        np.testing.assert_allclose(streamed, whole, rtol=1e-12)
+
+    def test_block_cost_independent_of_window(self):
+        """윈도우가 찬 뒤 한 샘플 블록 처리 시간이 윈도우 크기에 따라 늘지 않음"""
+        x = np.ones((1, 8))
+
+        def per_block(window):
+            filt = MovingAverageFilter(window)
+            filt.process(np.ones((window, 8)))
+            best = np.inf
+            for _ in range(3):
+                begin = time.perf_counter()
+                for _ in range(500):
+                    filt.process(x)
+                best = min(best, time.perf_counter() - begin)
+            return best
+
+        assert per_block(1 << 16) < 3 * per_block(8)
+
+    def test_long_run_matches_convolve(self):
+        """긴 실행 (큰 평균값 + 재동기화)에서도 누적 오차 없음"""
+        rng = np.random.default_rng(3)
+        x = 1e4 + rng.normal(0, 1, 20000)
+        window = 64
+
+        out = feed(MovingAverageFilter(window), x)
+
+        expected = np.convolve(x, np.ones(window) / window, mode='valid')
+        np.testing.assert_allclose(out[window - 1:], expected, rtol=1e-12)
+
+    def test_channel_mismatch(self, signal):
+        filt = MovingAverageFilter(4)
+        filt.process(signal[:10])
+
+        with pytest.raises(ValueError):
+            filt.process(signal[:10, :2])
+
+
+class TestExponentialMovingAverage:
+    """지수 이동 평균 테스트"""
+
+    def test_matches_recursion(self, signal):
+        alpha = 0.1
+        x = signal[:, 1]
+        expected = np.empty_like(x)
+        y = x[0]
+        for i, v in enumerate(x):
+            y = y + alpha * (v - y)
+            expected[i] = y
+
+        out = feed(ExponentialMovingAverage(alpha=alpha), x)
+
+        np.testing.assert_allclose(out, expected, rtol=1e-12)
+
+    def test_time_constant_step_response(self):
+        filt = ExponentialMovingAverage(time_constant=10.0, sample_interval=0.1)
+        filt.process(np.zeros(1))
+
+        out = filt.process(np.ones(100))
+
+        assert out[-1] == pytest.approx(1 - np.exp(-1), rel=1e-6)
+
+
+class TestRunningMedianFilter:
+    """이동 중앙값 테스트"""
+
+    def test_matches_reference(self, signal):
+        window = 9
+        x = signal[:, 2]
+
+        out = feed(RunningMedianFilter(window), x)
+
+        expected = [np.median(x[max(0, i - window + 1):i + 1]) for i in range(len(x))]
+        np.testing.assert_allclose(out, expected)
+
+    def test_rejects_spike(self):
+        x = np.ones(50)
+        x[25] = 1000.0
+
+        out = RunningMedianFilter(5).process(x)
+
+        assert np.all(out == 1.0)
+
+
+class TestDecimator:
+    """데시메이션 테스트"""
+
+    def test_mean_across_blocks(self, signal):
+        out = feed(Decimator(8), signal)
+
+        expected = signal[:1000 // 8 * 8].reshape(-1, 8, 4).mean(axis=1)
+        np.testing.assert_allclose(out, expected, rtol=1e-12)
+
+    def test_pick(self):
+        out = Decimator(3, mode='pick').process(np.arange(10.0))
+
+        np.testing.assert_array_equal(out, [2.0, 5.0, 8.0])
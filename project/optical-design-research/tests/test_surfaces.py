@@ -0,0 +1,165 @@
+"""
+Unit Tests for Surface Primitives
+표면 기본 요소 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import raytrace
+from scripts.prescription import Prescription
+from scripts.surfaces import (SAG_FUNCTIONS, intersect_even_asphere, newton_intersection,
+                              paraxial_curvature, surface_sag)
+
+
+def _singlet(surface_type='STANDARD', params=None, radius=50.0, conic=0.0):
+    """첫 면 종류만 바꾼 단렌즈"""
+    presc = Prescription(wavelengths=[0.55], fields=[0.0, 5.0], aperture=10.0)
+    presc.add_surface(radius=radius, thickness=5.0, glass='N-BK7', conic=conic,
+                      surface_type=surface_type, params=params)
+    presc.add_surface(radius=-50.0, thickness=45.0)
+    return presc
+
+
+def _rays(n=500, seed=0):
+    """1번 면 앞에서 출발하는 기울어진 광선"""
+    rng = np.random.default_rng(seed)
+    p = np.column_stack([rng.uniform(-5, 5, (n, 2)), np.full(n, -10.0)])
+    d = np.column_stack([rng.normal(0, 0.1, (n, 2)), np.ones(n)])
+    return p, d / np.linalg.norm(d, axis=1, keepdims=True)
+
+
+class TestSag:
+    """새그와 기울기 테스트"""
+
+    @pytest.mark.parametrize('surface_type, params, conic', [
+        ('STANDARD', None, -0.6),
+        ('EVENASPH', [1e-4, -2e-6, 3e-9], -0.5),
+        ('TOROIDAL', [-40.0, 1e-4, 1e-7], 0.3),
+        ('TOROIDAL', [0.0, 2e-4], 0.0),
+    ])
+    def test_slope_matches_finite_difference(self, surface_type, params, conic):
+        """dz/dx, dz/dy = 중앙 차분"""
+        presc = _singlet(surface_type, params, conic=conic)
+        sag = SAG_FUNCTIONS[surface_type]
+        x, y = np.random.default_rng(1).uniform(-4, 4, (2, 200))
+        z, zx, zy = sag(x, y, presc, 1)
+        h = 1e-6
+        np.testing.assert_allclose(zx, (sag(x + h, y, presc, 1)[0] -
+                                        sag(x - h, y, presc, 1)[0]) / (2 * h), atol=1e-7)
+        np.testing.assert_allclose(zy, (sag(x, y + h, presc, 1)[0] -
+                                        sag(x, y - h, presc, 1)[0]) / (2 * h), atol=1e-7)
+
+    def test_asphere_polynomial_and_paraxial_curvature(self):
+        """비구면 새그 = 코닉 + Σ α r^2m, 근축 곡률 = c + 2 α_1"""
+        alpha = [1e-4, -2e-6, 3e-9]
+        presc = _singlet('Even Asphere', alpha)
+        assert presc.surface_type[1] == 'EVENASPH'
+        r = np.linspace(0, 4, 9)
+        base = surface_sag(_singlet(), 1, r, 0.0)
+        poly = sum(a * r**(2 * m + 2) for m, a in enumerate(alpha))
+        np.testing.assert_allclose(surface_sag(presc, 1, r, 0.0), base + poly, atol=1e-15)
+        assert paraxial_curvature(presc)[1] == pytest.approx(1 / 50.0 + 2e-4)
+
+    def test_toroid_with_matching_rotation_is_sphere(self):
+        """회전 반경 = 단면 곡률 반경이면 구면"""
+        x, y = np.random.default_rng(2).uniform(-4, 4, (2, 100))
+        toroid = _singlet('TOROIDAL', [50.0])
+        np.testing.assert_allclose(surface_sag(toroid, 1, x, y),
+                                   surface_sag(_singlet(), 1, x, y), atol=1e-13)
+
+
+class TestIntersection:
+    """일괄 뉴턴 교점 테스트"""
+
+    def test_newton_matches_closed_form_conic(self):
+        """코닉 면에서 뉴턴 해 = 닫힌 해"""
+        presc = _singlet(conic=-0.5)
+        p, d = _rays()
+        t_ref, ok_ref = raytrace.intersect_conic(p, d, presc, 1)
+        t, ok = newton_intersection(p, d, presc, 1)
+        assert ok.all() and ok_ref.all()
+        np.testing.assert_allclose(t, t_ref, rtol=1e-12)
+
+    def test_asphere_hits_lie_on_surface(self):
+        """비구면/토로이드 교점의 새그 잔차"""
+        p, d = _rays()
+        for presc in (_singlet('EVENASPH', [1e-4, -2e-6, 3e-9], conic=-0.5),
+                      _singlet('TOROIDAL', [-40.0, 1e-4])):
+            intersect, _ = raytrace.SURFACE_INTERSECTORS[presc.surface_type[1]]
+            t, ok = intersect(p, d, presc, 1)
+            hit = p + t[:, None] * d
+            assert ok.all()
+            np.testing.assert_allclose(hit[:, 2], surface_sag(presc, 1, hit[:, 0], hit[:, 1]),
+                                       atol=1e-11)
+
+    def test_only_unconverged_rays_iterate(self, monkeypatch):
+        """정확한 시작값 광선은 첫 반복 뒤 제외, 나머지만 다시 계산"""
+        presc = _singlet('EVENASPH', [1e-4, -2e-6])
+        p, d = _rays(400)
+        t_exact, _ = intersect_even_asphere(p, d, presc, 1)
+        t0 = raytrace.intersect_conic(p, d, presc, 1)[0]
+        t0[:100] = t_exact[:100]
+        sizes = []
+        sag = SAG_FUNCTIONS['EVENASPH']
+
+        def counting(x, y, presc, i):
+            sizes.append(len(x))
+            return sag(x, y, presc, i)
+
+        monkeypatch.setitem(SAG_FUNCTIONS, 'EVENASPH', counting)
+        t, ok = newton_intersection(p, d, presc, 1, t0)
+        assert sizes[0] == 400 and sizes[1] == 300 and sizes == sorted(sizes, reverse=True)
+        assert ok.all()
+        np.testing.assert_allclose(t, t_exact, atol=1e-11)
+
+    def test_failures_are_masked(self):
+        """새그 정의역 밖 광선과 반복 부족 광선은 무효"""
+        presc = _singlet(radius=5.0)
+        p, d = _rays(50)
+        p[:, :2] *= 0.3
+        p[:10, :2] = 8.0
+        t, ok = newton_intersection(p, d, presc, 1)
+        assert not ok[:10].any() and ok[10:].all()
+        _, ok = newton_intersection(p, d, presc, 1, max_iterations=1)
+        assert not ok.any()
+        t, ok = newton_intersection(p[:0], d[:0], presc, 1)
+        assert len(t) == 0 and len(ok) == 0
+
+
+class TestTrace:
+    """순차 추적 통합 테스트"""
+
+    def test_zero_coefficient_asphere_traces_like_sphere(self):
+        """계수가 모두 0인 비구면 = 구면"""
+        sphere, asphere = _singlet(conic=-0.3), _singlet('EVENASPH', conic=-0.3)
+        for field in (0.0, 5.0):
+            a = raytrace.spot_diagram(sphere, field, 0.55)
+            b = raytrace.spot_diagram(asphere, field, 0.55)
+            np.testing.assert_allclose(b['x'], a['x'], atol=1e-9)
+            np.testing.assert_allclose(b['y'], a['y'], atol=1e-9)
+
+    def test_asphere_corrects_spherical_aberration(self):
+        """4차 계수로 구면 수차가 줄어듦"""
+        presc = _singlet(radius=30.0)
+        presc.thickness[2] = raytrace.paraxial_data(presc).bfl
+        start = raytrace.rms_spot_radius(presc)
+        presc.set_surface(1, surface_type='Even Asphere', params=[0.0, -1e-5])
+        assert raytrace.rms_spot_radius(presc) < 0.5 * start
+
+    def test_cylinder_focuses_one_axis(self):
+        """y 원통 렌즈는 y만 모으고 x 높이는 유지"""
+        presc = Prescription(wavelengths=[0.55], aperture=6.0)
+        presc.add_surface(radius=40.0, thickness=4.0, glass='N-BK7', surface_type='cylinder')
+        presc.add_surface(thickness=0.0)
+        presc.thickness[2] = raytrace.paraxial_data(presc).bfl
+        px, py = raytrace.pupil_grid(4, 'square')
+        bundle = raytrace.trace(presc, raytrace.launch_rays(presc, 0.0, 0.55, px * 0.1, py * 0.1),
+                                0.55)
+        assert bundle.valid.all()
+        np.testing.assert_allclose(bundle.position[:, 0], px * 0.1 * 3.0, atol=1e-12)
+        assert np.abs(bundle.position[:, 1]).max() < 1e-4
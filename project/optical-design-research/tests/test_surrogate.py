@@ -0,0 +1,164 @@
+"""
+Unit Tests for Surrogate-Assisted Optimization
+대리 모델 기반 최적화 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import raytrace
+from scripts.optics_backend import BackendError, LocalBackend
+from scripts.prescription import Prescription
+from scripts.surrogate import (GaussianProcess, SurrogateMerit, expected_improvement,
+                               screened_nelder_mead, surrogate_minimize)
+
+
+def _doublet():
+    """예제의 초기 이중 렌즈"""
+    presc = Prescription(wavelengths=[0.55], fields=[0.0, 5.0, 10.0], aperture=10.0)
+    presc.add_surface(radius=50.0, thickness=5.0, glass='N-BK7')
+    presc.add_surface(radius=-30.0, thickness=2.0)
+    presc.add_surface(radius=-30.0, thickness=5.0, glass='N-SF5')
+    presc.add_surface(radius=-100.0, thickness=95.0)
+    return presc
+
+
+def _bowl(x):
+    """양수 2차 메리트 (최소 1 at (1, -2))"""
+    return 1.0 + (x[0] - 1.0) ** 2 + 4.0 * (x[1] + 2.0) ** 2
+
+
+class TestGaussianProcess:
+    """GP 회귀와 기대 개선량 테스트"""
+
+    def test_interpolates_with_small_uncertainty(self):
+        """학습점은 보간하고, 멀어질수록 표준편차가 커짐"""
+        rng = np.random.default_rng(0)
+        X = rng.uniform(-1, 1, (30, 2))
+        y = np.sin(2 * X[:, 0]) + X[:, 1] ** 2
+        gp = GaussianProcess().fit(X, y)
+        mean, std = gp.predict(X)
+        np.testing.assert_allclose(mean, y, atol=1e-3)
+        assert np.all(std < 1e-2)
+        _, far = gp.predict(np.array([[5.0, 5.0]]))
+        assert far[0] > 10 * std.max()
+        assert gp.length_scale.shape == (2,)
+
+    def test_expected_improvement(self):
+        """EI는 음이 아니고, 확실히 나쁜 점은 0"""
+        mean = np.array([0.0, 1.0, 2.0, 5.0])
+        std = np.array([0.5, 0.5, 0.0, 1e-6])
+        ei = expected_improvement(mean, std, best=1.0)
+        assert np.all(ei >= 0)
+        assert ei[0] > ei[1] > 0
+        assert ei[2] == 0.0 and ei[3] == pytest.approx(0.0)
+
+
+class TestScreening:
+    """대리 모델 선별 테스트"""
+
+    def test_screen_skips_confident_rejections(self):
+        """충분히 학습된 뒤 확실히 나쁜 점은 실제 평가하지 않음"""
+        calls = []
+
+        def fn(x):
+            calls.append(x)
+            return _bowl(x)
+
+        merit = SurrogateMerit(fn, np.zeros(2), np.ones(2), min_points=6)
+        for x in np.random.default_rng(1).uniform(-3, 3, (40, 2)):
+            merit.evaluate(x)
+        value, evaluated = merit.screen(np.array([-3.0, 3.0]), threshold=2.0)
+        assert not evaluated and value > 2.0
+        assert merit.n_surrogate == 1 and len(calls) == 40
+        _, evaluated = merit.screen(np.array([1.0, -2.0]), threshold=2.0)
+        assert evaluated and merit.n_true == 41
+
+    def test_matches_plain_nelder_mead_path(self):
+        """kappa가 크면 선별이 없고, 선별하면 더 적은 실제 평가로 같은 최소점에 수렴"""
+        results = []
+        for kappa in (1e6, 3.0):
+            merit = SurrogateMerit(_bowl, np.zeros(2), np.ones(2), kappa=kappa, min_points=6)
+            screened_nelder_mead(merit, np.zeros(2), step=0.5, max_true=300)
+            results.append((merit.best(), merit.n_true, merit.n_surrogate))
+        (x_plain, f_plain), n_plain, saved_plain = results[0]
+        (x_fast, f_fast), n_fast, saved_fast = results[1]
+        assert saved_plain == 0
+        np.testing.assert_allclose(x_plain, [1.0, -2.0], atol=1e-4)
+        np.testing.assert_allclose(x_fast, [1.0, -2.0], atol=1e-4)
+        assert f_fast == pytest.approx(1.0, abs=1e-8)
+        assert saved_fast > 0 and n_fast < n_plain
+
+    def test_true_evaluation_cap_is_strict(self):
+        """확장/축소 중에도 실제 평가 수가 상한을 넘지 않음"""
+        calls = []
+
+        def fn(x):
+            calls.append(x)
+            return _bowl(x)
+
+        for max_true in range(3, 40):
+            calls.clear()
+            merit = SurrogateMerit(fn, np.zeros(2), np.ones(2), min_points=6)
+            screened_nelder_mead(merit, np.zeros(2), step=0.5, max_true=max_true)
+            assert len(calls) == merit.n_true <= max_true
+        result = surrogate_minimize(fn, np.zeros(2), np.ones(2), max_true=7, n_explore=5)
+        assert result.n_true == 7
+
+    def test_screen_disabled_is_plain_nelder_mead(self):
+        """screen=False는 건너뛴 평가 없이 같은 단체 경로 (kappa 무한대와 동일)"""
+        plain = surrogate_minimize(_bowl, np.zeros(2), np.ones(2), max_true=200, screen=False)
+        strict = surrogate_minimize(_bowl, np.zeros(2), np.ones(2), max_true=200, kappa=1e9)
+        assert plain.n_surrogate == 0
+        assert plain.history == strict.history
+
+    def test_minimize_with_exploration(self):
+        """EI 탐색 후 다듬기, 실제 평가 상한 준수"""
+        result = surrogate_minimize(_bowl, np.array([3.0, 1.0]), np.array([2.0, 2.0]),
+                                    max_true=120, n_explore=25, seed=0)
+        assert result.n_true <= 120
+        assert result.merit == pytest.approx(_bowl(result.x))
+        assert result.merit < 1.01
+        assert len(result.history) == result.n_true
+        assert set(result.summary()) == {'merit', 'n_evaluations', 'skipped_trials',
+                                         'elapsed'}
+
+
+class TestBackendSurrogateMode:
+    """LocalBackend.optimize(mode='surrogate') 테스트"""
+
+    def test_surrogate_mode_updates_system(self):
+        """실제 평가한 최고 설계로 갱신, 기각한 시험점 수 기록"""
+        backend = LocalBackend(_doublet())
+        start = raytrace.rms_spot_radius(backend.system, 2)
+        merit = backend.optimize(mode='surrogate', density=2, max_iterations=300,
+                                 max_true=300, seed=0)
+        info = backend.optimization_info
+        assert info['mode'] == 'surrogate' and info['merit'] == merit
+        assert 0 < info['n_evaluations'] <= 300
+        assert info['skipped_trials'] > 0
+        assert merit < start
+        assert merit == pytest.approx(raytrace.rms_spot_radius(backend.system, 2))
+
+    def test_screening_saves_true_evaluations(self):
+        """같은 반복 수에서 선별 없는 실행보다 실제 평가가 적고 메리트는 나쁘지 않음"""
+        runs = {}
+        for screen in (False, True):
+            backend = LocalBackend(_doublet())
+            merit = backend.optimize(mode='surrogate', density=2, max_iterations=100,
+                                     max_true=5000, screen=screen)
+            runs[screen] = (merit, backend.optimization_info['n_evaluations'])
+        (plain, n_plain), (screened, n_screened) = runs[False], runs[True]
+        assert n_screened < n_plain
+        assert screened <= plain * (1 + 1e-9)
+
+    def test_unknown_setting(self):
+        """알 수 없는 대리 모델 인자"""
+        with pytest.raises(TypeError):
+            LocalBackend(_doublet()).optimize(mode='surrogate', tolerance=0.1)
+        with pytest.raises(BackendError):
+            LocalBackend(_doublet()).optimize(max_true=10)
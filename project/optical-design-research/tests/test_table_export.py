@@ -0,0 +1,77 @@
+"""
+Unit Tests for Large Table Export
+대용량 표 내보내기 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.table_export import export_tables, read_hdf5, write_xlsx
+from scripts.data_processing import ReportGenerator
+
+
+@pytest.fixture
+def tables():
+    rng = np.random.default_rng(0)
+    n = 2500
+    tolerance = pd.DataFrame({
+        'run': np.arange(n),
+        'rms_spot': rng.normal(5, 0.5, n),
+        'lens': rng.choice(['A', 'B'], n),
+        'time': pd.date_range('2026-01-01', periods=n, freq='min'),
+    })
+    tolerance.loc[3, 'rms_spot'] = np.nan
+    summary = pd.DataFrame({'metric': ['mean'], 'value': [5.0]})
+    return {'tolerance': tolerance, 'summary': summary}
+
+
+def test_xlsx_splits_sheets(tmp_path, tables):
+    """시트 행 제한을 넘으면 여러 시트로 분할"""
+    from openpyxl import load_workbook
+    path = tmp_path / "out.xlsx"
+
+    write_xlsx(tables, path, chunk_rows=300, max_rows=1001)
+
+    wb = load_workbook(path, read_only=True)
+    assert wb.sheetnames == ['tolerance_1', 'tolerance_2', 'tolerance_3', 'summary']
+    back = pd.read_excel(path, sheet_name=None)
+    assert [len(back[f'tolerance_{i}']) for i in (1, 2, 3)] == [1000, 1000, 500]
+    merged = pd.concat([back[f'tolerance_{i}'] for i in (1, 2, 3)], ignore_index=True)
+    np.testing.assert_allclose(merged['rms_spot'], tables['tolerance']['rms_spot'])
+
+
+def test_csv_per_table(tmp_path, tables):
+    paths = export_tables(tables, tmp_path / "out.csv", chunk_rows=700)
+
+    assert [p.name for p in paths] == ['out_tolerance.csv', 'out_summary.csv']
+    back = pd.read_csv(paths[0])
+    assert len(back) == 2500
+    assert list(back.columns) == ['run', 'rms_spot', 'lens', 'time']
+
+
+def test_hdf5_roundtrip(tmp_path, tables):
+    export_tables(tables, tmp_path / "out.h5")
+
+    back = read_hdf5(tmp_path / "out.h5")
+
+    pd.testing.assert_frame_equal(back['tolerance'], tables['tolerance'],
+                                  check_dtype=False)
+
+
+def test_unknown_extension(tmp_path, tables):
+    with pytest.raises(ValueError):
+        export_tables(tables, tmp_path / "out.txt")
+
+
+def test_export_to_excel_streaming(tmp_path, tables):
+    path = tmp_path / "report.xlsx"
+
+    ReportGenerator.export_to_excel(tables, path, streaming=True)
+
+    back = pd.read_excel(path, sheet_name='summary')
+    assert back['value'][0] == 5.0
@@ -8,9 +8,9 @@ import numpy as np
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from thermal_analysis import (
+from scripts.thermal_analysis import (
     MaterialProperties,
     ThermalAnalyzer,
     PeltierModule,
@@ -0,0 +1,133 @@
+"""
+Unit Tests for Thin-Film Coating Module
+박막 코팅 모듈 단위 테스트
+"""
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.glass_catalog import refractive_index
+from scripts.thin_film import CoatingCurve, ThinFilmStack, material_index, quarter_wave
+
+
+def _fresnel(n, angles_deg):
+    """공기 -> 굴절률 n 경계의 (Rs, Rp)"""
+    ti = np.radians(angles_deg)
+    tt = np.arcsin(np.sin(ti) / n)
+    rs = (np.cos(ti) - n * np.cos(tt)) / (np.cos(ti) + n * np.cos(tt))
+    rp = (n * np.cos(ti) - np.cos(tt)) / (n * np.cos(ti) + np.cos(tt))
+    return rs**2, rp**2
+
+
+class TestSingleInterface:
+    """코팅 없는 경계 테스트"""
+
+    def test_bare_substrate_matches_fresnel(self):
+        """s/p 반사율 = 프레넬 식, 브루스터 각에서 Rp = 0"""
+        n = refractive_index('N-BK7', 0.55)
+        angles = np.array([0.0, 20.0, 45.0, 70.0, 85.0])
+        curve = ThinFilmStack([], 'N-BK7').compute(0.55, angles)
+        rs, rp = _fresnel(n, angles)
+        np.testing.assert_allclose(curve.R[0, 0], rs, atol=1e-14)
+        np.testing.assert_allclose(curve.R[1, 0], rp, atol=1e-14)
+        np.testing.assert_allclose(curve.R + curve.T, 1.0, atol=1e-14)
+        brewster = ThinFilmStack([], 'N-BK7').compute(0.55, np.degrees(np.arctan(n)))
+        assert brewster.R[1, 0, 0] == pytest.approx(0.0, abs=1e-20)
+
+    def test_total_internal_reflection(self):
+        """유리 -> 공기, 임계각 넘으면 R = 1, T = 0"""
+        critical = np.degrees(np.arcsin(1 / refractive_index('N-BK7', 0.55)))
+        curve = ThinFilmStack([], '', incident='N-BK7').compute(
+            0.55, [critical - 5, critical + 1, 80.0])
+        assert np.all(curve.T[:, 0, 0] > 0.5)
+        np.testing.assert_allclose(curve.R + curve.T, 1.0, atol=1e-12)
+        np.testing.assert_allclose(curve.R[:, 0, 1:], 1.0, atol=1e-12)
+        np.testing.assert_allclose(curve.T[:, 0, 1:], 0.0, atol=1e-12)
+
+
+class TestMultilayer:
+    """다층 코팅 닫힌 식 테스트"""
+
+    def test_quarter_wave_ar(self):
+        """1/4 파장 단층: R = ((ns - n1^2) / (ns + n1^2))^2, n1 = √ns이면 0"""
+        ns = refractive_index('N-BK7', 0.55)
+        curve = ThinFilmStack([('MGF2', quarter_wave('MGF2', 0.55))], 'N-BK7').compute(0.55)
+        assert curve.R[0, 0, 0] == pytest.approx(((ns - 1.38**2) / (ns + 1.38**2))**2)
+        ideal = ThinFilmStack([(np.sqrt(ns), quarter_wave(np.sqrt(ns), 0.55))], 'N-BK7')
+        assert ideal.compute(0.55).R[0, 0, 0] == pytest.approx(0.0, abs=1e-20)
+
+    def test_half_wave_is_absentee(self):
+        """설계 파장의 1/2 파장 층은 반사율을 바꾸지 않음"""
+        stack = ThinFilmStack.quarter_wave_stack(['TIO2'], 0.8, multiples=[2.0])
+        bare = ThinFilmStack([], 'N-BK7')
+        assert stack.compute(0.8).R[0, 0, 0] == pytest.approx(bare.compute(0.8).R[0, 0, 0])
+        assert stack.compute(0.6).R[0, 0, 0] > bare.compute(0.6).R[0, 0, 0]
+
+    def test_quarter_wave_mirror(self):
+        """(HL)^N H 미러: R = ((1 - Y) / (1 + Y))^2, Y = (nH/nL)^2N nH^2 / ns"""
+        N = 8
+        mirror = ThinFilmStack.quarter_wave_stack(['TIO2', 'SIO2'] * N + ['TIO2'], 1.064)
+        Y = (2.30 / 1.45)**(2 * N) * 2.30**2 / refractive_index('N-BK7', 1.064)
+        curve = mirror.compute([1.0, 1.064, 1.3], [0.0, 45.0])
+        assert curve.R[0, 1, 0] == pytest.approx(((1 - Y) / (1 + Y))**2, rel=1e-12)
+        assert curve.R[1, 1, 0] == curve.R[0, 1, 0]
+        # 45도에서 s가 p보다 반사율이 높음
+        assert curve.R[0, 1, 1] > curve.R[1, 1, 1]
+        np.testing.assert_allclose(curve.A, 0.0, atol=1e-12)
+
+    def test_absorbing_layer(self):
+        """두꺼운 흡수층은 벌크 경계 반사율, 얇으면 R + T + A = 1, A > 0"""
+        metal = 0.2 + 3.4j
+        thick = ThinFilmStack([(metal, 1.0)], 'N-BK7').compute(0.55, [0.0])
+        assert thick.R[0, 0, 0] == pytest.approx(abs((1 - metal) / (1 + metal))**2)
+        assert thick.T[0, 0, 0] == pytest.approx(0.0, abs=1e-20)
+        thin = ThinFilmStack([(metal, 0.01)], 'N-BK7').compute(
+            np.linspace(0.5, 0.6, 5), np.arange(0, 80, 10.0))
+        assert np.all(thin.A > 0) and np.all(thin.T > 0)
+        np.testing.assert_allclose(thin.R + thin.T + thin.A, 1.0)
+
+    def test_materials(self):
+        """카탈로그 이름, 공칭 박막 재질, 복소수, 함수"""
+        wl = np.array([8.0, 10.0])
+        np.testing.assert_allclose(material_index('GE', wl).real,
+                                   [refractive_index('GERMANIUM', w) for w in wl])
+        assert material_index('ZnS', wl)[0] == 2.2
+        assert material_index(1.5 + 0.1j, wl)[1] == 1.5 + 0.1j
+        np.testing.assert_allclose(material_index(lambda w: 1 + 0.01 * w, wl), [1.08, 1.1])
+        with pytest.raises(ValueError):
+            ThinFilmStack([('MGF2', -0.1)])
+        with pytest.raises(ValueError):
+            ThinFilmStack([]).compute(0.55, [90.0])
+
+
+class TestCoatingCurve:
+    """캐시와 보간 테스트"""
+
+    def test_interpolation_matches_direct(self):
+        """격자 보간 = 직접 계산 (격자점은 정확히)"""
+        ar = ThinFilmStack.quarter_wave_stack(['YF3', 'ZNS'], 10.0, substrate='GERMANIUM')
+        curve = ar.curve(np.linspace(8, 12, 201), np.arange(0, 61, 1.0))
+        rng = np.random.default_rng(0)
+        wl, angle = rng.uniform(8, 12, 50), rng.uniform(0, 60, 50)
+        direct = np.array([ar.compute(w, a).T.mean(axis=0)[0, 0] for w, a in zip(wl, angle)])
+        np.testing.assert_allclose(curve(wl, angle, 'T'), direct, atol=2e-4)
+        assert curve(10.0, -30.0, 'R', 's') == pytest.approx(curve.R[0, 100, 30])
+
+    def test_cache_and_roundtrip(self, tmp_path):
+        """같은 격자는 캐시 재사용, npz 저장/복원"""
+        stack = ThinFilmStack([('MGF2', 0.1)], cache_size=2)
+        first = stack.curve([0.5, 0.6])
+        assert stack.curve([0.5, 0.6]) is first
+        stack.curve([0.4])
+        stack.curve([0.7])
+        assert stack.curve([0.5, 0.6]) is not first
+        first.save(tmp_path / 'mgf2.npz')
+        loaded = CoatingCurve.load(tmp_path / 'mgf2.npz')
+        np.testing.assert_array_equal(loaded.R, first.R)
+        np.testing.assert_array_equal(loaded.angles, np.arange(90.0))
+        with pytest.raises(ValueError):
+            first(0.55, 0.0, polarization='x')
@@ -0,0 +1,224 @@
+"""
+Unit Tests for ZMX Lens File Reader
+ZMX 렌즈 파일 리더 단위 테스트
+"""
+
+import os
+
+import pytest
+import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import zmx_reader
+from scripts.optics_backend import BackendError, LocalBackend
+from scripts.prescription import Prescription
+from scripts.zmx_reader import (
+    ZmxFormatError,
+    index_designs,
+    parse_zmx,
+    read_zmx,
+    sidecar_path,
+    write_zmx,
+)
+
+
+# OpticStudio 형식의 2구성 비구면 단렌즈 (인치 단위, F수 지정)
+SAMPLE_ZMX = """VERS 190513 80 123457 L123457
+MODE SEQ
+NAME Asphere zoom test
+PFIL 0 0 0
+UNIT IN X W X CM MR CPMM
+FNUM 4 0
+ENVD 2.0E+1 1 0
+GFAC 0 0
+GCAT SCHOTT OHARA
+RAIM 0 0 1 1 0 0 0 0 0 1
+FTYP 0 0 2 2 0 0 0
+XFLN 0 0 0 0 0 0 0 0 0 0 0 0
+YFLN 0 3.5 0 0 0 0 0 0 0 0 0 0
+FWGN 1 1 1 1 1 1 1 1 1 1 1 1
+WAVM 1 0.5875618 1
+WAVM 2 0.4861327 1
+WAVM 3 0.55 1
+PWAV 1
+SURF 0
+  TYPE STANDARD
+  CURV 0.0 0 0 0 0 ""
+  HIDE 0 0 0 0 0 0 0 0 0 0
+  MIRR 2 0
+  DISZ INFINITY
+SURF 1
+  STOP
+  TYPE EVENASPH
+  CURV 0.25 0 0 0 0 ""
+  HIDE 0 0 0 0 0 0 0 0 0 0
+  MIRR 2 0
+  PARM 1 0
+  PARM 2 0.001
+  PARM 3 -2E-5
+  PARM 4 0
+  GLAS N-BK7 0 0 1.5168 6.41673E+1 0 0 0 0 0 0
+  CONI -0.5
+  DISZ 0.2
+  DIAM 0.5 1 0 0 1 ""
+SURF 2
+  TYPE STANDARD
+  CURV -0.05 0 0 0 0 ""
+  DISZ 3.5
+  DIAM 0.45 0 0 0 1 ""
+SURF 3
+  TYPE STANDARD
+  CURV 0.0 0 0 0 0 ""
+  GLAS ___BLANK 1 0 1.6 40 0 0 0 0 0 0
+  DISZ 0
+MNUM 2 1
+MOFF 0 1 "" 0 0 0 1 1 0 0.0 ""
+MOFF 0 2 "" 0 0 0 1 1 0 0.0 ""
+THIC 2 0 0
+MOFF 1 1 "" 3.5 0 0 1 1 0 0.0 ""
+MOFF 1 2 "" 4.0 0 0 1 1 0 0.0 ""
+GLSS 1 0 0
+MOFF 2 1 "N-BK7" 0 0 0 1 1 0 0.0 ""
+MOFF 2 2 "N-SF5" 0 0 0 1 1 0 0.0 ""
+TOL TOFF 0 0 0 0 0 0 0
+"""
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """UTF-16 (OpticStudio 기본 인코딩) 샘플 파일"""
+    path = tmp_path / "asphere.zmx"
+    path.write_bytes(SAMPLE_ZMX.encode('utf-16'))
+    return path
+
+
+class TestParse:
+    """ZMX 파싱 테스트"""
+
+    def test_surfaces_and_units(self, sample_file):
+        """표면 배열, 인치 -> mm 변환, 비구면 계수 변환"""
+        design = read_zmx(sample_file, sidecar=False)
+        presc = design.prescription
+        assert presc.name == "Asphere zoom test"
+        assert presc.n_surfaces == 4 and presc.stop == 1
+        assert presc.surface_type == ['STANDARD', 'EVENASPH', 'STANDARD', 'STANDARD']
+        np.testing.assert_allclose(presc.curvature[1], 0.25 / 25.4)
+        np.testing.assert_allclose(presc.thickness[1:3], [0.2 * 25.4, 3.5 * 25.4])
+        assert np.isinf(presc.thickness[0])
+        assert presc.conic[1] == -0.5
+        # PARM k (r^2k 계수)는 inch^(1-2k) -> mm^(1-2k)
+        np.testing.assert_allclose(presc.params[1, 1], 0.001 * 25.4**-3)
+        np.testing.assert_allclose(presc.params[1, 2], -2e-5 * 25.4**-5)
+        # 고정 반구경만 제한으로 사용, 모델 유리는 nd 상수
+        np.testing.assert_allclose(presc.semi_diameter, [0, 0.5 * 25.4, 0, 0])
+        assert presc.glass == ['', 'N-BK7', '', '1.6']
+
+    def test_system_data(self, sample_file):
+        """시야/파장 수는 FTYP, F수 -> 입사동 지름"""
+        from scripts.raytrace import paraxial_data
+        design = read_zmx(sample_file, sidecar=False)
+        presc = design.prescription
+        assert presc.fields.tolist() == [0.0, 3.5]
+        assert presc.wavelengths.tolist() == [0.5875618, 0.4861327]
+        assert design.catalogs == ['SCHOTT', 'OHARA']
+        assert design.aperture_type == 'FNUM'
+        assert paraxial_data(presc).f_number == pytest.approx(4.0)
+        assert design.unsupported() == []
+
+    def test_multi_configuration(self, sample_file):
+        """다중 구성 연산자 적용"""
+        design = read_zmx(sample_file, sidecar=False)
+        assert design.n_configs == 2
+        assert design.multi_config.operands == ['THIC', 'GLSS']
+        second = design.configuration(2)
+        assert second.thickness[2] == pytest.approx(4.0 * 25.4)
+        assert second.glass[1] == 'N-SF5'
+        assert design.prescription.glass[1] == 'N-BK7'
+        with pytest.raises(ValueError):
+            design.configuration(3)
+
+    def test_format_errors(self):
+        """잘못된 숫자는 줄 번호와 함께 오류"""
+        with pytest.raises(ZmxFormatError, match=r'bad\.zmx:4'):
+            parse_zmx("MODE SEQ\nSURF 0\n  DISZ INFINITY\n  CURV abc\nSURF 1\n", 'bad.zmx')
+        with pytest.raises(ZmxFormatError):
+            parse_zmx("MODE SEQ\nENPD 10\n")
+
+    def test_write_roundtrip(self, tmp_path):
+        """write_zmx -> read_zmx 왕복"""
+        presc = Prescription(wavelengths=[0.55, 0.65], fields=[0.0, 7.0], aperture=12.5)
+        presc.add_surface(radius=40.0, thickness=6.0, glass='N-BK7', conic=-1.2,
+                          surface_type='EVENASPH', params=[0.0, 1e-6, -3e-9])
+        presc.add_surface(radius=-80.0, thickness=70.0, semi_diameter=8.0)
+        write_zmx(presc, tmp_path / "lens.zmx")
+        loaded = read_zmx(tmp_path / "lens.zmx", sidecar=False).prescription
+        for key in ('curvature', 'thickness', 'conic', 'semi_diameter', 'params',
+                    'wavelengths', 'fields'):
+            np.testing.assert_array_equal(getattr(loaded, key), getattr(presc, key))
+        assert loaded.glass == presc.glass and loaded.surface_type == presc.surface_type
+        assert loaded.aperture == presc.aperture
+
+
+class TestSidecar:
+    """사이드카 캐시 테스트"""
+
+    def test_repeat_load_uses_sidecar(self, sample_file, monkeypatch):
+        """두 번째 로드는 파싱하지 않음, 원본이 바뀌면 다시 파싱"""
+        first = read_zmx(sample_file)
+        assert sidecar_path(sample_file).exists()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(zmx_reader, 'parse_zmx', fail)
+        cached = read_zmx(sample_file)
+        for key in ('curvature', 'thickness', 'params', 'semi_diameter'):
+            np.testing.assert_array_equal(getattr(cached.prescription, key),
+                                          getattr(first.prescription, key))
+        assert cached.prescription.aperture == first.prescription.aperture
+        assert cached.configuration(2).glass == first.configuration(2).glass
+
+        st = os.stat(sample_file)
+        os.utime(sample_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        with pytest.raises(AssertionError, match="parsed again"):
+            read_zmx(sample_file)
+
+    def test_corrupt_sidecar_and_separate_dir(self, sample_file, tmp_path):
+        """손상된 사이드카는 무시, 별도 사이드카 디렉토리"""
+        read_zmx(sample_file)
+        sidecar_path(sample_file).write_bytes(b'garbage')
+        assert read_zmx(sample_file).prescription.n_surfaces == 4
+
+        read_zmx(sample_file, sidecar_dir=tmp_path / 'cache')
+        assert len(list((tmp_path / 'cache').iterdir())) == 1
+
+
+class TestIndexAndBackend:
+    """설계 색인과 로컬 백엔드 연동 테스트"""
+
+    def test_index_designs(self, sample_file, tmp_path):
+        """표면당 한 행, 읽지 못한 파일은 errors에 기록"""
+        bad = tmp_path / "bad.zmx"
+        bad.write_text("SURF 0\n  CURV x\n")
+        df = index_designs([sample_file, bad, tmp_path / "missing.zmx"])
+        assert len(df) == 4
+        assert df['is_stop'].sum() == 1
+        assert df.loc[df['surface'] == 1, 'glass'].item() == 'N-BK7'
+        assert set(df['n_configs']) == {2}
+        assert set(df.attrs['errors']) == {str(bad), str(tmp_path / "missing.zmx")}
+
+    def test_local_backend_opens_zmx(self, sample_file, tmp_path):
+        """로컬 백엔드에서 .zmx 열기/저장"""
+        backend = LocalBackend()
+        backend.open_file(sample_file)
+        assert backend.system.surface_type[1] == 'EVENASPH'
+        backend.save_file(tmp_path / "copy.zmx")
+        assert read_zmx(tmp_path / "copy.zmx").prescription.n_surfaces == 4
+
+        height_fields = tmp_path / "height.zmx"
+        height_fields.write_text(SAMPLE_ZMX.replace("FTYP 0 0 2 2", "FTYP 1 0 2 2"))
+        with pytest.raises(BackendError, match="object_height"):
+            backend.open_file(height_fields)